@@ -18,9 +18,20 @@ class Settings(BaseSettings):
 
     # Database
     DATABASE_URL: str = "sqlite:///./daytrader.db"
+    DB_POOL_SIZE: int = 8  # Pooled connections for the read-write engine
+    DB_MAX_OVERFLOW: int = 4  # Extra connections allowed beyond the pool under bursts
+    DB_POOL_TIMEOUT_SECONDS: float = 10.0  # Wait for a free pooled connection before erroring
+    DB_READ_POOL_SIZE: int = 4  # Separate pool for read-only analytics/dashboard sessions
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000  # Wait on a locked database instead of failing immediately
+    SQLITE_MMAP_SIZE: int = 268435456  # 256 MB of the database file memory-mapped for reads
+    RESPONSE_CACHE_ENABLED: bool = True  # Cache polled dashboard responses with ETags until trade/alert data changes
+    RESPONSE_CACHE_MAX_ENTRIES: int = 256  # Least recently used responses are evicted beyond this
 
     # TradingView Webhook
     WEBHOOK_SECRET: str = "change-me"
+    WEBHOOK_QUEUE_ENABLED: bool = False  # Answer 202 and process alerts on per-ticker queue workers
+    WEBHOOK_QUEUE_MAX_DEPTH: int = 50  # Per-ticker backlog before the webhook answers 503
+    WEBHOOK_QUEUE_DRAIN_SECONDS: float = 30.0  # On shutdown, time to finish queued alerts before the rest are marked ERROR
 
     # Schwab API (OAuth2 Authorization Code Flow)
     SCHWAB_APP_KEY: str = "change-me"
@@ -41,6 +52,8 @@ class Settings(BaseSettings):
     MAX_CONSECUTIVE_LOSSES: int = 3
     # VIX circuit breaker — block all new trades when VIX >= this
     VIX_CIRCUIT_BREAKER: float = 28.0
+    RISK_VIX_TTL_SECONDS: float = 30.0  # Reuse a REST VIX reading for this long when not streaming
+    RISK_STATE_RESYNC_SECONDS: int = 60  # Full reload of the in-memory pre-trade risk counters
 
     # Entry limit strategy
     ENTRY_LIMIT_BELOW_PERCENT: float = 5.0
@@ -110,12 +123,30 @@ class Settings(BaseSettings):
 
     # Monitoring Intervals
     ORDER_POLL_INTERVAL_SECONDS: int = 5
+    ORDER_RECONCILE_INTERVAL_SECONDS: int = 30  # REST sweep while ACCT_ACTIVITY is streaming
     EXIT_CHECK_INTERVAL_SECONDS: int = 10
+    POSITION_BOOK_RESYNC_SECONDS: int = 60  # Full reload of the in-memory open-trade book
+
+    # Schwab REST calls from the event loop — max in-flight and timeout per endpoint
+    SCHWAB_ORDER_CONCURRENCY: int = 4
+    SCHWAB_ORDER_TIMEOUT_SECONDS: float = 15.0  # Order status reads only; place/cancel always run to completion
+    SCHWAB_QUOTE_CONCURRENCY: int = 4
+    SCHWAB_QUOTE_TIMEOUT_SECONDS: float = 5.0
+    SCHWAB_CHAIN_CONCURRENCY: int = 2
+    SCHWAB_CHAIN_TIMEOUT_SECONDS: float = 15.0
+    SCHWAB_HISTORY_CONCURRENCY: int = 2
+    SCHWAB_HISTORY_TIMEOUT_SECONDS: float = 10.0
+
+    # Option chains younger than this are reused across alerts/tasks (0 = off)
+    OPTION_CHAIN_CACHE_TTL_SECONDS: float = 3.0
 
     # Schwab Streaming (WebSocket)
     STREAMING_ENABLED: bool = True
     STREAMING_STALE_SECONDS: float = 30.0
-    SNAPSHOT_RECORD_INTERVAL_SECONDS: float = 2.0  # How often PriceRecorderTask polls streaming cache
+    SNAPSHOT_RECORD_INTERVAL_SECONDS: float = 2.0  # How often PriceRecorderTask persists high-water marks
+    WRITE_BEHIND_FLUSH_MS: int = 250  # BulkWriter flush interval for snapshot/event rows
+    WRITE_BEHIND_BATCH_SIZE: int = 500  # Flush early once this many rows are pending
+    BAR_STREAM_STALE_SECONDS: float = 150.0  # Fall back to REST bars when CHART_EQUITY goes quiet
 
     # ORB Auto Strategy
     ACTIVE_STRATEGY: str = "orb_auto"  # "orb_auto" | "tradingview" | "disabled"
@@ -1,17 +1,59 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 
 from app.config import Settings
 
 settings = Settings()
 
-engine = create_engine(
-    settings.DATABASE_URL,
-    connect_args={"check_same_thread": False},
-    echo=settings.DEBUG,
+
+def _is_sqlite_file(url: str) -> bool:
+    return url.startswith("sqlite") and url not in ("sqlite://", "sqlite:///:memory:")
+
+
+def _sqlite_pragmas(read_only: bool):
+    def on_connect(dbapi_conn, _record):
+        cursor = dbapi_conn.cursor()
+        # WAL lets the dashboard read while a task writes; NORMAL only
+        # fsyncs at checkpoints, which is safe under WAL
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute(f"PRAGMA mmap_size={settings.SQLITE_MMAP_SIZE}")
+        cursor.execute(f"PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS}")
+        if read_only:
+            cursor.execute("PRAGMA query_only=ON")
+        cursor.close()
+
+    return on_connect
+
+
+def create_db_engine(url: str, read_only: bool = False):
+    """Engine for url; file-backed SQLite gets WAL pragmas and a bounded pool."""
+    if not _is_sqlite_file(url):
+        return create_engine(url, connect_args={"check_same_thread": False}, echo=settings.DEBUG)
+
+    db_engine = create_engine(
+        url,
+        connect_args={"check_same_thread": False},
+        echo=settings.DEBUG,
+        pool_size=settings.DB_READ_POOL_SIZE if read_only else settings.DB_POOL_SIZE,
+        max_overflow=0 if read_only else settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+    )
+    event.listen(db_engine, "connect", _sqlite_pragmas(read_only))
+    return db_engine
+
+
+engine = create_db_engine(settings.DATABASE_URL)
+# Dashboard/analytics reads use their own pool so they never hold up
+# trade-state writes waiting for a connection
+read_engine = (
+    create_db_engine(settings.DATABASE_URL, read_only=True)
+    if _is_sqlite_file(settings.DATABASE_URL)
+    else engine  # an in-memory database is private to its own engine
 )
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
 
 
 def get_db():
@@ -20,3 +62,11 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def get_read_db():
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
@@ -1,10 +1,24 @@
 from fastapi import Request
 
+from app.services.alert_queue import AlertQueue
+from app.services.bar_aggregator import BarAggregator
+from app.services.bulk_writer import BulkWriter
+from app.services.position_book import PositionBook, TradeStateBus
+from app.services.response_cache import ResponseCache
+from app.services.risk_state import RiskState
 from app.services.streaming import StreamingService
 from app.services.ws_manager import WebSocketManager
 
 _ws_manager = WebSocketManager()
-_streaming_service = StreamingService()
+_bar_aggregator = BarAggregator()
+_streaming_service = StreamingService(bar_aggregator=_bar_aggregator)
+_trade_state_bus = TradeStateBus()
+_position_book = PositionBook(_trade_state_bus)
+_risk_state = RiskState(_trade_state_bus)
+_bulk_writer = BulkWriter()
+_alert_queue = AlertQueue()
+_response_cache = ResponseCache()
+_ws_manager.add_listener(_response_cache.on_ws_event)
 
 
 def get_ws_manager() -> WebSocketManager:
@@ -15,10 +29,38 @@ def get_streaming_service() -> StreamingService:
     return _streaming_service
 
 
+def get_bar_aggregator() -> BarAggregator:
+    return _bar_aggregator
+
+
+def get_trade_state_bus() -> TradeStateBus:
+    return _trade_state_bus
+
+
+def get_position_book() -> PositionBook:
+    return _position_book
+
+
+def get_risk_state() -> RiskState:
+    return _risk_state
+
+
+def get_bulk_writer() -> BulkWriter:
+    return _bulk_writer
+
+
+def get_alert_queue() -> AlertQueue:
+    return _alert_queue
+
+
+def get_response_cache() -> ResponseCache:
+    return _response_cache
+
+
 def get_schwab_service(request: Request):
-    from app.services.schwab_client import SchwabService
+    from app.services.schwab_client import AsyncSchwabService, SchwabService
 
-    return SchwabService(request.app.state.schwab_client)
+    return AsyncSchwabService(SchwabService(request.app.state.schwab_client))
 
 
 def get_option_selector(request: Request):
@@ -29,12 +71,16 @@ def get_option_selector(request: Request):
     return OptionSelector(schwab)
 
 
-def get_trade_manager(request: Request):
+def build_trade_manager(app):
     from app.services.option_selector import OptionSelector
     from app.services.schwab_client import SchwabService
     from app.services.trade_manager import TradeManager
 
-    schwab = SchwabService(request.app.state.schwab_client)
+    schwab = SchwabService(app.state.schwab_client)
     selector = OptionSelector(schwab)
     ws = get_ws_manager()
-    return TradeManager(schwab, selector, ws, app=request.app)
+    return TradeManager(schwab, selector, ws, app=app)
+
+
+def get_trade_manager(request: Request):
+    return build_trade_manager(request.app)
@@ -75,6 +75,16 @@ async def lifespan(app: FastAPI):
 
     conn.close()
 
+    # Dashboard PnL aggregates for trade days recorded before the tables existed
+    from app.database import SessionLocal
+    from app.services import pnl_aggregates
+
+    db = SessionLocal()
+    try:
+        pnl_aggregates.backfill(db)
+    finally:
+        db.close()
+
     # Initialize Schwab client (OAuth2 or Paper)
     if settings.PAPER_TRADE:
         from app.services.paper_client import PaperSchwabClient
@@ -137,6 +147,12 @@ async def lifespan(app: FastAPI):
         elif not settings.STREAMING_ENABLED:
             logger.info("Streaming disabled by STREAMING_ENABLED=False")
 
+    # Write-behind queue for price snapshots and exit-check events
+    from app.dependencies import get_bulk_writer
+
+    bulk_writer = get_bulk_writer()
+    bulk_writer.start()
+
     # Start background tasks
     tasks = []
     if app.state.schwab_client:
@@ -181,6 +197,11 @@ async def lifespan(app: FastAPI):
 
     yield
 
+    # Let the webhook queue workers finish accepted alerts while streaming and the monitors still run
+    from app.dependencies import get_alert_queue
+
+    await get_alert_queue().stop(drain_timeout=settings.WEBHOOK_QUEUE_DRAIN_SECONDS)
+
     # Stop streaming
     if getattr(app.state, "streaming_service", None):
         await streaming.stop()
@@ -188,8 +209,12 @@ async def lifespan(app: FastAPI):
 
     for task in tasks:
         task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
     logger.info("Background tasks cancelled")
 
+    # Flush rows the tasks queued before they stopped
+    await bulk_writer.stop()
+
 
 def create_app() -> FastAPI:
     app = FastAPI(title="DayTrader 0DTE", lifespan=lifespan)
@@ -208,6 +208,39 @@ class DailySummary(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
 
 
+class DailyPnL(Base):
+    """Per-day trade counts and PnL, refreshed whenever one of the day's trades changes."""
+
+    __tablename__ = "daily_pnl"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    trade_date = Column(Date, unique=True, nullable=False)
+    total_trades = Column(Integer, default=0)  # Non-cancelled
+    open_positions = Column(Integer, default=0)
+    closed_trades = Column(Integer, default=0)
+    winning_trades = Column(Integer, default=0)
+    total_pnl = Column(Float, default=0.0)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+
+class PnLBucket(Base):
+    """Closed-trade PnL per (day, ET entry hour, source, ticker, hold-time bucket)."""
+
+    __tablename__ = "pnl_buckets"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    trade_date = Column(Date, nullable=False, index=True)
+    hour = Column(Integer, nullable=True)  # ET hour of entry fill
+    source = Column(String(20), nullable=False)
+    ticker = Column(String(10), nullable=True)
+    hold_bucket = Column(Integer, nullable=True)  # Index into pnl_aggregates.HOLD_BUCKETS
+    total_trades = Column(Integer, default=0)
+    winning_trades = Column(Integer, default=0)
+    total_pnl = Column(Float, default=0.0)
+    gross_wins = Column(Float, default=0.0)
+    gross_losses = Column(Float, default=0.0)  # Absolute sum over non-winning trades
+
+
 class OptionChainSnapshot(Base):
     __tablename__ = "option_chain_snapshots"
 
@@ -294,6 +294,8 @@ class OptimizeRequest(BaseModel):
     scale_out_enabled: bool = True
     quantity: int = Field(2, ge=1, le=10)
     walk_forward: bool = Field(True, description="Enable walk-forward train/test split")
+    search_strategy: str = Field("random", description="random | tpe | halving")
+    exit_variants: int = Field(4, ge=1, le=20, description="Combos per signal setup, varying only exit params")
 
 
 class OptimizeResultEntry(BaseModel):
@@ -325,6 +327,15 @@ class OptimizeResponse(BaseModel):
     train_end: Optional[str] = None
     test_start: Optional[str] = None
     test_end: Optional[str] = None
+    # Indicator cache effectiveness
+    indicator_cache_hits: int = 0
+    indicator_cache_misses: int = 0
+    search_strategy: str = "random"
+    screening_backtests: int = 0
+    # Early-abort pruning
+    pruned_combos: int = 0
+    pruned_days_skipped: int = 0
+    pruned_work_saved_pct: float = 0.0
 
 
 # ── Helpers ───────────────────────────────────────────────────────
@@ -406,6 +417,10 @@ def run_optimize_endpoint(body: OptimizeRequest):
     if body.target_metric not in valid_metrics:
         raise HTTPException(400, f"target_metric must be one of {valid_metrics}")
 
+    valid_strategies = ("random", "tpe", "halving")
+    if body.search_strategy not in valid_strategies:
+        raise HTTPException(400, f"search_strategy must be one of {valid_strategies}")
+
     config = OptimizationConfig(
         start_date=body.start_date,
         end_date=body.end_date,
@@ -418,6 +433,8 @@ def run_optimize_endpoint(body: OptimizeRequest):
         scale_out_enabled=body.scale_out_enabled,
         quantity=body.quantity,
         walk_forward=body.walk_forward,
+        search_strategy=body.search_strategy,
+        exit_variants=body.exit_variants,
     )
 
     try:
@@ -463,4 +480,11 @@ def run_optimize_endpoint(body: OptimizeRequest):
         train_end=result.train_end.isoformat() if result.train_end else None,
         test_start=result.test_start.isoformat() if result.test_start else None,
         test_end=result.test_end.isoformat() if result.test_end else None,
+        indicator_cache_hits=result.indicator_cache_hits,
+        indicator_cache_misses=result.indicator_cache_misses,
+        search_strategy=result.search_strategy,
+        screening_backtests=result.screening_backtests,
+        pruned_combos=result.pruned_combos,
+        pruned_days_skipped=result.pruned_days_skipped,
+        pruned_work_saved_pct=result.pruned_work_saved_pct,
     )
@@ -10,12 +10,15 @@ from zoneinfo import ZoneInfo
 import httpx
 from fastapi import APIRouter, Depends, Query, Request
 from pydantic import BaseModel
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 
 from app.config import Settings
-from app.database import get_db
-from app.models import Alert, Trade, TradeStatus
+from app.database import get_read_db
+from app.dependencies import get_alert_queue, get_response_cache
+from app.models import Alert, DailyPnL, PnLBucket, Trade, TradeStatus
 from app.schemas import DailyStatsResponse, PnLChartResponse, PnLDataPoint, PnLSummaryDay, PnLSummaryResponse
+from app.services.pnl_aggregates import HOLD_BUCKETS
 
 logger = logging.getLogger(__name__)
 
@@ -27,70 +30,69 @@ ENV_FILE = Path(__file__).resolve().parent.parent.parent / ".env"
 
 @router.get("/dashboard/stats", response_model=DailyStatsResponse)
 def get_daily_stats(
+    request: Request,
     trade_date: Optional[date] = None,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
-    today = trade_date or date.today()
-    trades = db.query(Trade).filter(Trade.trade_date == today).all()
-
-    closed = [t for t in trades if t.status == TradeStatus.CLOSED]
-    open_positions = [
-        t
-        for t in trades
-        if t.status
-        in (TradeStatus.FILLED, TradeStatus.STOP_LOSS_PLACED, TradeStatus.EXITING)
-    ]
-    winners = [t for t in closed if (t.pnl_dollars or 0) > 0]
-    total_pnl = sum(t.pnl_dollars or 0 for t in closed)
-    trade_count = len(
-        [t for t in trades if t.status != TradeStatus.CANCELLED]
-    )
+    def build():
+        today = trade_date or date.today()
+        day = db.query(DailyPnL).filter(DailyPnL.trade_date == today).first()
+        trade_count = day.total_trades if day else 0
+        closed = day.closed_trades if day else 0
+        winners = day.winning_trades if day else 0
+
+        return DailyStatsResponse(
+            trade_date=today,
+            total_trades=trade_count,
+            trades_remaining=max(0, settings.MAX_DAILY_TRADES - trade_count),
+            winning_trades=winners,
+            losing_trades=closed - winners,
+            total_pnl=day.total_pnl if day else 0.0,
+            win_rate=(winners / closed * 100) if closed else 0,
+            open_positions=day.open_positions if day else 0,
+        )
 
-    return DailyStatsResponse(
-        trade_date=today,
-        total_trades=trade_count,
-        trades_remaining=max(0, settings.MAX_DAILY_TRADES - trade_count),
-        winning_trades=len(winners),
-        losing_trades=len(closed) - len(winners),
-        total_pnl=total_pnl,
-        win_rate=(len(winners) / len(closed) * 100) if closed else 0,
-        open_positions=len(open_positions),
-    )
+    return get_response_cache().respond(request, ("trades",), build)
 
 
 @router.get("/dashboard/pnl", response_model=PnLChartResponse)
 def get_pnl_chart(
+    request: Request,
     trade_date: Optional[date] = None,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
-    target_date = trade_date or date.today()
-    closed_trades = (
-        db.query(Trade)
-        .filter(Trade.trade_date == target_date)
-        .filter(Trade.status == TradeStatus.CLOSED)
-        .order_by(Trade.exit_filled_at.asc())
-        .all()
-    )
+    def build():
+        target_date = trade_date or date.today()
+        # One point per trade, so this reads the three columns it plots rather than an aggregate
+        closed_trades = (
+            db.query(Trade.id, Trade.exit_filled_at, Trade.pnl_dollars)
+            .filter(Trade.trade_date == target_date)
+            .filter(Trade.status == TradeStatus.CLOSED)
+            .order_by(Trade.exit_filled_at.asc())
+            .all()
+        )
 
-    data_points = []
-    cumulative = 0.0
-    for trade in closed_trades:
-        cumulative += trade.pnl_dollars or 0
-        data_points.append(
-            PnLDataPoint(
-                timestamp=trade.exit_filled_at,
-                cumulative_pnl=cumulative,
-                trade_id=trade.id,
+        data_points = []
+        cumulative = 0.0
+        for trade in closed_trades:
+            cumulative += trade.pnl_dollars or 0
+            data_points.append(
+                PnLDataPoint(
+                    timestamp=trade.exit_filled_at,
+                    cumulative_pnl=cumulative,
+                    trade_id=trade.id,
+                )
             )
-        )
 
-    return PnLChartResponse(data_points=data_points, total_pnl=cumulative)
+        return PnLChartResponse(data_points=data_points, total_pnl=cumulative)
+
+    return get_response_cache().respond(request, ("trades",), build)
 
 
 @router.get("/dashboard/pnl-summary", response_model=PnLSummaryResponse)
 def get_pnl_summary(
     period: str = "weekly",
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """Return per-day PnL for the current week or month."""
     today = date.today()
@@ -100,30 +102,26 @@ def get_pnl_summary(
         # weekly: Monday of current week
         start_date = today - timedelta(days=today.weekday())
 
-    closed_trades = (
-        db.query(Trade)
-        .filter(Trade.trade_date >= start_date, Trade.trade_date <= today)
-        .filter(Trade.status == TradeStatus.CLOSED)
+    by_date = {
+        d.trade_date: d
+        for d in db.query(DailyPnL)
+        .filter(DailyPnL.trade_date >= start_date, DailyPnL.trade_date <= today)
         .all()
-    )
-
-    # Group by date
-    by_date: dict[date, list] = {}
-    for t in closed_trades:
-        by_date.setdefault(t.trade_date, []).append(t)
+    }
 
     days = []
     current = start_date
     while current <= today:
-        trades_on_day = by_date.get(current, [])
-        winners = [t for t in trades_on_day if (t.pnl_dollars or 0) > 0]
+        d = by_date.get(current)
+        closed = d.closed_trades if d else 0
+        winners = d.winning_trades if d else 0
         days.append(
             PnLSummaryDay(
                 trade_date=current,
-                pnl=sum(t.pnl_dollars or 0 for t in trades_on_day),
-                total_trades=len(trades_on_day),
-                winning_trades=len(winners),
-                losing_trades=len(trades_on_day) - len(winners),
+                pnl=d.total_pnl if d else 0.0,
+                total_trades=closed,
+                winning_trades=winners,
+                losing_trades=closed - winners,
             )
         )
         current += timedelta(days=1)
@@ -244,13 +242,13 @@ class SpyPriceResponse(BaseModel):
 
 
 @router.get("/dashboard/spy-price", response_model=SpyPriceResponse)
-def get_spy_price(request: Request):
+async def get_spy_price(request: Request):
     """Fetch current SPY price from Schwab."""
     try:
-        from app.services.schwab_client import SchwabService
+        from app.services.schwab_client import AsyncSchwabService, SchwabService
 
-        schwab = SchwabService(request.app.state.schwab_client)
-        data = schwab.get_quote("SPY")
+        schwab = AsyncSchwabService(SchwabService(request.app.state.schwab_client))
+        data = await schwab.get_quote("SPY")
         q = data.get("SPY", {}).get("quote", {})
         last = q.get("lastPrice")
         change = q.get("netChange")
@@ -355,6 +353,23 @@ async def get_ngrok_status():
         return NgrokStatus(online=False, error="ngrok not running")
 
 
+class AlertQueueStatus(BaseModel):
+    enabled: bool
+    depth: int
+    depth_by_ticker: Dict[str, int]
+    last_lag_ms: Optional[float] = None
+    max_lag_ms: Optional[float] = None
+    processed: int
+    coalesced: int
+    rejected_full: int
+
+
+@router.get("/dashboard/alert-queue", response_model=AlertQueueStatus)
+def get_alert_queue_status():
+    """Webhook queue depth and receive-to-processing lag."""
+    return AlertQueueStatus(enabled=settings.WEBHOOK_QUEUE_ENABLED, **get_alert_queue().stats())
+
+
 class TokenStatus(BaseModel):
     valid: bool
     refresh_token_issued: Optional[str] = None
@@ -576,160 +591,168 @@ class AnalyticsResponse(BaseModel):
 
 @router.get("/dashboard/analytics", response_model=AnalyticsResponse)
 def get_analytics(
+    request: Request,
     days: int = Query(30, ge=1, le=365, description="Lookback period in days"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """Post-trade analytics: PnL by hour, strategy, day-of-week, hold time, streaks."""
-    cutoff = date.today() - timedelta(days=days)
-    closed_trades = (
-        db.query(Trade)
-        .filter(Trade.trade_date >= cutoff)
-        .filter(Trade.status == TradeStatus.CLOSED)
-        .order_by(Trade.exit_filled_at.asc())
-        .all()
-    )
+    def build():
+        cutoff = date.today() - timedelta(days=days)
+        in_range = PnLBucket.trade_date >= cutoff
+        bucket_sums = (
+            func.sum(PnLBucket.total_trades),
+            func.sum(PnLBucket.winning_trades),
+            func.sum(PnLBucket.total_pnl),
+        )
 
-    # Link trades to their alerts to get source/ticker info
-    trade_ids = [t.id for t in closed_trades]
-    alerts = db.query(Alert).filter(Alert.trade_id.in_(trade_ids)).all() if trade_ids else []
-    alert_by_trade: dict[int, Alert] = {a.trade_id: a for a in alerts}
-
-    # ── By hour of day (ET) ──
-    hour_data: dict[int, list] = defaultdict(list)
-    for t in closed_trades:
-        if t.entry_filled_at:
-            et_time = t.entry_filled_at.replace(tzinfo=ZoneInfo("UTC")).astimezone(_ET)
-            hour_data[et_time.hour].append(t)
-
-    hour_labels = {
-        9: "9 AM", 10: "10 AM", 11: "11 AM", 12: "12 PM",
-        13: "1 PM", 14: "2 PM", 15: "3 PM",
-    }
-    by_hour = []
-    for h in range(9, 16):
-        trades = hour_data.get(h, [])
-        wins = [t for t in trades if (t.pnl_dollars or 0) > 0]
-        total_pnl = sum(t.pnl_dollars or 0 for t in trades)
-        by_hour.append(HourBucket(
-            hour=h,
-            label=hour_labels.get(h, f"{h}:00"),
-            total_trades=len(trades),
-            winning_trades=len(wins),
-            losing_trades=len(trades) - len(wins),
-            win_rate=round(len(wins) / len(trades) * 100, 1) if trades else 0,
-            total_pnl=round(total_pnl, 2),
-            avg_pnl=round(total_pnl / len(trades), 2) if trades else 0,
-        ))
+        # ── By hour of day (ET) ──
+        hour_rows = {
+            r[0]: r[1:]
+            for r in db.query(PnLBucket.hour, *bucket_sums)
+            .filter(in_range, PnLBucket.hour.isnot(None))
+            .group_by(PnLBucket.hour)
+            .all()
+        }
+
+        hour_labels = {
+            9: "9 AM", 10: "10 AM", 11: "11 AM", 12: "12 PM",
+            13: "1 PM", 14: "2 PM", 15: "3 PM",
+        }
+        by_hour = []
+        for h in range(9, 16):
+            count, wins, total_pnl = hour_rows.get(h, (0, 0, 0.0))
+            by_hour.append(HourBucket(
+                hour=h,
+                label=hour_labels.get(h, f"{h}:00"),
+                total_trades=count,
+                winning_trades=wins,
+                losing_trades=count - wins,
+                win_rate=round(wins / count * 100, 1) if count else 0,
+                total_pnl=round(total_pnl, 2),
+                avg_pnl=round(total_pnl / count, 2) if count else 0,
+            ))
 
-    # ── By strategy (source) ──
-    strat_data: dict[str, list] = defaultdict(list)
-    for t in closed_trades:
-        source = t.source or "unknown"
-        strat_data[source].append(t)
-
-    by_strategy = []
-    for strat, trades in sorted(strat_data.items()):
-        wins = [t for t in trades if (t.pnl_dollars or 0) > 0]
-        losses = [t for t in trades if (t.pnl_dollars or 0) <= 0]
-        total_pnl = sum(t.pnl_dollars or 0 for t in trades)
-        gross_wins = sum(t.pnl_dollars or 0 for t in wins)
-        gross_losses = abs(sum(t.pnl_dollars or 0 for t in losses))
-        by_strategy.append(StrategyBucket(
-            strategy=strat,
-            total_trades=len(trades),
-            winning_trades=len(wins),
-            losing_trades=len(losses),
-            win_rate=round(len(wins) / len(trades) * 100, 1) if trades else 0,
-            total_pnl=round(total_pnl, 2),
-            avg_pnl=round(total_pnl / len(trades), 2) if trades else 0,
-            profit_factor=round(gross_wins / gross_losses, 2) if gross_losses > 0 else 0,
-        ))
+        # ── By strategy (source) ──
+        strat_rows = (
+            db.query(
+                PnLBucket.source, *bucket_sums,
+                func.sum(PnLBucket.gross_wins), func.sum(PnLBucket.gross_losses),
+            )
+            .filter(in_range)
+            .group_by(PnLBucket.source)
+            .order_by(PnLBucket.source)
+            .all()
+        )
 
-    # ── By day of week ──
-    dow_labels = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
-    dow_data: dict[int, list] = defaultdict(list)
-    for t in closed_trades:
-        dow_data[t.trade_date.weekday()].append(t)
-
-    by_day_of_week = []
-    for d in range(5):  # Mon-Fri
-        trades = dow_data.get(d, [])
-        wins = [t for t in trades if (t.pnl_dollars or 0) > 0]
-        total_pnl = sum(t.pnl_dollars or 0 for t in trades)
-        by_day_of_week.append(DayOfWeekBucket(
-            day=d,
-            label=dow_labels[d],
-            total_trades=len(trades),
-            winning_trades=len(wins),
-            losing_trades=len(trades) - len(wins),
-            win_rate=round(len(wins) / len(trades) * 100, 1) if trades else 0,
-            total_pnl=round(total_pnl, 2),
-        ))
+        by_strategy = []
+        for strat, count, wins, total_pnl, gross_wins, gross_losses in strat_rows:
+            by_strategy.append(StrategyBucket(
+                strategy=strat,
+                total_trades=count,
+                winning_trades=wins,
+                losing_trades=count - wins,
+                win_rate=round(wins / count * 100, 1) if count else 0,
+                total_pnl=round(total_pnl, 2),
+                avg_pnl=round(total_pnl / count, 2) if count else 0,
+                profit_factor=round(gross_wins / gross_losses, 2) if gross_losses > 0 else 0,
+            ))
+
+        # ── By day of week ──
+        dow_labels = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+        dow_data: dict[int, list] = defaultdict(lambda: [0, 0, 0.0])
+        total_closed = 0
+        for day in (
+            db.query(DailyPnL.trade_date, DailyPnL.closed_trades, DailyPnL.winning_trades, DailyPnL.total_pnl)
+            .filter(DailyPnL.trade_date >= cutoff, DailyPnL.closed_trades > 0)
+            .all()
+        ):
+            bucket = dow_data[day.trade_date.weekday()]
+            bucket[0] += day.closed_trades
+            bucket[1] += day.winning_trades
+            bucket[2] += day.total_pnl
+            total_closed += day.closed_trades
+
+        by_day_of_week = []
+        for d in range(5):  # Mon-Fri
+            count, wins, total_pnl = dow_data.get(d, (0, 0, 0.0))
+            by_day_of_week.append(DayOfWeekBucket(
+                day=d,
+                label=dow_labels[d],
+                total_trades=count,
+                winning_trades=wins,
+                losing_trades=count - wins,
+                win_rate=round(wins / count * 100, 1) if count else 0,
+                total_pnl=round(total_pnl, 2),
+            ))
 
-    # ── By hold time ──
-    hold_buckets_def = [
-        ("< 5 min", 0, 5),
-        ("5-15 min", 5, 15),
-        ("15-30 min", 15, 30),
-        ("30-60 min", 30, 60),
-        ("60-90 min", 60, 90),
-        ("> 90 min", 90, 9999),
-    ]
-    by_hold_time = []
-    for label, lo, hi in hold_buckets_def:
-        trades = [
-            t for t in closed_trades
-            if t.exit_filled_at and t.entry_filled_at
-            and lo <= (t.exit_filled_at - t.entry_filled_at).total_seconds() / 60 < hi
+        # ── By hold time ──
+        hold_rows = {
+            r[0]: r[1:]
+            for r in db.query(PnLBucket.hold_bucket, *bucket_sums)
+            .filter(in_range, PnLBucket.hold_bucket.isnot(None))
+            .group_by(PnLBucket.hold_bucket)
+            .all()
+        }
+        by_hold_time = []
+        for idx, (label, _, _) in enumerate(HOLD_BUCKETS):
+            count, wins, total_pnl = hold_rows.get(idx, (0, 0, 0.0))
+            by_hold_time.append(HoldTimeBucket(
+                label=label,
+                total_trades=count,
+                winning_trades=wins,
+                win_rate=round(wins / count * 100, 1) if count else 0,
+                avg_pnl=round(total_pnl / count, 2) if count else 0,
+            ))
+
+        # Streaks depend on trade order, so they read the PnL column in exit order
+        closed_pnls = [
+            pnl for (pnl,) in db.query(Trade.pnl_dollars)
+            .filter(Trade.trade_date >= cutoff)
+            .filter(Trade.status == TradeStatus.CLOSED)
+            .order_by(Trade.exit_filled_at.asc())
+            .all()
         ]
-        wins = [t for t in trades if (t.pnl_dollars or 0) > 0]
-        total_pnl = sum(t.pnl_dollars or 0 for t in trades)
-        by_hold_time.append(HoldTimeBucket(
-            label=label,
-            total_trades=len(trades),
-            winning_trades=len(wins),
-            win_rate=round(len(wins) / len(trades) * 100, 1) if trades else 0,
-            avg_pnl=round(total_pnl / len(trades), 2) if trades else 0,
-        ))
 
-    # ── Streak analysis ──
-    current_type = "none"
-    current_count = 0
-    longest_win = 0
-    longest_loss = 0
-    streak_win = 0
-    streak_loss = 0
-    for t in closed_trades:
-        if (t.pnl_dollars or 0) > 0:
-            streak_win += 1
-            streak_loss = 0
-            longest_win = max(longest_win, streak_win)
-        else:
-            streak_loss += 1
-            streak_win = 0
-            longest_loss = max(longest_loss, streak_loss)
-
-    if streak_win > 0:
-        current_type = "win"
-        current_count = streak_win
-    elif streak_loss > 0:
-        current_type = "loss"
-        current_count = streak_loss
-
-    return AnalyticsResponse(
-        period_label=f"Last {days} days",
-        total_trades=len(closed_trades),
-        by_hour=by_hour,
-        by_strategy=by_strategy,
-        by_day_of_week=by_day_of_week,
-        by_hold_time=by_hold_time,
-        streak=StreakInfo(
-            current_type=current_type,
-            current_count=current_count,
-            longest_win=longest_win,
-            longest_loss=longest_loss,
-        ),
-    )
+        # ── Streak analysis ──
+        current_type = "none"
+        current_count = 0
+        longest_win = 0
+        longest_loss = 0
+        streak_win = 0
+        streak_loss = 0
+        for pnl in closed_pnls:
+            if (pnl or 0) > 0:
+                streak_win += 1
+                streak_loss = 0
+                longest_win = max(longest_win, streak_win)
+            else:
+                streak_loss += 1
+                streak_win = 0
+                longest_loss = max(longest_loss, streak_loss)
+
+        if streak_win > 0:
+            current_type = "win"
+            current_count = streak_win
+        elif streak_loss > 0:
+            current_type = "loss"
+            current_count = streak_loss
+
+        return AnalyticsResponse(
+            period_label=f"Last {days} days",
+            total_trades=total_closed,
+            by_hour=by_hour,
+            by_strategy=by_strategy,
+            by_day_of_week=by_day_of_week,
+            by_hold_time=by_hold_time,
+            streak=StreakInfo(
+                current_type=current_type,
+                current_count=current_count,
+                longest_win=longest_win,
+                longest_loss=longest_loss,
+            ),
+        )
+
+    return get_response_cache().respond(request, ("trades",), build)
 
 
 # --- Chart markers (signals + trades) ---
@@ -751,7 +774,7 @@ def _to_fake_utc(dt: datetime) -> int:
 
 
 @router.get("/dashboard/chart-markers", response_model=List[ChartMarker])
-def get_chart_markers(ticker: str, trade_date: Optional[date] = None, db: Session = Depends(get_db)):
+def get_chart_markers(ticker: str, trade_date: Optional[date] = None, db: Session = Depends(get_read_db)):
     """Return signals and trades for a ticker on a given date (defaults to today)."""
     today = trade_date or date.today()
     markers: list[ChartMarker] = []
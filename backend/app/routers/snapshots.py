@@ -7,7 +7,7 @@ from pydantic import BaseModel
 from sqlalchemy import func
 from sqlalchemy.orm import Session
 
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.models import OptionChainContract, OptionChainSnapshot, TradeDirection
 
 router = APIRouter()
@@ -66,7 +66,7 @@ class RecordingStatsResponse(BaseModel):
 
 
 @router.get("/snapshots/stats/summary", response_model=RecordingStatsResponse)
-def get_recording_stats(db: Session = Depends(get_db)):
+def get_recording_stats(db: Session = Depends(get_read_db)):
     """Get statistics about recorded snapshot data."""
     stats = db.query(
         func.min(OptionChainSnapshot.snapshot_date).label("start_date"),
@@ -98,7 +98,7 @@ def list_snapshots(
     end_date: Optional[date] = None,
     page: int = Query(1, ge=1),
     per_page: int = Query(50, ge=1, le=500),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """List recorded option chain snapshots with date filtering and pagination."""
     query = db.query(
@@ -145,7 +145,7 @@ def list_snapshots(
 
 
 @router.get("/snapshots/{snapshot_id}", response_model=SnapshotDetailResponse)
-def get_snapshot_detail(snapshot_id: int, db: Session = Depends(get_db)):
+def get_snapshot_detail(snapshot_id: int, db: Session = Depends(get_read_db)):
     """Get full snapshot with all contracts."""
     snapshot = (
         db.query(OptionChainSnapshot)
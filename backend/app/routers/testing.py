@@ -9,7 +9,8 @@ from app.database import get_db
 from app.dependencies import get_ws_manager
 from app.models import ExitReason, Trade, TradeEventType, TradeStatus
 from app.schemas import TradeResponse
-from app.services.schwab_client import SchwabService
+from app.services.position_book import publish_trade_state
+from app.services.schwab_client import AsyncSchwabService, SchwabService
 from app.services.trade_events import log_trade_event
 from app.services.ws_manager import WebSocketManager
 
@@ -62,8 +63,8 @@ async def test_close_trade(
     # Cancel stop-loss order if present
     if trade.stop_loss_order_id:
         try:
-            schwab = SchwabService(request.app.state.schwab_client)
-            schwab.cancel_order(trade.stop_loss_order_id)
+            schwab = AsyncSchwabService(SchwabService(request.app.state.schwab_client))
+            await schwab.cancel_order(trade.stop_loss_order_id)
             log_trade_event(
                 db, trade.id, TradeEventType.STOP_LOSS_CANCELLED,
                 f"Stop-loss order {trade.stop_loss_order_id} cancelled for manual close",
@@ -84,6 +85,7 @@ async def test_close_trade(
         details={"exit_price": exit_price, "pnl_dollars": pnl_dollars, "pnl_percent": body.pnl_percent},
     )
     db.commit()
+    publish_trade_state(trade)
 
     logger.info(
         f"Test close: Trade #{trade.id} closed at {exit_price:.2f}, "
@@ -8,13 +8,14 @@ from sqlalchemy import func
 from sqlalchemy.orm import Session
 
 from app.config import Settings
-from app.database import get_db
-from app.dependencies import get_trade_manager
+from app.database import get_db, get_read_db
+from app.dependencies import get_position_book, get_response_cache, get_trade_manager
 
 settings = Settings()
 from app.models import Alert, Trade, TradeEvent, TradePriceSnapshot, TradeStatus
 from app.schemas import PriceSnapshotListResponse, PriceSnapshotResponse, TradeEventListResponse, TradeEventResponse, TradeListResponse, TradeResponse, WebhookResponse
-from app.services.schwab_client import SchwabService
+from app.services.position_book import publish_trade_state
+from app.services.schwab_client import AsyncSchwabService, SchwabService
 from app.services.trade_manager import TradeManager
 
 router = APIRouter()
@@ -78,7 +79,7 @@ def _enrich_with_best_entry(
 
 
 @router.get("/trades/tickers")
-def list_trade_tickers(db: Session = Depends(get_db)):
+def list_trade_tickers(db: Session = Depends(get_read_db)):
     """Return distinct tickers that have associated trades."""
     rows = (
         db.query(Alert.ticker)
@@ -92,43 +93,47 @@ def list_trade_tickers(db: Session = Depends(get_db)):
 
 @router.get("/trades", response_model=TradeListResponse)
 def list_trades(
+    request: Request,
     trade_date: Optional[date] = None,
     status: Optional[TradeStatus] = None,
     ticker: Optional[str] = None,
     page: int = Query(1, ge=1),
     per_page: int = Query(50, ge=1, le=100),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
-    query = db.query(Trade)
-    if trade_date:
-        query = query.filter(Trade.trade_date == trade_date)
-    if status:
-        query = query.filter(Trade.status == status)
-    if ticker:
-        query = query.filter(Trade.alert.has(Alert.ticker == ticker))
-
-    total = query.count()
-    trades = (
-        query.order_by(Trade.created_at.desc())
-        .offset((page - 1) * per_page)
-        .limit(per_page)
-        .all()
-    )
+    def build():
+        query = db.query(Trade)
+        if trade_date:
+            query = query.filter(Trade.trade_date == trade_date)
+        if status:
+            query = query.filter(Trade.status == status)
+        if ticker:
+            query = query.filter(Trade.alert.has(Alert.ticker == ticker))
+
+        total = query.count()
+        trades = (
+            query.order_by(Trade.created_at.desc())
+            .offset((page - 1) * per_page)
+            .limit(per_page)
+            .all()
+        )
 
-    trade_responses = [TradeResponse.model_validate(t) for t in trades]
-    _enrich_with_best_entry(trade_responses, [t.id for t in trades], db)
+        trade_responses = [TradeResponse.model_validate(t) for t in trades]
+        _enrich_with_best_entry(trade_responses, [t.id for t in trades], db)
 
-    # Populate ticker from related alert
-    alert_map = {a.trade_id: a.ticker for a in db.query(Alert).filter(Alert.trade_id.in_([t.id for t in trades])).all()}
-    for tr in trade_responses:
-        tr.ticker = alert_map.get(tr.id)
+        # Populate ticker from related alert
+        alert_map = {a.trade_id: a.ticker for a in db.query(Alert).filter(Alert.trade_id.in_([t.id for t in trades])).all()}
+        for tr in trade_responses:
+            tr.ticker = alert_map.get(tr.id)
 
-    return TradeListResponse(
-        trades=trade_responses,
-        total=total,
-        page=page,
-        per_page=per_page,
-    )
+        return TradeListResponse(
+            trades=trade_responses,
+            total=total,
+            page=page,
+            per_page=per_page,
+        )
+
+    return get_response_cache().respond(request, ("trades", "alerts", "snapshots"), build)
 
 
 class QuoteItem(BaseModel):
@@ -144,39 +149,36 @@ class QuotesResponse(BaseModel):
 
 
 @router.get("/trades/open/quotes", response_model=QuotesResponse)
-def get_open_quotes(request: Request, db: Session = Depends(get_db)):
+async def get_open_quotes(request: Request, db: Session = Depends(get_db)):
     """Fetch live quotes for all open positions."""
-    active_statuses = [TradeStatus.PENDING, TradeStatus.FILLED, TradeStatus.STOP_LOSS_PLACED, TradeStatus.EXITING]
-    open_trades = (
-        db.query(Trade)
-        .filter(Trade.trade_date == date.today())
-        .filter(Trade.status.in_(active_statuses))
-        .all()
-    )
+    book = get_position_book()
+    book.ensure_loaded(db)
+    positions = sorted(book.positions(), key=lambda p: p.trade_id)
 
-    if not open_trades:
+    if not positions:
         return QuotesResponse(quotes=[])
 
-    schwab = SchwabService(request.app.state.schwab_client)
+    schwab = AsyncSchwabService(SchwabService(request.app.state.schwab_client))
+    await schwab.prefetch_quotes(p.option_symbol for p in positions)
     quotes: List[QuoteItem] = []
 
-    for trade in open_trades:
-        item = QuoteItem(trade_id=trade.id, option_symbol=trade.option_symbol)
+    for pos in positions:
+        item = QuoteItem(trade_id=pos.trade_id, option_symbol=pos.option_symbol)
         try:
-            quote_data = schwab.get_quote(trade.option_symbol)
-            q = quote_data.get(trade.option_symbol, {}).get("quote", {})
+            quote_data = await schwab.get_quote(pos.option_symbol)
+            q = quote_data.get(pos.option_symbol, {}).get("quote", {})
             item.last_price = q.get("lastPrice")
             item.bid = q.get("bidPrice")
             item.ask = q.get("askPrice")
         except Exception as e:
-            logger.warning(f"Failed to get quote for {trade.option_symbol}: {e}")
+            logger.warning(f"Failed to get quote for {pos.option_symbol}: {e}")
         quotes.append(item)
 
     return QuotesResponse(quotes=quotes)
 
 
 @router.get("/trades/{trade_id}", response_model=TradeResponse)
-def get_trade(trade_id: int, db: Session = Depends(get_db)):
+def get_trade(trade_id: int, db: Session = Depends(get_read_db)):
     trade = db.query(Trade).filter(Trade.id == trade_id).first()
     if not trade:
         raise HTTPException(status_code=404, detail="Trade not found")
@@ -188,7 +190,7 @@ def get_trade(trade_id: int, db: Session = Depends(get_db)):
 
 
 @router.get("/trades/{trade_id}/events", response_model=TradeEventListResponse)
-def get_trade_events(trade_id: int, db: Session = Depends(get_db)):
+def get_trade_events(trade_id: int, db: Session = Depends(get_read_db)):
     trade = db.query(Trade).filter(Trade.id == trade_id).first()
     if not trade:
         raise HTTPException(status_code=404, detail="Trade not found")
@@ -207,7 +209,7 @@ def get_trade_events(trade_id: int, db: Session = Depends(get_db)):
 
 
 @router.get("/trades/{trade_id}/prices", response_model=PriceSnapshotListResponse)
-def get_trade_prices(trade_id: int, db: Session = Depends(get_db)):
+def get_trade_prices(trade_id: int, db: Session = Depends(get_read_db)):
     trade = db.query(Trade).filter(Trade.id == trade_id).first()
     if not trade:
         raise HTTPException(status_code=404, detail="Trade not found")
@@ -280,7 +282,7 @@ async def cancel_pending_trade(
     schwab = get_schwab_service(request)
     if trade.entry_order_id:
         try:
-            schwab.cancel_order(trade.entry_order_id)
+            await schwab.cancel_order(trade.entry_order_id)
         except Exception as e:
             logger.warning(f"Trade #{trade.id}: cancel order failed: {e}")
 
@@ -291,6 +293,7 @@ async def cancel_pending_trade(
         details={"order_id": trade.entry_order_id},
     )
     db.commit()
+    publish_trade_state(trade)
 
     ws = get_ws_manager()
     await ws.broadcast({
@@ -327,7 +330,7 @@ async def cancel_stop_loss(
 
     schwab = get_schwab_service(request)
     try:
-        schwab.cancel_order(trade.stop_loss_order_id)
+        await schwab.cancel_order(trade.stop_loss_order_id)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to cancel stop-loss: {e}")
 
@@ -341,6 +344,7 @@ async def cancel_stop_loss(
         details={"order_id": old_order_id},
     )
     db.commit()
+    publish_trade_state(trade)
 
     ws = get_ws_manager()
     await ws.broadcast({
@@ -377,7 +381,7 @@ async def replace_stop_loss(
     # Cancel existing stop-loss if present
     if trade.stop_loss_order_id:
         try:
-            schwab.cancel_order(trade.stop_loss_order_id)
+            await schwab.cancel_order(trade.stop_loss_order_id)
         except Exception:
             pass
         trade.stop_loss_order_id = None
@@ -391,7 +395,7 @@ async def replace_stop_loss(
         quantity=remaining_qty,
         stop_price=stop_price,
     )
-    order_id = schwab.place_order(order)
+    order_id = await schwab.place_order(order)
     trade.stop_loss_order_id = order_id
     trade.stop_loss_price = stop_price
     trade.status = TradeStatus.STOP_LOSS_PLACED
@@ -401,6 +405,7 @@ async def replace_stop_loss(
         details={"stop_price": stop_price, "order_id": order_id, "stop_loss_percent": sl_pct},
     )
     db.commit()
+    publish_trade_state(trade)
 
     ws = get_ws_manager()
     await ws.broadcast({
@@ -5,12 +5,13 @@ from pathlib import Path
 from zoneinfo import ZoneInfo
 
 from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import JSONResponse
 from pydantic import ValidationError
 from sqlalchemy.orm import Session
 
 from app.config import Settings
 from app.database import get_db
-from app.dependencies import get_trade_manager
+from app.dependencies import get_alert_queue, get_trade_manager
 from app.models import Alert, AlertStatus
 from app.schemas import TradingViewAlert, WebhookResponse
 from app.services.trade_manager import TradeManager
@@ -40,6 +41,37 @@ def _in_trading_window() -> bool:
     return any(start <= now_et <= end for start, end in _get_trading_windows())
 
 
+def _reject_outside_window(db: Session, db_alert: Alert) -> WebhookResponse:
+    now_et = datetime.now(ET).strftime("%H:%M")
+    db_alert.status = AlertStatus.REJECTED
+    db_alert.rejection_reason = f"Outside trading window ({now_et} ET)"
+    db.commit()
+    logger.info(f"Webhook rejected: outside trading window ({now_et} ET)")
+    return WebhookResponse(
+        status="rejected",
+        message=f"Outside trading window ({now_et} ET). "
+                f"Windows: 09:35-11:15, 12:45-14:50",
+    )
+
+
+def _enqueue_alert(request: Request, db: Session, db_alert: Alert, alert: TradingViewAlert):
+    """Hand the persisted alert to the per-ticker queue and answer 202."""
+    ignore_windows = getattr(request.app.state, "ignore_trading_windows", False)
+    if alert.action != "CLOSE" and not _in_trading_window() and not ignore_windows:
+        return _reject_outside_window(db, db_alert)
+
+    db.commit()
+    if not get_alert_queue().enqueue(request.app, db_alert.id, alert):
+        db_alert.status = AlertStatus.REJECTED
+        db_alert.rejection_reason = "Alert queue full"
+        db.commit()
+        logger.warning(f"Webhook rejected: {alert.ticker} alert queue full")
+        raise HTTPException(status_code=503, detail="Alert queue full, retry later")
+
+    response = WebhookResponse(status="queued", message=f"Alert #{db_alert.id} queued")
+    return JSONResponse(status_code=202, content=response.model_dump())
+
+
 @router.post("/webhook", response_model=WebhookResponse)
 async def receive_webhook(
     request: Request,
@@ -115,6 +147,10 @@ async def receive_webhook(
         db.commit()
         return WebhookResponse(status="rejected", message="Only SPY is supported")
 
+    # Queued mode: duplicates are coalesced by the ticker's worker instead
+    if settings.WEBHOOK_QUEUE_ENABLED:
+        return _enqueue_alert(request, db, db_alert, alert)
+
     # Dedup: reject if identical alert (same action + direction) arrived recently
     dedup_cutoff = datetime.now(timezone.utc) - timedelta(seconds=settings.DEDUP_WINDOW_SECONDS)
     dup = (
@@ -140,16 +176,7 @@ async def receive_webhook(
         else:
             ignore_windows = getattr(request.app.state, "ignore_trading_windows", False)
             if not _in_trading_window() and not ignore_windows:
-                now_et = datetime.now(ET).strftime("%H:%M")
-                db_alert.status = AlertStatus.REJECTED
-                db_alert.rejection_reason = f"Outside trading window ({now_et} ET)"
-                db.commit()
-                logger.info(f"Webhook rejected: outside trading window ({now_et} ET)")
-                return WebhookResponse(
-                    status="rejected",
-                    message=f"Outside trading window ({now_et} ET). "
-                            f"Windows: 09:35-11:15, 12:45-14:50",
-                )
+                return _reject_outside_window(db, db_alert)
             result = await trade_manager.process_alert(db, db_alert, alert)
         return result
     except Exception as e:
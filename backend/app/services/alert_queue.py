@@ -0,0 +1,225 @@
+"""Webhook ingestion queue: accept alerts fast, process them per ticker in order.
+
+With WEBHOOK_QUEUE_ENABLED the webhook endpoint only validates and persists
+the Alert, enqueues it here and answers 202. One worker task per ticker
+drains that ticker's queue in arrival order through TradeManager. Before
+processing, a worker takes everything already waiting and coalesces alerts
+within DEDUP_WINDOW_SECONDS of each other: a repeat of the same action is
+rejected as a duplicate, and of two opposite BUY signals only the later one
+is kept. CLOSE alerts are never coalesced away. A full queue
+(WEBHOOK_QUEUE_MAX_DEPTH per ticker) makes enqueue() return False so the
+endpoint can push back. On shutdown stop() lets the workers drain for up to
+WEBHOOK_QUEUE_DRAIN_SECONDS; any accepted alert still unprocessed after that
+is marked ERROR rather than left RECEIVED.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass, field
+
+from app.config import Settings
+from app.models import Alert, AlertStatus
+from app.schemas import TradingViewAlert
+
+logger = logging.getLogger(__name__)
+settings = Settings()
+
+# Recent processing lags kept for the dashboard's max-lag figure
+LAG_HISTORY_SIZE = 100
+
+
+@dataclass
+class QueuedAlert:
+    alert_id: int
+    alert: TradingViewAlert
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+class AlertQueue:
+    def __init__(self):
+        self._queues: dict[str, asyncio.Queue[QueuedAlert]] = {}
+        self._workers: dict[str, asyncio.Task] = {}
+        # Per ticker: (action, enqueued_at) of the last BUY alert handed to TradeManager
+        self._last_buy: dict[str, tuple[str, float]] = {}
+        # Per ticker: alerts taken off the queue but not yet processed
+        self._batch_pending: dict[str, list[QueuedAlert]] = {}
+        self._lags_ms: deque[float] = deque(maxlen=LAG_HISTORY_SIZE)
+        self.processed = 0
+        self.coalesced = 0
+        self.rejected_full = 0
+
+    def reset(self) -> None:
+        self.__init__()
+
+    def enqueue(self, app, alert_id: int, alert: TradingViewAlert) -> bool:
+        """Queue an already-persisted alert. Returns False when the ticker's queue is full."""
+        ticker = alert.ticker.upper()
+        queue = self._queues.get(ticker)
+        if queue is None:
+            queue = self._queues[ticker] = asyncio.Queue(maxsize=settings.WEBHOOK_QUEUE_MAX_DEPTH)
+        try:
+            queue.put_nowait(QueuedAlert(alert_id, alert))
+        except asyncio.QueueFull:
+            self.rejected_full += 1
+            return False
+        worker = self._workers.get(ticker)
+        if worker is None or worker.done():
+            self._workers[ticker] = asyncio.create_task(self._worker(app, ticker, queue))
+        return True
+
+    def stats(self) -> dict:
+        depth_by_ticker = {
+            t: q.qsize() + len(self._batch_pending.get(t, ())) for t, q in self._queues.items()
+        }
+        lags = list(self._lags_ms)
+        return {
+            "depth": sum(depth_by_ticker.values()),
+            "depth_by_ticker": depth_by_ticker,
+            "last_lag_ms": lags[-1] if lags else None,
+            "max_lag_ms": max(lags) if lags else None,
+            "processed": self.processed,
+            "coalesced": self.coalesced,
+            "rejected_full": self.rejected_full,
+        }
+
+    async def stop(self, drain_timeout: float = 0.0) -> None:
+        """Cancel the workers, first giving them up to drain_timeout seconds to empty the queues."""
+        if drain_timeout > 0 and self._workers:
+            try:
+                await asyncio.wait_for(self._drained(), drain_timeout)
+            except asyncio.TimeoutError:
+                logger.warning(f"AlertQueue not drained after {drain_timeout}s")
+        for task in self._workers.values():
+            task.cancel()
+        await asyncio.gather(*self._workers.values(), return_exceptions=True)
+        self._workers = {}
+
+        leftover = [item for pending in self._batch_pending.values() for item in pending]
+        for queue in self._queues.values():
+            while not queue.empty():
+                leftover.append(queue.get_nowait())
+        self._batch_pending = {}
+        if leftover:
+            self._mark_error(leftover, "Not processed before shutdown")
+
+    async def _drained(self) -> None:
+        while any(q.qsize() or self._batch_pending.get(t) for t, q in self._queues.items()):
+            await asyncio.sleep(0.05)
+
+    def _coalesce(self, ticker: str, batch: list[QueuedAlert]) -> tuple[list[QueuedAlert], list[tuple[QueuedAlert, str]]]:
+        """Split a batch into alerts to process and (alert, reason) to reject."""
+        window = settings.DEDUP_WINDOW_SECONDS
+        keep: list[QueuedAlert] = []
+        dropped: list[tuple[QueuedAlert, str]] = []
+        for item in batch:
+            if item.alert.action == "CLOSE":
+                keep.append(item)
+                continue
+            # Latest BUY still waiting in this batch, not separated by a CLOSE
+            prev = keep[-1] if keep and keep[-1].alert.action != "CLOSE" else None
+            if prev is not None and item.enqueued_at - prev.enqueued_at <= window:
+                if prev.alert.action == item.alert.action:
+                    dropped.append((item, f"Duplicate alert (within {window}s)"))
+                else:
+                    keep.remove(prev)
+                    dropped.append((prev, f"Superseded by opposite alert #{item.alert_id} (within {window}s)"))
+                    keep.append(item)
+                continue
+            if prev is None and not any(q.alert.action == "CLOSE" for q in keep):
+                last = self._last_buy.get(ticker)
+                if last and last[0] == item.alert.action and item.enqueued_at - last[1] <= window:
+                    dropped.append((item, f"Duplicate alert (within {window}s)"))
+                    continue
+            keep.append(item)
+        return keep, dropped
+
+    async def _worker(self, app, ticker: str, queue: asyncio.Queue) -> None:
+        logger.info(f"AlertQueue worker started for {ticker}")
+        while True:
+            try:
+                batch = [await queue.get()]
+                while not queue.empty():
+                    batch.append(queue.get_nowait())
+                keep, dropped = self._coalesce(ticker, batch)
+                pending = self._batch_pending[ticker] = keep
+                if dropped:
+                    self._reject(dropped)
+                while pending:
+                    item = pending[0]
+                    self._lags_ms.append(round((time.monotonic() - item.enqueued_at) * 1000, 1))
+                    await self._process(app, item)
+                    if item.alert.action != "CLOSE":
+                        self._last_buy[ticker] = (item.alert.action, item.enqueued_at)
+                    pending.pop(0)
+                    self.processed += 1
+            except asyncio.CancelledError:
+                logger.info(f"AlertQueue worker for {ticker} cancelled")
+                break
+            except Exception as e:
+                logger.exception(f"AlertQueue worker error for {ticker}: {e}")
+                pending = self._batch_pending.pop(ticker, [])
+                if pending:
+                    self._mark_error(pending, f"Alert queue worker error: {e}")
+
+    def _reject(self, dropped: list[tuple[QueuedAlert, str]]) -> None:
+        from app.database import SessionLocal
+
+        db = SessionLocal()
+        try:
+            for item, reason in dropped:
+                db_alert = db.get(Alert, item.alert_id)
+                if db_alert is not None:
+                    db_alert.status = AlertStatus.REJECTED
+                    db_alert.rejection_reason = reason
+                logger.info(f"Queued alert #{item.alert_id} rejected: {reason}")
+            db.commit()
+        finally:
+            db.close()
+        self.coalesced += len(dropped)
+
+    def _mark_error(self, items: list[QueuedAlert], reason: str) -> None:
+        """Mark accepted alerts that will never be processed, unless they got past RECEIVED."""
+        from app.database import SessionLocal
+
+        db = SessionLocal()
+        try:
+            for item in items:
+                db_alert = db.get(Alert, item.alert_id)
+                if db_alert is not None and db_alert.status == AlertStatus.RECEIVED:
+                    db_alert.status = AlertStatus.ERROR
+                    db_alert.rejection_reason = reason
+                    logger.warning(f"Queued alert #{item.alert_id} not processed: {reason}")
+            db.commit()
+        except Exception:
+            logger.exception("AlertQueue: could not mark unprocessed alerts")
+        finally:
+            db.close()
+
+    async def _process(self, app, item: QueuedAlert) -> None:
+        from app.database import SessionLocal
+        from app.dependencies import build_trade_manager
+
+        db = SessionLocal()
+        try:
+            db_alert = db.get(Alert, item.alert_id)
+            if db_alert is None:
+                logger.warning(f"Queued alert #{item.alert_id} no longer exists")
+                return
+            trade_manager = build_trade_manager(app)
+            try:
+                if item.alert.action == "CLOSE":
+                    result = await trade_manager.close_open_position(db, db_alert)
+                else:
+                    result = await trade_manager.process_alert(db, db_alert, item.alert)
+                logger.info(f"Queued alert #{item.alert_id}: {result.status} — {result.message}")
+            except Exception as e:
+                db.rollback()
+                db_alert = db.get(Alert, item.alert_id)
+                db_alert.status = AlertStatus.ERROR
+                db_alert.rejection_reason = str(e)
+                db.commit()
+                logger.exception(f"Error processing queued alert #{item.alert_id}")
+        finally:
+            db.close()
@@ -0,0 +1,157 @@
+"""Memory-mapped columnar cache for the {TICKER}_{N}min_6months.csv bar files.
+
+The first load of a CSV converts it to one .npy file per column plus a
+day-offset index, stored under a .barstore/ directory next to the CSV. Later
+loads memory-map those files, so opening six months of bars costs a few
+syscalls instead of a pandas parse plus one BarData per row. The cache is
+rebuilt whenever the CSV's mtime or size changes.
+
+Columns use the DayBars layout from day_bars.py (int64 epoch-minute
+timestamps on the ET wall clock, float64 OHLC, int64 volume, day offsets).
+"""
+
+import json
+import logging
+import os
+import shutil
+import tempfile
+from datetime import date
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from app.services.backtest.day_bars import DayBars
+
+logger = logging.getLogger(__name__)
+
+_COLUMNS = ("ts", "open", "high", "low", "close", "volume")
+_FORMAT_VERSION = 1
+
+# In-process memo so repeated loads of the same file reuse one set of mmaps
+_open_stores: dict[str, tuple[dict, "BarStore"]] = {}
+
+
+class BarStore:
+    """All bars of one CSV as a DayBars, optionally backed by mapped .npy files."""
+
+    def __init__(self, bars: DayBars, cache_dir: Optional[str] = None):
+        self.bars = bars
+        self.cache_dir = cache_dir
+
+    @property
+    def num_rows(self) -> int:
+        return self.bars.num_bars
+
+    def between(self, start: date, end: date) -> DayBars:
+        """Days in [start, end] as zero-copy views of the store's columns.
+
+        A mapped store's result pickles as (cache_dir, start, end), so worker
+        processes re-map the same files instead of receiving a copy.
+        """
+        bars = self.bars.between(start, end)
+        if self.cache_dir:
+            bars._reducer = (_mapped_between, (self.cache_dir, start, end))
+        return bars
+
+
+def _mapped_between(cache_dir: str, start: date, end: date) -> DayBars:
+    return _map_cache_dir(cache_dir).between(start, end)
+
+
+# ── Build / open ──────────────────────────────────────────────────
+
+
+def _cache_dir_for(csv_path: str) -> str:
+    stem = os.path.splitext(os.path.basename(csv_path))[0]
+    return os.path.join(os.path.dirname(csv_path), ".barstore", stem)
+
+
+def _source_signature(csv_path: str) -> dict:
+    st = os.stat(csv_path)
+    return {"version": _FORMAT_VERSION, "mtime_ns": st.st_mtime_ns, "size": st.st_size}
+
+
+def _build_columns(csv_path: str) -> Optional[DayBars]:
+    df = pd.read_csv(csv_path, parse_dates=["Timestamp"])
+    ts_seconds = df["Timestamp"].values.astype("datetime64[s]").astype(np.int64)
+    if len(ts_seconds) and np.any(ts_seconds % 60):
+        return None  # sub-minute timestamps can't be represented as epoch minutes
+
+    order = np.argsort(ts_seconds, kind="stable")
+    return DayBars.from_sorted_columns(
+        ts=ts_seconds[order] // 60,
+        open=df["Open"].to_numpy(dtype=np.float64)[order],
+        high=df["High"].to_numpy(dtype=np.float64)[order],
+        low=df["Low"].to_numpy(dtype=np.float64)[order],
+        close=df["Close"].to_numpy(dtype=np.float64)[order],
+        volume=df["Volume"].to_numpy().astype(np.int64)[order],
+    )
+
+
+def _map_cache_dir(cache_dir: str) -> BarStore:
+    def load(name: str, mmap_mode: Optional[str] = "r") -> np.ndarray:
+        return np.load(os.path.join(cache_dir, f"{name}.npy"), mmap_mode=mmap_mode)
+
+    bars = DayBars(
+        *(load(name) for name in _COLUMNS),
+        day_ordinals=load("day_ordinals", None),
+        day_offsets=load("day_offsets", None),
+    )
+    return BarStore(bars, cache_dir=cache_dir)
+
+
+def _write_cache_dir(cache_dir: str, bars: DayBars, signature: dict) -> None:
+    parent = os.path.dirname(cache_dir)
+    os.makedirs(parent, exist_ok=True)
+    tmp_dir = tempfile.mkdtemp(prefix=".tmp-", dir=parent)
+    try:
+        names = _COLUMNS + ("day_ordinals", "day_offsets")
+        for name, arr in zip(names, bars.arrays()):
+            np.save(os.path.join(tmp_dir, f"{name}.npy"), arr)
+        with open(os.path.join(tmp_dir, "meta.json"), "w") as f:
+            json.dump(signature, f)
+        if os.path.isdir(cache_dir):
+            shutil.rmtree(cache_dir)
+        os.replace(tmp_dir, cache_dir)
+    except BaseException:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+
+
+def open_bar_store(csv_path: str) -> Optional[BarStore]:
+    """Open (building or rebuilding if stale) the columnar store for a CSV.
+
+    Returns None if the CSV can't be represented (sub-minute timestamps);
+    callers then fall back to parsing rows.
+    """
+    signature = _source_signature(csv_path)
+    memo = _open_stores.get(csv_path)
+    if memo is not None and memo[0] == signature:
+        return memo[1]
+
+    cache_dir = _cache_dir_for(csv_path)
+    meta_path = os.path.join(cache_dir, "meta.json")
+    store: Optional[BarStore] = None
+    try:
+        with open(meta_path) as f:
+            if json.load(f) == signature:
+                store = _map_cache_dir(cache_dir)
+    except (OSError, ValueError):
+        pass
+
+    if store is None:
+        built = _build_columns(csv_path)
+        if built is None:
+            logger.warning(f"Bar store: {csv_path} has sub-minute timestamps, not caching")
+            return None
+        try:
+            _write_cache_dir(cache_dir, built, signature)
+            store = _map_cache_dir(cache_dir)
+            logger.info(f"Bar store: built {cache_dir} ({built.num_bars} rows)")
+        except OSError as e:
+            logger.warning(f"Bar store: can't write {cache_dir} ({e}), keeping columns in memory")
+            store = BarStore(built)
+
+    _open_stores[csv_path] = (signature, store)
+    return store
@@ -2,11 +2,16 @@
 
 Uses math.erf for the normal CDF (no scipy dependency).
 VIX is used as the annualized implied volatility input.
+
+black_scholes_array() prices a whole vector (e.g. a trade's remaining path)
+in one call with results identical to black_scholes() elementwise.
 """
 
 import math
 from dataclasses import dataclass
-from typing import Literal
+from typing import Literal, Union
+
+import numpy as np
 
 
 def norm_cdf(x: float) -> float:
@@ -17,6 +22,80 @@ def norm_pdf(x: float) -> float:
     return math.exp(-0.5 * x * x) / math.sqrt(2.0 * math.pi)
 
 
+# ── Vectorized kernel ─────────────────────────────────────────────
+
+
+def _map(fn, x: np.ndarray) -> np.ndarray:
+    """Apply a scalar math function elementwise.
+
+    NumPy has no erf, and np.log/np.exp can differ from libm in the last
+    bit; mapping the math versions keeps the array kernel bit-identical to
+    black_scholes() while the arithmetic around them stays vectorized.
+    """
+    return np.array(list(map(fn, x.ravel().tolist())), dtype=np.float64).reshape(x.shape)
+
+
+def _round_array(x: np.ndarray, ndigits: int) -> np.ndarray:
+    """round(v, ndigits) elementwise, matching Python's rounding exactly.
+
+    rint(x * 10**n) / 10**n agrees with round() unless the scaled value sits
+    within float error of a .5 tie; those few go through round() itself.
+    """
+    scale = 10.0 ** ndigits
+    scaled = x * scale
+    out = np.rint(scaled) / scale
+    near_tie = np.abs(np.abs(scaled - np.trunc(scaled)) - 0.5) < 1e-6
+    if near_tie.any():
+        out = np.where(near_tie, _map(lambda v: round(v, ndigits), x), out)
+    return out
+
+
+def norm_cdf_array(x: np.ndarray) -> np.ndarray:
+    return 0.5 * (1.0 + _map(math.erf, np.asarray(x, dtype=np.float64) / math.sqrt(2.0)))
+
+
+def black_scholes_array(
+    S: Union[float, np.ndarray],
+    K: Union[float, np.ndarray],
+    T: Union[float, np.ndarray],
+    sigma: float,
+    r: float = 0.05,
+    option_type: Literal["CALL", "PUT"] = "CALL",
+) -> tuple[np.ndarray, np.ndarray]:
+    """Vectorized black_scholes(): (price, delta) arrays, same values elementwise.
+
+    S, K and T broadcast against each other.
+    """
+    S, K, T = (np.asarray(v, dtype=np.float64) for v in (S, K, T))
+    expired = T < 1.0 / 525600  # under a minute left: intrinsic value
+    any_expired = bool(expired.any())
+    if any_expired:
+        T = np.where(expired, 1.0, T)
+
+    sqrt_T = np.sqrt(T)
+    d1 = (_map(math.log, S / K) + (r + 0.5 * sigma * sigma) * T) / (sigma * sqrt_T)
+    d2 = d1 - sigma * sqrt_T
+    exp_rT = _map(math.exp, -r * T)
+
+    if option_type == "CALL":
+        delta = norm_cdf_array(d1)
+        price = S * delta - K * exp_rT * norm_cdf_array(d2)
+    else:
+        price = K * exp_rT * norm_cdf_array(-d2) - S * norm_cdf_array(-d1)
+        delta = norm_cdf_array(d1) - 1.0
+
+    if any_expired:
+        if option_type == "CALL":
+            intrinsic, itm_delta = S - K, np.where(S > K, 1.0, 0.0)
+        else:
+            intrinsic, itm_delta = K - S, np.where(K > S, -1.0, 0.0)
+        price = np.where(expired, intrinsic, price)
+        delta = np.where(expired, itm_delta, delta)
+    price = np.maximum(price, 0.0)
+    delta = _round_array(delta, 4)
+    return price, delta
+
+
 @dataclass
 class OptionPrice:
     price: float
@@ -149,3 +228,16 @@ def estimate_option_price_at(
     T = minutes_to_expiry / 525600.0
     sigma = vix / 100.0
     return black_scholes(ticker_price, strike, T, sigma, option_type=option_type).price
+
+
+def estimate_option_path(
+    ticker_prices: np.ndarray,
+    strike: float,
+    minutes_to_expiry: np.ndarray,
+    vix: float,
+    option_type: Literal["CALL", "PUT"] = "CALL",
+) -> tuple[np.ndarray, np.ndarray]:
+    """Vectorized estimate_option_price_and_delta(): (prices, deltas) along a path."""
+    T = np.asarray(minutes_to_expiry, dtype=np.float64) / 525600.0
+    sigma = vix / 100.0
+    return black_scholes_array(ticker_prices, strike, T, sigma, option_type=option_type)
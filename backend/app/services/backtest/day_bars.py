@@ -0,0 +1,321 @@
+"""Struct-of-arrays container for intraday bars.
+
+DayBars replaces dict[date, list[BarData]] with six flat columns (int64
+epoch-minute timestamps on the ET wall clock, float64 OHLC, int64 volume) and
+a per-day offset table. Six months of 5m bars is ~0.5 MB of arrays instead of
+tens of MB of dataclasses and tz-aware datetimes, and it pickles as a handful
+of buffers.
+
+Indexing a DayBars by date gives a DayView: a read-only Sequence over that
+day's rows that yields BarData on demand, so legacy code that iterates bars
+keeps working. Hot paths read the column arrays off the view directly.
+"""
+
+from collections.abc import Iterator, Mapping, Sequence
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Optional, Union
+
+import numpy as np
+import pytz
+
+from app.services.backtest.market_data import BarData
+
+ET = pytz.timezone("US/Eastern")
+
+EPOCH = datetime(1970, 1, 1)
+_EPOCH_ORDINAL = EPOCH.date().toordinal()
+_ONE_MINUTE = timedelta(minutes=1)
+_UNSET = object()
+
+
+def minute_to_datetime(minute: int) -> datetime:
+    """Epoch-minute (ET wall clock) -> ET-aware datetime."""
+    return ET.localize(EPOCH + timedelta(minutes=minute))
+
+
+def datetime_to_minute(ts: datetime) -> int:
+    """ET-aware or naive ET datetime -> epoch-minute; rejects sub-minute times."""
+    if ts.tzinfo is not None:
+        ts = ts.astimezone(ET).replace(tzinfo=None)
+    delta = ts - EPOCH
+    if delta % _ONE_MINUTE:
+        raise ValueError(f"{ts} is not on a minute boundary")
+    return delta // _ONE_MINUTE
+
+
+class DayView(Sequence):
+    """One day's bars as zero-copy column slices, iterable as BarData."""
+
+    __slots__ = ("ts", "open", "high", "low", "close", "volume", "_tz")
+
+    def __init__(self, ts, open, high, low, close, volume):
+        self.ts = ts
+        self.open = open
+        self.high = high
+        self.low = low
+        self.close = close
+        self.volume = volume
+        self._tz = _UNSET
+
+    def __getstate__(self):
+        return (self.ts, self.open, self.high, self.low, self.close, self.volume)
+
+    def __setstate__(self, state):
+        self.__init__(*state)
+
+    def __len__(self) -> int:
+        return len(self.ts)
+
+    def _tzinfo(self):
+        # A whole trading day shares one UTC offset (DST switches at 2am), so
+        # localize once and stamp that tzinfo on every bar. Days with bars
+        # before 3am fall back to per-bar localize.
+        if self._tz is _UNSET:
+            self._tz = None
+            if len(self.ts) and int(self.ts.min()) % 1440 >= 180:
+                self._tz = minute_to_datetime(int(self.ts[0])).tzinfo
+        return self._tz
+
+    def timestamp_at(self, i: int) -> datetime:
+        minute = int(self.ts[i])
+        tz = self._tzinfo()
+        if tz is None:
+            return minute_to_datetime(minute)
+        return (EPOCH + timedelta(minutes=minute)).replace(tzinfo=tz)
+
+    def _row(self, i: int) -> BarData:
+        return BarData(
+            timestamp=self.timestamp_at(i),
+            open=float(self.open[i]),
+            high=float(self.high[i]),
+            low=float(self.low[i]),
+            close=float(self.close[i]),
+            volume=int(self.volume[i]),
+        )
+
+    def __getitem__(self, i: Union[int, slice]):
+        if isinstance(i, slice):
+            start, stop, step = i.indices(len(self))
+            if step != 1:
+                return [self._row(j) for j in range(start, stop, step)]
+            view = DayView(
+                self.ts[start:stop], self.open[start:stop], self.high[start:stop],
+                self.low[start:stop], self.close[start:stop], self.volume[start:stop],
+            )
+            if self._tz is not _UNSET and self._tz is not None:
+                view._tz = self._tz  # a slice of a one-offset day shares it
+            return view
+        n = len(self)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError("bar index out of range")
+        return self._row(i)
+
+    def __iter__(self) -> Iterator[BarData]:
+        for i in range(len(self)):
+            yield self._row(i)
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, Sequence):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"DayView({len(self)} bars)"
+
+    @property
+    def timestamps(self) -> "_Timestamps":
+        """Lazy sorted timestamp sequence (works with bisect)."""
+        return _Timestamps(self)
+
+
+class _Timestamps(Sequence):
+    __slots__ = ("_view",)
+
+    def __init__(self, view: DayView):
+        self._view = view
+
+    def __len__(self) -> int:
+        return len(self._view)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self._view.timestamp_at(j) for j in range(*i.indices(len(self)))]
+        return self._view.timestamp_at(i)
+
+
+class DayBars(Mapping):
+    """date -> DayView over flat columns with a per-day offset table."""
+
+    def __init__(
+        self,
+        ts: np.ndarray,
+        open: np.ndarray,
+        high: np.ndarray,
+        low: np.ndarray,
+        close: np.ndarray,
+        volume: np.ndarray,
+        day_ordinals: np.ndarray,
+        day_offsets: np.ndarray,
+        reducer: Optional[tuple[Callable, tuple]] = None,
+    ):
+        self.ts = ts
+        self.open = open
+        self.high = high
+        self.low = low
+        self.close = close
+        self.volume = volume
+        self.day_ordinals = day_ordinals  # date.toordinal() per day, ascending
+        self.day_offsets = day_offsets    # len(days) + 1; day i is rows [off[i], off[i+1])
+        self._reducer = reducer           # how to rebuild cheaply in another process
+        self._day_pos = {o: i for i, o in enumerate(day_ordinals.tolist())}
+
+    def __reduce__(self):
+        if self._reducer is not None:
+            return self._reducer
+        return (DayBars, self.arrays())
+
+    def arrays(self) -> tuple[np.ndarray, ...]:
+        return (
+            self.ts, self.open, self.high, self.low, self.close, self.volume,
+            self.day_ordinals, self.day_offsets,
+        )
+
+    # ── Construction ──────────────────────────────────────────────
+
+    @classmethod
+    def from_bars_by_day(cls, bars_by_day: Mapping[date, Sequence[BarData]]) -> "DayBars":
+        """Pack a legacy dict of BarData lists (already a DayBars -> returned as is).
+
+        Raises ValueError if any timestamp isn't on a minute boundary.
+        """
+        if isinstance(bars_by_day, DayBars):
+            return bars_by_day
+        days = [d for d in sorted(bars_by_day) if len(bars_by_day[d])]
+        rows = [b for d in days for b in bars_by_day[d]]
+        offsets = np.zeros(len(days) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(bars_by_day[d]) for d in days])
+        return cls(
+            ts=np.array([datetime_to_minute(b.timestamp) for b in rows], dtype=np.int64),
+            open=np.array([b.open for b in rows], dtype=np.float64),
+            high=np.array([b.high for b in rows], dtype=np.float64),
+            low=np.array([b.low for b in rows], dtype=np.float64),
+            close=np.array([b.close for b in rows], dtype=np.float64),
+            volume=np.array([b.volume for b in rows], dtype=np.int64),
+            day_ordinals=np.array([d.toordinal() for d in days], dtype=np.int64),
+            day_offsets=offsets,
+        )
+
+    @classmethod
+    def from_sorted_columns(
+        cls, ts, open, high, low, close, volume,
+        reducer: Optional[tuple[Callable, tuple]] = None,
+    ) -> "DayBars":
+        """Build the day index for columns already sorted by timestamp."""
+        day_numbers = ts // 1440
+        if len(ts):
+            starts = np.flatnonzero(np.diff(day_numbers)) + 1
+            day_offsets = np.concatenate(([0], starts, [len(ts)])).astype(np.int64)
+        else:
+            day_offsets = np.zeros(1, dtype=np.int64)
+        day_ordinals = (day_numbers[day_offsets[:-1]] + _EPOCH_ORDINAL).astype(np.int64)
+        return cls(ts, open, high, low, close, volume, day_ordinals, day_offsets, reducer=reducer)
+
+    # ── Mapping interface ─────────────────────────────────────────
+
+    def __getitem__(self, day: date) -> DayView:
+        i = self._day_pos.get(day.toordinal()) if isinstance(day, date) else None
+        if i is None:
+            raise KeyError(day)
+        lo, hi = int(self.day_offsets[i]), int(self.day_offsets[i + 1])
+        return DayView(
+            self.ts[lo:hi], self.open[lo:hi], self.high[lo:hi],
+            self.low[lo:hi], self.close[lo:hi], self.volume[lo:hi],
+        )
+
+    def __contains__(self, day: Any) -> bool:
+        return isinstance(day, date) and day.toordinal() in self._day_pos
+
+    def __iter__(self) -> Iterator[date]:
+        return (date.fromordinal(o) for o in self.day_ordinals.tolist())
+
+    def __len__(self) -> int:
+        return len(self.day_ordinals)
+
+    def __repr__(self) -> str:
+        return f"DayBars({len(self)} days, {self.num_bars} bars)"
+
+    @property
+    def num_bars(self) -> int:
+        return int(self.day_offsets[-1] - self.day_offsets[0])
+
+    @property
+    def nbytes(self) -> int:
+        return sum(a.nbytes for a in self.arrays())
+
+    # ── Date subsets ──────────────────────────────────────────────
+
+    def between(self, start: date, end: date) -> "DayBars":
+        """Days in [start, end]; column arrays are zero-copy views."""
+        lo = int(np.searchsorted(self.day_ordinals, start.toordinal(), side="left"))
+        hi = int(np.searchsorted(self.day_ordinals, end.toordinal(), side="right"))
+        return self._day_range(lo, hi)
+
+    def _day_range(self, lo: int, hi: int) -> "DayBars":
+        r0, r1 = int(self.day_offsets[lo]), int(self.day_offsets[hi])
+        return DayBars(
+            self.ts[r0:r1], self.open[r0:r1], self.high[r0:r1],
+            self.low[r0:r1], self.close[r0:r1], self.volume[r0:r1],
+            self.day_ordinals[lo:hi], self.day_offsets[lo:hi + 1] - r0,
+        )
+
+    def subset(self, days: Sequence[date]) -> "DayBars":
+        """Days in the given order. A contiguous run of days is zero-copy."""
+        pos = [self._day_pos[d.toordinal()] for d in days]
+        if pos and pos == list(range(pos[0], pos[0] + len(pos))):
+            return self._day_range(pos[0], pos[0] + len(pos))
+        idx = np.concatenate(
+            [np.arange(self.day_offsets[i], self.day_offsets[i + 1]) for i in pos]
+        ) if pos else np.zeros(0, dtype=np.int64)
+        lengths = [int(self.day_offsets[i + 1] - self.day_offsets[i]) for i in pos]
+        offsets = np.zeros(len(pos) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum(lengths)
+        return DayBars(
+            self.ts[idx], self.open[idx], self.high[idx], self.low[idx],
+            self.close[idx], self.volume[idx],
+            self.day_ordinals[pos], offsets,
+        )
+
+
+def as_day_bars(bars_by_day: Mapping[date, Sequence[BarData]]) -> Mapping[date, Sequence[BarData]]:
+    """Pack into a DayBars where possible; sub-minute data stays as given."""
+    try:
+        return DayBars.from_bars_by_day(bars_by_day)
+    except ValueError:
+        return bars_by_day
+
+
+# ── Column access that works for both DayView and list[BarData] ───
+
+
+def bar_column(bars: Sequence[BarData], name: str) -> list:
+    """One field of every bar as a plain list."""
+    if isinstance(bars, DayView):
+        return getattr(bars, name).tolist()
+    return [getattr(b, name) for b in bars]
+
+
+def bar_timestamps(bars: Sequence[BarData]) -> Sequence[datetime]:
+    if isinstance(bars, DayView):
+        return bars.timestamps
+    return [b.timestamp for b in bars]
+
+
+def day_extremes(bars: Sequence[BarData]) -> tuple[float, float, float]:
+    """(last close, high, low) of a non-empty day, used for the next day's pivots."""
+    if isinstance(bars, DayView):
+        return float(bars.close[-1]), float(bars.high.max()), float(bars.low.min())
+    return bars[-1].close, max(b.high for b in bars), min(b.low for b in bars)
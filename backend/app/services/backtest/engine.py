@@ -8,16 +8,21 @@ import bisect
 import logging
 from dataclasses import dataclass, field
 from datetime import date, datetime, time
-from typing import Literal, Optional
+from typing import Callable, Iterator, Literal, Optional, Sequence
+
+import numpy as np
 
 from app.services.backtest.black_scholes import (
-    estimate_option_price_at,
+    estimate_option_path,
     estimate_option_price_and_delta,
+    estimate_option_price_at,
     select_strike_for_delta,
 )
 from app.services.backtest.spread_model import (
     estimate_spread_pct,
 )
+from app.services.backtest.day_bars import DayView, bar_column, bar_timestamps, day_extremes
+from app.services.backtest.indicator_cache import IndicatorCache
 from app.services.backtest.market_data import BarData, fetch_spy_bars, fetch_vix_daily, load_csv_bars
 
 logger = logging.getLogger(__name__)
@@ -122,11 +127,32 @@ class BacktestParams:
     entry_confirm_minutes: int = 0
 
 
+# BacktestParams fields read by signal generation. The rest only affect strike
+# selection, exits and risk limits, so combos that differ only in those share
+# the same signals for a day.
+SIGNAL_PARAM_FIELDS = (
+    "signal_type", "ema_fast", "ema_slow", "rsi_period", "rsi_ob", "rsi_os",
+    "orb_minutes", "orb_body_min_pct", "orb_vwap_filter", "orb_gap_fade_filter", "orb_time_stop",
+    "morning_window_start", "morning_window_end",
+    "afternoon_window_start", "afternoon_window_end", "afternoon_enabled",
+    "min_confluence", "vol_sma_period", "vol_threshold",
+    "pivot_enabled", "pivot_proximity_pct", "pivot_filter_enabled",
+    "bb_period", "bb_std_mult", "macd_fast", "macd_slow", "macd_signal_period",
+    "entry_confirm_minutes",
+)
+
+
+def signal_params_key(params: BacktestParams) -> tuple:
+    """Hashable key of the params that determine a day's signals."""
+    return tuple(getattr(params, name) for name in SIGNAL_PARAM_FIELDS)
+
+
 @dataclass
 class MarketDataCache:
     """Pre-fetched market data to avoid redundant yfinance downloads."""
-    bars_by_day: dict  # dict[date, list[BarData]]
+    bars_by_day: dict  # dict[date, list[BarData]] or DayBars
     vix_by_day: dict   # dict[date, float]
+    indicator_cache: Optional[IndicatorCache] = None  # per-day indicators reused across runs
 
 
 @dataclass
@@ -164,6 +190,15 @@ class SimulatedTrade:
     exit_detail: Optional[str] = None
 
 
+@dataclass
+class ExitLevels:
+    """Stop/target levels fixed at entry."""
+    use_orb_stops: bool
+    stop_price: float                   # option-price stop (non-ORB trades)
+    spy_stop: Optional[float] = None    # underlying levels (ORB trades)
+    spy_target: Optional[float] = None
+
+
 @dataclass
 class DailyResult:
     trade_date: date
@@ -192,64 +227,60 @@ class BacktestResult:
     profit_factor: float = 0.0
     avg_hold_minutes: float = 0.0
     exit_reasons: dict[str, int] = field(default_factory=dict)
+    pruned: bool = False  # stopped early by run_backtest's prune callback
 
 
-# ── Signal generation ─────────────────────────────────────────────
-
-
-def _compute_ema(values: list[float], period: int) -> list[Optional[float]]:
-    if len(values) < period:
-        return [None] * len(values)
-
-    result: list[Optional[float]] = [None] * (period - 1)
-    sma = sum(values[:period]) / period
-    result.append(sma)
-
-    k = 2.0 / (period + 1)
-    for i in range(period, len(values)):
-        val = values[i] * k + result[-1] * (1 - k)
-        result.append(val)
-
-    return result
-
-
-def _compute_rsi(closes: list[float], period: int) -> list[Optional[float]]:
-    """Wilder's RSI."""
-    if len(closes) < period + 1:
-        return [None] * len(closes)
-
-    result: list[Optional[float]] = [None] * period
+@dataclass
+class BacktestProgress:
+    """Running totals passed to run_backtest's prune callback between days."""
+    days_done: int
+    days_total: int
+    total_trades: int = 0
+    winning_trades: int = 0
+    total_pnl: float = 0.0
+    gross_wins: float = 0.0
+    gross_losses: float = 0.0
+    max_drawdown: float = 0.0
+    max_hold_exits: int = 0
+    _peak_pnl: float = 0.0
+
+    def add_trade(self, trade: SimulatedTrade) -> None:
+        pnl = trade.pnl_dollars or 0
+        self.total_trades += 1
+        self.total_pnl += pnl
+        if pnl > 0:
+            self.winning_trades += 1
+            self.gross_wins += pnl
+        else:
+            self.gross_losses -= pnl
+        if trade.exit_reason == "MAX_HOLD_TIME":
+            self.max_hold_exits += 1
+        self._peak_pnl = max(self._peak_pnl, self.total_pnl)
+        self.max_drawdown = max(self.max_drawdown, self._peak_pnl - self.total_pnl)
 
-    gains = []
-    losses = []
-    for i in range(1, period + 1):
-        delta = closes[i] - closes[i - 1]
-        gains.append(max(delta, 0))
-        losses.append(max(-delta, 0))
-
-    avg_gain = sum(gains) / period
-    avg_loss = sum(losses) / period
-    rs = avg_gain / avg_loss if avg_loss > 0 else 100
-    result.append(100 - 100 / (1 + rs))
-
-    for i in range(period + 1, len(closes)):
-        delta = closes[i] - closes[i - 1]
-        avg_gain = (avg_gain * (period - 1) + max(delta, 0)) / period
-        avg_loss = (avg_loss * (period - 1) + max(-delta, 0)) / period
-        rs = avg_gain / avg_loss if avg_loss > 0 else 100
-        result.append(100 - 100 / (1 + rs))
 
-    return result
+# ── Signal generation ─────────────────────────────────────────────
 
 
-def _compute_atr(bars: list[BarData], period: int) -> list[Optional[float]]:
+def _compute_atr(
+    bars: list[BarData],
+    period: int,
+    indicator_cache: Optional[IndicatorCache] = None,
+    cache_day: Optional[date] = None,
+) -> list[Optional[float]]:
     """Average True Range (Wilder smoothing)."""
+    if indicator_cache is not None and cache_day is not None:
+        return indicator_cache.get_or_compute(
+            (cache_day, "atr", (period,)), lambda: _compute_atr(bars, period),
+        )
+
     if len(bars) < period + 1:
         return [None] * len(bars)
 
+    highs, lows, closes = bar_column(bars, "high"), bar_column(bars, "low"), bar_column(bars, "close")
     trs: list[float] = [0.0]  # first bar has no previous close
     for i in range(1, len(bars)):
-        h, l, pc = bars[i].high, bars[i].low, bars[i - 1].close
+        h, l, pc = highs[i], lows[i], closes[i - 1]
         trs.append(max(h - l, abs(h - pc), abs(l - pc)))
 
     result: list[Optional[float]] = [None] * period
@@ -263,18 +294,6 @@ def _compute_atr(bars: list[BarData], period: int) -> list[Optional[float]]:
     return result
 
 
-def _compute_vwap(bars: list[BarData]) -> list[Optional[float]]:
-    vwap: list[Optional[float]] = []
-    cum_tp_vol = 0.0
-    cum_vol = 0
-    for bar in bars:
-        tp = (bar.high + bar.low + bar.close) / 3.0
-        cum_tp_vol += tp * bar.volume
-        cum_vol += bar.volume
-        vwap.append(cum_tp_vol / cum_vol if cum_vol > 0 else None)
-    return vwap
-
-
 @dataclass
 class PivotLevels:
     """Classic floor trader pivot points from prior day OHLC."""
@@ -314,79 +333,6 @@ class Signal:
     rel_vol: Optional[float] = None
 
 
-def _compute_bollinger(closes: list[float], period: int = 20, std_mult: float = 2.0):
-    """Returns (upper, lower, mid) band lists."""
-    n = len(closes)
-    upper: list[Optional[float]] = [None] * n
-    lower: list[Optional[float]] = [None] * n
-    mid: list[Optional[float]] = [None] * n
-
-    for i in range(period - 1, n):
-        window = closes[i - period + 1 : i + 1]
-        m = sum(window) / period
-        var = sum((x - m) ** 2 for x in window) / period
-        std = var ** 0.5
-        mid[i] = m
-        upper[i] = m + std_mult * std
-        lower[i] = m - std_mult * std
-
-    return upper, lower, mid
-
-
-def _compute_macd(
-    closes: list[float],
-    fast: int = 12,
-    slow: int = 26,
-    signal: int = 9,
-) -> tuple[list[Optional[float]], list[Optional[float]], list[Optional[float]]]:
-    """MACD line, signal line, histogram."""
-    ema_fast = _compute_ema(closes, fast)
-    ema_slow = _compute_ema(closes, slow)
-    n = len(closes)
-
-    macd_line: list[Optional[float]] = [None] * n
-    for i in range(n):
-        if ema_fast[i] is not None and ema_slow[i] is not None:
-            macd_line[i] = ema_fast[i] - ema_slow[i]
-
-    # Signal line = EMA of MACD line (skip Nones)
-    macd_vals = [v for v in macd_line if v is not None]
-    if len(macd_vals) < signal:
-        return macd_line, [None] * n, [None] * n
-
-    sig_ema = _compute_ema(macd_vals, signal)
-    signal_line: list[Optional[float]] = [None] * n
-    j = 0
-    for i in range(n):
-        if macd_line[i] is not None:
-            signal_line[i] = sig_ema[j] if j < len(sig_ema) else None
-            j += 1
-
-    histogram: list[Optional[float]] = [None] * n
-    for i in range(n):
-        if macd_line[i] is not None and signal_line[i] is not None:
-            histogram[i] = macd_line[i] - signal_line[i]
-
-    return macd_line, signal_line, histogram
-
-
-def _compute_volume_sma(bars: list[BarData], period: int) -> list[Optional[float]]:
-    """Simple moving average of volume."""
-    n = len(bars)
-    if n < period:
-        return [None] * n
-
-    result: list[Optional[float]] = [None] * (period - 1)
-    window_sum = sum(b.volume for b in bars[:period])
-    result.append(window_sum / period)
-
-    for i in range(period, n):
-        window_sum += bars[i].volume - bars[i - period].volume
-        result.append(window_sum / period)
-
-    return result
-
-
 def _generate_signals(
     bars: list[BarData],
     params: BacktestParams,
@@ -394,382 +340,125 @@ def _generate_signals(
     prev_high: Optional[float] = None,
     prev_low: Optional[float] = None,
     confirm_bars: Optional[list[BarData]] = None,
+    indicator_cache: Optional[IndicatorCache] = None,
+    cache_day: Optional[date] = None,
 ) -> list[Signal]:
+    """Generate entry signals for one day of bars.
+
+    Delegates to the columnar NumPy engine, which is parity-tested against
+    the per-bar reference loop in tests/mocks/reference_engine.py. Passing an
+    indicator_cache plus the bars' cache_day reuses the day's columns and
+    indicator series across calls.
+    """
+    from app.services.backtest.signal_engine import OHLCVArrays, generate_signals_columnar
+
     if len(bars) < max(params.ema_slow + 1, 26):
         return []
 
-    closes = [b.close for b in bars]
-    ema_f = _compute_ema(closes, params.ema_fast)
-    ema_s = _compute_ema(closes, params.ema_slow)
-    vwap = _compute_vwap(bars)
-
-    # RSI (computed if needed for rsi strategies OR confluence)
-    rsi: list[Optional[float]] = [None] * len(bars)
-    rsi_period = params.rsi_period if params.rsi_period > 0 else 9
-    if params.rsi_period > 0 or params.signal_type == "confluence":
-        rsi = _compute_rsi(closes, rsi_period)
-
-    # Bollinger Bands (for bb_squeeze strategy)
-    bb_upper, bb_lower, bb_mid = _compute_bollinger(closes, params.bb_period, params.bb_std_mult)
-
-    # MACD and Volume SMA (for confluence strategy)
-    macd_line: list[Optional[float]] = [None] * len(bars)
-    macd_sig_line: list[Optional[float]] = [None] * len(bars)
-    macd_hist: list[Optional[float]] = [None] * len(bars)
-    vol_sma: list[Optional[float]] = [None] * len(bars)
-    if params.signal_type == "confluence":
-        macd_line, macd_sig_line, macd_hist = _compute_macd(closes, params.macd_fast, params.macd_slow, params.macd_signal_period)
-        vol_sma = _compute_volume_sma(bars, params.vol_sma_period)
-
-    # Pivot points (from prior day OHLC)
-    pivots: Optional[PivotLevels] = None
-    if params.pivot_enabled and prev_high is not None and prev_low is not None and prev_close is not None:
-        pivots = compute_pivot_levels(prev_high, prev_low, prev_close)
-
-    # ORB: compute opening range from first N minutes
-    orb_high: Optional[float] = None
-    orb_low: Optional[float] = None
-    orb_open: Optional[float] = None
-    orb_close: Optional[float] = None
-    orb_ready = False
-    if params.signal_type in ("orb", "orb_direction"):
-        open_time = bars[0].timestamp.replace(hour=9, minute=30, second=0) if bars else None
-        if open_time:
-            from datetime import timedelta
-            orb_end_time = open_time + timedelta(minutes=params.orb_minutes)
-            orb_bars = [b for b in bars if b.timestamp < orb_end_time]
-            if orb_bars:
-                orb_high = max(b.high for b in orb_bars)
-                orb_low = min(b.low for b in orb_bars)
-                orb_open = orb_bars[0].open
-                orb_close = orb_bars[-1].close
-                orb_ready = True
-
-    windows = [(params.morning_window_start, params.morning_window_end)]
-    if params.afternoon_enabled:
-        windows.append((params.afternoon_window_start, params.afternoon_window_end))
-
-    signals: list[Signal] = []
+    if indicator_cache is not None and cache_day is not None:
+        day = indicator_cache.get_or_compute((cache_day, "ohlcv", ()), lambda: OHLCVArrays.from_bars(bars))
+    else:
+        day = OHLCVArrays.from_bars(bars)
+    return generate_signals_columnar(
+        day, params,
+        prev_close=prev_close, prev_high=prev_high, prev_low=prev_low,
+        confirm_bars=confirm_bars,
+        cache=indicator_cache, day_key=cache_day,
+    )
 
-    for i in range(1, len(bars)):
-        bar = bars[i]
-        bt = bar.timestamp.time()
 
-        # Strategy-specific window checks
-        if params.signal_type == "vwap_reclaim":
-            if not (time(10, 30) <= bt <= time(12, 0)):
-                continue
-        elif params.signal_type == "orb_direction":
-            orb_end_minutes = 30 + params.orb_minutes
-            orb_end_t = time(9 + orb_end_minutes // 60, orb_end_minutes % 60)
-            if bt < orb_end_t or bt > params.orb_time_stop:
-                continue
-        else:
-            if not any(s <= bt <= e for s, e in windows):
-                continue
+def _apply_entry_confirmation(
+    signals: list[Signal],
+    params: BacktestParams,
+    confirm_bars: list[BarData],
+) -> list[Signal]:
+    """Require N 1-minute bars to confirm each signal's direction."""
+    confirmed: list[Signal] = []
+    for sig in signals:
+        future = [b for b in confirm_bars if b.timestamp > sig.timestamp]
+        if len(future) < params.entry_confirm_minutes:
+            continue
+        confirm_bar = future[params.entry_confirm_minutes - 1]
+        if sig.direction == "CALL" and confirm_bar.close > confirm_bar.open:
+            sig.timestamp = confirm_bar.timestamp
+            sig.ticker_price = confirm_bar.close
+            confirmed.append(sig)
+        elif sig.direction == "PUT" and confirm_bar.close < confirm_bar.open:
+            sig.timestamp = confirm_bar.timestamp
+            sig.ticker_price = confirm_bar.close
+            confirmed.append(sig)
+    return confirmed
 
-        direction: Optional[str] = None
-        reason = ""
-        sig_orb_range: Optional[float] = None
-        sig_orb_entry: Optional[float] = None
-        sig_confluence_score: Optional[int] = None
-        sig_confluence_max: Optional[int] = None
-        sig_rel_vol: Optional[float] = None
-
-        if params.signal_type == "confluence":
-            # ── Multi-indicator confluence scoring ──
-            # 6 factors scored independently for CALL and PUT
-            call_score = 0
-            put_score = 0
-            call_factors: list[str] = []
-            put_factors: list[str] = []
-
-            # 1. VWAP bias: close above/below VWAP
-            if vwap[i] is not None:
-                if bar.close > vwap[i]:
-                    call_score += 1
-                    call_factors.append("VWAP")
-                elif bar.close < vwap[i]:
-                    put_score += 1
-                    put_factors.append("VWAP")
-
-            # 2. EMA trend: fast above/below slow
-            if ema_f[i] is not None and ema_s[i] is not None:
-                if ema_f[i] > ema_s[i]:
-                    call_score += 1
-                    call_factors.append("EMA")
-                elif ema_f[i] < ema_s[i]:
-                    put_score += 1
-                    put_factors.append("EMA")
-
-            # 3. RSI favorable zone (not at extremes)
-            if rsi[i] is not None:
-                if rsi[i] < params.rsi_ob:
-                    call_score += 1
-                    call_factors.append(f"RSI:{rsi[i]:.0f}")
-                if rsi[i] > params.rsi_os:
-                    put_score += 1
-                    put_factors.append(f"RSI:{rsi[i]:.0f}")
-
-            # 4. MACD histogram direction
-            if macd_hist[i] is not None:
-                if macd_hist[i] > 0:
-                    call_score += 1
-                    call_factors.append("MACD")
-                elif macd_hist[i] < 0:
-                    put_score += 1
-                    put_factors.append("MACD")
-
-            # 5. Relative volume above threshold (confirms EMA trend direction)
-            if vol_sma[i] is not None and vol_sma[i] > 0:
-                rel_vol = bar.volume / vol_sma[i]
-                if rel_vol >= params.vol_threshold:
-                    if ema_f[i] is not None and ema_s[i] is not None:
-                        if ema_f[i] > ema_s[i]:
-                            call_score += 1
-                            call_factors.append(f"Vol:{rel_vol:.1f}x")
-                        elif ema_f[i] < ema_s[i]:
-                            put_score += 1
-                            put_factors.append(f"Vol:{rel_vol:.1f}x")
-
-            # 6. Price action: candle direction
-            if bar.close > bar.open:
-                call_score += 1
-                call_factors.append("Candle")
-            elif bar.close < bar.open:
-                put_score += 1
-                put_factors.append("Candle")
-
-            # 7. Pivot point S/R proximity
-            if pivots is not None:
-                proximity = params.pivot_proximity_pct / 100.0
-                price = bar.close
-                near_s1 = abs(price - pivots.s1) / pivots.s1 < proximity if pivots.s1 != 0 else False
-                near_s2 = abs(price - pivots.s2) / pivots.s2 < proximity if pivots.s2 != 0 else False
-                near_r1 = abs(price - pivots.r1) / pivots.r1 < proximity if pivots.r1 != 0 else False
-                near_r2 = abs(price - pivots.r2) / pivots.r2 < proximity if pivots.r2 != 0 else False
-                if near_s1 or near_s2:
-                    call_score += 1
-                    nearest = "S1" if abs(price - pivots.s1) < abs(price - pivots.s2) else "S2"
-                    call_factors.append(f"Pivot:{nearest}")
-                elif near_r1 or near_r2:
-                    put_score += 1
-                    nearest = "R1" if abs(price - pivots.r1) < abs(price - pivots.r2) else "R2"
-                    put_factors.append(f"Pivot:{nearest}")
-                elif price < pivots.pivot:
-                    call_score += 1
-                    call_factors.append("Pivot:<P")
-                elif price > pivots.pivot:
-                    put_score += 1
-                    put_factors.append("Pivot:>P")
-
-            # Fire signal if score meets minimum confluence threshold
-            max_score = 7 if pivots is not None else 6
-
-            # Compute rel_vol for this bar (used for confidence sizing)
-            bar_rel_vol = None
-            if vol_sma[i] is not None and vol_sma[i] > 0:
-                bar_rel_vol = round(bar.volume / vol_sma[i], 2)
-
-            if call_score >= params.min_confluence and call_score > put_score:
-                direction = "CALL"
-                reason = f"Confluence {call_score}/{max_score}: {', '.join(call_factors)}"
-                sig_confluence_score = call_score
-                sig_confluence_max = max_score
-                sig_rel_vol = bar_rel_vol
-            elif put_score >= params.min_confluence and put_score > call_score:
-                direction = "PUT"
-                reason = f"Confluence {put_score}/{max_score}: {', '.join(put_factors)}"
-                sig_confluence_score = put_score
-                sig_confluence_max = max_score
-                sig_rel_vol = bar_rel_vol
-
-        elif params.signal_type == "orb":
-            # ORB: trade breakouts of opening range
-            if orb_ready and orb_high is not None and orb_low is not None:
-                prev = bars[i - 1]
-                if prev.close <= orb_high and bar.close > orb_high:
-                    direction, reason = "CALL", f"ORB breakout above {orb_high:.2f}"
-                elif prev.close >= orb_low and bar.close < orb_low:
-                    direction, reason = "PUT", f"ORB breakdown below {orb_low:.2f}"
-
-        elif params.signal_type == "orb_direction":
-            # ORB with direction filter: only trade in ORB candle direction
-            if orb_ready and orb_high is not None and orb_low is not None:
-                orb_rng = orb_high - orb_low
-                if orb_rng > 0:
-                    prev = bars[i - 1]
-                    orb_body = abs((orb_close or 0) - (orb_open or 0))
-                    body_pct = orb_body / orb_rng
-
-                    if body_pct >= params.orb_body_min_pct:
-                        orb_bullish = (orb_close or 0) > (orb_open or 0)
-                        orb_bearish = (orb_close or 0) < (orb_open or 0)
-
-                        vwap_ok = True
-                        if params.orb_vwap_filter and vwap[i] is not None:
-                            if orb_bullish and (orb_close or 0) < vwap[i]:
-                                vwap_ok = False
-                            elif orb_bearish and (orb_close or 0) > vwap[i]:
-                                vwap_ok = False
-
-                        gap_ok = True
-                        if params.orb_gap_fade_filter and prev_close is not None and orb_open is not None:
-                            gap = orb_open - prev_close
-                            if orb_bullish and gap > 0:
-                                gap_ok = False  # want gap to oppose direction
-                            elif orb_bearish and gap < 0:
-                                gap_ok = False
-
-                        if vwap_ok and gap_ok:
-                            if orb_bullish and prev.close <= orb_high and bar.close > orb_high:
-                                direction = "CALL"
-                                reason = f"ORB-{params.orb_minutes} bullish breakout (body {body_pct:.0%})"
-                                sig_orb_range = orb_rng
-                                sig_orb_entry = orb_high
-                            elif orb_bearish and prev.close >= orb_low and bar.close < orb_low:
-                                direction = "PUT"
-                                reason = f"ORB-{params.orb_minutes} bearish breakdown (body {body_pct:.0%})"
-                                sig_orb_range = orb_rng
-                                sig_orb_entry = orb_low
-
-        elif params.signal_type == "vwap_reclaim":
-            # VWAP reclaim: price crosses VWAP with strong bar
-            if vwap[i] is not None and vwap[i - 1] is not None:
-                prev = bars[i - 1]
-                bar_body = abs(bar.close - bar.open)
-                if bar_body >= 0.30:
-                    if prev.close < vwap[i - 1] and bar.close > vwap[i]:
-                        direction = "CALL"
-                        reason = f"VWAP reclaim bullish (body ${bar_body:.2f})"
-                    elif prev.close > vwap[i - 1] and bar.close < vwap[i]:
-                        direction = "PUT"
-                        reason = f"VWAP reclaim bearish (body ${bar_body:.2f})"
-
-        elif params.signal_type == "vwap_rsi":
-            # VWAP for direction + RSI for timing
-            if vwap[i] is not None and rsi[i] is not None:
-                if bar.close > vwap[i] and rsi[i] <= params.rsi_os:
-                    direction, reason = "CALL", f"Above VWAP + RSI oversold ({rsi[i]:.0f})"
-                elif bar.close < vwap[i] and rsi[i] >= params.rsi_ob:
-                    direction, reason = "PUT", f"Below VWAP + RSI overbought ({rsi[i]:.0f})"
-
-        elif params.signal_type == "bb_squeeze":
-            # Bollinger Band squeeze breakout
-            if bb_upper[i] is not None and bb_lower[i] is not None and bb_upper[i - 1] is not None:
-                width = bb_upper[i] - bb_lower[i]
-                prev_width = (bb_upper[i - 1] or 0) - (bb_lower[i - 1] or 0)
-                expanding = width > prev_width  # bands expanding = squeeze release
-                if expanding:
-                    if bar.close > bb_upper[i]:
-                        direction, reason = "CALL", "BB squeeze breakout above"
-                    elif bar.close < bb_lower[i]:
-                        direction, reason = "PUT", "BB squeeze breakdown below"
-
-        elif params.signal_type == "rsi_reversal":
-            # Pure RSI reversal signals
-            if rsi[i] is not None and rsi[i - 1] is not None:
-                if rsi[i - 1] < params.rsi_os and rsi[i] >= params.rsi_os:
-                    direction, reason = "CALL", f"RSI crossed above {params.rsi_os:.0f}"
-                elif rsi[i - 1] > params.rsi_ob and rsi[i] <= params.rsi_ob:
-                    direction, reason = "PUT", f"RSI crossed below {params.rsi_ob:.0f}"
 
-        else:
-            # Original strategies: ema_cross, vwap_cross, ema_vwap
-            if any(v is None for v in [ema_f[i], ema_f[i - 1], ema_s[i], ema_s[i - 1]]):
-                continue
+# ── Trade simulation ──────────────────────────────────────────────
 
-            ema_bull = ema_f[i - 1] <= ema_s[i - 1] and ema_f[i] > ema_s[i]
-            ema_bear = ema_f[i - 1] >= ema_s[i - 1] and ema_f[i] < ema_s[i]
-
-            vwap_bull = vwap[i] is not None and bar.close > vwap[i]
-            vwap_bear = vwap[i] is not None and bar.close < vwap[i]
-
-            if params.signal_type == "ema_cross":
-                if ema_bull:
-                    direction, reason = "CALL", f"EMA {params.ema_fast}/{params.ema_slow} bullish cross"
-                elif ema_bear:
-                    direction, reason = "PUT", f"EMA {params.ema_fast}/{params.ema_slow} bearish cross"
-
-            elif params.signal_type == "vwap_cross":
-                if vwap[i] is not None and vwap[i - 1] is not None:
-                    if bars[i - 1].close <= vwap[i - 1] and bar.close > vwap[i]:
-                        direction, reason = "CALL", "Price crossed above VWAP"
-                    elif bars[i - 1].close >= vwap[i - 1] and bar.close < vwap[i]:
-                        direction, reason = "PUT", "Price crossed below VWAP"
-
-            elif params.signal_type == "ema_vwap":
-                if ema_bull and vwap_bull:
-                    direction, reason = "CALL", "EMA cross + above VWAP"
-                elif ema_bear and vwap_bear:
-                    direction, reason = "PUT", "EMA cross + below VWAP"
-
-        # RSI filter: if enabled, block signals that disagree with RSI
-        # (confluence handles RSI internally, skip filter for it)
-        if direction and params.rsi_period > 0 and rsi[i] is not None:
-            if params.signal_type not in ("vwap_rsi", "rsi_reversal", "confluence"):
-                if direction == "CALL" and rsi[i] > params.rsi_ob:
-                    continue  # don't buy calls when overbought
-                if direction == "PUT" and rsi[i] < params.rsi_os:
-                    continue  # don't buy puts when oversold
-
-        # Pivot S/R filter: block signals that fight key levels
-        if direction and params.pivot_filter_enabled and pivots is not None:
-            proximity = params.pivot_proximity_pct / 100.0
-            price = bar.close
-            if direction == "CALL":
-                # Block CALL if price is near resistance (buying into ceiling)
-                near_r1 = abs(price - pivots.r1) / pivots.r1 < proximity if pivots.r1 != 0 else False
-                near_r2 = abs(price - pivots.r2) / pivots.r2 < proximity if pivots.r2 != 0 else False
-                if near_r1 or near_r2:
-                    continue
-            elif direction == "PUT":
-                # Block PUT if price is near support (selling into floor)
-                near_s1 = abs(price - pivots.s1) / pivots.s1 < proximity if pivots.s1 != 0 else False
-                near_s2 = abs(price - pivots.s2) / pivots.s2 < proximity if pivots.s2 != 0 else False
-                if near_s1 or near_s2:
-                    continue
 
-        if direction:
-            signals.append(Signal(
-                timestamp=bar.timestamp,
-                direction=direction,
-                ticker_price=bar.close,
-                reason=reason,
-                orb_range=sig_orb_range,
-                orb_entry_level=sig_orb_entry,
-                confluence_score=sig_confluence_score,
-                confluence_max_score=sig_confluence_max,
-                rel_vol=sig_rel_vol,
-            ))
-
-    # Entry confirmation: require N 1-minute bars to confirm direction
-    if params.entry_confirm_minutes > 0 and confirm_bars:
-        confirmed: list[Signal] = []
-        for sig in signals:
-            future = [b for b in confirm_bars if b.timestamp > sig.timestamp]
-            if len(future) < params.entry_confirm_minutes:
-                continue
-            confirm_bar = future[params.entry_confirm_minutes - 1]
-            if sig.direction == "CALL" and confirm_bar.close > confirm_bar.open:
-                sig.timestamp = confirm_bar.timestamp
-                sig.ticker_price = confirm_bar.close
-                confirmed.append(sig)
-            elif sig.direction == "PUT" and confirm_bar.close < confirm_bar.open:
-                sig.timestamp = confirm_bar.timestamp
-                sig.ticker_price = confirm_bar.close
-                confirmed.append(sig)
-        signals = confirmed
+def _minutes_to_close(ts: datetime) -> float:
+    close_dt = ts.replace(hour=16, minute=0, second=0, microsecond=0)
+    return max((close_dt - ts).total_seconds() / 60.0, 0.0)
 
-    return signals
 
+_PATH_SCALAR_BARS = 4  # leading bars of a trade priced with scalar B-S
+_PATH_CHUNK = 16       # bars in the first vectorized B-S call after those
 
-# ── Trade simulation ──────────────────────────────────────────────
 
+def _path_minutes_to_close(bars: Sequence[BarData]) -> list[float]:
+    """_minutes_to_close() for every bar."""
+    if isinstance(bars, DayView):
+        return np.maximum(960 - bars.ts % 1440, 0).astype(np.float64).tolist()
+    return [_minutes_to_close(b.timestamp) for b in bars]
 
-def _minutes_to_close(ts: datetime) -> float:
-    close_dt = ts.replace(hour=16, minute=0, second=0, microsecond=0)
-    return max((close_dt - ts).total_seconds() / 60.0, 0.0)
+
+def _price_path_chunks(
+    bars: Sequence[BarData],
+    strike: float,
+    vix: float,
+    direction: str,
+    intrabar_worst: bool,
+    minutes_to_expiry: Callable[[Sequence[BarData]], list[float]] = _path_minutes_to_close,
+) -> Iterator[tuple[int, list[float], list[float], list[float], list[float]]]:
+    """Price a trade's bars chunk by chunk, lazily.
+
+    Yields (start index, minutes to expiry, mids, deltas, worst-case mids)
+    per chunk. Mids are floored at $0.01; the worst case is the mid at the
+    bar's low (calls) or high (puts) if intrabar_worst, else the mid itself.
+    Values equal the per-bar scalar calls exactly.
+
+    Most trades exit within a few bars, where a vectorized call's fixed
+    overhead loses to scalar B-S, so the first _PATH_SCALAR_BARS are priced
+    one by one and the rest in vectorized chunks that double in size.
+    """
+    worst_attr = "low" if direction == "CALL" else "high"
+    head = bars[:_PATH_SCALAR_BARS]
+    if len(head):
+        head_mtc = minutes_to_expiry(head)
+        results = [
+            estimate_option_price_and_delta(close, strike, mtc, vix, direction)
+            for close, mtc in zip(bar_column(head, "close"), head_mtc)
+        ]
+        prices = [max(r.price, 0.01) for r in results]
+        worst = prices
+        if intrabar_worst:
+            worst = [
+                max(estimate_option_price_at(level, strike, mtc, vix, direction), 0.01)
+                for level, mtc in zip(bar_column(head, worst_attr), head_mtc)
+            ]
+        yield 0, head_mtc, prices, [r.delta for r in results], worst
+
+    lo, size = len(head), _PATH_CHUNK
+    while lo < len(bars):
+        hi = min(lo + size, len(bars))
+        chunk = bars[lo:hi]
+        underlying = bar_column(chunk, "close")
+        chunk_mtc = minutes = minutes_to_expiry(chunk)
+        if intrabar_worst:
+            underlying = underlying + bar_column(chunk, worst_attr)
+            minutes = minutes + minutes
+        prices, deltas = estimate_option_path(np.array(underlying), strike, np.array(minutes), vix, direction)
+        prices = np.maximum(prices, 0.01).tolist()
+        n = hi - lo
+        yield lo, chunk_mtc, prices[:n], deltas[:n].tolist(), prices[n:] if intrabar_worst else prices
+        lo, size = hi, size * 2
 
 
 def _close_trade(
@@ -803,16 +492,11 @@ def _close_trade(
     )
 
 
-def _simulate_trade(
+def _exit_levels(
     trade: SimulatedTrade,
-    bars_after: list[BarData],
-    vix: float,
     params: BacktestParams,
     atr_at_entry: Optional[float] = None,
-) -> None:
-    """Walk bars and apply exit rules (same priority as exit_engine.py)."""
-    trade.highest_price_seen = trade.entry_price
-
+) -> ExitLevels:
     # ORB range-based stops (SPY-level)
     use_orb_stops = (
         trade.orb_range is not None
@@ -839,127 +523,26 @@ def _simulate_trade(
         else:
             stop_price = trade.entry_price * (1 - params.stop_loss_percent / 100)
 
-    for bar in bars_after:
-        mtc = _minutes_to_close(bar.timestamp)
-        # Combined B-S call: get both price and delta in one shot
-        opt_result = estimate_option_price_and_delta(bar.close, trade.strike, mtc, vix, trade.direction)
-        opt_price = max(opt_result.price, 0.01)
-
-        # Intrabar stop check: estimate option price at worst underlying level
-        if not use_orb_stops:
-            worst_underlying = bar.low if trade.direction == "CALL" else bar.high
-            opt_price_worst = max(
-                estimate_option_price_at(worst_underlying, trade.strike, mtc, vix, trade.direction),
-                0.01,
-            )
-        else:
-            opt_price_worst = opt_price
+    return ExitLevels(use_orb_stops, stop_price, spy_stop, spy_target)
 
-        # Compute per-bar exit slippage (dynamic spread or flat)
-        if params.spread_model_enabled:
-            exit_spread = estimate_spread_pct(opt_result.delta, mtc, vix, opt_price, is_0dte=True)
-            bar_slippage = exit_spread / 2 * 100  # _close_trade expects a percentage
-        else:
-            bar_slippage = params.exit_slippage_percent
-
-        if opt_price > trade.highest_price_seen:
-            trade.highest_price_seen = opt_price
-
-        elapsed = (bar.timestamp - trade.entry_time).total_seconds() / 60
-        gain_pct = (opt_price - trade.entry_price) / trade.entry_price * 100 if trade.entry_price > 0 else 0
-
-        # P1: Force exit
-        if bar.timestamp.time() >= params.force_exit_time:
-            _close_trade(trade, bar.timestamp, opt_price, "TIME_BASED", bar_slippage,
-                         exit_detail=f"Force exit at {bar.timestamp.strftime('%H:%M')} (opt ${opt_price:.2f})")
-            return
-
-        # ORB time stop
-        if use_orb_stops and bar.timestamp.time() >= params.orb_time_stop:
-            _close_trade(trade, bar.timestamp, opt_price, "ORB_TIME_STOP", bar_slippage,
-                         exit_detail=f"ORB time stop at {bar.timestamp.strftime('%H:%M')} (opt ${opt_price:.2f})")
-            return
-
-        # P2: Max hold
-        if elapsed >= params.max_hold_minutes:
-            _close_trade(trade, bar.timestamp, opt_price, "MAX_HOLD_TIME", bar_slippage,
-                         exit_detail=f"Held {elapsed:.0f}min (max {params.max_hold_minutes}min)")
-            return
-
-        # P3: Stop loss (intrabar: check worst-case price within bar)
-        if use_orb_stops:
-            if trade.direction == "CALL" and bar.low <= spy_stop:
-                _close_trade(trade, bar.timestamp, opt_price, "STOP_LOSS", bar_slippage,
-                             exit_detail=f"Underlying ${bar.low:.2f} hit ORB stop ${spy_stop:.2f}")
-                return
-            elif trade.direction == "PUT" and bar.high >= spy_stop:
-                _close_trade(trade, bar.timestamp, opt_price, "STOP_LOSS", bar_slippage,
-                             exit_detail=f"Underlying ${bar.high:.2f} hit ORB stop ${spy_stop:.2f}")
-                return
-        else:
-            if opt_price_worst <= stop_price:
-                fill_price = opt_price_worst  # realistic fill at actual worst price, not ideal stop level
-                _close_trade(trade, bar.timestamp, fill_price, "STOP_LOSS", bar_slippage,
-                             exit_detail=f"Opt ${opt_price_worst:.2f} <= stop ${stop_price:.2f} (-{params.stop_loss_percent:.0f}%)")
-                return
-
-        # Breakeven stop adjustment (non-ORB only)
-        if not use_orb_stops:
-            if (
-                not trade.breakeven_stop_applied
-                and params.breakeven_trigger_percent > 0
-                and trade.highest_price_seen >= trade.entry_price * (1 + params.breakeven_trigger_percent / 100)
-            ):
-                stop_price = trade.entry_price
-                trade.breakeven_stop_applied = True
-
-        # P4: Profit target
-        if use_orb_stops:
-            if trade.direction == "CALL" and bar.high >= spy_target:
-                _close_trade(trade, bar.timestamp, opt_price, "PROFIT_TARGET", bar_slippage,
-                             exit_detail=f"Underlying ${bar.high:.2f} hit ORB target ${spy_target:.2f}")
-                return
-            elif trade.direction == "PUT" and bar.low <= spy_target:
-                _close_trade(trade, bar.timestamp, opt_price, "PROFIT_TARGET", bar_slippage,
-                             exit_detail=f"Underlying ${bar.low:.2f} hit ORB target ${spy_target:.2f}")
-                return
-        else:
-            if gain_pct >= params.profit_target_percent:
-                if params.scale_out_enabled and trade.quantity >= 2 and not trade.scaled_out:
-                    trade.scaled_out = True
-                    trade.scaled_out_quantity = trade.quantity // 2
-                    trade.scaled_out_price = opt_price
-                elif not trade.scaled_out:
-                    _close_trade(trade, bar.timestamp, opt_price, "PROFIT_TARGET", bar_slippage,
-                                 exit_detail=f"Gain {gain_pct:.1f}% >= {params.profit_target_percent:.0f}% (opt ${opt_price:.2f})")
-                    return
-
-        # P5: Trailing stop
-        if trade.highest_price_seen > trade.entry_price:
-            trail_pct = (
-                params.trailing_stop_after_scale_out_percent
-                if trade.scaled_out
-                else params.trailing_stop_percent
-            )
-            trail_price = trade.highest_price_seen * (1 - trail_pct / 100)
-            if opt_price <= trail_price:
-                _close_trade(trade, bar.timestamp, opt_price, "TRAILING_STOP", bar_slippage,
-                             exit_detail=f"Opt ${opt_price:.2f} <= trail ${trail_price:.2f} (peak ${trade.highest_price_seen:.2f}, {trail_pct:.0f}%)")
-                return
-
-    # End of day — force close at last bar
-    if trade.exit_time is None and bars_after:
-        last = bars_after[-1]
-        mtc = _minutes_to_close(last.timestamp)
-        eod_result = estimate_option_price_and_delta(last.close, trade.strike, mtc, vix, trade.direction)
-        last_price = max(eod_result.price, 0.01)
-        if params.spread_model_enabled:
-            exit_spread = estimate_spread_pct(eod_result.delta, mtc, vix, last_price, is_0dte=True)
-            eod_slippage = exit_spread / 2 * 100
-        else:
-            eod_slippage = params.exit_slippage_percent
-        _close_trade(trade, last.timestamp, last_price, "TIME_BASED", eod_slippage,
-                     exit_detail=f"EOD close (opt ${last_price:.2f})")
+
+def _simulate_trade(
+    trade: SimulatedTrade,
+    bars_after: list[BarData],
+    vix: float,
+    params: BacktestParams,
+    atr_at_entry: Optional[float] = None,
+) -> None:
+    """Apply exit rules to a trade (same priority as exit_engine.py).
+
+    Delegates to the event-indexed simulator, which finds each rule's first
+    trigger with array searches over the priced path. It is parity-tested
+    against the per-bar reference loop in tests/mocks/reference_engine.py.
+    """
+    from app.services.backtest.exit_simulator import simulate_exits
+
+    trade.highest_price_seen = trade.entry_price
+    simulate_exits(trade, bars_after, vix, params, _exit_levels(trade, params, atr_at_entry))
 
 
 # ── Main entry point ──────────────────────────────────────────────
@@ -968,12 +551,26 @@ def _simulate_trade(
 def run_backtest(
     params: BacktestParams,
     market_data: Optional[MarketDataCache] = None,
+    prune: Optional[Callable[[BacktestProgress], bool]] = None,
+    day_signals: Optional[dict] = None,
 ) -> BacktestResult:
+    """Backtest params over every day of market data (or freshly fetched data).
+
+    prune is called before each day after the first with the running totals;
+    returning True stops the backtest there and marks the result pruned. The
+    summary then covers only the days that ran.
+
+    day_signals memoizes each day's signals by (date, signal_params_key) for
+    runs over the same market data: a day already in it is not regenerated,
+    and a day generated here is added.
+    """
     logger.info(f"Starting backtest: {params.start_date} to {params.end_date}")
 
+    indicator_cache: Optional[IndicatorCache] = None
     if market_data is not None:
         bars_by_day = market_data.bars_by_day
         vix_by_day = market_data.vix_by_day
+        indicator_cache = market_data.indicator_cache
     else:
         if params.data_source == "csv":
             bars_by_day = load_csv_bars(params.start_date, params.end_date, params.bar_interval)
@@ -994,33 +591,47 @@ def run_backtest(
     prev_close: Optional[float] = None
     prev_high: Optional[float] = None
     prev_low: Optional[float] = None
+    trade_dates = sorted(bars_by_day.keys())
+    progress = BacktestProgress(days_done=0, days_total=len(trade_dates))
+
+    for day_idx, trade_date in enumerate(trade_dates):
+        progress.days_done = day_idx
+        if prune is not None and day_idx > 0 and prune(progress):
+            result.pruned = True
+            break
 
-    for trade_date in sorted(bars_by_day.keys()):
         day_bars = bars_by_day[trade_date]
         vix = vix_by_day.get(trade_date, default_vix)
 
         # VIX regime filter: skip entire day if VIX outside [vix_min, vix_max]
         if vix < params.vix_min or vix > params.vix_max:
             if day_bars:
-                prev_close = day_bars[-1].close
-                prev_high = max(b.high for b in day_bars)
-                prev_low = min(b.low for b in day_bars)
+                prev_close, prev_high, prev_low = day_extremes(day_bars)
             result.days.append(DailyResult(trade_date=trade_date))
             continue
 
         day_result = DailyResult(trade_date=trade_date)
 
-        confirm_day = confirm_bars_by_day.get(trade_date) if confirm_bars_by_day else None
-        signals = _generate_signals(
-            day_bars, params, prev_close=prev_close,
-            prev_high=prev_high, prev_low=prev_low,
-            confirm_bars=confirm_day,
-        )
+        signals_key = (trade_date, signal_params_key(params))
+        signals = day_signals.get(signals_key) if day_signals is not None else None
+        if signals is None:
+            confirm_day = confirm_bars_by_day.get(trade_date) if confirm_bars_by_day else None
+            signals = _generate_signals(
+                day_bars, params, prev_close=prev_close,
+                prev_high=prev_high, prev_low=prev_low,
+                confirm_bars=confirm_day,
+                indicator_cache=indicator_cache, cache_day=trade_date,
+            )
+            if day_signals is not None:
+                day_signals[signals_key] = signals
 
         # Precompute ATR for the day if enabled
         day_atr: list[Optional[float]] = [None] * len(day_bars)
         if params.atr_period > 0:
-            day_atr = _compute_atr(day_bars, params.atr_period)
+            day_atr = _compute_atr(
+                day_bars, params.atr_period,
+                indicator_cache=indicator_cache, cache_day=trade_date,
+            )
 
         daily_trades = 0
         daily_pnl = 0.0
@@ -1028,7 +639,7 @@ def run_backtest(
         last_exit_time: Optional[datetime] = None
 
         # Precompute sorted timestamps for bisect-based entry bar lookup
-        bar_timestamps = [b.timestamp for b in day_bars]
+        day_timestamps = bar_timestamps(day_bars)
 
         for signal in signals:
             # Limits
@@ -1096,7 +707,7 @@ def run_backtest(
                     max(limit_price * (1 + params.entry_slippage_percent / 100), 0.01), 2,
                 )
 
-            entry_idx = bisect.bisect_left(bar_timestamps, signal.timestamp)
+            entry_idx = bisect.bisect_left(day_timestamps, signal.timestamp)
             if entry_idx >= len(day_bars):
                 continue
             bars_after = day_bars[entry_idx + 1:]
@@ -1130,6 +741,7 @@ def run_backtest(
 
                 day_result.trades.append(trade)
                 result.trades.append(trade)
+                progress.add_trade(trade)
 
                 if (trade.pnl_dollars or 0) > 0:
                     day_result.winning_trades += 1
@@ -1140,12 +752,12 @@ def run_backtest(
 
         day_result.pnl = round(daily_pnl, 2)
         if day_bars:
-            prev_close = day_bars[-1].close
-            prev_high = max(b.high for b in day_bars)
-            prev_low = min(b.low for b in day_bars)
+            prev_close, prev_high, prev_low = day_extremes(day_bars)
         result.days.append(day_result)
 
     _compute_summary(result)
+    if result.pruned:
+        logger.info(f"Backtest pruned after {progress.days_done}/{progress.days_total} days")
     logger.info(
         f"Backtest complete: {result.total_trades} trades, "
         f"PnL=${result.total_pnl:.2f}, WR={result.win_rate:.1f}%"
@@ -0,0 +1,221 @@
+"""Event-indexed trade exit simulation for the backtester.
+
+Instead of stepping a trade bar by bar, simulate_exits() takes the trade's
+option-price path one priced chunk at a time (engine._price_path_chunks) and
+finds the first bar that triggers each exit rule with array searches: force
+exit time, ORB time stop, max hold, stop loss, profit target, and the
+trailing stop against a running max of the option price. The earliest
+trigger wins; triggers on the same bar are resolved in the P1-P5 priority
+order of the per-bar reference loop it is parity-tested against
+(tests/mocks/reference_engine.py).
+
+Rules whose inputs change mid-trade (the breakeven stop, the trailing
+percentage after a scale-out) split their mask at the bar where the state
+flips, and that state is carried from chunk to chunk. The spread model only
+runs for the exit bar.
+"""
+
+from typing import Optional, Sequence
+
+import numpy as np
+
+from app.services.backtest.day_bars import DayView, bar_column, bar_timestamps, datetime_to_minute
+from app.services.backtest.engine import (
+    BacktestParams,
+    ExitLevels,
+    SimulatedTrade,
+    _close_trade,
+    _price_path_chunks,
+)
+from app.services.backtest.market_data import BarData
+from app.services.backtest.signal_engine import _time_to_seconds
+from app.services.backtest.spread_model import estimate_spread_pct
+
+# Same-bar tie-break order
+_FORCE, _ORB_TIME, _MAX_HOLD, _STOP, _TARGET, _TRAIL = range(6)
+
+
+def _first(mask: np.ndarray) -> Optional[int]:
+    """Index of the first True, or None."""
+    i = int(mask.argmax())
+    return i if mask[i] else None
+
+
+def _clock(
+    chunk: Sequence[BarData],
+    entry_time,
+    entry_minute: Optional[int],
+) -> tuple[np.ndarray, np.ndarray]:
+    """(seconds since midnight, minutes since entry) for each bar."""
+    if isinstance(chunk, DayView) and entry_minute is not None:
+        return (chunk.ts % 1440) * 60.0, chunk.ts - entry_minute
+    stamps = bar_timestamps(chunk)
+    return (
+        np.array([_time_to_seconds(ts.time()) for ts in stamps], dtype=np.float64),
+        np.array([(ts - entry_time).total_seconds() / 60 for ts in stamps], dtype=np.float64),
+    )
+
+
+def _exit_slippage(params: BacktestParams, delta: float, mtc: float, vix: float, price: float) -> float:
+    if params.spread_model_enabled:
+        exit_spread = estimate_spread_pct(delta, mtc, vix, price, is_0dte=True)
+        return exit_spread / 2 * 100  # _close_trade expects a percentage
+    return params.exit_slippage_percent
+
+
+def simulate_exits(
+    trade: SimulatedTrade,
+    bars_after: Sequence[BarData],
+    vix: float,
+    params: BacktestParams,
+    levels: ExitLevels,
+) -> None:
+    """Close the trade at its first exit over bars_after (or at the last bar)."""
+    entry = trade.entry_price
+    use_orb = levels.use_orb_stops
+    stop_price = levels.stop_price
+    is_call = trade.direction == "CALL"
+
+    force_at = _time_to_seconds(params.force_exit_time)
+    orb_time_at = _time_to_seconds(params.orb_time_stop)
+    breakeven_at = (
+        entry * (1 + params.breakeven_trigger_percent / 100)
+        if not use_orb and params.breakeven_trigger_percent > 0 else None
+    )
+    can_scale = params.scale_out_enabled and trade.quantity >= 2
+    trail_keep = 1 - params.trailing_stop_percent / 100
+    trail_keep_scaled = 1 - params.trailing_stop_after_scale_out_percent / 100
+
+    entry_minute: Optional[int] = None
+    if isinstance(bars_after, DayView):
+        try:
+            entry_minute = datetime_to_minute(trade.entry_time)
+        except ValueError:
+            pass
+
+    last = None
+    chunks = _price_path_chunks(bars_after, trade.strike, vix, trade.direction, intrabar_worst=not use_orb)
+    for lo, mtc, prices, deltas, worst in chunks:
+        chunk = bars_after[lo:lo + len(prices)]
+        price = np.array(prices)
+        idx = np.arange(len(price))
+        highest = np.maximum.accumulate(np.maximum(price, trade.highest_price_seen))
+        tod, held = _clock(chunk, trade.entry_time, entry_minute)
+        if use_orb:
+            lows = np.array(bar_column(chunk, "low"))
+            highs = np.array(bar_column(chunk, "high"))
+
+        first = [None] * 6
+        first[_FORCE] = _first(tod >= force_at)
+        if use_orb:
+            first[_ORB_TIME] = _first(tod >= orb_time_at)
+        first[_MAX_HOLD] = _first(held >= params.max_hold_minutes)
+
+        # Breakeven moves the stop to entry after bar `breakeven`'s stop check
+        breakeven = None
+        if breakeven_at is not None and not trade.breakeven_stop_applied:
+            breakeven = _first(highest >= breakeven_at)
+
+        if use_orb:
+            if is_call:
+                first[_STOP] = _first(lows <= levels.spy_stop)
+                first[_TARGET] = _first(highs >= levels.spy_target)
+            else:
+                first[_STOP] = _first(highs >= levels.spy_stop)
+                first[_TARGET] = _first(lows <= levels.spy_target)
+        else:
+            worst_price = np.array(worst)
+            stop_hit = worst_price <= stop_price
+            if breakeven is not None:
+                stop_hit = np.where(idx <= breakeven, stop_hit, worst_price <= entry)
+            first[_STOP] = _first(stop_hit)
+
+        # Profit target: exits, or scales out once (no exit afterwards)
+        scale = None
+        if not use_orb and not trade.scaled_out:
+            gain_pct = (price - entry) / entry * 100 if entry > 0 else np.zeros(len(price))
+            hit = _first(gain_pct >= params.profit_target_percent)
+            if can_scale:
+                scale = hit
+            else:
+                first[_TARGET] = hit
+
+        # Trailing stop: tighter once scaled out (from the scale-out bar on)
+        keep = trail_keep_scaled if trade.scaled_out else trail_keep
+        if scale is not None:
+            keep = np.where(idx >= scale, trail_keep_scaled, trail_keep)
+        first[_TRAIL] = _first((highest > entry) & (price <= highest * keep))
+
+        hits = [(i, rule) for rule, i in enumerate(first) if i is not None]
+        if not hits:
+            trade.highest_price_seen = float(highest[-1])
+            if breakeven is not None:
+                trade.breakeven_stop_applied = True
+                stop_price = entry
+            if scale is not None:
+                _scale_out(trade, prices[scale])
+            last = (chunk, mtc, prices, deltas)
+            continue
+
+        e, rule = min(hits)
+        trade.highest_price_seen = float(highest[e])
+        # Same-bar state changes only happen if P1-P3 didn't exit first
+        if breakeven is not None and (breakeven < e or (breakeven == e and rule >= _TARGET)):
+            trade.breakeven_stop_applied = True
+            if breakeven < e:
+                stop_price = entry
+        if scale is not None and (scale < e or (scale == e and rule == _TRAIL)):
+            _scale_out(trade, prices[scale])
+
+        ts = bar_timestamps(chunk)[e]
+        opt_price = prices[e]
+        slippage = _exit_slippage(params, deltas[e], mtc[e], vix, opt_price)
+        if rule == _FORCE:
+            _close_trade(trade, ts, opt_price, "TIME_BASED", slippage,
+                         exit_detail=f"Force exit at {ts.strftime('%H:%M')} (opt ${opt_price:.2f})")
+        elif rule == _ORB_TIME:
+            _close_trade(trade, ts, opt_price, "ORB_TIME_STOP", slippage,
+                         exit_detail=f"ORB time stop at {ts.strftime('%H:%M')} (opt ${opt_price:.2f})")
+        elif rule == _MAX_HOLD:
+            _close_trade(trade, ts, opt_price, "MAX_HOLD_TIME", slippage,
+                         exit_detail=f"Held {float(held[e]):.0f}min (max {params.max_hold_minutes}min)")
+        elif rule == _STOP and use_orb:
+            level = float(lows[e]) if is_call else float(highs[e])
+            _close_trade(trade, ts, opt_price, "STOP_LOSS", slippage,
+                         exit_detail=f"Underlying ${level:.2f} hit ORB stop ${levels.spy_stop:.2f}")
+        elif rule == _STOP:
+            fill_price = worst[e]  # realistic fill at actual worst price, not ideal stop level
+            _close_trade(trade, ts, fill_price, "STOP_LOSS", slippage,
+                         exit_detail=f"Opt ${fill_price:.2f} <= stop ${stop_price:.2f} (-{params.stop_loss_percent:.0f}%)")
+        elif rule == _TARGET and use_orb:
+            level = float(highs[e]) if is_call else float(lows[e])
+            _close_trade(trade, ts, opt_price, "PROFIT_TARGET", slippage,
+                         exit_detail=f"Underlying ${level:.2f} hit ORB target ${levels.spy_target:.2f}")
+        elif rule == _TARGET:
+            gain_pct = (opt_price - entry) / entry * 100 if entry > 0 else 0
+            _close_trade(trade, ts, opt_price, "PROFIT_TARGET", slippage,
+                         exit_detail=f"Gain {gain_pct:.1f}% >= {params.profit_target_percent:.0f}% (opt ${opt_price:.2f})")
+        else:
+            trail_pct = (
+                params.trailing_stop_after_scale_out_percent
+                if trade.scaled_out
+                else params.trailing_stop_percent
+            )
+            trail_price = trade.highest_price_seen * (1 - trail_pct / 100)
+            _close_trade(trade, ts, opt_price, "TRAILING_STOP", slippage,
+                         exit_detail=f"Opt ${opt_price:.2f} <= trail ${trail_price:.2f} (peak ${trade.highest_price_seen:.2f}, {trail_pct:.0f}%)")
+        return
+
+    # End of day — force close at last bar
+    if last is not None:
+        chunk, mtc, prices, deltas = last
+        last_price = prices[-1]
+        _close_trade(trade, bar_timestamps(chunk)[-1], last_price, "TIME_BASED",
+                     _exit_slippage(params, deltas[-1], mtc[-1], vix, last_price),
+                     exit_detail=f"EOD close (opt ${last_price:.2f})")
+
+
+def _scale_out(trade: SimulatedTrade, price: float) -> None:
+    trade.scaled_out = True
+    trade.scaled_out_quantity = trade.quantity // 2
+    trade.scaled_out_price = price
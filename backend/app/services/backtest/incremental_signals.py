@@ -0,0 +1,552 @@
+"""Incremental (bar-at-a-time) signal engine for live strategy polling.
+
+The backtester evaluates a whole day at once. A live task instead sees the
+same day grow one bar per poll, so re-running _generate_signals on every poll
+recomputes every indicator from 9:30. IncrementalSignalEngine keeps running
+state per indicator (EMA, Wilder RSI/ATR, VWAP, Bollinger, MACD, volume SMA)
+and only advances it for bars it has not seen yet. Each bar costs the same
+amount of work however late in the day it arrives.
+
+update(bars) returns exactly what _generate_signals(bars, params, ...) would
+for the same bars (no entry confirmation), so live and backtest agree. The
+last bar is treated as still forming: it is evaluated without being committed
+and re-evaluated on the next call.
+
+The recurrences use the same floating-point operations as the signal engine
+so values match bar-for-bar, e.g. the EMA seed is the plain sum of the first `period`
+values and Bollinger bands re-sum their (bounded) window each bar.
+"""
+
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, time, timedelta
+from typing import Optional
+
+from app.services.backtest.engine import (
+    BacktestParams,
+    PivotLevels,
+    Signal,
+    compute_pivot_levels,
+)
+from app.services.backtest.market_data import BarData
+
+_ORB_TYPES = ("orb", "orb_direction")
+
+
+# ── Running indicators ────────────────────────────────────────────
+#
+# step(x, commit) returns the indicator value after x. With commit=False the
+# state is left untouched, which is how the forming bar is evaluated.
+
+
+class _EMA:
+    def __init__(self, period: int):
+        self.period = period
+        self.k = 2.0 / (period + 1)
+        self.count = 0
+        self.total = 0.0
+        self.value: Optional[float] = None
+
+    def step(self, x: float, commit: bool = True) -> Optional[float]:
+        count = self.count + 1
+        total = self.total
+        if count < self.period:
+            total += x
+            value = None
+        elif count == self.period:
+            total += x
+            value = total / self.period
+        else:
+            value = x * self.k + self.value * (1 - self.k)
+        if commit:
+            self.count, self.total, self.value = count, total, value
+        return value
+
+
+class _WilderRSI:
+    def __init__(self, period: int):
+        self.period = period
+        self.prev: Optional[float] = None
+        self.count = 0  # deltas seen
+        self.avg_gain = 0.0
+        self.avg_loss = 0.0
+
+    def step(self, close: float, commit: bool = True) -> Optional[float]:
+        if self.prev is None:
+            if commit:
+                self.prev = close
+            return None
+
+        delta = close - self.prev
+        gain, loss = max(delta, 0.0), max(-delta, 0.0)
+        count = self.count + 1
+        value = None
+        if count < self.period:
+            avg_gain, avg_loss = self.avg_gain + gain, self.avg_loss + loss
+        else:
+            if count == self.period:
+                avg_gain = (self.avg_gain + gain) / self.period
+                avg_loss = (self.avg_loss + loss) / self.period
+            else:
+                avg_gain = (self.avg_gain * (self.period - 1) + gain) / self.period
+                avg_loss = (self.avg_loss * (self.period - 1) + loss) / self.period
+            rs = avg_gain / avg_loss if avg_loss > 0 else 100
+            value = 100 - 100 / (1 + rs)
+        if commit:
+            self.prev, self.count = close, count
+            self.avg_gain, self.avg_loss = avg_gain, avg_loss
+        return value
+
+
+class _WilderATR:
+    def __init__(self, period: int):
+        self.period = period
+        self.prev_close: Optional[float] = None
+        self.count = 0  # true ranges seen
+        self.value = 0.0
+
+    def step(self, bar: BarData, commit: bool = True) -> Optional[float]:
+        if self.prev_close is None:
+            if commit:
+                self.prev_close = bar.close
+            return None
+
+        pc = self.prev_close
+        tr = max(bar.high - bar.low, abs(bar.high - pc), abs(bar.low - pc))
+        count = self.count + 1
+        if count < self.period:
+            value, result = self.value + tr, None
+        elif count == self.period:
+            value = result = (self.value + tr) / self.period
+        else:
+            value = result = (self.value * (self.period - 1) + tr) / self.period
+        if commit:
+            self.prev_close, self.count, self.value = bar.close, count, value
+        return result
+
+
+class _VWAP:
+    def __init__(self):
+        self.cum_tp_vol = 0.0
+        self.cum_vol = 0
+
+    def step(self, bar: BarData, commit: bool = True) -> Optional[float]:
+        tp = (bar.high + bar.low + bar.close) / 3.0
+        cum_tp_vol = self.cum_tp_vol + tp * bar.volume
+        cum_vol = self.cum_vol + bar.volume
+        if commit:
+            self.cum_tp_vol, self.cum_vol = cum_tp_vol, cum_vol
+        return cum_tp_vol / cum_vol if cum_vol > 0 else None
+
+
+class _Bollinger:
+    def __init__(self, period: int, std_mult: float):
+        self.period = period
+        self.std_mult = std_mult
+        self.window: deque[float] = deque(maxlen=max(period, 1))
+
+    def step(self, x: float, commit: bool = True) -> tuple[Optional[float], Optional[float]]:
+        """Returns (upper, lower)."""
+        window = list(self.window)
+        window.append(x)
+        if commit:
+            self.window.append(x)
+        if self.period <= 0 or len(window) < self.period:
+            return None, None
+
+        window = window[-self.period:]
+        m = sum(window) / self.period
+        std = (sum((v - m) ** 2 for v in window) / self.period) ** 0.5
+        return m + self.std_mult * std, m - self.std_mult * std
+
+
+class _MACD:
+    def __init__(self, fast: int, slow: int, signal: int):
+        self.fast = _EMA(fast)
+        self.slow = _EMA(slow)
+        self.signal = _EMA(signal)
+
+    def step(self, x: float, commit: bool = True) -> Optional[float]:
+        """Returns the histogram (MACD line - signal line)."""
+        f = self.fast.step(x, commit)
+        s = self.slow.step(x, commit)
+        if f is None or s is None:
+            return None
+        line = f - s
+        sig = self.signal.step(line, commit)
+        return line - sig if sig is not None else None
+
+
+class _VolumeSMA:
+    def __init__(self, period: int):
+        self.period = period
+        self.window: deque[int] = deque()
+        self.total = 0
+
+    def step(self, volume: int, commit: bool = True) -> Optional[float]:
+        total = self.total + volume
+        dropped = self.window[0] if len(self.window) == self.period else None
+        if dropped is not None:
+            total -= dropped
+        count = min(len(self.window) + 1, self.period)
+        if commit:
+            if dropped is not None:
+                self.window.popleft()
+            self.window.append(volume)
+            self.total = total
+        return total / self.period if count >= self.period else None
+
+
+# ── Engine ────────────────────────────────────────────────────────
+
+
+@dataclass
+class _Row:
+    """Indicator values at one bar — all the signal rules read."""
+    bar: BarData
+    ema_f: Optional[float] = None
+    ema_s: Optional[float] = None
+    vwap: Optional[float] = None
+    rsi: Optional[float] = None
+    bb_upper: Optional[float] = None
+    bb_lower: Optional[float] = None
+    macd_hist: Optional[float] = None
+    vol_sma: Optional[float] = None
+
+
+class IncrementalSignalEngine:
+    """Running signal state for one strategy on one ticker/timeframe/day."""
+
+    def __init__(
+        self,
+        params: BacktestParams,
+        prev_close: Optional[float] = None,
+        prev_high: Optional[float] = None,
+        prev_low: Optional[float] = None,
+    ):
+        self.params = params
+        self.prev_close = prev_close
+        self.pivots: Optional[PivotLevels] = None
+        if params.pivot_enabled and prev_high is not None and prev_low is not None and prev_close is not None:
+            self.pivots = compute_pivot_levels(prev_high, prev_low, prev_close)
+        self.min_bars = max(params.ema_slow + 1, 26)
+
+        self.windows = [(params.morning_window_start, params.morning_window_end)]
+        if params.afternoon_enabled:
+            self.windows.append((params.afternoon_window_start, params.afternoon_window_end))
+        orb_end_minutes = 30 + params.orb_minutes
+        self.orb_end_t = time(9 + orb_end_minutes // 60, orb_end_minutes % 60)
+        self.reset()
+
+    def reset(self) -> None:
+        p = self.params
+        st = p.signal_type
+        self.count = 0
+        self.last: Optional[_Row] = None
+        self.signals: list[Signal] = []
+        self.atr: Optional[float] = None
+
+        self._ema_f = _EMA(p.ema_fast)
+        self._ema_s = _EMA(p.ema_slow)
+        self._vwap = _VWAP()
+        self._rsi = None
+        if p.rsi_period > 0 or st == "confluence":
+            self._rsi = _WilderRSI(p.rsi_period if p.rsi_period > 0 else 9)
+        self._atr = _WilderATR(p.atr_period) if p.atr_period > 0 else None
+        self._bb = _Bollinger(p.bb_period, p.bb_std_mult) if st == "bb_squeeze" else None
+        self._macd = self._vol_sma = None
+        if st == "confluence":
+            self._macd = _MACD(p.macd_fast, p.macd_slow, p.macd_signal_period)
+            self._vol_sma = _VolumeSMA(p.vol_sma_period)
+
+        # Opening range, plus rows judged before it was complete
+        self._orb_end: Optional[datetime] = None
+        self._orb: Optional[tuple[float, float, float, float]] = None  # high, low, open, close
+        self._pre_orb: list[tuple[_Row, _Row]] = []
+
+    def update(self, bars: list[BarData]) -> list[Signal]:
+        """Advance over today's bars and return every signal so far.
+
+        `bars` is the full day (oldest first), last bar possibly still forming.
+        Bars already committed are skipped; if the list no longer extends what
+        was committed (new day, revised history) the state is rebuilt.
+        """
+        if not bars:
+            self.reset()
+            return []
+        if self.count > len(bars) - 1 or (self.last is not None and bars[self.count - 1].timestamp != self.last.bar.timestamp):
+            self.reset()
+
+        for bar in bars[self.count:-1]:
+            self._push(bar, commit=True)
+        forming = self._push(bars[-1], commit=False)
+
+        if self._pre_orb and bars[-1].timestamp >= self._orb_end:
+            # The opening range is final: re-judge bars that saw it partial
+            redone = [self._evaluate(row, prev) for row, prev in self._pre_orb]
+            self.signals = [s for s in redone if s] + [s for s in self.signals if s.timestamp >= self._orb_end]
+            self._pre_orb = []
+
+        if len(bars) < self.min_bars:
+            return []
+        return self.signals + ([forming] if forming else [])
+
+    def _push(self, bar: BarData, commit: bool) -> Optional[Signal]:
+        st = self.params.signal_type
+        row = _Row(bar=bar, vwap=self._vwap.step(bar, commit))
+        row.ema_f = self._ema_f.step(bar.close, commit)
+        row.ema_s = self._ema_s.step(bar.close, commit)
+        if self._rsi is not None:
+            row.rsi = self._rsi.step(bar.close, commit)
+        if self._bb is not None:
+            row.bb_upper, row.bb_lower = self._bb.step(bar.close, commit)
+        if self._macd is not None:
+            row.macd_hist = self._macd.step(bar.close, commit)
+            row.vol_sma = self._vol_sma.step(bar.volume, commit)
+        if self._atr is not None:
+            atr = self._atr.step(bar, commit)
+            if commit:
+                self.atr = atr
+
+        orb = self._orb
+        if st in _ORB_TYPES:
+            if self._orb_end is None:
+                open_time = bar.timestamp.replace(hour=9, minute=30, second=0)
+                self._orb_end = open_time + timedelta(minutes=self.params.orb_minutes)
+            if bar.timestamp < self._orb_end:
+                if orb is None:
+                    orb = (bar.high, bar.low, bar.open, bar.close)
+                else:
+                    orb = (max(orb[0], bar.high), min(orb[1], bar.low), orb[2], bar.close)
+
+        prev = self.last
+        if commit:
+            self._orb = orb
+            self.count += 1
+            self.last = row
+
+        if prev is None:
+            return None
+        signal = self._evaluate(row, prev, orb)
+        if commit:
+            if st in _ORB_TYPES and bar.timestamp < self._orb_end:
+                self._pre_orb.append((row, prev))
+            if signal:
+                self.signals.append(signal)
+        return signal
+
+    def _evaluate(self, row: _Row, prev: _Row, orb=None) -> Optional[Signal]:
+        """Apply params.signal_type's rules to one bar, as _generate_signals does for a day."""
+        p = self.params
+        st = p.signal_type
+        bar = row.bar
+        bt = bar.timestamp.time()
+        if orb is None:
+            orb = self._orb
+
+        if st == "vwap_reclaim":
+            if not (time(10, 30) <= bt <= time(12, 0)):
+                return None
+        elif st == "orb_direction":
+            if bt < self.orb_end_t or bt > p.orb_time_stop:
+                return None
+        elif not any(s <= bt <= e for s, e in self.windows):
+            return None
+
+        direction: Optional[str] = None
+        reason = ""
+        extra: dict = {}
+        vw = row.vwap
+
+        if st == "confluence":
+            call_factors: list[str] = []
+            put_factors: list[str] = []
+            if vw is not None:
+                if bar.close > vw:
+                    call_factors.append("VWAP")
+                elif bar.close < vw:
+                    put_factors.append("VWAP")
+            ema_up = ema_down = False
+            if row.ema_f is not None and row.ema_s is not None:
+                ema_up, ema_down = row.ema_f > row.ema_s, row.ema_f < row.ema_s
+                if ema_up:
+                    call_factors.append("EMA")
+                elif ema_down:
+                    put_factors.append("EMA")
+            if row.rsi is not None:
+                if row.rsi < p.rsi_ob:
+                    call_factors.append(f"RSI:{row.rsi:.0f}")
+                if row.rsi > p.rsi_os:
+                    put_factors.append(f"RSI:{row.rsi:.0f}")
+            if row.macd_hist is not None:
+                if row.macd_hist > 0:
+                    call_factors.append("MACD")
+                elif row.macd_hist < 0:
+                    put_factors.append("MACD")
+            rel_vol = None
+            if row.vol_sma is not None and row.vol_sma > 0:
+                rel_vol = bar.volume / row.vol_sma
+                if rel_vol >= p.vol_threshold:
+                    if ema_up:
+                        call_factors.append(f"Vol:{rel_vol:.1f}x")
+                    elif ema_down:
+                        put_factors.append(f"Vol:{rel_vol:.1f}x")
+            if bar.close > bar.open:
+                call_factors.append("Candle")
+            elif bar.close < bar.open:
+                put_factors.append("Candle")
+
+            pv = self.pivots
+            if pv is not None:
+                price = bar.close
+                near_s1, near_s2, near_r1, near_r2 = self._near_levels(price)
+                if near_s1 or near_s2:
+                    call_factors.append("Pivot:S1" if abs(price - pv.s1) < abs(price - pv.s2) else "Pivot:S2")
+                elif near_r1 or near_r2:
+                    put_factors.append("Pivot:R1" if abs(price - pv.r1) < abs(price - pv.r2) else "Pivot:R2")
+                elif price < pv.pivot:
+                    call_factors.append("Pivot:<P")
+                elif price > pv.pivot:
+                    put_factors.append("Pivot:>P")
+
+            max_score = 7 if pv is not None else 6
+            call_score, put_score = len(call_factors), len(put_factors)
+            bar_rel_vol = round(rel_vol, 2) if rel_vol is not None else None
+            if call_score >= p.min_confluence and call_score > put_score:
+                direction, score, factors = "CALL", call_score, call_factors
+            elif put_score >= p.min_confluence and put_score > call_score:
+                direction, score, factors = "PUT", put_score, put_factors
+            if direction:
+                reason = f"Confluence {score}/{max_score}: {', '.join(factors)}"
+                extra = {"confluence_score": score, "confluence_max_score": max_score, "rel_vol": bar_rel_vol}
+
+        elif st == "orb":
+            if orb is not None:
+                orb_high, orb_low = orb[0], orb[1]
+                if prev.bar.close <= orb_high and bar.close > orb_high:
+                    direction, reason = "CALL", f"ORB breakout above {orb_high:.2f}"
+                elif prev.bar.close >= orb_low and bar.close < orb_low:
+                    direction, reason = "PUT", f"ORB breakdown below {orb_low:.2f}"
+
+        elif st == "orb_direction":
+            if orb is not None:
+                orb_high, orb_low, orb_open, orb_close = orb
+                orb_rng = orb_high - orb_low
+                if orb_rng > 0:
+                    body_pct = abs(orb_close - orb_open) / orb_rng
+                    if body_pct >= p.orb_body_min_pct:
+                        orb_bullish = orb_close > orb_open
+                        orb_bearish = orb_close < orb_open
+
+                        vwap_ok = True
+                        if p.orb_vwap_filter and vw is not None:
+                            if (orb_bullish and orb_close < vw) or (orb_bearish and orb_close > vw):
+                                vwap_ok = False
+
+                        gap_ok = True
+                        if p.orb_gap_fade_filter and self.prev_close is not None:
+                            gap = orb_open - self.prev_close
+                            if (orb_bullish and gap > 0) or (orb_bearish and gap < 0):
+                                gap_ok = False
+
+                        if vwap_ok and gap_ok:
+                            if orb_bullish and prev.bar.close <= orb_high and bar.close > orb_high:
+                                direction = "CALL"
+                                reason = f"ORB-{p.orb_minutes} bullish breakout (body {body_pct:.0%})"
+                                extra = {"orb_range": orb_rng, "orb_entry_level": orb_high}
+                            elif orb_bearish and prev.bar.close >= orb_low and bar.close < orb_low:
+                                direction = "PUT"
+                                reason = f"ORB-{p.orb_minutes} bearish breakdown (body {body_pct:.0%})"
+                                extra = {"orb_range": orb_rng, "orb_entry_level": orb_low}
+
+        elif st == "vwap_reclaim":
+            if vw is not None and prev.vwap is not None:
+                bar_body = abs(bar.close - bar.open)
+                if bar_body >= 0.30:
+                    if prev.bar.close < prev.vwap and bar.close > vw:
+                        direction, reason = "CALL", f"VWAP reclaim bullish (body ${bar_body:.2f})"
+                    elif prev.bar.close > prev.vwap and bar.close < vw:
+                        direction, reason = "PUT", f"VWAP reclaim bearish (body ${bar_body:.2f})"
+
+        elif st == "vwap_rsi":
+            if vw is not None and row.rsi is not None:
+                if bar.close > vw and row.rsi <= p.rsi_os:
+                    direction, reason = "CALL", f"Above VWAP + RSI oversold ({row.rsi:.0f})"
+                elif bar.close < vw and row.rsi >= p.rsi_ob:
+                    direction, reason = "PUT", f"Below VWAP + RSI overbought ({row.rsi:.0f})"
+
+        elif st == "bb_squeeze":
+            if row.bb_upper is not None and row.bb_lower is not None and prev.bb_upper is not None:
+                width = row.bb_upper - row.bb_lower
+                prev_width = (prev.bb_upper or 0) - (prev.bb_lower or 0)
+                if width > prev_width:
+                    if bar.close > row.bb_upper:
+                        direction, reason = "CALL", "BB squeeze breakout above"
+                    elif bar.close < row.bb_lower:
+                        direction, reason = "PUT", "BB squeeze breakdown below"
+
+        elif st == "rsi_reversal":
+            if row.rsi is not None and prev.rsi is not None:
+                if prev.rsi < p.rsi_os and row.rsi >= p.rsi_os:
+                    direction, reason = "CALL", f"RSI crossed above {p.rsi_os:.0f}"
+                elif prev.rsi > p.rsi_ob and row.rsi <= p.rsi_ob:
+                    direction, reason = "PUT", f"RSI crossed below {p.rsi_ob:.0f}"
+
+        else:
+            # ema_cross, vwap_cross, ema_vwap
+            if any(v is None for v in (row.ema_f, prev.ema_f, row.ema_s, prev.ema_s)):
+                return None
+            ema_bull = prev.ema_f <= prev.ema_s and row.ema_f > row.ema_s
+            ema_bear = prev.ema_f >= prev.ema_s and row.ema_f < row.ema_s
+
+            if st == "ema_cross":
+                if ema_bull:
+                    direction, reason = "CALL", f"EMA {p.ema_fast}/{p.ema_slow} bullish cross"
+                elif ema_bear:
+                    direction, reason = "PUT", f"EMA {p.ema_fast}/{p.ema_slow} bearish cross"
+            elif st == "vwap_cross":
+                if vw is not None and prev.vwap is not None:
+                    if prev.bar.close <= prev.vwap and bar.close > vw:
+                        direction, reason = "CALL", "Price crossed above VWAP"
+                    elif prev.bar.close >= prev.vwap and bar.close < vw:
+                        direction, reason = "PUT", "Price crossed below VWAP"
+            elif st == "ema_vwap":
+                if ema_bull and vw is not None and bar.close > vw:
+                    direction, reason = "CALL", "EMA cross + above VWAP"
+                elif ema_bear and vw is not None and bar.close < vw:
+                    direction, reason = "PUT", "EMA cross + below VWAP"
+
+        if not direction:
+            return None
+
+        # RSI filter (the RSI-based strategies handle RSI themselves)
+        if p.rsi_period > 0 and row.rsi is not None and st not in ("vwap_rsi", "rsi_reversal", "confluence"):
+            if direction == "CALL" and row.rsi > p.rsi_ob:
+                return None
+            if direction == "PUT" and row.rsi < p.rsi_os:
+                return None
+
+        # Pivot S/R filter
+        if p.pivot_filter_enabled and self.pivots is not None:
+            near_s1, near_s2, near_r1, near_r2 = self._near_levels(bar.close)
+            if direction == "CALL" and (near_r1 or near_r2):
+                return None
+            if direction == "PUT" and (near_s1 or near_s2):
+                return None
+
+        return Signal(
+            timestamp=bar.timestamp,
+            direction=direction,
+            ticker_price=bar.close,
+            reason=reason,
+            **extra,
+        )
+
+    def _near_levels(self, price: float) -> tuple[bool, bool, bool, bool]:
+        """(near S1, near S2, near R1, near R2) within pivot_proximity_pct."""
+        pv = self.pivots
+        proximity = self.params.pivot_proximity_pct / 100.0
+        return tuple(
+            abs(price - level) / level < proximity if level != 0 else False
+            for level in (pv.s1, pv.s2, pv.r1, pv.r2)
+        )
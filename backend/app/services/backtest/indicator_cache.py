@@ -0,0 +1,92 @@
+"""Per-day indicator cache shared across optimizer combos.
+
+Optimizer combos draw from a small PARAM_SPACE (4 EMA fast periods, 3 RSI
+periods, ...), so the same EMA/RSI/BB/MACD series for a given day is needed
+by many combos. Entries are keyed by (day, indicator, period tuple), bounded
+by an approximate byte budget and evicted least-recently-used first.
+
+One cache belongs to one data set (ticker + bar interval): keys carry only the
+day, so never share an instance between MarketDataCache objects holding
+different bars for the same dates.
+"""
+
+import sys
+from collections import OrderedDict
+from dataclasses import fields, is_dataclass
+from typing import Any, Callable, Hashable
+
+import numpy as np
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def _freeze(value: Any) -> None:
+    """Mark cached arrays read-only so a caller can't corrupt other combos."""
+    if isinstance(value, np.ndarray):
+        value.flags.writeable = False
+    elif isinstance(value, tuple):
+        for v in value:
+            _freeze(v)
+    elif is_dataclass(value):
+        for f in fields(value):
+            _freeze(getattr(value, f.name))
+
+
+def _nbytes(value: Any) -> int:
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(_nbytes(v) for v in value)
+    if is_dataclass(value):
+        return sum(_nbytes(getattr(value, f.name)) for f in fields(value))
+    return sys.getsizeof(value)
+
+
+class IndicatorCache:
+    """LRU cache of per-day indicator series with hit/miss counters."""
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[Hashable, tuple[Any, int]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+        self.misses += 1
+        value = compute()
+        size = _nbytes(value)
+        if size > self.max_bytes:
+            return value  # never fits; don't flush everything else for it
+
+        _freeze(value)
+        self._entries[key] = (value, size)
+        self.current_bytes += size
+        while self.current_bytes > self.max_bytes:
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self.current_bytes -= evicted_size
+            self.evictions += 1
+        return value
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.current_bytes = 0
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "bytes": self.current_bytes,
+        }
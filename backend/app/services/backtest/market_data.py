@@ -2,6 +2,7 @@
 
 import logging
 import os
+from collections.abc import Mapping
 from dataclasses import dataclass
 from datetime import date, datetime, time, timedelta
 
@@ -87,7 +88,7 @@ def load_csv_bars(
     start_date: date,
     end_date: date,
     interval: str = "5m",
-) -> dict[date, list[BarData]]:
+) -> Mapping[date, list[BarData]]:
     """Load SPY bars from local CSV files (Schwab data, up to 6 months).
 
     CSV format: Date,Time,Timestamp,Open,High,Low,Close,Volume
@@ -101,6 +102,31 @@ def load_csv_bars(
         logger.warning(f"CSV not found: {csv_path}, falling back to yfinance")
         return fetch_spy_bars(start_date, end_date, interval)
 
+    bars_by_day = read_bar_csv(csv_path, start_date, end_date)
+
+    logger.info(
+        f"CSV SPY {interval}: {len(bars_by_day)} days, "
+        f"{count_bars(bars_by_day)} bars "
+        f"({start_date} to {end_date})"
+    )
+    return bars_by_day
+
+
+def read_bar_csv(csv_path: str, start_date: date, end_date: date) -> Mapping[date, list[BarData]]:
+    """Bars from a Schwab CSV grouped by trading day, sorted by timestamp.
+
+    Goes through the memory-mapped column store in bar_store.py, so the CSV
+    is parsed once per change and the result is a DayBars whose BarData rows
+    are only built when a caller iterates them. Falls back to row-by-row
+    parsing when the file can't be stored as epoch minutes.
+    """
+    from app.services.backtest.bar_store import open_bar_store
+
+    store = open_bar_store(csv_path)
+    if store is not None:
+        logger.info(f"Mapped {store.num_rows} rows from {csv_path}")
+        return store.between(start_date, end_date)
+
     df = pd.read_csv(csv_path, parse_dates=["Timestamp"])
     logger.info(f"Loaded {len(df)} rows from {csv_path}")
 
@@ -128,14 +154,15 @@ def load_csv_bars(
     for day in bars_by_day:
         bars_by_day[day].sort(key=lambda b: b.timestamp)
 
-    logger.info(
-        f"CSV SPY {interval}: {len(bars_by_day)} days, "
-        f"{sum(len(v) for v in bars_by_day.values())} bars "
-        f"({start_date} to {end_date})"
-    )
     return bars_by_day
 
 
+def count_bars(bars_by_day: Mapping[date, list[BarData]]) -> int:
+    if hasattr(bars_by_day, "num_bars"):
+        return bars_by_day.num_bars  # DayBars: no need to build rows just to log
+    return sum(len(v) for v in bars_by_day.values())
+
+
 def resample_bars(bars_by_day: dict[date, list[BarData]], target_minutes: int) -> dict[date, list[BarData]]:
     """Resample 1-minute bars into N-minute bars (2m, 3m, etc.)."""
     resampled: dict[date, list[BarData]] = {}
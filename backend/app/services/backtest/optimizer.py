@@ -1,26 +1,41 @@
 """Parameter optimizer for the backtest engine.
 
-Generates random parameter combinations, runs backtests with cached market data,
+Generates parameter combinations, runs backtests with cached market data,
 ranks results by a configurable target metric.
+
+Search strategies (OptimizationConfig.search_strategy):
+  random   — uniform random combos (the default)
+  tpe      — a TPE sampler (tpe_sampler.py) proposes each combo from the
+             results so far, after a random start-up batch
+  halving  — every random combo is screened on the most recent slice of the
+             train window; only the best are backtested on the full window
 """
 
+import heapq
 import logging
 import math
+import multiprocessing
 import os
 import random
 import time
-from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures import FIRST_COMPLETED, Executor, ProcessPoolExecutor, as_completed, wait
 from dataclasses import dataclass, field
 from datetime import date, time as dtime
-from typing import Literal, Optional
+from typing import Callable, Literal, Optional
 
 from app.services.backtest.engine import (
     BacktestParams,
+    BacktestProgress,
     BacktestResult,
+    SIGNAL_PARAM_FIELDS,
     MarketDataCache,
     run_backtest,
 )
-from app.services.backtest.market_data import fetch_spy_bars, fetch_vix_daily, load_csv_bars
+from app.services.backtest.day_bars import DayBars, as_day_bars
+from app.services.backtest.indicator_cache import IndicatorCache
+from app.services.backtest.market_data import count_bars, fetch_spy_bars, fetch_vix_daily, load_csv_bars
+from app.services.backtest.shared_bars import SharedBarsPublisher
+from app.services.backtest.tpe_sampler import TPESampler
 
 logger = logging.getLogger(__name__)
 
@@ -83,6 +98,24 @@ MIN_WIN_RATE = 35.0
 MIN_PROFIT_FACTOR = 0.8
 MAX_HOLD_EXIT_PCT = 40.0  # max % of exits that can be MAX_HOLD_TIME
 
+# PARAM_SPACE keys named differently from the BacktestParams field they set
+PARAM_FIELD_NAMES = {
+    "morning_start_min": "morning_window_start",
+    "morning_end_min": "morning_window_end",
+    "afternoon_start_min": "afternoon_window_start",
+    "afternoon_end_min": "afternoon_window_end",
+}
+
+# PARAM_SPACE keys that don't feed signal generation (engine.SIGNAL_PARAM_FIELDS):
+# combos that differ only in these share each day's signals
+EXIT_PARAM_KEYS = tuple(k for k in PARAM_SPACE if PARAM_FIELD_NAMES.get(k, k) not in SIGNAL_PARAM_FIELDS)
+
+# Early-abort pruning: after this fraction of the window a combo whose
+# projected score (even scaled up by PRUNE_SLACK) can't reach the current
+# top-N cutoff is stopped
+PRUNE_MIN_PROGRESS = 0.5
+PRUNE_SLACK = 1.5
+
 TargetMetric = Literal[
     "total_pnl",
     "profit_factor",
@@ -93,6 +126,12 @@ TargetMetric = Literal[
     "pro",
 ]
 
+SearchStrategy = Literal[
+    "random",   # uniform random sampling of PARAM_SPACE
+    "tpe",      # adaptive TPE sampling after a random start-up batch
+    "halving",  # screen combos on a short window, promote the best to the full window
+]
+
 
 # ── Data classes ──────────────────────────────────────────────────
 
@@ -111,6 +150,12 @@ class OptimizationConfig:
     data_source: str = "yfinance"  # "csv" or "yfinance"
     walk_forward: bool = True       # enable train/test split validation
     train_pct: float = 0.7          # fraction of days for training (0.7 = 70%)
+    indicator_cache_mb: int = 256   # per-worker indicator cache budget (0 = disabled)
+    search_strategy: str = "random"  # "random" | "tpe" | "halving"
+    halving_subset_pct: float = 0.25  # halving: fraction of train days in the screening round
+    halving_keep_pct: float = 0.2     # halving: fraction of screened combos promoted to the full window
+    prune_enabled: bool = True       # abort combos that can't reach the top-N part-way through
+    exit_variants: int = 4           # combos sampled per signal setup, differing only in exit params
 
 
 @dataclass
@@ -142,90 +187,142 @@ class OptimizationResult:
     train_end: Optional[date] = None
     test_start: Optional[date] = None
     test_end: Optional[date] = None
+    # Indicator cache counters, summed across workers
+    indicator_cache_hits: int = 0
+    indicator_cache_misses: int = 0
+    search_strategy: str = "random"
+    screening_backtests: int = 0  # halving: short-window backtests run before promotion
+    # Early-abort pruning
+    pruned_combos: int = 0
+    pruned_days_skipped: int = 0     # backtest days not run because of pruning
+    pruned_work_saved_pct: float = 0.0
 
 
 # ── Combination generation ────────────────────────────────────────
 
 
-def _generate_combinations(num_iterations: int) -> list[dict]:
-    combos: list[dict] = []
-    max_attempts = num_iterations * 15
+def _normalize_combo(combo: dict) -> Optional[dict]:
+    """Apply the parameter constraints to a raw combo.
 
+    Returns None if the combo is invalid; otherwise the combo with parameters
+    its strategy doesn't use normalized (mutated in place).
+    """
     # Strategies that don't use EMA crossovers (but confluence uses EMA as trend indicator)
     non_ema_strategies = {"orb", "bb_squeeze", "rsi_reversal", "orb_direction", "vwap_reclaim"}
 
+    # ema_fast must be < ema_slow (for EMA-based strategies and confluence)
+    if combo["signal_type"] not in non_ema_strategies:
+        if combo["ema_fast"] >= combo["ema_slow"]:
+            return None
+
+    # profit target should exceed stop loss (for non-ORB strategies)
+    if combo["signal_type"] != "orb_direction":
+        if combo["profit_target_percent"] <= combo["stop_loss_percent"]:
+            return None
+
+    # RSI strategies need rsi_period > 0
+    if combo["signal_type"] in ("vwap_rsi", "rsi_reversal") and combo["rsi_period"] == 0:
+        combo["rsi_period"] = random.choice([9, 14])
+
+    # Confluence always uses RSI internally (default 9 if not set)
+    if combo["signal_type"] == "confluence" and combo["rsi_period"] == 0:
+        combo["rsi_period"] = random.choice([9, 14])
+
+    # ATR stops: if atr_period is 0, atr_stop_mult doesn't matter
+    if combo["atr_period"] == 0:
+        combo["atr_stop_mult"] = 2.0  # doesn't matter, normalize
+
+    # Non-confluence strategies don't use confluence params
+    if combo["signal_type"] != "confluence":
+        combo["min_confluence"] = 5
+        combo["vol_threshold"] = 1.5
+
+    # Non-ORB-direction strategies: normalize ORB direction params
+    if combo["signal_type"] != "orb_direction":
+        combo["orb_body_min_pct"] = 0.0
+        combo["orb_vwap_filter"] = False
+        combo["orb_gap_fade_filter"] = False
+        combo["orb_stop_mult"] = 1.0
+        combo["orb_target_mult"] = 1.5
+
+    # MACD: fast must be < slow
+    if combo["macd_fast"] >= combo["macd_slow"]:
+        return None
+
+    # Normalize BB/MACD params for strategies that don't use them
+    if combo["signal_type"] not in ("bb_squeeze", "confluence"):
+        combo["bb_period"] = 20
+        combo["bb_std_mult"] = 2.0
+    if combo["signal_type"] != "confluence":
+        combo["macd_fast"] = 12
+        combo["macd_slow"] = 26
+        combo["macd_signal_period"] = 9
+
+    # VIX range: vix_min must be < vix_max
+    if combo["vix_min"] >= combo["vix_max"]:
+        return None
+
+    # Trading windows: start must be < end
+    if combo["morning_start_min"] >= combo["morning_end_min"]:
+        return None
+    if combo["afternoon_start_min"] >= combo["afternoon_end_min"]:
+        return None
+
+    # Normalize pivot params when disabled
+    if not combo.get("pivot_enabled", False):
+        combo["pivot_proximity_pct"] = 0.3
+        combo["pivot_filter_enabled"] = False
+
+    return combo
+
+
+def _generate_combinations(num_iterations: int, exit_variants: int = 1) -> list[dict]:
+    """Random valid combos. With exit_variants > 1, each sampled signal setup
+    also gets up to exit_variants - 1 siblings with re-drawn EXIT_PARAM_KEYS.
+    """
+    combos: list[dict] = []
+    max_attempts = num_iterations * 15
+
     for _ in range(max_attempts):
         if len(combos) >= num_iterations:
             break
 
-        combo = {k: random.choice(v) for k, v in PARAM_SPACE.items()}
-
-        # ema_fast must be < ema_slow (for EMA-based strategies and confluence)
-        if combo["signal_type"] not in non_ema_strategies:
-            if combo["ema_fast"] >= combo["ema_slow"]:
-                continue
-
-        # profit target should exceed stop loss (for non-ORB strategies)
-        if combo["signal_type"] != "orb_direction":
-            if combo["profit_target_percent"] <= combo["stop_loss_percent"]:
-                continue
-
-        # RSI strategies need rsi_period > 0
-        if combo["signal_type"] in ("vwap_rsi", "rsi_reversal") and combo["rsi_period"] == 0:
-            combo["rsi_period"] = random.choice([9, 14])
-
-        # Confluence always uses RSI internally (default 9 if not set)
-        if combo["signal_type"] == "confluence" and combo["rsi_period"] == 0:
-            combo["rsi_period"] = random.choice([9, 14])
-
-        # ATR stops: if atr_period is 0, atr_stop_mult doesn't matter
-        if combo["atr_period"] == 0:
-            combo["atr_stop_mult"] = 2.0  # doesn't matter, normalize
-
-        # Non-confluence strategies don't use confluence params
-        if combo["signal_type"] != "confluence":
-            combo["min_confluence"] = 5
-            combo["vol_threshold"] = 1.5
-
-        # Non-ORB-direction strategies: normalize ORB direction params
-        if combo["signal_type"] != "orb_direction":
-            combo["orb_body_min_pct"] = 0.0
-            combo["orb_vwap_filter"] = False
-            combo["orb_gap_fade_filter"] = False
-            combo["orb_stop_mult"] = 1.0
-            combo["orb_target_mult"] = 1.5
-
-        # MACD: fast must be < slow
-        if combo["macd_fast"] >= combo["macd_slow"]:
+        combo = _normalize_combo({k: random.choice(v) for k, v in PARAM_SPACE.items()})
+        if combo is None:
             continue
+        combos.append(combo)
 
-        # Normalize BB/MACD params for strategies that don't use them
-        if combo["signal_type"] not in ("bb_squeeze", "confluence"):
-            combo["bb_period"] = 20
-            combo["bb_std_mult"] = 2.0
-        if combo["signal_type"] != "confluence":
-            combo["macd_fast"] = 12
-            combo["macd_slow"] = 26
-            combo["macd_signal_period"] = 9
-
-        # VIX range: vix_min must be < vix_max
-        if combo["vix_min"] >= combo["vix_max"]:
-            continue
+        for _ in range(exit_variants - 1):
+            if len(combos) >= num_iterations:
+                break
+            exits = {k: random.choice(PARAM_SPACE[k]) for k in EXIT_PARAM_KEYS}
+            variant = _normalize_combo(dict(combo, **exits))
+            if variant is not None:
+                combos.append(variant)
 
-        # Trading windows: start must be < end
-        if combo["morning_start_min"] >= combo["morning_end_min"]:
-            continue
-        if combo["afternoon_start_min"] >= combo["afternoon_end_min"]:
-            continue
+    return combos
 
-        # Normalize pivot params when disabled
-        if not combo.get("pivot_enabled", False):
-            combo["pivot_proximity_pct"] = 0.3
-            combo["pivot_filter_enabled"] = False
 
-        combos.append(combo)
+def _combo_key(combo: dict) -> tuple:
+    return tuple(sorted(combo.items()))
+
+
+def _signal_group_key(combo: dict) -> tuple:
+    """Key shared by combos that generate the same signals."""
+    return tuple(sorted((k, v) for k, v in combo.items() if k not in EXIT_PARAM_KEYS))
 
-    return combos
+
+def _suggest_combo(sampler: TPESampler, seen: set, max_attempts: int = 50) -> Optional[dict]:
+    """Next valid, untested combo from the sampler (falls back to random draws)."""
+    for attempt in range(max_attempts):
+        raw = sampler.suggest() if attempt < max_attempts // 2 else {
+            k: random.choice(v) for k, v in PARAM_SPACE.items()
+        }
+        combo = _normalize_combo(raw)
+        if combo is not None and _combo_key(combo) not in seen:
+            seen.add(_combo_key(combo))
+            return combo
+    return None
 
 
 # ── Helpers ───────────────────────────────────────────────────────
@@ -238,15 +335,67 @@ def _minutes_to_time(m: int) -> dtime:
     return dtime(h, mn)
 
 
+def _combo_params(combo: dict, cfg: dict, start_date: date, end_date: date) -> BacktestParams:
+    """BacktestParams for a combo under the optimizer's fixed settings."""
+    return BacktestParams(
+        start_date=start_date,
+        end_date=end_date,
+        bar_interval=cfg["bar_interval"],
+        data_source=cfg["data_source"],
+        signal_type=combo["signal_type"],
+        ema_fast=combo["ema_fast"],
+        ema_slow=combo["ema_slow"],
+        stop_loss_percent=combo["stop_loss_percent"],
+        profit_target_percent=combo["profit_target_percent"],
+        trailing_stop_percent=combo["trailing_stop_percent"],
+        trailing_stop_after_scale_out_percent=combo.get("trailing_stop_after_scale_out_percent", 10.0),
+        delta_target=combo["delta_target"],
+        max_hold_minutes=combo["max_hold_minutes"],
+        rsi_period=combo.get("rsi_period", 0),
+        atr_period=combo.get("atr_period", 0),
+        atr_stop_mult=combo.get("atr_stop_mult", 2.0),
+        orb_minutes=combo.get("orb_minutes", 15),
+        min_confluence=combo.get("min_confluence", 5),
+        vol_threshold=combo.get("vol_threshold", 1.5),
+        bb_period=combo.get("bb_period", 20),
+        bb_std_mult=combo.get("bb_std_mult", 2.0),
+        macd_fast=combo.get("macd_fast", 12),
+        macd_slow=combo.get("macd_slow", 26),
+        macd_signal_period=combo.get("macd_signal_period", 9),
+        orb_body_min_pct=combo.get("orb_body_min_pct", 0.0),
+        orb_vwap_filter=combo.get("orb_vwap_filter", False),
+        orb_gap_fade_filter=combo.get("orb_gap_fade_filter", False),
+        orb_stop_mult=combo.get("orb_stop_mult", 1.0),
+        orb_target_mult=combo.get("orb_target_mult", 1.5),
+        vix_min=combo.get("vix_min", 0.0),
+        vix_max=combo.get("vix_max", 100.0),
+        spread_model_enabled=combo.get("spread_model_enabled", True),
+        entry_confirm_minutes=combo.get("entry_confirm_minutes", 0),
+        max_daily_trades=combo.get("max_daily_trades", 10),
+        max_daily_loss=combo.get("max_daily_loss", 2000.0),
+        max_consecutive_losses=combo.get("max_consecutive_losses", 3),
+        morning_window_start=_minutes_to_time(combo.get("morning_start_min", 15)),
+        morning_window_end=_minutes_to_time(combo.get("morning_end_min", 105)),
+        afternoon_window_start=_minutes_to_time(combo.get("afternoon_start_min", 195)),
+        afternoon_window_end=_minutes_to_time(combo.get("afternoon_end_min", 320)),
+        afternoon_enabled=cfg["afternoon_enabled"],
+        scale_out_enabled=cfg["scale_out_enabled"],
+        quantity=cfg["quantity"],
+        pivot_enabled=combo.get("pivot_enabled", False),
+        pivot_proximity_pct=combo.get("pivot_proximity_pct", 0.3),
+        pivot_filter_enabled=combo.get("pivot_filter_enabled", False),
+    )
+
+
 # ── Scoring ───────────────────────────────────────────────────────
 
 
-def _compute_score(result: BacktestResult, metric: str) -> float:
+def _compute_score(result: BacktestResult, metric: str, min_trades: int = MIN_TRADES) -> float:
     if result.total_trades == 0:
         return float("-inf")
 
     # ── Pre-score filters: reject unviable strategies early ──
-    if result.total_trades < MIN_TRADES:
+    if result.total_trades < min_trades:
         return float("-inf")
     if result.win_rate < MIN_WIN_RATE:
         return float("-inf")
@@ -303,72 +452,141 @@ def _compute_score(result: BacktestResult, metric: str) -> float:
     return float("-inf")
 
 
+def _projected_score(progress: BacktestProgress, params: BacktestParams, metric: str, min_trades: int) -> float:
+    """Score of a partial backtest, extrapolating its trade rate to the full window."""
+    scale = progress.days_total / max(progress.days_done, 1)
+    trades = progress.total_trades
+    projected = BacktestResult(
+        params=params,
+        total_pnl=progress.total_pnl * scale,
+        total_trades=round(trades * scale),
+        winning_trades=round(progress.winning_trades * scale),
+        win_rate=round(progress.winning_trades / trades * 100, 1) if trades else 0.0,
+        max_drawdown=progress.max_drawdown,
+        profit_factor=round(progress.gross_wins / progress.gross_losses, 2) if progress.gross_losses > 0 else 0,
+        exit_reasons={"MAX_HOLD_TIME": round(progress.max_hold_exits * scale)},
+    )
+    return _compute_score(projected, metric, min_trades)
+
+
+def _make_pruner(
+    params: BacktestParams,
+    metric: str,
+    min_trades: int,
+    cutoff: float,
+) -> Callable[[BacktestProgress], bool]:
+    """run_backtest prune callback for one combo against a leaderboard cutoff.
+
+    A combo is stopped as soon as it can't reach min_trades even at its daily
+    trade limit (its score is -inf regardless), and once PRUNE_MIN_PROGRESS of
+    the window has run if it has no trades yet or its projected score, scaled
+    optimistically by PRUNE_SLACK, is below the cutoff.
+    """
+    def prune(progress: BacktestProgress) -> bool:
+        days_left = progress.days_total - progress.days_done
+        if progress.total_trades + days_left * params.max_daily_trades < min_trades:
+            return True
+        if progress.days_done < progress.days_total * PRUNE_MIN_PROGRESS:
+            return False
+        if progress.total_trades == 0:
+            return True
+        if cutoff == float("-inf"):
+            return False
+        score = _projected_score(progress, params, metric, min_trades)
+        bound = score * PRUNE_SLACK if score > 0 else score / PRUNE_SLACK
+        return bound < cutoff
+
+    return prune
+
+
+class _Leaderboard:
+    """Top-N finite scores seen so far; publishes the N-th best as the prune cutoff."""
+
+    def __init__(self, top_n: int, cutoff=None):
+        self.top_n = top_n
+        self.cutoff = cutoff  # shared multiprocessing.Value read by the workers
+        self._scores: list[float] = []
+
+    def add(self, score: float) -> None:
+        if score == float("-inf"):
+            return
+        if len(self._scores) < self.top_n:
+            heapq.heappush(self._scores, score)
+        elif score > self._scores[0]:
+            heapq.heapreplace(self._scores, score)
+        else:
+            return
+        if self.cutoff is not None and len(self._scores) == self.top_n:
+            self.cutoff.value = self._scores[0]
+
+
 # ── Parallel worker ───────────────────────────────────────────────
 
 _worker_market_data: Optional[MarketDataCache] = None
 _worker_config_dict: Optional[dict] = None
+_worker_subsets: dict[tuple, MarketDataCache] = {}
+_worker_prune_cutoff = None  # shared multiprocessing.Value, updated by the parent
 
 
-def _init_worker(bars_by_day, vix_by_day, config_dict):
-    global _worker_market_data, _worker_config_dict
-    _worker_market_data = MarketDataCache(bars_by_day=bars_by_day, vix_by_day=vix_by_day)
+def _init_worker(bars_by_day, vix_by_day, config_dict, prune_cutoff=None):
+    global _worker_market_data, _worker_config_dict, _worker_prune_cutoff
+    cache_mb = config_dict.get("indicator_cache_mb", 0)
+    _worker_market_data = MarketDataCache(
+        bars_by_day=bars_by_day,
+        vix_by_day=vix_by_day,
+        indicator_cache=IndicatorCache(max_bytes=cache_mb * 1024 * 1024) if cache_mb > 0 else None,
+    )
     _worker_config_dict = config_dict
+    _worker_prune_cutoff = prune_cutoff
+    _worker_subsets.clear()
+
+
+def _worker_data(days: Optional[tuple]) -> MarketDataCache:
+    """The worker's market data, optionally restricted to some days (memoized)."""
+    if days is None:
+        return _worker_market_data
+    data = _worker_subsets.get(days)
+    if data is None:
+        bars = _worker_market_data.bars_by_day
+        vix = _worker_market_data.vix_by_day
+        data = MarketDataCache(
+            bars_by_day=bars.subset(days) if isinstance(bars, DayBars) else {d: bars[d] for d in days},
+            vix_by_day={d: vix[d] for d in days if d in vix},
+            # Indicators are computed per day, so subsets can share the cache
+            indicator_cache=_worker_market_data.indicator_cache,
+        )
+        _worker_subsets[days] = data
+    return data
+
+
+def _run_single_combo(
+    combo: dict,
+    days: Optional[tuple] = None,
+    min_trades: int = MIN_TRADES,
+    day_signals: Optional[dict] = None,
+) -> tuple:
+    """Worker: run one backtest, return (score, combo, summary_dict).
+
+    days restricts the backtest to a subset of the worker's days (halving
+    screening round), with min_trades scaled down to match. day_signals is
+    passed through to run_backtest to reuse signals across a signal group.
+    """
+    cfg = _worker_config_dict
+    params = _combo_params(combo, cfg, cfg["start_date"], cfg["end_date"])
 
+    market_data = _worker_data(days)
+    cache = market_data.indicator_cache
+    hits_before = cache.hits if cache else 0
+    misses_before = cache.misses if cache else 0
 
-def _run_single_combo(combo: dict) -> tuple:
-    """Worker: run one backtest, return (score, combo, summary_dict)."""
-    cfg = _worker_config_dict
-    params = BacktestParams(
-        start_date=cfg["start_date"],
-        end_date=cfg["end_date"],
-        bar_interval=cfg["bar_interval"],
-        data_source=cfg["data_source"],
-        signal_type=combo["signal_type"],
-        ema_fast=combo["ema_fast"],
-        ema_slow=combo["ema_slow"],
-        stop_loss_percent=combo["stop_loss_percent"],
-        profit_target_percent=combo["profit_target_percent"],
-        trailing_stop_percent=combo["trailing_stop_percent"],
-        trailing_stop_after_scale_out_percent=combo.get("trailing_stop_after_scale_out_percent", 10.0),
-        delta_target=combo["delta_target"],
-        max_hold_minutes=combo["max_hold_minutes"],
-        rsi_period=combo.get("rsi_period", 0),
-        atr_period=combo.get("atr_period", 0),
-        atr_stop_mult=combo.get("atr_stop_mult", 2.0),
-        orb_minutes=combo.get("orb_minutes", 15),
-        min_confluence=combo.get("min_confluence", 5),
-        vol_threshold=combo.get("vol_threshold", 1.5),
-        bb_period=combo.get("bb_period", 20),
-        bb_std_mult=combo.get("bb_std_mult", 2.0),
-        macd_fast=combo.get("macd_fast", 12),
-        macd_slow=combo.get("macd_slow", 26),
-        macd_signal_period=combo.get("macd_signal_period", 9),
-        orb_body_min_pct=combo.get("orb_body_min_pct", 0.0),
-        orb_vwap_filter=combo.get("orb_vwap_filter", False),
-        orb_gap_fade_filter=combo.get("orb_gap_fade_filter", False),
-        orb_stop_mult=combo.get("orb_stop_mult", 1.0),
-        orb_target_mult=combo.get("orb_target_mult", 1.5),
-        vix_min=combo.get("vix_min", 0.0),
-        vix_max=combo.get("vix_max", 100.0),
-        spread_model_enabled=combo.get("spread_model_enabled", True),
-        entry_confirm_minutes=combo.get("entry_confirm_minutes", 0),
-        max_daily_trades=combo.get("max_daily_trades", 10),
-        max_daily_loss=combo.get("max_daily_loss", 2000.0),
-        max_consecutive_losses=combo.get("max_consecutive_losses", 3),
-        morning_window_start=_minutes_to_time(combo.get("morning_start_min", 15)),
-        morning_window_end=_minutes_to_time(combo.get("morning_end_min", 105)),
-        afternoon_window_start=_minutes_to_time(combo.get("afternoon_start_min", 195)),
-        afternoon_window_end=_minutes_to_time(combo.get("afternoon_end_min", 320)),
-        afternoon_enabled=cfg["afternoon_enabled"],
-        scale_out_enabled=cfg["scale_out_enabled"],
-        quantity=cfg["quantity"],
-        pivot_enabled=combo.get("pivot_enabled", False),
-        pivot_proximity_pct=combo.get("pivot_proximity_pct", 0.3),
-        pivot_filter_enabled=combo.get("pivot_filter_enabled", False),
-    )
+    prune = None
+    if cfg.get("prune_enabled"):
+        cutoff = _worker_prune_cutoff.value if _worker_prune_cutoff is not None else float("-inf")
+        prune = _make_pruner(params, cfg["target_metric"], min_trades, cutoff)
 
-    result = run_backtest(params, market_data=_worker_market_data)
-    score = _compute_score(result, cfg["target_metric"])
+    result = run_backtest(params, market_data=market_data, prune=prune, day_signals=day_signals)
+    # A pruned combo's partial metrics aren't comparable with full runs
+    score = float("-inf") if result.pruned else _compute_score(result, cfg["target_metric"], min_trades)
     summary = {
         "total_pnl": result.total_pnl,
         "total_trades": result.total_trades,
@@ -377,10 +595,123 @@ def _run_single_combo(combo: dict) -> tuple:
         "max_drawdown": result.max_drawdown,
         "avg_hold_minutes": result.avg_hold_minutes,
         "exit_reasons": result.exit_reasons,
+        "cache_hits": (cache.hits - hits_before) if cache else 0,
+        "cache_misses": (cache.misses - misses_before) if cache else 0,
+        "pruned": result.pruned,
+        "days_run": len(result.days),
+        "days_total": len(market_data.bars_by_day),
     }
     return (score, combo, summary)
 
 
+def _run_combo_group(combos: list[dict], days: Optional[tuple] = None, min_trades: int = MIN_TRADES) -> list[tuple]:
+    """Worker: run combos that share a signal setup back to back. Each day's
+    signals are generated once for the group and only the trade simulation
+    runs per combo.
+    """
+    day_signals: dict = {}
+    return [_run_single_combo(combo, days, min_trades, day_signals) for combo in combos]
+
+
+# ── Search strategies ─────────────────────────────────────────────
+
+
+def _run_combos(
+    pool: Executor,
+    combos: list[dict],
+    days: Optional[tuple] = None,
+    min_trades: int = MIN_TRADES,
+    leaderboard: Optional[_Leaderboard] = None,
+) -> list[tuple[float, dict, dict]]:
+    """Run a fixed batch of combos in the pool, one task per signal group."""
+    groups: dict[tuple, list[dict]] = {}
+    for combo in combos:
+        groups.setdefault(_signal_group_key(combo), []).append(combo)
+
+    scored = []
+    futures = [pool.submit(_run_combo_group, group, days, min_trades) for group in groups.values()]
+    for future in as_completed(futures):
+        for result in future.result():
+            scored.append(result)
+            if leaderboard is not None:
+                leaderboard.add(result[0])
+            if len(scored) % 50 == 0:
+                logger.info(f"Optimizer: completed {len(scored)}/{len(combos)}")
+    return scored
+
+
+def _search_tpe(
+    pool: Executor,
+    num_iterations: int,
+    workers: int,
+    leaderboard: Optional[_Leaderboard] = None,
+) -> list[tuple[float, dict, dict]]:
+    """Adaptive search: each finished backtest updates the TPE sampler.
+
+    About two combos per worker stay in flight, so every suggestion after the
+    random start-up batch sees all but the last few results.
+    """
+    sampler = TPESampler(PARAM_SPACE, n_startup=max(10, num_iterations // 5))
+    seen: set = set()
+    scored: list[tuple[float, dict, dict]] = []
+    pending = set()
+    submitted = 0
+    exhausted = False
+
+    while pending or (submitted < num_iterations and not exhausted):
+        while not exhausted and submitted < num_iterations and len(pending) < 2 * workers:
+            combo = _suggest_combo(sampler, seen)
+            if combo is None:
+                exhausted = True
+                break
+            pending.add(pool.submit(_run_single_combo, combo))
+            submitted += 1
+        if not pending:
+            break
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            score, combo, summary = future.result()
+            sampler.observe(combo, score)
+            scored.append((score, combo, summary))
+            if leaderboard is not None:
+                leaderboard.add(score)
+            if len(scored) % 50 == 0:
+                logger.info(f"Optimizer: completed {len(scored)}/{num_iterations}")
+    return scored
+
+
+def _search_halving(
+    pool: Executor,
+    combos: list[dict],
+    train_days: list[date],
+    config: OptimizationConfig,
+    leaderboard: Optional[_Leaderboard] = None,
+) -> tuple[list[tuple[float, dict, dict]], int]:
+    """Successive halving: screen every combo on the most recent slice of the
+    train window, then rerun the best ones on the full window.
+
+    Returns (full-window results, number of screening backtests). Screening
+    scores aren't comparable with full-window ones, so only the full-window
+    round feeds the leaderboard.
+    """
+    frac = min(max(config.halving_subset_pct, 0.0), 1.0)
+    n_days = math.ceil(len(train_days) * frac)
+    keep = min(len(combos), max(config.top_n, math.ceil(len(combos) * config.halving_keep_pct)))
+    if n_days == 0 or n_days >= len(train_days) or keep >= len(combos):
+        return _run_combos(pool, combos, leaderboard=leaderboard), 0
+
+    screen_days = tuple(sorted(train_days)[-n_days:])
+    screen_min_trades = max(1, round(MIN_TRADES * n_days / len(train_days)))
+    screened = _run_combos(pool, combos, days=screen_days, min_trades=screen_min_trades)
+    screened.sort(key=lambda x: x[0], reverse=True)
+    survivors = [combo for _, combo, _ in screened[:keep]]
+    logger.info(
+        f"Optimizer: halving screened {len(combos)} combos on {n_days} days, "
+        f"promoting {len(survivors)} to the full {len(train_days)}-day window"
+    )
+    return _run_combos(pool, survivors, leaderboard=leaderboard), len(screened)
+
+
 # ── Main optimizer ────────────────────────────────────────────────
 
 
@@ -394,8 +725,12 @@ def _split_data(bars_by_day: dict, vix_by_day: dict, train_pct: float):
     train_dates = sorted_dates[:split_idx]
     test_dates = sorted_dates[split_idx:]
 
-    train_bars = {d: bars_by_day[d] for d in train_dates}
-    test_bars = {d: bars_by_day[d] for d in test_dates}
+    if isinstance(bars_by_day, DayBars):
+        train_bars = bars_by_day.subset(train_dates)
+        test_bars = bars_by_day.subset(test_dates)
+    else:
+        train_bars = {d: bars_by_day[d] for d in train_dates}
+        test_bars = {d: bars_by_day[d] for d in test_dates}
     train_vix = {d: vix_by_day[d] for d in train_dates if d in vix_by_day}
     test_vix = {d: vix_by_day[d] for d in test_dates if d in vix_by_day}
 
@@ -413,54 +748,7 @@ def _run_oos_backtest(combo: dict, config_dict: dict, test_bars: dict, test_vix:
     if not test_dates:
         return {"total_pnl": 0, "total_trades": 0, "win_rate": 0, "profit_factor": 0, "score": 0}
 
-    params = BacktestParams(
-        start_date=test_dates[0],
-        end_date=test_dates[-1],
-        bar_interval=config_dict["bar_interval"],
-        data_source=config_dict["data_source"],
-        signal_type=combo["signal_type"],
-        ema_fast=combo["ema_fast"],
-        ema_slow=combo["ema_slow"],
-        stop_loss_percent=combo["stop_loss_percent"],
-        profit_target_percent=combo["profit_target_percent"],
-        trailing_stop_percent=combo["trailing_stop_percent"],
-        trailing_stop_after_scale_out_percent=combo.get("trailing_stop_after_scale_out_percent", 10.0),
-        delta_target=combo["delta_target"],
-        max_hold_minutes=combo["max_hold_minutes"],
-        rsi_period=combo.get("rsi_period", 0),
-        atr_period=combo.get("atr_period", 0),
-        atr_stop_mult=combo.get("atr_stop_mult", 2.0),
-        orb_minutes=combo.get("orb_minutes", 15),
-        min_confluence=combo.get("min_confluence", 5),
-        vol_threshold=combo.get("vol_threshold", 1.5),
-        bb_period=combo.get("bb_period", 20),
-        bb_std_mult=combo.get("bb_std_mult", 2.0),
-        macd_fast=combo.get("macd_fast", 12),
-        macd_slow=combo.get("macd_slow", 26),
-        macd_signal_period=combo.get("macd_signal_period", 9),
-        orb_body_min_pct=combo.get("orb_body_min_pct", 0.0),
-        orb_vwap_filter=combo.get("orb_vwap_filter", False),
-        orb_gap_fade_filter=combo.get("orb_gap_fade_filter", False),
-        orb_stop_mult=combo.get("orb_stop_mult", 1.0),
-        orb_target_mult=combo.get("orb_target_mult", 1.5),
-        vix_min=combo.get("vix_min", 0.0),
-        vix_max=combo.get("vix_max", 100.0),
-        spread_model_enabled=combo.get("spread_model_enabled", True),
-        entry_confirm_minutes=combo.get("entry_confirm_minutes", 0),
-        max_daily_trades=combo.get("max_daily_trades", 10),
-        max_daily_loss=combo.get("max_daily_loss", 2000.0),
-        max_consecutive_losses=combo.get("max_consecutive_losses", 3),
-        morning_window_start=_minutes_to_time(combo.get("morning_start_min", 15)),
-        morning_window_end=_minutes_to_time(combo.get("morning_end_min", 105)),
-        afternoon_window_start=_minutes_to_time(combo.get("afternoon_start_min", 195)),
-        afternoon_window_end=_minutes_to_time(combo.get("afternoon_end_min", 320)),
-        afternoon_enabled=config_dict["afternoon_enabled"],
-        scale_out_enabled=config_dict["scale_out_enabled"],
-        quantity=config_dict["quantity"],
-        pivot_enabled=combo.get("pivot_enabled", False),
-        pivot_proximity_pct=combo.get("pivot_proximity_pct", 0.3),
-        pivot_filter_enabled=combo.get("pivot_filter_enabled", False),
-    )
+    params = _combo_params(combo, config_dict, test_dates[0], test_dates[-1])
 
     cache = MarketDataCache(bars_by_day=test_bars, vix_by_day=test_vix)
     result = run_backtest(params, market_data=cache)
@@ -484,6 +772,8 @@ def run_optimization(config: OptimizationConfig) -> OptimizationResult:
         all_bars = load_csv_bars(config.start_date, config.end_date, config.bar_interval)
     else:
         all_bars = fetch_spy_bars(config.start_date, config.end_date, config.bar_interval)
+    # Array-backed bars are far cheaper to pickle into every worker
+    all_bars = as_day_bars(all_bars)
     all_vix = fetch_vix_daily(config.start_date, config.end_date)
 
     # Walk-forward: split into train/test
@@ -505,11 +795,20 @@ def run_optimization(config: OptimizationConfig) -> OptimizationResult:
         train_bars = all_bars
         train_vix = all_vix
 
-    logger.info(f"Optimizer: {len(train_bars)} train days, {sum(len(v) for v in train_bars.values())} bars loaded")
+    logger.info(f"Optimizer: {len(train_bars)} train days, {count_bars(train_bars)} bars loaded")
 
-    # Generate combos
-    combos = _generate_combinations(config.num_iterations)
-    logger.info(f"Optimizer: testing {len(combos)} parameter combinations")
+    # Generate combos (TPE suggests its own as results come in)
+    if config.search_strategy not in ("random", "tpe", "halving"):
+        raise ValueError(f"Unknown search strategy: {config.search_strategy}")
+    combos = (
+        [] if config.search_strategy == "tpe"
+        else _generate_combinations(config.num_iterations, config.exit_variants)
+    )
+    logger.info(
+        f"Optimizer: testing {len(combos) or config.num_iterations} parameter combinations "
+        f"(search={config.search_strategy}, "
+        f"{len({_signal_group_key(c) for c in combos}) or config.num_iterations} signal setups)"
+    )
 
     config_dict = {
         "start_date": config.start_date,
@@ -520,23 +819,50 @@ def run_optimization(config: OptimizationConfig) -> OptimizationResult:
         "scale_out_enabled": config.scale_out_enabled,
         "quantity": config.quantity,
         "target_metric": config.target_metric,
+        "indicator_cache_mb": config.indicator_cache_mb,
+        "prune_enabled": config.prune_enabled,
     }
 
     # Run backtests in parallel on TRAIN data
-    workers = min(os.cpu_count() or 4, len(combos))
-    scored: list[tuple[float, dict, dict]] = []
-
-    with ProcessPoolExecutor(
+    workers = max(1, min(os.cpu_count() or 4, len(combos) or config.num_iterations))
+    screening_backtests = 0
+    # Workers read the current top-N cutoff from shared memory to prune against
+    prune_cutoff = multiprocessing.Value("d", float("-inf"), lock=False)
+    leaderboard = _Leaderboard(config.top_n, prune_cutoff)
+
+    # Workers attach to one shared copy of the bars instead of unpickling their own
+    with SharedBarsPublisher() as publisher, ProcessPoolExecutor(
         max_workers=workers,
         initializer=_init_worker,
-        initargs=(train_bars, train_vix, config_dict),
+        initargs=(publisher.publish(train_bars), train_vix, config_dict, prune_cutoff),
     ) as pool:
-        futures = {pool.submit(_run_single_combo, combo): combo for combo in combos}
-        for i, future in enumerate(as_completed(futures)):
-            result = future.result()
-            scored.append(result)
-            if (i + 1) % 50 == 0:
-                logger.info(f"Optimizer: completed {i + 1}/{len(combos)}")
+        if config.search_strategy == "tpe":
+            scored = _search_tpe(pool, config.num_iterations, workers, leaderboard)
+        elif config.search_strategy == "halving":
+            scored, screening_backtests = _search_halving(
+                pool, combos, list(train_bars.keys()), config, leaderboard,
+            )
+        else:
+            scored = _run_combos(pool, combos, leaderboard=leaderboard)
+
+    # Screening-round cache traffic isn't counted (its results are discarded)
+    cache_hits = sum(s.get("cache_hits", 0) for _, _, s in scored)
+    cache_misses = sum(s.get("cache_misses", 0) for _, _, s in scored)
+    if cache_hits + cache_misses:
+        logger.info(
+            f"Optimizer: indicator cache {cache_hits} hits / {cache_misses} misses "
+            f"({cache_hits / (cache_hits + cache_misses) * 100:.1f}% hit rate)"
+        )
+
+    pruned = [s for _, _, s in scored if s.get("pruned")]
+    days_skipped = sum(s["days_total"] - s["days_run"] for s in pruned)
+    days_total = sum(s.get("days_total", 0) for _, _, s in scored)
+    work_saved_pct = round(days_skipped / days_total * 100, 1) if days_total else 0.0
+    if pruned:
+        logger.info(
+            f"Optimizer: pruned {len(pruned)}/{len(scored)} combos early, "
+            f"skipping {days_skipped} backtest days ({work_saved_pct}% of the work)"
+        )
 
     # Rank by in-sample score and take top N
     scored.sort(key=lambda x: x[0], reverse=True)
@@ -569,16 +895,27 @@ def run_optimization(config: OptimizationConfig) -> OptimizationResult:
         entries.append(entry)
 
     elapsed = round(time.time() - t0, 1)
-    logger.info(f"Optimizer: {len(combos)} combos in {elapsed}s ({workers} workers). Best score={entries[0].score if entries else 0}")
+    tested = len(combos) if config.search_strategy == "halving" else len(scored)
+    logger.info(
+        f"Optimizer: {tested} combos in {elapsed}s ({workers} workers, "
+        f"{screening_backtests} screening backtests). Best score={entries[0].score if entries else 0}"
+    )
     if config.walk_forward and entries and entries[0].oos_score is not None:
         logger.info(f"Optimizer: best OOS score={entries[0].oos_score}, OOS PnL=${entries[0].oos_total_pnl}")
 
     return OptimizationResult(
-        total_combinations_tested=len(combos),
+        total_combinations_tested=tested,
         elapsed_seconds=elapsed,
         results=entries,
         train_start=train_start,
         train_end=train_end,
         test_start=test_start,
         test_end=test_end,
+        indicator_cache_hits=cache_hits,
+        indicator_cache_misses=cache_misses,
+        search_strategy=config.search_strategy,
+        screening_backtests=screening_backtests,
+        pruned_combos=len(pruned),
+        pruned_days_skipped=days_skipped,
+        pruned_work_saved_pct=work_saved_pct,
     )
@@ -0,0 +1,125 @@
+"""Publish DayBars to worker processes through multiprocessing.shared_memory.
+
+The parent copies each data set's columns into one shared block; what it
+hands to ProcessPoolExecutor (initargs or task tuples) is a DayBars that
+pickles as the block's name and shape. Workers attach by name on unpickle and
+build their DayBars as read-only views of the block, so worker start-up cost
+and resident memory don't grow with the bar count or the worker count.
+
+    with SharedBarsPublisher() as publisher:
+        shared = publisher.publish(bars_by_day)
+        with ProcessPoolExecutor(initializer=_init, initargs=(shared,)) as pool:
+            ...
+"""
+
+import logging
+from collections.abc import Mapping
+from dataclasses import dataclass
+from datetime import date
+from multiprocessing import shared_memory
+from typing import Sequence
+
+import numpy as np
+
+from app.services.backtest.day_bars import DayBars, as_day_bars
+from app.services.backtest.market_data import BarData
+
+logger = logging.getLogger(__name__)
+
+_ITEM = 8  # every DayBars column is 8 bytes wide
+
+# Attachments made by this process, by block name. Kept for the life of the
+# process: the DayBars views point into the mapping.
+_attached: dict[str, tuple[shared_memory.SharedMemory, DayBars]] = {}
+
+
+@dataclass(frozen=True)
+class SharedBarsHandle:
+    """Everything a worker needs to find and view a published block."""
+    name: str
+    num_rows: int
+    num_days: int
+
+    def _views(self, buf) -> DayBars:
+        n, d = self.num_rows, self.num_days
+        layout = [
+            (np.int64, n), (np.float64, n), (np.float64, n), (np.float64, n),
+            (np.float64, n), (np.int64, n), (np.int64, d), (np.int64, d + 1),
+        ]
+        arrays = []
+        offset = 0
+        for dtype, count in layout:
+            arrays.append(np.ndarray((count,), dtype=dtype, buffer=buf, offset=offset))
+            offset += count * _ITEM
+        return DayBars(*arrays)
+
+
+def _block_size(num_rows: int, num_days: int) -> int:
+    # 6 row columns + day_ordinals + day_offsets; shared blocks can't be empty
+    return max((6 * num_rows + 2 * num_days + 1) * _ITEM, 1)
+
+
+def attach_shared_bars(handle: SharedBarsHandle) -> DayBars:
+    """Worker side: map a published block (once per process) as a read-only DayBars."""
+    entry = _attached.get(handle.name)
+    if entry is None:
+        shm = shared_memory.SharedMemory(name=handle.name)
+        views = handle._views(shm.buf).arrays()
+        for arr in views:
+            arr.flags.writeable = False
+        bars = DayBars(*views, reducer=(attach_shared_bars, (handle,)))
+        entry = _attached[handle.name] = (shm, bars)
+    return entry[1]
+
+
+class SharedBarsPublisher:
+    """Owns the shared blocks for one optimizer run; unlinks them on close."""
+
+    def __init__(self):
+        self._blocks: list[shared_memory.SharedMemory] = []
+
+    def __enter__(self) -> "SharedBarsPublisher":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    @property
+    def nbytes(self) -> int:
+        return sum(shm.size for shm in self._blocks)
+
+    def publish(self, bars_by_day: Mapping[date, Sequence[BarData]]) -> Mapping[date, Sequence[BarData]]:
+        """Copy bars into a new shared block.
+
+        Returns a DayBars with the same contents that pickles as a handle to
+        the block. Bars that can't be packed into a DayBars (sub-minute
+        timestamps) are returned unchanged and pickle the usual way.
+        """
+        bars = as_day_bars(bars_by_day)
+        if not isinstance(bars, DayBars):
+            return bars_by_day
+
+        num_rows, num_days = len(bars.ts), len(bars.day_ordinals)
+        shm = shared_memory.SharedMemory(create=True, size=_block_size(num_rows, num_days))
+        self._blocks.append(shm)
+        handle = SharedBarsHandle(name=shm.name, num_rows=num_rows, num_days=num_days)
+
+        # Fill through temporary views, then drop them so close() can unmap.
+        target = handle._views(shm.buf)
+        for dst, src in zip(target.arrays(), bars.arrays()):
+            dst[:] = src
+        del target, dst
+
+        # The parent keeps using its own arrays; only pickling goes via the block.
+        published = DayBars(*bars.arrays(), reducer=(attach_shared_bars, (handle,)))
+        logger.info(f"Shared bars: published {len(published)} days / {published.num_bars} bars as {shm.name}")
+        return published
+
+    def close(self) -> None:
+        for shm in self._blocks:
+            shm.close()
+            try:
+                shm.unlink()
+            except FileNotFoundError:
+                pass
+        self._blocks.clear()
@@ -0,0 +1,523 @@
+"""Columnar (NumPy) signal engine for the backtester.
+
+Implements the 10 signal rules on a day's OHLCV held as NumPy arrays and is
+parity-tested against the per-bar reference loop in
+tests/mocks/reference_engine.py. Every indicator is computed once for the
+whole day and each signal type is evaluated as a set of boolean masks. Only the bars that actually fire are turned back into Signal
+objects, so the per-bar Python work is proportional to the number of signals
+rather than the number of bars.
+
+The recursive indicators (EMA, Wilder RSI/ATR) keep a scalar recurrence
+because each value depends on the previous one; they use the exact same
+floating-point operations as the reference loop's list versions so signals
+match bar-for-bar.
+"""
+
+from dataclasses import dataclass
+from datetime import date, datetime, time
+from typing import Any, Callable, Optional, Sequence
+
+import numpy as np
+
+from app.services.backtest.day_bars import DayView
+from app.services.backtest.engine import (
+    BacktestParams,
+    PivotLevels,
+    Signal,
+    _apply_entry_confirmation,
+    compute_pivot_levels,
+)
+from app.services.backtest.indicator_cache import IndicatorCache
+from app.services.backtest.market_data import BarData
+
+
+def _time_to_seconds(t: time) -> float:
+    return t.hour * 3600 + t.minute * 60 + t.second + t.microsecond / 1e6
+
+
+# ── Day arrays ────────────────────────────────────────────────────
+
+
+@dataclass
+class OHLCVArrays:
+    """One trading day of bars as parallel NumPy columns."""
+    timestamps: Sequence[datetime]  # ET-aware, only touched for fired bars
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray   # int64
+    tod: np.ndarray      # ET wall-clock seconds after midnight
+
+    @classmethod
+    def from_bars(cls, bars: Sequence[BarData]) -> "OHLCVArrays":
+        if isinstance(bars, DayView):
+            # Already columnar: share the arrays, timestamps stay lazy
+            return cls(
+                timestamps=bars.timestamps,
+                open=bars.open,
+                high=bars.high,
+                low=bars.low,
+                close=bars.close,
+                volume=bars.volume,
+                tod=(bars.ts % 1440) * 60.0,
+            )
+        timestamps = [b.timestamp for b in bars]
+        return cls(
+            timestamps=timestamps,
+            open=np.array([b.open for b in bars], dtype=np.float64),
+            high=np.array([b.high for b in bars], dtype=np.float64),
+            low=np.array([b.low for b in bars], dtype=np.float64),
+            close=np.array([b.close for b in bars], dtype=np.float64),
+            volume=np.array([b.volume for b in bars], dtype=np.int64),
+            tod=np.array([_time_to_seconds(ts.time()) for ts in timestamps], dtype=np.float64),
+        )
+
+    def __len__(self) -> int:
+        return len(self.close)
+
+
+# ── Indicators (NaN = not enough history yet) ─────────────────────
+
+
+def ema(values: np.ndarray, period: int) -> np.ndarray:
+    n = len(values)
+    out = np.full(n, np.nan)
+    if n < period:
+        return out
+
+    vals = values.tolist()
+    prev = sum(vals[:period]) / period
+    series = [prev]
+    k = 2.0 / (period + 1)
+    for v in vals[period:]:
+        prev = v * k + prev * (1 - k)
+        series.append(prev)
+    out[period - 1:] = series
+    return out
+
+
+def rsi(closes: np.ndarray, period: int) -> np.ndarray:
+    """Wilder's RSI."""
+    n = len(closes)
+    out = np.full(n, np.nan)
+    if n < period + 1:
+        return out
+
+    deltas = np.diff(closes)
+    gains = np.maximum(deltas, 0.0).tolist()
+    losses = np.maximum(-deltas, 0.0).tolist()
+
+    avg_gain = sum(gains[:period]) / period
+    avg_loss = sum(losses[:period]) / period
+    rs = avg_gain / avg_loss if avg_loss > 0 else 100
+    series = [100 - 100 / (1 + rs)]
+
+    for g, l in zip(gains[period:], losses[period:]):
+        avg_gain = (avg_gain * (period - 1) + g) / period
+        avg_loss = (avg_loss * (period - 1) + l) / period
+        rs = avg_gain / avg_loss if avg_loss > 0 else 100
+        series.append(100 - 100 / (1 + rs))
+
+    out[period:] = series
+    return out
+
+
+def atr(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int) -> np.ndarray:
+    """Average True Range (Wilder smoothing)."""
+    n = len(close)
+    out = np.full(n, np.nan)
+    if n < period + 1:
+        return out
+
+    prev_close = close[:-1]
+    trs = np.maximum.reduce([
+        high[1:] - low[1:],
+        np.abs(high[1:] - prev_close),
+        np.abs(low[1:] - prev_close),
+    ]).tolist()
+
+    value = sum(trs[:period]) / period
+    series = [value]
+    for tr in trs[period:]:
+        value = (value * (period - 1) + tr) / period
+        series.append(value)
+
+    out[period:] = series
+    return out
+
+
+def vwap(high: np.ndarray, low: np.ndarray, close: np.ndarray, volume: np.ndarray) -> np.ndarray:
+    tp = (high + low + close) / 3.0
+    cum_tp_vol = np.cumsum(tp * volume)
+    cum_vol = np.cumsum(volume)
+    out = np.full(len(close), np.nan)
+    np.divide(cum_tp_vol, cum_vol, out=out, where=cum_vol > 0)
+    return out
+
+
+def bollinger(
+    closes: np.ndarray,
+    period: int = 20,
+    std_mult: float = 2.0,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Returns (upper, lower, mid) bands."""
+    n = len(closes)
+    upper = np.full(n, np.nan)
+    lower = np.full(n, np.nan)
+    mid = np.full(n, np.nan)
+    if period <= 0 or n < period:
+        return upper, lower, mid
+
+    # Sum window columns left to right so each row is accumulated in the
+    # same order as the scalar sum() in the reference _compute_bollinger.
+    windows = np.lib.stride_tricks.sliding_window_view(closes, period)
+    total = windows[:, 0].copy()
+    for j in range(1, period):
+        total += windows[:, j]
+    m = total / period
+
+    sq_dev = (windows - m[:, None]) ** 2
+    var_total = sq_dev[:, 0].copy()
+    for j in range(1, period):
+        var_total += sq_dev[:, j]
+    std = np.sqrt(var_total / period)
+
+    mid[period - 1:] = m
+    upper[period - 1:] = m + std_mult * std
+    lower[period - 1:] = m - std_mult * std
+    return upper, lower, mid
+
+
+def macd(
+    closes: np.ndarray,
+    fast: int = 12,
+    slow: int = 26,
+    signal: int = 9,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """MACD line, signal line, histogram."""
+    line = ema(closes, fast) - ema(closes, slow)
+    signal_line = np.full(len(closes), np.nan)
+
+    valid = ~np.isnan(line)
+    if np.count_nonzero(valid) < signal:
+        return line, signal_line, signal_line.copy()
+
+    signal_line[valid] = ema(line[valid], signal)
+    return line, signal_line, line - signal_line
+
+
+def volume_sma(volume: np.ndarray, period: int) -> np.ndarray:
+    """Simple moving average of volume."""
+    n = len(volume)
+    out = np.full(n, np.nan)
+    if n < period:
+        return out
+
+    csum = np.concatenate(([0], np.cumsum(volume)))
+    out[period - 1:] = (csum[period:] - csum[:-period]) / period
+    return out
+
+
+# ── Signal masks ──────────────────────────────────────────────────
+
+
+def _cached(
+    cache: Optional[IndicatorCache],
+    day_key: Optional[date],
+    name: str,
+    args: tuple,
+    compute: Callable[[], Any],
+) -> Any:
+    if cache is None or day_key is None:
+        return compute()
+    return cache.get_or_compute((day_key, name, args), compute)
+
+
+def _shift(a: np.ndarray) -> np.ndarray:
+    """Previous-bar view of a column (index 0 gets NaN)."""
+    out = np.empty(len(a), dtype=np.float64)
+    out[0] = np.nan
+    out[1:] = a[:-1]
+    return out
+
+
+def _near(price: np.ndarray, level: float, proximity: float) -> np.ndarray:
+    if level == 0:
+        return np.zeros(len(price), dtype=bool)
+    return np.abs(price - level) / level < proximity
+
+
+def generate_signals_columnar(
+    day: OHLCVArrays,
+    params: BacktestParams,
+    prev_close: Optional[float] = None,
+    prev_high: Optional[float] = None,
+    prev_low: Optional[float] = None,
+    confirm_bars: Optional[list[BarData]] = None,
+    cache: Optional[IndicatorCache] = None,
+    day_key: Optional[date] = None,
+) -> list[Signal]:
+    """Evaluate params.signal_type over one day of columns.
+
+    With a cache and day_key, indicator series are looked up by
+    (day_key, indicator, periods) before being computed.
+    """
+    n = len(day)
+    if n < max(params.ema_slow + 1, 26):
+        return []
+
+    st = params.signal_type
+    o, h, l, c, v, tod = day.open, day.high, day.low, day.close, day.volume, day.tod
+    prev_c = _shift(c)
+
+    vw = _cached(cache, day_key, "vwap", (), lambda: vwap(h, l, c, v))
+    vw_prev = _shift(vw)
+
+    if st not in ("orb", "orb_direction", "vwap_reclaim", "vwap_rsi", "bb_squeeze", "rsi_reversal"):
+        ema_f = _cached(cache, day_key, "ema", (params.ema_fast,), lambda: ema(c, params.ema_fast))
+        ema_s = _cached(cache, day_key, "ema", (params.ema_slow,), lambda: ema(c, params.ema_slow))
+
+    rsi_vals = np.full(n, np.nan)
+    if params.rsi_period > 0 or st == "confluence":
+        rsi_period = params.rsi_period if params.rsi_period > 0 else 9
+        rsi_vals = _cached(cache, day_key, "rsi", (rsi_period,), lambda: rsi(c, rsi_period))
+
+    pivots: Optional[PivotLevels] = None
+    if params.pivot_enabled and prev_high is not None and prev_low is not None and prev_close is not None:
+        pivots = compute_pivot_levels(prev_high, prev_low, prev_close)
+    if pivots is not None:
+        proximity = params.pivot_proximity_pct / 100.0
+        near_s1, near_s2 = _near(c, pivots.s1, proximity), _near(c, pivots.s2, proximity)
+        near_r1, near_r2 = _near(c, pivots.r1, proximity), _near(c, pivots.r2, proximity)
+
+    # Trading window per signal type
+    if st == "vwap_reclaim":
+        in_window = (tod >= _time_to_seconds(time(10, 30))) & (tod <= _time_to_seconds(time(12, 0)))
+    elif st == "orb_direction":
+        orb_end_minutes = 30 + params.orb_minutes
+        orb_end_t = time(9 + orb_end_minutes // 60, orb_end_minutes % 60)
+        in_window = (tod >= _time_to_seconds(orb_end_t)) & (tod <= _time_to_seconds(params.orb_time_stop))
+    else:
+        windows = [(params.morning_window_start, params.morning_window_end)]
+        if params.afternoon_enabled:
+            windows.append((params.afternoon_window_start, params.afternoon_window_end))
+        in_window = np.zeros(n, dtype=bool)
+        for s, e in windows:
+            in_window |= (tod >= _time_to_seconds(s)) & (tod <= _time_to_seconds(e))
+    in_window[0] = False
+
+    call = np.zeros(n, dtype=bool)
+    put = np.zeros(n, dtype=bool)
+
+    if st == "confluence":
+        macd_args = (params.macd_fast, params.macd_slow, params.macd_signal_period)
+        macd_hist = _cached(cache, day_key, "macd", macd_args, lambda: macd(c, *macd_args))[2]
+        vol_avg = _cached(
+            cache, day_key, "volume_sma", (params.vol_sma_period,),
+            lambda: volume_sma(v, params.vol_sma_period),
+        )
+        has_vol_avg = vol_avg > 0
+        rel_vol = np.full(n, np.nan)
+        np.divide(v, vol_avg, out=rel_vol, where=has_vol_avg)
+        high_vol = has_vol_avg & (rel_vol >= params.vol_threshold)
+
+        ema_up, ema_down = ema_f > ema_s, ema_f < ema_s
+        factors_call = {
+            "VWAP": c > vw,
+            "EMA": ema_up,
+            "RSI": rsi_vals < params.rsi_ob,
+            "MACD": macd_hist > 0,
+            "Vol": high_vol & ema_up,
+            "Candle": c > o,
+        }
+        factors_put = {
+            "VWAP": c < vw,
+            "EMA": ema_down,
+            "RSI": rsi_vals > params.rsi_os,
+            "MACD": macd_hist < 0,
+            "Vol": high_vol & ema_down,
+            "Candle": c < o,
+        }
+        if pivots is not None:
+            near_support = near_s1 | near_s2
+            near_resist = near_r1 | near_r2
+            factors_call["Pivot"] = near_support | (~near_resist & (c < pivots.pivot))
+            factors_put["Pivot"] = ~near_support & (near_resist | (c > pivots.pivot))
+
+        call_score = np.sum(list(factors_call.values()), axis=0, dtype=np.int64)
+        put_score = np.sum(list(factors_put.values()), axis=0, dtype=np.int64)
+        call = (call_score >= params.min_confluence) & (call_score > put_score)
+        put = (put_score >= params.min_confluence) & (put_score > call_score)
+        max_score = 7 if pivots is not None else 6
+
+    elif st in ("orb", "orb_direction"):
+        open_tod = 9 * 3600 + 30 * 60 + day.timestamps[0].microsecond / 1e6
+        orb_idx = np.flatnonzero(tod < open_tod + params.orb_minutes * 60)
+        if len(orb_idx):
+            orb_high = float(h[orb_idx].max())
+            orb_low = float(l[orb_idx].min())
+            orb_open = float(o[orb_idx[0]])
+            orb_close = float(c[orb_idx[-1]])
+
+            if st == "orb":
+                call = (prev_c <= orb_high) & (c > orb_high)
+                put = ~call & (prev_c >= orb_low) & (c < orb_low)
+            else:
+                orb_rng = orb_high - orb_low
+                body_pct = abs(orb_close - orb_open) / orb_rng if orb_rng > 0 else 0.0
+                orb_bullish = orb_close > orb_open
+                orb_bearish = orb_close < orb_open
+
+                gap_ok = True
+                if params.orb_gap_fade_filter and prev_close is not None:
+                    gap = orb_open - prev_close
+                    if (orb_bullish and gap > 0) or (orb_bearish and gap < 0):
+                        gap_ok = False
+
+                if orb_rng > 0 and body_pct >= params.orb_body_min_pct and gap_ok:
+                    vwap_ok = np.ones(n, dtype=bool)
+                    if params.orb_vwap_filter:
+                        if orb_bullish:
+                            vwap_ok = ~(orb_close < vw)
+                        elif orb_bearish:
+                            vwap_ok = ~(orb_close > vw)
+                    if orb_bullish:
+                        call = vwap_ok & (prev_c <= orb_high) & (c > orb_high)
+                    elif orb_bearish:
+                        put = vwap_ok & (prev_c >= orb_low) & (c < orb_low)
+
+    elif st == "vwap_reclaim":
+        body = np.abs(c - o)
+        strong = body >= 0.30
+        call = strong & (prev_c < vw_prev) & (c > vw)
+        put = strong & ~call & (prev_c > vw_prev) & (c < vw)
+
+    elif st == "vwap_rsi":
+        call = (c > vw) & (rsi_vals <= params.rsi_os)
+        put = ~call & (c < vw) & (rsi_vals >= params.rsi_ob)
+
+    elif st == "bb_squeeze":
+        bb_args = (params.bb_period, params.bb_std_mult)
+        bb_upper, bb_lower, _ = _cached(cache, day_key, "bollinger", bb_args, lambda: bollinger(c, *bb_args))
+        upper_prev = _shift(bb_upper)
+        expanding = (bb_upper - bb_lower) > (upper_prev - _shift(bb_lower))
+        call = expanding & (c > bb_upper)
+        put = expanding & ~call & (c < bb_lower)
+
+    elif st == "rsi_reversal":
+        rsi_prev = _shift(rsi_vals)
+        call = (rsi_prev < params.rsi_os) & (rsi_vals >= params.rsi_os)
+        put = ~call & (rsi_prev > params.rsi_ob) & (rsi_vals <= params.rsi_ob)
+
+    else:
+        ema_f_prev, ema_s_prev = _shift(ema_f), _shift(ema_s)
+        ema_ok = ~(np.isnan(ema_f) | np.isnan(ema_f_prev) | np.isnan(ema_s) | np.isnan(ema_s_prev))
+        ema_bull = ema_ok & (ema_f_prev <= ema_s_prev) & (ema_f > ema_s)
+        ema_bear = ema_ok & (ema_f_prev >= ema_s_prev) & (ema_f < ema_s)
+
+        if st == "ema_cross":
+            call, put = ema_bull, ema_bear
+        elif st == "vwap_cross":
+            call = ema_ok & (prev_c <= vw_prev) & (c > vw)
+            put = ema_ok & ~call & (prev_c >= vw_prev) & (c < vw)
+        elif st == "ema_vwap":
+            call = ema_bull & (c > vw)
+            put = ema_bear & (c < vw)
+
+    call &= in_window
+    put &= in_window
+
+    # RSI filter: block signals that disagree with RSI
+    if params.rsi_period > 0 and st not in ("vwap_rsi", "rsi_reversal", "confluence"):
+        call &= ~(rsi_vals > params.rsi_ob)
+        put &= ~(rsi_vals < params.rsi_os)
+
+    # Pivot S/R filter: block signals that fight key levels
+    if params.pivot_filter_enabled and pivots is not None:
+        call &= ~(near_r1 | near_r2)
+        put &= ~(near_s1 | near_s2)
+
+    signals: list[Signal] = []
+    for i in np.flatnonzero(call | put).tolist():
+        direction = "CALL" if call[i] else "PUT"
+        price = float(c[i])
+        sig = Signal(
+            timestamp=day.timestamps[i],
+            direction=direction,
+            ticker_price=price,
+            reason="",
+        )
+
+        if st == "confluence":
+            factors = factors_call if direction == "CALL" else factors_put
+            labels: list[str] = []
+            for name, mask in factors.items():
+                if not mask[i]:
+                    continue
+                if name == "RSI":
+                    labels.append(f"RSI:{rsi_vals[i]:.0f}")
+                elif name == "Vol":
+                    labels.append(f"Vol:{rel_vol[i]:.1f}x")
+                elif name == "Pivot":
+                    if direction == "CALL" and (near_s1[i] or near_s2[i]):
+                        labels.append("Pivot:S1" if abs(price - pivots.s1) < abs(price - pivots.s2) else "Pivot:S2")
+                    elif direction == "PUT" and (near_r1[i] or near_r2[i]):
+                        labels.append("Pivot:R1" if abs(price - pivots.r1) < abs(price - pivots.r2) else "Pivot:R2")
+                    else:
+                        labels.append("Pivot:<P" if direction == "CALL" else "Pivot:>P")
+                else:
+                    labels.append(name)
+            score = int(call_score[i] if direction == "CALL" else put_score[i])
+            sig.reason = f"Confluence {score}/{max_score}: {', '.join(labels)}"
+            sig.confluence_score = score
+            sig.confluence_max_score = max_score
+            sig.rel_vol = round(float(rel_vol[i]), 2) if has_vol_avg[i] else None
+
+        elif st == "orb":
+            sig.reason = (
+                f"ORB breakout above {orb_high:.2f}" if direction == "CALL"
+                else f"ORB breakdown below {orb_low:.2f}"
+            )
+
+        elif st == "orb_direction":
+            kind = "bullish breakout" if direction == "CALL" else "bearish breakdown"
+            sig.reason = f"ORB-{params.orb_minutes} {kind} (body {body_pct:.0%})"
+            sig.orb_range = orb_rng
+            sig.orb_entry_level = orb_high if direction == "CALL" else orb_low
+
+        elif st == "vwap_reclaim":
+            kind = "bullish" if direction == "CALL" else "bearish"
+            sig.reason = f"VWAP reclaim {kind} (body ${body[i]:.2f})"
+
+        elif st == "vwap_rsi":
+            sig.reason = (
+                f"Above VWAP + RSI oversold ({rsi_vals[i]:.0f})" if direction == "CALL"
+                else f"Below VWAP + RSI overbought ({rsi_vals[i]:.0f})"
+            )
+
+        elif st == "bb_squeeze":
+            sig.reason = "BB squeeze breakout above" if direction == "CALL" else "BB squeeze breakdown below"
+
+        elif st == "rsi_reversal":
+            sig.reason = (
+                f"RSI crossed above {params.rsi_os:.0f}" if direction == "CALL"
+                else f"RSI crossed below {params.rsi_ob:.0f}"
+            )
+
+        elif st == "ema_cross":
+            kind = "bullish" if direction == "CALL" else "bearish"
+            sig.reason = f"EMA {params.ema_fast}/{params.ema_slow} {kind} cross"
+
+        elif st == "vwap_cross":
+            sig.reason = "Price crossed above VWAP" if direction == "CALL" else "Price crossed below VWAP"
+
+        elif st == "ema_vwap":
+            sig.reason = "EMA cross + above VWAP" if direction == "CALL" else "EMA cross + below VWAP"
+
+        signals.append(sig)
+
+    if params.entry_confirm_minutes > 0 and confirm_bars:
+        signals = _apply_entry_confirmation(signals, params, confirm_bars)
+
+    return signals
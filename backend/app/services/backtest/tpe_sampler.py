@@ -0,0 +1,78 @@
+"""Tree-structured Parzen estimator (TPE) sampler over categorical parameters.
+
+After a few random start-up trials, observed trials are split by score into
+a "good" group (top gamma fraction) and a "bad" group. Each parameter gets a
+smoothed categorical density per group, l(x) over the good trials and g(x)
+over the bad ones. Candidates are drawn from l, and the one with the highest
+l(x) / g(x) is suggested. Parameters are modelled independently, which is
+the original TPE formulation and is enough to steer a budget away from
+obviously bad regions of the space.
+"""
+
+import math
+import random
+from typing import Any, Optional
+
+
+class TPESampler:
+    def __init__(
+        self,
+        space: dict[str, list],
+        gamma: float = 0.25,
+        n_startup: int = 20,
+        n_candidates: int = 24,
+        prior_weight: float = 1.0,
+        rng: Optional[random.Random] = None,
+    ):
+        self.space = space
+        self.gamma = gamma
+        self.n_startup = n_startup
+        self.n_candidates = n_candidates
+        self.prior_weight = prior_weight
+        self.rng = rng or random.Random()
+        self._index = {name: {v: i for i, v in enumerate(values)} for name, values in space.items()}
+        self._trials: list[tuple[float, dict]] = []
+
+    def __len__(self) -> int:
+        return len(self._trials)
+
+    def observe(self, combo: dict, score: float) -> None:
+        """Record a finished trial. Unviable trials (score -inf) count as bad."""
+        self._trials.append((score, combo))
+
+    def suggest(self) -> dict[str, Any]:
+        finite = [t for t in self._trials if t[0] != float("-inf")]
+        if len(self._trials) < self.n_startup or not finite:
+            return {name: self.rng.choice(values) for name, values in self.space.items()}
+
+        ranked = sorted(self._trials, key=lambda t: t[0], reverse=True)
+        n_good = min(max(1, math.ceil(self.gamma * len(ranked))), len(finite))
+        good = [combo for _, combo in ranked[:n_good]]
+        bad = [combo for _, combo in ranked[n_good:]]
+
+        l_weights = {name: self._density(name, good) for name in self.space}
+        g_weights = {name: self._density(name, bad) for name in self.space}
+
+        best: Optional[dict] = None
+        best_ratio = float("-inf")
+        for _ in range(self.n_candidates):
+            candidate = {}
+            log_ratio = 0.0
+            for name, values in self.space.items():
+                i = self.rng.choices(range(len(values)), weights=l_weights[name])[0]
+                candidate[name] = values[i]
+                log_ratio += math.log(l_weights[name][i]) - math.log(g_weights[name][i])
+            if log_ratio > best_ratio:
+                best, best_ratio = candidate, log_ratio
+        return best
+
+    def _density(self, name: str, combos: list[dict]) -> list[float]:
+        """Smoothed categorical density of one parameter over some trials."""
+        index = self._index[name]
+        counts = [self.prior_weight] * len(index)
+        for combo in combos:
+            i = index.get(combo.get(name))
+            if i is not None:
+                counts[i] += 1.0
+        total = sum(counts)
+        return [c / total for c in counts]
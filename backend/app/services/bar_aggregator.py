@@ -0,0 +1,204 @@
+"""Shared live bar builder fed by the CHART_EQUITY stream.
+
+Keeps today's 1-minute bars per ticker in memory and resamples them to any
+minute timeframe on request, so every strategy task on a ticker reads the
+same bars instead of re-downloading the day from price_history. Each ticker
+is backfilled from REST once per day; after that the stream appends one bar
+per minute and wakes tasks waiting for their timeframe's bar to close.
+"""
+
+import asyncio
+import logging
+import time as _time
+from datetime import date, datetime, time, timedelta
+from typing import Optional
+from zoneinfo import ZoneInfo
+
+from app.config import Settings
+from app.services.backtest.market_data import BarData
+
+logger = logging.getLogger(__name__)
+settings = Settings()
+
+ET = ZoneInfo("America/New_York")
+MARKET_OPEN = time(9, 30)
+MARKET_CLOSE = time(16, 0)
+
+
+def resample_bars(minute_bars: list[BarData], minutes: int) -> list[BarData]:
+    """Aggregate 1-minute bars into `minutes` bars aligned to the 9:30 open.
+
+    The last bar may be partial (still forming), matching what price_history
+    returns for the current bar.
+    """
+    if minutes <= 1:
+        return list(minute_bars)
+
+    out: list[BarData] = []
+    bucket_start: Optional[datetime] = None
+    for bar in minute_bars:
+        ts = bar.timestamp
+        open_dt = datetime.combine(ts.date(), MARKET_OPEN, tzinfo=ts.tzinfo)
+        offset = int((ts - open_dt).total_seconds() // 60)
+        start = open_dt + timedelta(minutes=(offset // minutes) * minutes)
+        if start != bucket_start:
+            out.append(BarData(
+                timestamp=start, open=bar.open, high=bar.high,
+                low=bar.low, close=bar.close, volume=bar.volume,
+            ))
+            bucket_start = start
+        else:
+            agg = out[-1]
+            agg.high = max(agg.high, bar.high)
+            agg.low = min(agg.low, bar.low)
+            agg.close = bar.close
+            agg.volume += bar.volume
+    return out
+
+
+class _TickerBars:
+    def __init__(self):
+        self.day: Optional[date] = None
+        self.backfilled: Optional[date] = None
+        self.minute_bars: list[BarData] = []
+        self.updated_at: float = 0.0
+        self.backfill_lock = asyncio.Lock()
+        self.closed: dict[int, asyncio.Event] = {}
+
+
+class BarAggregator:
+    """In-process 1-minute bar store with resampling and bar-close wakeups."""
+
+    def __init__(self):
+        self._tickers: dict[str, _TickerBars] = {}
+
+    def _state(self, ticker: str) -> _TickerBars:
+        state = self._tickers.get(ticker)
+        if state is None:
+            state = self._tickers[ticker] = _TickerBars()
+        return state
+
+    # ── Feeding ──────────────────────────────────────────────────
+
+    def add_minute_bar(self, ticker: str, bar: BarData) -> None:
+        """Insert or replace one 1-minute bar (keyed by its start time)."""
+        t = bar.timestamp.time()
+        if t < MARKET_OPEN or t >= MARKET_CLOSE:
+            return
+        state = self._state(ticker)
+        if state.day != bar.timestamp.date():
+            if state.day is not None and bar.timestamp.date() < state.day:
+                return
+            state.day = bar.timestamp.date()
+            state.minute_bars = []
+
+        bars = state.minute_bars
+        if bars and bars[-1].timestamp == bar.timestamp:
+            bars[-1] = bar
+        elif not bars or bars[-1].timestamp < bar.timestamp:
+            bars.append(bar)
+        else:
+            # Out-of-order replay — keep the list sorted
+            for i, existing in enumerate(bars):
+                if existing.timestamp == bar.timestamp:
+                    bars[i] = bar
+                    break
+                if existing.timestamp > bar.timestamp:
+                    bars.insert(i, bar)
+                    break
+        state.updated_at = _time.time()
+
+        # A `minutes` bar closes with the 1m bar that starts one minute before
+        # its boundary.
+        open_dt = datetime.combine(bar.timestamp.date(), MARKET_OPEN, tzinfo=bar.timestamp.tzinfo)
+        elapsed = int((bar.timestamp - open_dt).total_seconds() // 60) + 1
+        for minutes, event in state.closed.items():
+            if elapsed % minutes == 0:
+                event.set()
+
+    async def track(self, ticker: str, streaming, schwab) -> bool:
+        """Subscribe `ticker` to chart bars and backfill today.
+
+        Returns True when the streamed bars can be used; callers fall back
+        to REST history otherwise.
+        """
+        if not streaming.is_active or streaming.bars is not self:
+            return False
+        await streaming.subscribe_chart_equity(ticker)
+        await self.ensure_backfilled(ticker, schwab)
+        return self.is_live(ticker)
+
+    async def ensure_backfilled(self, ticker: str, schwab) -> None:
+        """Load today's 1-minute bars from REST once per ticker per day."""
+        state = self._state(ticker)
+        today = datetime.now(ET).date()
+        if state.backfilled == today:
+            return
+        async with state.backfill_lock:
+            if state.backfilled == today:
+                return
+            start = datetime.combine(today, MARKET_OPEN, tzinfo=ET)
+            end = datetime.now(ET) + timedelta(minutes=1)
+            try:
+                resp = await schwab.price_history(
+                    ticker,
+                    periodType="day",
+                    period="1",
+                    frequencyType="minute",
+                    frequency=1,
+                    startDate=start,
+                    endDate=end,
+                    needExtendedHoursData=False,
+                )
+                resp.raise_for_status()
+                candles = resp.json().get("candles", [])
+            except Exception as e:
+                logger.warning(f"BarAggregator: backfill failed for {ticker}: {e}")
+                return
+
+            for candle in candles:
+                self.add_minute_bar(ticker, BarData(
+                    timestamp=datetime.fromtimestamp(candle["datetime"] / 1000, tz=ET),
+                    open=float(candle["open"]),
+                    high=float(candle["high"]),
+                    low=float(candle["low"]),
+                    close=float(candle["close"]),
+                    volume=int(candle["volume"]),
+                ))
+            state.backfilled = today
+            logger.info(f"BarAggregator: backfilled {len(candles)} 1m bars for {ticker}")
+
+    # ── Reading ──────────────────────────────────────────────────
+
+    def is_live(self, ticker: str) -> bool:
+        """True when today is backfilled and the stream has updated recently."""
+        state = self._tickers.get(ticker)
+        if state is None or not state.minute_bars:
+            return False
+        today = datetime.now(ET).date()
+        if state.day != today or state.backfilled != today:
+            return False
+        return (_time.time() - state.updated_at) <= settings.BAR_STREAM_STALE_SECONDS
+
+    def get_bars(self, ticker: str, minutes: int = 1, since: Optional[datetime] = None) -> list[BarData]:
+        state = self._tickers.get(ticker)
+        if state is None:
+            return []
+        bars = state.minute_bars
+        if since is not None:
+            bars = [b for b in bars if b.timestamp >= since]
+        return resample_bars(bars, minutes)
+
+    async def wait_for_bar_close(self, ticker: str, minutes: int, timeout: float) -> bool:
+        """Wait until the next `minutes` bar closes. Returns False on timeout."""
+        state = self._state(ticker)
+        event = state.closed.get(minutes)
+        if event is None:
+            event = state.closed[minutes] = asyncio.Event()
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            event.clear()
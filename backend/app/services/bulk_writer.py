@@ -0,0 +1,154 @@
+"""Write-behind queue for append-only TradePriceSnapshot and TradeEvent rows.
+
+Price snapshots (one per streamed option quote) and exit-check audit events
+used to be added and flushed on the event loop inside whichever session
+produced them. BulkWriter buffers them as plain row dicts and inserts them in
+one executemany per table, in a worker thread with its own session, every
+WRITE_BEHIND_FLUSH_MS or as soon as WRITE_BEHIND_BATCH_SIZE rows are pending.
+The lifespan stops it after the background tasks so pending rows are flushed
+before shutdown.
+"""
+
+import asyncio
+import json
+import logging
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from sqlalchemy import insert
+
+from app.config import Settings
+from app.models import TradeEvent, TradeEventType, TradePriceSnapshot
+
+logger = logging.getLogger(__name__)
+settings = Settings()
+
+
+class BulkWriter:
+    def __init__(self):
+        self._snapshots: list[dict] = []
+        self._events: list[dict] = []
+        self._wake = asyncio.Event()
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def pending(self) -> int:
+        return len(self._snapshots) + len(self._events)
+
+    def reset(self) -> None:
+        self._snapshots = []
+        self._events = []
+        self._wake = asyncio.Event()
+        self._lock = asyncio.Lock()
+        self._task = None
+
+    def add_snapshot(
+        self,
+        trade_id: int,
+        price: float,
+        highest_price_seen: float,
+        timestamp: Optional[datetime] = None,
+    ) -> None:
+        self._snapshots.append({
+            "trade_id": trade_id,
+            "timestamp": timestamp or datetime.utcnow(),
+            "price": price,
+            "highest_price_seen": highest_price_seen,
+        })
+        self._check_batch()
+
+    def add_event(
+        self,
+        trade_id: int,
+        event_type: TradeEventType,
+        message: str,
+        details: Optional[Dict[str, Any]] = None,
+        timestamp: Optional[datetime] = None,
+    ) -> None:
+        self._events.append({
+            "trade_id": trade_id,
+            "timestamp": timestamp or datetime.utcnow(),
+            "event_type": event_type,
+            "message": message,
+            "details": json.dumps(details) if details else None,
+        })
+        self._check_batch()
+
+    def _check_batch(self) -> None:
+        if self.pending >= settings.WRITE_BEHIND_BATCH_SIZE:
+            self._wake.set()
+
+    async def flush(self) -> int:
+        """Insert everything pending. Returns the number of rows written."""
+        async with self._lock:
+            snapshots, self._snapshots = self._snapshots, []
+            events, self._events = self._events, []
+            if not snapshots and not events:
+                return 0
+            try:
+                await asyncio.to_thread(self._write, snapshots, events)
+            except Exception as e:
+                # Keep the rows (ahead of anything queued meanwhile) for the next flush
+                logger.exception(f"BulkWriter: flush of {len(snapshots) + len(events)} rows failed: {e}")
+                self._snapshots[:0] = snapshots
+                self._events[:0] = events
+                # Don't grow without bound while the database stays unavailable
+                limit = settings.WRITE_BEHIND_BATCH_SIZE * 10
+                if len(self._snapshots) > limit:
+                    logger.warning(f"BulkWriter: dropping {len(self._snapshots) - limit} oldest snapshots")
+                    del self._snapshots[:-limit]
+                return 0
+            return len(snapshots) + len(events)
+
+    @staticmethod
+    def _write(snapshots: list[dict], events: list[dict]) -> None:
+        from app.database import SessionLocal
+
+        db = SessionLocal()
+        try:
+            if snapshots:
+                db.execute(insert(TradePriceSnapshot), snapshots)
+            if events:
+                db.execute(insert(TradeEvent), events)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    async def run(self) -> None:
+        logger.info("BulkWriter started")
+        interval = settings.WRITE_BEHIND_FLUSH_MS / 1000
+        while True:
+            try:
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._wake.clear()
+                await self.flush()
+            except asyncio.CancelledError:
+                logger.info("BulkWriter cancelled")
+                break
+            except Exception as e:
+                logger.exception(f"BulkWriter error: {e}")
+                await asyncio.sleep(1)
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        """Stop the flush loop and write whatever is still pending."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        written = await self.flush()
+        if written:
+            logger.info(f"BulkWriter: flushed {written} pending rows on shutdown")
@@ -1,15 +1,15 @@
 import logging
 from datetime import datetime, time
-from typing import Optional
+from typing import Optional, Union
 
 import pytz
 from sqlalchemy.orm import Session
 
 from app.config import Settings
-from app.models import ExitReason, Trade, TradeEventType, TradePriceSnapshot, TradeStatus
+from app.models import ExitReason, Trade, TradeEventType, TradeStatus
 from app.services.option_selector import _0DTE_TICKERS
 from app.services.order_manager import OrderManager
-from app.services.schwab_client import SchwabService
+from app.services.schwab_client import AsyncSchwabService, SchwabService, as_async
 from app.services.trade_events import log_trade_event
 
 logger = logging.getLogger(__name__)
@@ -31,11 +31,11 @@ class ExitEngine:
 
     def __init__(
         self,
-        schwab_service: SchwabService,
+        schwab_service: Union[SchwabService, AsyncSchwabService],
         order_manager: OrderManager,
         streaming_service=None,
     ):
-        self.schwab = schwab_service
+        self.schwab = as_async(schwab_service)
         self.order_manager = order_manager
         self.streaming = streaming_service
 
@@ -49,7 +49,7 @@ class ExitEngine:
         if now_et is None:
             now_et = datetime.now(ET)
 
-        price_data = self._get_price_data(trade.option_symbol)
+        price_data = await self._get_price_data(trade.option_symbol)
         if price_data is None:
             logger.warning(f"Trade #{trade.id}: could not get current price")
             return None
@@ -66,12 +66,11 @@ class ExitEngine:
         # Record price snapshot for post-trade analysis
         # (skipped when PriceRecorderTask handles recording via streaming)
         if not skip_snapshot:
-            db.add(TradePriceSnapshot(
-                trade_id=trade.id,
-                price=current_price,
-                highest_price_seen=trade.highest_price_seen or bid_price,
-            ))
-            db.flush()
+            from app.dependencies import get_bulk_writer
+
+            get_bulk_writer().add_snapshot(
+                trade.id, current_price, trade.highest_price_seen or bid_price,
+            )
 
         gain_percent = (
             ((current_price - trade.entry_price) / trade.entry_price) * 100
@@ -93,6 +92,7 @@ class ExitEngine:
                 db, trade.id, TradeEventType.EXIT_TRIGGERED,
                 f"Force exit triggered at {now_et.strftime('%H:%M')} ET (cutoff {settings.FORCE_EXIT_HOUR}:{settings.FORCE_EXIT_MINUTE:02d})",
                 details={"reason": "TIME_BASED", "current_time": str(now_et.time()), "current_price": current_price, "gain_percent": round(gain_percent, 2)},
+                write_behind=True,
             )
             await self.order_manager.place_exit_order(
                 db, trade, ExitReason.TIME_BASED, current_price=current_price
@@ -114,6 +114,7 @@ class ExitEngine:
                     db, trade.id, TradeEventType.EXIT_TRIGGERED,
                     f"Max hold time reached ({elapsed_minutes:.0f} min >= {max_hold} min)",
                     details={"reason": "MAX_HOLD_TIME", "elapsed_minutes": round(elapsed_minutes, 1), "max_hold_minutes": max_hold, "current_price": current_price, "gain_percent": round(gain_percent, 2)},
+                    write_behind=True,
                 )
                 await self.order_manager.place_exit_order(
                     db, trade, ExitReason.MAX_HOLD_TIME, current_price=current_price
@@ -163,6 +164,7 @@ class ExitEngine:
                             "elapsed_seconds": round(elapsed_secs, 1),
                             "emergency_threshold_pct": settings.ENTRY_CONFIRM_EMERGENCY_PCT,
                         },
+                        write_behind=True,
                     )
                     await self.order_manager.place_exit_order(
                         db, trade, ExitReason.STOP_LOSS, current_price=current_price
@@ -200,6 +202,7 @@ class ExitEngine:
                     db, trade.id, TradeEventType.EXIT_TRIGGERED,
                     f"App-managed stop-loss hit ({current_price:.2f} <= {trade.stop_loss_price:.2f})",
                     details={"reason": "STOP_LOSS", "current_price": current_price, "stop_price": trade.stop_loss_price, "gain_percent": round(gain_percent, 2)},
+                    write_behind=True,
                 )
                 await self.order_manager.place_exit_order(
                     db, trade, ExitReason.STOP_LOSS, current_price=current_price
@@ -243,6 +246,7 @@ class ExitEngine:
                             "gain_percent": round(gain_percent, 2), "scale_qty": scale_qty,
                             "tier": 1, "target_percent": settings.SCALE_OUT_TIER_1_PERCENT,
                         },
+                        write_behind=True,
                     )
                     await self.order_manager.place_scale_out_order(
                         db, trade, scale_qty, current_price
@@ -268,6 +272,7 @@ class ExitEngine:
                             "gain_percent": round(gain_percent, 2), "scale_qty": scale_qty,
                             "tier": 2, "target_percent": settings.SCALE_OUT_TIER_2_PERCENT,
                         },
+                        write_behind=True,
                     )
                     await self.order_manager.place_scale_out_order(
                         db, trade, scale_qty, current_price
@@ -292,6 +297,7 @@ class ExitEngine:
                     "gain_percent": round(gain_percent, 2),
                     "target_percent": profit_target_pct,
                 },
+                write_behind=True,
             )
             await self.order_manager.place_exit_order(
                 db, trade, ExitReason.PROFIT_TARGET,
@@ -355,6 +361,7 @@ class ExitEngine:
                         "gain_percent": round(gain_percent, 2),
                         "remaining_quantity": remaining_qty,
                     },
+                    write_behind=True,
                 )
                 # Exit with LIMIT at bid — avoids filling below bid in wide spreads
                 await self.order_manager.place_exit_order(
@@ -365,12 +372,12 @@ class ExitEngine:
 
         return None
 
-    def _get_current_price(self, option_symbol: str) -> Optional[float]:
+    async def _get_current_price(self, option_symbol: str) -> Optional[float]:
         """Return mid-price (legacy, used for non-trailing-stop checks)."""
-        data = self._get_price_data(option_symbol)
+        data = await self._get_price_data(option_symbol)
         return data["mid"] if data else None
 
-    def _get_price_data(self, option_symbol: str) -> Optional[dict]:
+    async def _get_price_data(self, option_symbol: str) -> Optional[dict]:
         """Return bid, ask, mid, and spread_pct for spread-aware decisions.
 
         Checks streaming cache first, falls back to REST API.
@@ -388,7 +395,7 @@ class ExitEngine:
 
         # REST fallback
         try:
-            quote = self.schwab.get_quote(option_symbol)
+            quote = await self.schwab.get_quote(option_symbol)
             quote_data = quote.get(option_symbol, {}).get("quote", {})
             bid = quote_data.get("bidPrice", 0)
             ask = quote_data.get("askPrice", 0)
@@ -54,6 +54,8 @@ DEFAULT_IV = 0.20
 # IV rank cache: {ticker: (iv_rank, timestamp)}
 _IV_RANK_CACHE: dict[str, tuple[float, float]] = {}
 IV_RANK_CACHE_TTL = 3600  # 1 hour
+# 52-week realized-vol range cache: {ticker: ((hv_min, hv_max), timestamp)}
+_HV_RANGE_CACHE: dict[str, tuple[tuple[float, float], float]] = {}
 
 
 class IVRankTooHighError(Exception):
@@ -80,6 +82,8 @@ class OptionContract:
     theta: float = 0.0
     open_interest: int = 0
     volume: int = 0
+    chain_cache_hit: Optional[bool] = None
+    chain_fetch_ms: Optional[float] = None
 
     @property
     def spread_percent(self) -> float:
@@ -109,36 +113,10 @@ class OptionSelector:
                 return rank
 
         try:
-            candles = self.schwab.fetch_daily_bars(ticker, period_months=12)
-            if len(candles) < 30:
-                logger.warning(f"Not enough daily bars for {ticker} IV rank ({len(candles)} bars)")
+            hv_range = self._hv_range(ticker)
+            if hv_range is None:
                 return None
-
-            # Compute daily log returns
-            closes = [c["close"] for c in candles]
-            log_returns = [
-                math.log(closes[i] / closes[i - 1])
-                for i in range(1, len(closes))
-                if closes[i - 1] > 0
-            ]
-
-            if len(log_returns) < 25:
-                return None
-
-            # 20-day rolling realized volatility (annualized)
-            window = 20
-            hv_series = []
-            for i in range(window, len(log_returns) + 1):
-                chunk = log_returns[i - window : i]
-                std = (sum((r - sum(chunk) / len(chunk)) ** 2 for r in chunk) / (len(chunk) - 1)) ** 0.5
-                hv = std * math.sqrt(252)  # annualize
-                hv_series.append(hv)
-
-            if not hv_series:
-                return None
-
-            hv_min = min(hv_series)
-            hv_max = max(hv_series)
+            hv_min, hv_max = hv_range
 
             if hv_max - hv_min < 0.001:
                 # Flat vol — can't compute meaningful rank
@@ -160,6 +138,53 @@ class OptionSelector:
             logger.warning(f"IV rank computation failed for {ticker}: {e}")
             return None
 
+    def _hv_range(self, ticker: str) -> Optional[tuple[float, float]]:
+        """(min, max) of the 20-day realized vol over the last 12 months, cached for IV_RANK_CACHE_TTL."""
+        cached = _HV_RANGE_CACHE.get(ticker)
+        if cached and _time.time() - cached[1] < IV_RANK_CACHE_TTL:
+            return cached[0]
+
+        candles = self.schwab.fetch_daily_bars(ticker, period_months=12)
+        if len(candles) < 30:
+            logger.warning(f"Not enough daily bars for {ticker} IV rank ({len(candles)} bars)")
+            return None
+
+        # Compute daily log returns
+        closes = [c["close"] for c in candles]
+        log_returns = [
+            math.log(closes[i] / closes[i - 1])
+            for i in range(1, len(closes))
+            if closes[i - 1] > 0
+        ]
+
+        if len(log_returns) < 25:
+            return None
+
+        # 20-day rolling realized volatility (annualized)
+        window = 20
+        hv_series = []
+        for i in range(window, len(log_returns) + 1):
+            chunk = log_returns[i - window : i]
+            std = (sum((r - sum(chunk) / len(chunk)) ** 2 for r in chunk) / (len(chunk) - 1)) ** 0.5
+            hv = std * math.sqrt(252)  # annualize
+            hv_series.append(hv)
+
+        if not hv_series:
+            return None
+
+        hv_range = (min(hv_series), max(hv_series))
+        _HV_RANGE_CACHE[ticker] = (hv_range, _time.time())
+        return hv_range
+
+    def warm_iv_history(self, ticker: str) -> None:
+        """Fetch the daily history behind IV rank ahead of select_contract."""
+        if settings.IV_RANK_MAX >= 100:
+            return
+        try:
+            self._hv_range(ticker)
+        except Exception as e:
+            logger.debug(f"IV history prefetch failed for {ticker}: {e}")
+
     @staticmethod
     def _next_weekly_expiry(trade_date: date) -> date:
         """Find the next Friday expiry (weekly options)."""
@@ -168,6 +193,28 @@ class OptionSelector:
             return trade_date
         return trade_date + timedelta(days=days_until_friday)
 
+    def _target_expiry(self, ticker: str) -> date:
+        """Today for 0DTE tickers, else the next weekly expiry."""
+        if ticker.upper() in _0DTE_TICKERS:
+            return date.today()
+        return self._next_weekly_expiry(date.today())
+
+    def warm_chain(self, direction: str, ticker: str = "SPY") -> None:
+        """Fetch the chain select_contract will use into the short-TTL chain cache."""
+        if settings.OPTION_CHAIN_CACHE_TTL_SECONDS <= 0:
+            return
+        target_expiry = self._target_expiry(ticker)
+        try:
+            self.schwab.get_option_chain_cached(
+                symbol=ticker,
+                contract_type=direction,
+                strike_count=20,
+                from_date=target_expiry,
+                to_date=target_expiry,
+            )
+        except Exception as e:
+            logger.debug(f"Option chain prefetch failed for {ticker}: {e}")
+
     def select_contract(
         self,
         direction: str,
@@ -178,19 +225,17 @@ class OptionSelector:
         effective_delta = delta_target if delta_target is not None else settings.OPTION_DELTA_TARGET
 
         # Determine target expiry before fetching chain
-        is_0dte = ticker.upper() in _0DTE_TICKERS
-        if is_0dte:
-            target_expiry = date.today()
-        else:
-            target_expiry = self._next_weekly_expiry(date.today())
+        target_expiry = self._target_expiry(ticker)
 
-        chain = self.schwab.get_option_chain(
+        fetch_start = _time.perf_counter()
+        chain, chain_cache_hit = self.schwab.get_option_chain_cached(
             symbol=ticker,
             contract_type=direction,
             strike_count=20,
             from_date=target_expiry,
             to_date=target_expiry,
         )
+        chain_fetch_ms = round((_time.perf_counter() - fetch_start) * 1000, 1)
 
         chain_price = chain.get("underlyingPrice", underlying_price)
         if chain_price is None:
@@ -406,13 +451,16 @@ class OptionSelector:
             )
 
         best_score, best_contract, best_breakdown = candidates[0]
+        best_contract.chain_cache_hit = chain_cache_hit
+        best_contract.chain_fetch_ms = chain_fetch_ms
         logger.info(
             f"Selected: {best_contract.symbol} strike={best_contract.strike} "
             f"delta={best_contract.delta:.2f} (target={effective_delta:.2f}) "
             f"gamma={best_contract.gamma:.4f} OI={best_contract.open_interest} "
             f"bid={best_contract.bid} ask={best_contract.ask} "
             f"spread={best_contract.spread_percent:.1f}% "
-            f"composite_score={best_score:.4f}"
+            f"composite_score={best_score:.4f} "
+            f"(chain {'cache hit' if chain_cache_hit else 'fetched'} in {chain_fetch_ms:.0f}ms)"
         )
         return best_contract
 
@@ -1,12 +1,13 @@
 import logging
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Union
 
 from sqlalchemy.orm import Session
 
 from app.config import Settings
 from app.models import ExitReason, Trade, TradeEventType, TradeStatus
-from app.services.schwab_client import SchwabService
+from app.services.position_book import publish_trade_state
+from app.services.schwab_client import AsyncSchwabService, SchwabService, as_async
 from app.services.trade_events import log_trade_event
 from app.services.ws_manager import WebSocketManager
 
@@ -15,8 +16,13 @@ settings = Settings()
 
 
 class OrderManager:
-    def __init__(self, schwab_service: SchwabService, ws_manager: WebSocketManager, streaming_service=None):
-        self.schwab = schwab_service
+    def __init__(
+        self,
+        schwab_service: Union[SchwabService, AsyncSchwabService],
+        ws_manager: WebSocketManager,
+        streaming_service=None,
+    ):
+        self.schwab = as_async(schwab_service)
         self.ws_manager = ws_manager
         self.streaming = streaming_service
 
@@ -24,7 +30,7 @@ class OrderManager:
         if trade.status != TradeStatus.PENDING:
             return False
 
-        order_data = self.schwab.get_order_status(trade.entry_order_id)
+        order_data = await self.schwab.get_order_status(trade.entry_order_id)
         schwab_status = order_data.get("status", "").upper()
 
         if schwab_status == "FILLED":
@@ -54,6 +60,7 @@ class OrderManager:
                 },
             )
             db.commit()
+            publish_trade_state(trade)
 
             logger.info(
                 f"Trade #{trade.id} FILLED at {fill_price:.2f}, "
@@ -80,6 +87,7 @@ class OrderManager:
                 details={"schwab_status": schwab_status, "order_id": trade.entry_order_id},
             )
             db.commit()
+            publish_trade_state(trade)
             logger.warning(f"Trade #{trade.id} entry order {schwab_status}")
             await self.ws_manager.broadcast(
                 {
@@ -90,51 +98,55 @@ class OrderManager:
             return True
 
         # Entry limit timeout: cancel the trade — don't chase
-        if (
-            not trade.entry_is_fallback
-            and trade.created_at
-            and settings.ENTRY_LIMIT_TIMEOUT_MINUTES > 0
-        ):
+        if self.entry_limit_expired(trade):
             elapsed = (datetime.utcnow() - trade.created_at).total_seconds()
-            if elapsed >= settings.ENTRY_LIMIT_TIMEOUT_MINUTES * 60:
-                old_order_id = trade.entry_order_id
-                try:
-                    self.schwab.cancel_order(old_order_id)
-                except Exception as e:
-                    logger.warning(
-                        f"Trade #{trade.id}: could not cancel timed-out limit order: {e}"
-                    )
-                    return False
-
-                trade.status = TradeStatus.CANCELLED
-                log_trade_event(
-                    db, trade.id, TradeEventType.ENTRY_CANCELLED,
-                    f"Limit order timed out after {settings.ENTRY_LIMIT_TIMEOUT_MINUTES} min — "
-                    f"setup expired, not chasing (order {old_order_id})",
-                    details={
-                        "old_order_id": old_order_id,
-                        "elapsed_seconds": round(elapsed, 1),
-                        "original_limit_price": trade.alert_option_price,
-                    },
+            old_order_id = trade.entry_order_id
+            try:
+                await self.schwab.cancel_order(old_order_id)
+            except Exception as e:
+                logger.warning(
+                    f"Trade #{trade.id}: could not cancel timed-out limit order: {e}"
                 )
-                db.commit()
+                return False
 
-                logger.info(
-                    f"Trade #{trade.id}: limit timeout after "
-                    f"{elapsed:.0f}s — cancelled (not chasing)"
-                )
+            trade.status = TradeStatus.CANCELLED
+            log_trade_event(
+                db, trade.id, TradeEventType.ENTRY_CANCELLED,
+                f"Limit order timed out after {settings.ENTRY_LIMIT_TIMEOUT_MINUTES} min — "
+                f"setup expired, not chasing (order {old_order_id})",
+                details={
+                    "old_order_id": old_order_id,
+                    "elapsed_seconds": round(elapsed, 1),
+                    "original_limit_price": trade.alert_option_price,
+                },
+            )
+            db.commit()
+            publish_trade_state(trade)
 
-                await self.ws_manager.broadcast({
-                    "event": "trade_cancelled",
-                    "data": {
-                        "trade_id": trade.id,
-                        "reason": "LIMIT_TIMEOUT",
-                    },
-                })
-                return True
+            logger.info(
+                f"Trade #{trade.id}: limit timeout after "
+                f"{elapsed:.0f}s — cancelled (not chasing)"
+            )
+
+            await self.ws_manager.broadcast({
+                "event": "trade_cancelled",
+                "data": {
+                    "trade_id": trade.id,
+                    "reason": "LIMIT_TIMEOUT",
+                },
+            })
+            return True
 
         return False
 
+    @staticmethod
+    def entry_limit_expired(trade: Trade) -> bool:
+        """True once a non-fallback entry limit has rested ENTRY_LIMIT_TIMEOUT_MINUTES."""
+        if trade.entry_is_fallback or not trade.created_at or settings.ENTRY_LIMIT_TIMEOUT_MINUTES <= 0:
+            return False
+        elapsed = (datetime.utcnow() - trade.created_at).total_seconds()
+        return elapsed >= settings.ENTRY_LIMIT_TIMEOUT_MINUTES * 60
+
     def _compute_stop_price(self, trade: Trade) -> None:
         """Compute stop_loss_price without placing Schwab order (for confirmation delay)."""
         if trade.entry_atr_value and trade.param_atr_stop_mult:
@@ -168,7 +180,7 @@ class OrderManager:
             atr_info = f", {sl_pct}% SL"
 
         try:
-            order_id = self.schwab.place_order(order)
+            order_id = await self.schwab.place_order(order)
             trade.stop_loss_order_id = order_id
             trade.status = TradeStatus.STOP_LOSS_PLACED
             log_trade_event(
@@ -181,6 +193,7 @@ class OrderManager:
                 },
             )
             db.commit()
+            publish_trade_state(trade)
             logger.info(
                 f"Trade #{trade.id} stop-loss at {stop_price:.2f}{atr_info} (order={order_id})"
             )
@@ -196,6 +209,7 @@ class OrderManager:
                 details={"stop_price": stop_price, "app_managed": True, "error": str(e)},
             )
             db.commit()
+            publish_trade_state(trade)
 
     async def move_stop_to_breakeven(self, db: Session, trade: Trade) -> None:
         """Cancel existing stop-loss and re-place at entry price (breakeven)."""
@@ -205,7 +219,7 @@ class OrderManager:
         # Cancel existing Schwab stop-loss
         if trade.stop_loss_order_id:
             try:
-                self.schwab.cancel_order(trade.stop_loss_order_id)
+                await self.schwab.cancel_order(trade.stop_loss_order_id)
                 log_trade_event(
                     db, trade.id, TradeEventType.STOP_LOSS_CANCELLED,
                     f"Stop-loss cancelled for breakeven move",
@@ -224,7 +238,7 @@ class OrderManager:
             stop_price=breakeven_price,
         )
         try:
-            order_id = self.schwab.place_order(order)
+            order_id = await self.schwab.place_order(order)
             trade.stop_loss_order_id = order_id
             log_trade_event(
                 db, trade.id, TradeEventType.BREAKEVEN_STOP_MOVED,
@@ -263,7 +277,7 @@ class OrderManager:
         # Cancel existing stop-loss (will re-place for remaining qty)
         if trade.stop_loss_order_id:
             try:
-                self.schwab.cancel_order(trade.stop_loss_order_id)
+                await self.schwab.cancel_order(trade.stop_loss_order_id)
                 log_trade_event(
                     db, trade.id, TradeEventType.STOP_LOSS_CANCELLED,
                     f"Stop-loss cancelled for scale-out",
@@ -279,7 +293,7 @@ class OrderManager:
             quantity=quantity,
             order_type="MARKET",
         )
-        order_id = self.schwab.place_order(order)
+        order_id = await self.schwab.place_order(order)
 
         # Update trade with cumulative scale-out info
         trade.scaled_out = True
@@ -313,7 +327,7 @@ class OrderManager:
                     quantity=remaining_qty,
                     stop_price=trade.stop_loss_price,
                 )
-                sl_order_id = self.schwab.place_order(sl_order)
+                sl_order_id = await self.schwab.place_order(sl_order)
                 trade.stop_loss_order_id = sl_order_id
                 log_trade_event(
                     db, trade.id, TradeEventType.STOP_LOSS_PLACED,
@@ -354,7 +368,7 @@ class OrderManager:
         # Cancel existing stop-loss if managed by Schwab
         if trade.stop_loss_order_id:
             try:
-                self.schwab.cancel_order(trade.stop_loss_order_id)
+                await self.schwab.cancel_order(trade.stop_loss_order_id)
                 log_trade_event(
                     db, trade.id, TradeEventType.STOP_LOSS_CANCELLED,
                     f"Stop-loss order {trade.stop_loss_order_id} cancelled for exit",
@@ -378,7 +392,7 @@ class OrderManager:
         if current_price and not limit_price:
             order["_sim_price"] = str(current_price)
 
-        order_id = self.schwab.place_order(order)
+        order_id = await self.schwab.place_order(order)
         trade.exit_order_id = order_id
         trade.exit_reason = exit_reason
         trade.status = TradeStatus.EXITING
@@ -388,6 +402,7 @@ class OrderManager:
             details={"order_id": order_id, "order_type": order_type, "exit_reason": exit_reason.value, "limit_price": limit_price, "quantity": remaining_qty},
         )
         db.commit()
+        publish_trade_state(trade)
 
         logger.info(
             f"Trade #{trade.id} exit: reason={exit_reason.value}, "
@@ -398,7 +413,7 @@ class OrderManager:
         if trade.status != TradeStatus.EXITING:
             return False
 
-        order_data = self.schwab.get_order_status(trade.exit_order_id)
+        order_data = await self.schwab.get_order_status(trade.exit_order_id)
         schwab_status = order_data.get("status", "").upper()
 
         if schwab_status == "FILLED":
@@ -432,6 +447,7 @@ class OrderManager:
                 },
             )
             db.commit()
+            publish_trade_state(trade)
 
             logger.info(
                 f"Trade #{trade.id} CLOSED: exit={fill_price:.2f}, "
@@ -456,12 +472,12 @@ class OrderManager:
 
         return False
 
-    def check_stop_loss_fill(self, db: Session, trade: Trade) -> bool:
+    async def check_stop_loss_fill(self, db: Session, trade: Trade) -> bool:
         if not trade.stop_loss_order_id or trade.status == TradeStatus.CLOSED:
             return False
 
         try:
-            order_data = self.schwab.get_order_status(trade.stop_loss_order_id)
+            order_data = await self.schwab.get_order_status(trade.stop_loss_order_id)
             schwab_status = order_data.get("status", "").upper()
 
             if schwab_status == "FILLED":
@@ -495,6 +511,7 @@ class OrderManager:
                     },
                 )
                 db.commit()
+                publish_trade_state(trade)
                 logger.info(
                     f"Trade #{trade.id} STOP-LOSS HIT at {fill_price:.2f}"
                 )
@@ -506,7 +523,7 @@ class OrderManager:
 
         return False
 
-    def _get_current_mid(self, option_symbol: str) -> Optional[float]:
+    async def _get_current_mid(self, option_symbol: str) -> Optional[float]:
         # Try streaming cache first
         if self.streaming:
             snap = self.streaming.get_option_quote(option_symbol)
@@ -515,7 +532,7 @@ class OrderManager:
 
         # REST fallback
         try:
-            quote = self.schwab.get_quote(option_symbol)
+            quote = await self.schwab.get_quote(option_symbol)
             quote_data = quote.get(option_symbol, {}).get("quote", {})
             bid = quote_data.get("bidPrice", 0)
             ask = quote_data.get("askPrice", 0)
@@ -0,0 +1,174 @@
+"""Event-driven order tracking from the Schwab ACCT_ACTIVITY stream.
+
+StreamingService queues raw account activity entries; OrderTracker maps each
+fill / cancel / reject message to the trade that owns the order id and runs
+the matching OrderManager transition right away. The transition re-reads the
+order from REST, so a misparsed or duplicate message can never move a trade
+on its own — it only triggers an early check. When REST hasn't caught up yet
+(the order still reads WORKING), the order id is kept and re-checked on each
+OrderMonitorTask wake until REST agrees or the trade moves on.
+"""
+
+import json
+import logging
+from dataclasses import dataclass
+from datetime import date
+from typing import Optional
+
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+
+from app.models import Trade, TradeStatus
+from app.services.order_manager import OrderManager
+
+logger = logging.getLogger(__name__)
+
+# ACCT_ACTIVITY content fields: 1=Account, 2=Message type, 3=Message data
+_MESSAGE_TYPE_FIELD = "2"
+_MESSAGE_DATA_FIELD = "3"
+
+_ORDER_ID_KEYS = ("SchwabOrderID", "OrderID", "orderId", "order_id")
+
+
+@dataclass
+class OrderActivity:
+    order_id: str
+    kind: str  # "fill" | "cancel" | "reject"
+    message_type: str
+
+
+def _classify(message_type: str) -> Optional[str]:
+    """Map a Schwab message type to fill / cancel / reject (None = ignore)."""
+    t = message_type.lower()
+    if "partial" in t:
+        return None  # Wait for the completed fill
+    if "fill" in t:
+        return "fill"
+    if "urout" in t or "cancel" in t:
+        return "cancel"
+    if "reject" in t or "expire" in t:
+        return "reject"
+    return None
+
+
+def _find_order_id(data) -> Optional[str]:
+    """Depth-first search for the first order id key in the message data."""
+    if isinstance(data, dict):
+        for key in _ORDER_ID_KEYS:
+            if data.get(key) not in (None, ""):
+                return str(data[key])
+        for value in data.values():
+            found = _find_order_id(value)
+            if found:
+                return found
+    elif isinstance(data, list):
+        for value in data:
+            found = _find_order_id(value)
+            if found:
+                return found
+    return None
+
+
+def parse_account_activity(entry: dict) -> Optional[OrderActivity]:
+    """Parse one ACCT_ACTIVITY content entry, or None if it is not actionable."""
+    message_type = str(entry.get(_MESSAGE_TYPE_FIELD, ""))
+    kind = _classify(message_type)
+    if kind is None:
+        return None
+
+    data = entry.get(_MESSAGE_DATA_FIELD)
+    if isinstance(data, str):
+        try:
+            data = json.loads(data)
+        except json.JSONDecodeError:
+            logger.debug(f"OrderTracker: non-JSON activity data for {message_type}")
+            return None
+
+    order_id = _find_order_id(data)
+    if order_id is None:
+        return None
+    return OrderActivity(order_id=order_id, kind=kind, message_type=message_type)
+
+
+class OrderTracker:
+    """Drives OrderManager state transitions from streamed account activity."""
+
+    def __init__(self, order_manager: OrderManager):
+        self.order_manager = order_manager
+        # Order ids with a streamed event REST hasn't confirmed yet
+        self.unconfirmed: set[str] = set()
+
+    def _find_trade(self, db: Session, order_id: str) -> Optional[Trade]:
+        return (
+            db.query(Trade)
+            .filter(Trade.trade_date == date.today())
+            .filter(
+                or_(
+                    Trade.entry_order_id == order_id,
+                    Trade.stop_loss_order_id == order_id,
+                    Trade.exit_order_id == order_id,
+                )
+            )
+            .first()
+        )
+
+    async def handle_events(self, db: Session, events: list[dict]) -> int:
+        """Apply a batch of raw ACCT_ACTIVITY entries. Returns trades changed."""
+        changed = 0
+        seen: set[tuple[str, str]] = set()
+        for entry in events:
+            activity = parse_account_activity(entry)
+            if activity is None:
+                continue
+            key = (activity.order_id, activity.kind)
+            if key in seen:
+                continue
+            seen.add(key)
+
+            trade = self._find_trade(db, activity.order_id)
+            if trade is None:
+                continue
+
+            logger.info(
+                f"OrderTracker: {activity.message_type} for order {activity.order_id} "
+                f"(trade #{trade.id}, status={trade.status.value})"
+            )
+            if await self._check(db, trade, activity.order_id):
+                changed += 1
+        return changed
+
+    async def recheck_unconfirmed(self, db: Session) -> int:
+        """Re-check orders whose event REST didn't confirm yet. Returns trades changed."""
+        changed = 0
+        for order_id in list(self.unconfirmed):
+            trade = self._find_trade(db, order_id)
+            if trade is None:
+                self.unconfirmed.discard(order_id)
+                continue
+            if await self._check(db, trade, order_id):
+                logger.info(f"OrderTracker: order {order_id} confirmed on re-check (trade #{trade.id})")
+                changed += 1
+        return changed
+
+    async def _check(self, db: Session, trade: Trade, order_id: str) -> bool:
+        """Run the transition and keep the order id for a re-check unless REST settled it."""
+        result = await self._apply(db, trade, order_id)
+        if result is False:
+            self.unconfirmed.add(order_id)
+        else:
+            self.unconfirmed.discard(order_id)
+        return bool(result)
+
+    async def _apply(self, db: Session, trade: Trade, order_id: str) -> Optional[bool]:
+        """True if the trade moved, False if REST didn't confirm, None if no transition applies."""
+        om = self.order_manager
+        if order_id == trade.entry_order_id and trade.status == TradeStatus.PENDING:
+            return await om.check_entry_fill(db, trade)
+        if order_id == trade.exit_order_id and trade.status == TradeStatus.EXITING:
+            return await om.check_exit_fill(db, trade)
+        if order_id == trade.stop_loss_order_id and trade.status in (
+            TradeStatus.FILLED,
+            TradeStatus.STOP_LOSS_PLACED,
+        ):
+            return await om.check_stop_loss_fill(db, trade)
+        return None
@@ -141,16 +141,25 @@ class PaperSchwabClient:
         return MockResponse(None, status_code=200)
 
     def quote(self, symbol):
+        return MockResponse(self._quote_data(symbol))
+
+    def quotes(self, symbols, **kwargs):
+        if isinstance(symbols, str):
+            symbols = symbols.split(",")
+        data = {}
+        for symbol in symbols:
+            data.update(self._quote_data(symbol))
+        return MockResponse(data)
+
+    def _quote_data(self, symbol):
         if symbol in self._quote_overrides:
-            return MockResponse(self._quote_overrides[symbol])
-        return MockResponse(
-            {
-                symbol: {
-                    "quote": {
-                        "bidPrice": 1.50,
-                        "askPrice": 1.60,
-                        "lastPrice": 1.55,
-                    }
+            return self._quote_overrides[symbol]
+        return {
+            symbol: {
+                "quote": {
+                    "bidPrice": 1.50,
+                    "askPrice": 1.60,
+                    "lastPrice": 1.55,
                 }
             }
-        )
+        }
@@ -0,0 +1,159 @@
+"""Materialized PnL aggregates for the dashboard endpoints.
+
+/dashboard/stats, /dashboard/pnl-summary and /dashboard/analytics used to load
+every Trade row in range and bucket them in Python on each poll (up to a
+365-day lookback). Instead, DailyPnL holds one row of counts per day and
+PnLBucket one row of closed-trade PnL per (day, ET entry hour, source,
+ticker, hold-time bucket), and the endpoints GROUP BY over those.
+
+The rows are kept current by an after_flush listener on every Session: when
+a flush inserts, deletes or changes a Trade field the aggregates depend on,
+the affected days are recomputed from that day's trades inside the same
+transaction. Recomputing a whole day (a handful of trades) keeps the rows
+idempotent however many times a trade is touched. The lifespan backfills
+days that predate the tables and EODCleanupTask refreshes the day once more
+as a reconciliation.
+"""
+
+import logging
+from datetime import date, datetime
+from typing import Iterable, Optional
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import delete, event, insert, inspect, select
+from sqlalchemy.orm import Session
+
+from app.models import DailyPnL, PnLBucket, Trade, TradeStatus
+
+logger = logging.getLogger(__name__)
+
+ET = ZoneInfo("America/New_York")
+UTC = ZoneInfo("UTC")
+
+OPEN_STATUSES = (TradeStatus.FILLED, TradeStatus.STOP_LOSS_PLACED, TradeStatus.EXITING)
+# (label, min minutes inclusive, max minutes exclusive)
+HOLD_BUCKETS = [
+    ("< 5 min", 0, 5),
+    ("5-15 min", 5, 15),
+    ("15-30 min", 15, 30),
+    ("30-60 min", 30, 60),
+    ("60-90 min", 60, 90),
+    ("> 90 min", 90, 9999),
+]
+# Trade fields the aggregates are computed from
+_TRACKED_FIELDS = (
+    "trade_date", "status", "pnl_dollars", "source", "ticker", "entry_filled_at", "exit_filled_at",
+)
+
+
+def hold_bucket(entry_filled_at: Optional[datetime], exit_filled_at: Optional[datetime]) -> Optional[int]:
+    if not entry_filled_at or not exit_filled_at:
+        return None
+    minutes = (exit_filled_at - entry_filled_at).total_seconds() / 60
+    for idx, (_, lo, hi) in enumerate(HOLD_BUCKETS):
+        if lo <= minutes < hi:
+            return idx
+    return None
+
+
+def _entry_hour_et(entry_filled_at: Optional[datetime]) -> Optional[int]:
+    if not entry_filled_at:
+        return None
+    return entry_filled_at.replace(tzinfo=UTC).astimezone(ET).hour
+
+
+def refresh_days(conn, days: Iterable[date]) -> None:
+    """Recompute DailyPnL and PnLBucket rows for the given days on a Connection."""
+    for day in days:
+        rows = conn.execute(
+            select(
+                Trade.status, Trade.pnl_dollars, Trade.source, Trade.ticker,
+                Trade.entry_filled_at, Trade.exit_filled_at,
+            ).where(Trade.trade_date == day)
+        ).all()
+
+        conn.execute(delete(DailyPnL).where(DailyPnL.trade_date == day))
+        conn.execute(delete(PnLBucket).where(PnLBucket.trade_date == day))
+        if not rows:
+            continue
+
+        closed = [r for r in rows if r.status == TradeStatus.CLOSED]
+        conn.execute(insert(DailyPnL).values(
+            trade_date=day,
+            total_trades=sum(1 for r in rows if r.status != TradeStatus.CANCELLED),
+            open_positions=sum(1 for r in rows if r.status in OPEN_STATUSES),
+            closed_trades=len(closed),
+            winning_trades=sum(1 for r in closed if (r.pnl_dollars or 0) > 0),
+            total_pnl=sum(r.pnl_dollars or 0 for r in closed),
+            updated_at=datetime.utcnow(),
+        ))
+
+        buckets: dict[tuple, dict] = {}
+        for r in closed:
+            key = (
+                _entry_hour_et(r.entry_filled_at),
+                r.source or "unknown",
+                r.ticker,
+                hold_bucket(r.entry_filled_at, r.exit_filled_at),
+            )
+            b = buckets.setdefault(key, {
+                "total_trades": 0, "winning_trades": 0, "total_pnl": 0.0, "gross_wins": 0.0, "gross_losses": 0.0,
+            })
+            pnl = r.pnl_dollars or 0
+            b["total_trades"] += 1
+            b["total_pnl"] += pnl
+            if pnl > 0:
+                b["winning_trades"] += 1
+                b["gross_wins"] += pnl
+            else:
+                b["gross_losses"] += abs(pnl)
+        if buckets:
+            conn.execute(insert(PnLBucket), [
+                {"trade_date": day, "hour": hour, "source": source, "ticker": ticker, "hold_bucket": hold, **b}
+                for (hour, source, ticker, hold), b in buckets.items()
+            ])
+
+
+def backfill(db: Session) -> int:
+    """Build aggregates for trade days that have none yet. Returns the number of days built."""
+    missing = db.execute(
+        select(Trade.trade_date).distinct().where(
+            Trade.trade_date.not_in(select(DailyPnL.trade_date))
+        )
+    ).scalars().all()
+    if missing:
+        refresh_days(db.connection(), missing)
+        db.commit()
+        logger.info(f"PnL aggregates backfilled for {len(missing)} day(s)")
+    return len(missing)
+
+
+def _affected_days(session: Session) -> set[date]:
+    days: set[date] = set()
+    for obj in session.new:
+        if isinstance(obj, Trade) and obj.trade_date is not None:
+            days.add(obj.trade_date)
+    for obj in session.deleted:
+        if isinstance(obj, Trade) and obj.trade_date is not None:
+            days.add(obj.trade_date)
+    for obj in session.dirty:
+        if not isinstance(obj, Trade):
+            continue
+        state = inspect(obj)
+        changed = False
+        for field in _TRACKED_FIELDS:
+            history = state.attrs[field].history
+            if history.has_changes():
+                changed = True
+                if field == "trade_date":
+                    days.update(d for d in history.deleted if d is not None)
+        if changed and obj.trade_date is not None:
+            days.add(obj.trade_date)
+    return days
+
+
+@event.listens_for(Session, "after_flush")
+def _refresh_after_flush(session: Session, flush_context) -> None:
+    days = _affected_days(session)
+    if days:
+        refresh_days(session.connection(), sorted(days))
@@ -0,0 +1,148 @@
+"""In-memory book of today's active trades shared by the monitor tasks.
+
+OrderMonitorTask, ExitMonitorTask, PriceRecorderTask and /trades/open/quotes
+each used to query SQLite for today's open trades every few seconds. The
+book loads them once, then follows the trade state changes that
+OrderManager, TradeManager and the trade routes publish on the
+TradeStateBus, so the monitors read positions from memory and only touch
+the database to act on a trade. A full reload every
+POSITION_BOOK_RESYNC_SECONDS is the safety net for any write made outside
+those paths.
+"""
+
+import logging
+import time
+from dataclasses import dataclass
+from datetime import date
+from typing import Callable, Iterable, Optional
+
+from sqlalchemy.orm import Session
+
+from app.config import Settings
+from app.models import Trade, TradeStatus
+
+logger = logging.getLogger(__name__)
+settings = Settings()
+
+# Statuses the monitors care about; anything else drops out of the book
+ACTIVE_STATUSES = (
+    TradeStatus.PENDING,
+    TradeStatus.FILLED,
+    TradeStatus.STOP_LOSS_PLACED,
+    TradeStatus.EXITING,
+)
+# Holding contracts and watched for exits
+OPEN_STATUSES = (TradeStatus.FILLED, TradeStatus.STOP_LOSS_PLACED)
+
+
+@dataclass
+class Position:
+    trade_id: int
+    option_symbol: str
+    ticker: Optional[str]
+    status: TradeStatus
+    highest_price_seen: Optional[float] = None
+
+    @classmethod
+    def from_trade(cls, trade: Trade) -> "Position":
+        return cls(
+            trade_id=trade.id,
+            option_symbol=trade.option_symbol,
+            ticker=trade.ticker,
+            status=trade.status,
+            highest_price_seen=trade.highest_price_seen,
+        )
+
+
+class TradeStateBus:
+    """Synchronous fan-out of committed trade state changes."""
+
+    def __init__(self):
+        self._subscribers: list[Callable[[Trade], None]] = []
+
+    def subscribe(self, callback: Callable[[Trade], None]) -> None:
+        self._subscribers.append(callback)
+
+    def publish(self, trade: Trade) -> None:
+        for callback in self._subscribers:
+            try:
+                callback(trade)
+            except Exception as e:
+                logger.exception(f"TradeStateBus: subscriber failed for trade #{trade.id}: {e}")
+
+
+class PositionBook:
+    """Today's active trades by id, kept current from the TradeStateBus."""
+
+    def __init__(self, bus: Optional[TradeStateBus] = None):
+        self._positions: dict[int, Position] = {}
+        self._day: Optional[date] = None
+        self._loaded_at = 0.0
+        # Bumped whenever the set of positions or a status changes
+        self.version = 0
+        if bus is not None:
+            bus.subscribe(self.apply)
+
+    def reset(self) -> None:
+        self._positions = {}
+        self._day = None
+        self._loaded_at = 0.0
+        self.version += 1
+
+    def ensure_loaded(self, db: Session) -> None:
+        """Load today's active trades on first use, each new day and on the resync interval."""
+        today = date.today()
+        if self._day == today and time.monotonic() - self._loaded_at < settings.POSITION_BOOK_RESYNC_SECONDS:
+            return
+        trades = (
+            db.query(Trade)
+            .filter(Trade.trade_date == today)
+            .filter(Trade.status.in_(ACTIVE_STATUSES))
+            .all()
+        )
+        positions = {t.id: Position.from_trade(t) for t in trades}
+        for trade_id, pos in positions.items():
+            # Keep high-water marks recorded in memory since the last load
+            known = self._positions.get(trade_id)
+            if known and (known.highest_price_seen or 0) > (pos.highest_price_seen or 0):
+                pos.highest_price_seen = known.highest_price_seen
+        self._positions = positions
+        self._day = today
+        self._loaded_at = time.monotonic()
+        self.version += 1
+
+    def apply(self, trade: Trade) -> None:
+        """TradeStateBus subscriber: upsert or drop one trade."""
+        if trade.trade_date != date.today() or trade.status not in ACTIVE_STATUSES:
+            if self._positions.pop(trade.id, None) is not None:
+                self.version += 1
+            return
+        known = self._positions.get(trade.id)
+        pos = Position.from_trade(trade)
+        if known is not None and (known.highest_price_seen or 0) > (pos.highest_price_seen or 0):
+            pos.highest_price_seen = known.highest_price_seen
+        self._positions[trade.id] = pos
+        if known is None or known.status != pos.status or known.option_symbol != pos.option_symbol:
+            self.version += 1
+
+    def positions(self, statuses: Iterable[TradeStatus] = ACTIVE_STATUSES) -> list[Position]:
+        statuses = tuple(statuses)
+        return [p for p in self._positions.values() if p.status in statuses]
+
+    def get(self, trade_id: int) -> Optional[Position]:
+        return self._positions.get(trade_id)
+
+    def raise_high_water(self, trade_id: int, price: float) -> bool:
+        """Record a new highest_price_seen in memory. Returns True if it rose."""
+        pos = self._positions.get(trade_id)
+        if pos is None or price <= (pos.highest_price_seen or 0):
+            return False
+        pos.highest_price_seen = price
+        return True
+
+
+def publish_trade_state(trade: Trade) -> None:
+    """Announce a committed trade state change on the shared TradeStateBus."""
+    from app.dependencies import get_trade_state_bus
+
+    get_trade_state_bus().publish(trade)
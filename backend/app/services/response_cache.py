@@ -0,0 +1,160 @@
+"""In-process cache of polled dashboard responses with ETag revalidation.
+
+The dashboard polls /dashboard/stats, /dashboard/pnl, /dashboard/analytics,
+/trades and /alerts, and each poll used to recompute from SQLite even when
+nothing had changed. ResponseCache keeps the serialized body and a strong
+ETag per endpoint + query string (+ today's date, since several endpoints
+default to it). A matching If-None-Match is answered 304 without touching
+the database.
+
+Entries carry tags for the tables they read and are dropped when:
+  - WebSocketManager broadcasts a trade lifecycle event (trade_created,
+    trade_filled, trade_closed, trade_cancelled, ...), and
+  - a Session commits a write to Trade, Alert or TradePriceSnapshot rows,
+    which also covers the writes that never broadcast (webhook alerts,
+    write-behind snapshots, the high-water UPDATE).
+A response computed while an invalidation happened is not stored.
+"""
+
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date
+from typing import Callable, Iterable
+
+from fastapi import Request, Response
+from pydantic import BaseModel
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.config import Settings
+from app.models import Alert, Trade, TradePriceSnapshot
+
+logger = logging.getLogger(__name__)
+settings = Settings()
+
+# Table -> tag for entries that read it
+_MODEL_TAGS = {Trade: "trades", Alert: "alerts", TradePriceSnapshot: "snapshots"}
+
+
+@dataclass
+class _Entry:
+    etag: str
+    body: bytes
+    tags: frozenset
+
+
+class ResponseCache:
+    def __init__(self):
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._lock = threading.Lock()
+        # Bumped on every invalidation; a build that straddles one isn't stored
+        self._version = 0
+        self.hits = 0
+        self.not_modified = 0
+        self.misses = 0
+
+    def reset(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._version += 1
+            self.hits = self.not_modified = self.misses = 0
+
+    def invalidate(self, tags: Iterable[str]) -> None:
+        tags = set(tags)
+        with self._lock:
+            self._version += 1
+            stale = [key for key, entry in self._entries.items() if entry.tags & tags]
+            for key in stale:
+                del self._entries[key]
+
+    def on_ws_event(self, message: dict) -> None:
+        """WebSocketManager listener: trade lifecycle events change trade-derived responses."""
+        if str(message.get("event", "")).startswith("trade_"):
+            self.invalidate(("trades", "alerts"))
+
+    @staticmethod
+    def _key(request: Request) -> str:
+        query = "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items()))
+        return f"{request.url.path}?{query}#{date.today().isoformat()}"
+
+    def respond(self, request: Request, tags: Iterable[str], build: Callable[[], BaseModel]):
+        """Serve the cached body (or 304) for this request, building it on a miss."""
+        if not settings.RESPONSE_CACHE_ENABLED:
+            return build()
+
+        key = self._key(request)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            version = self._version
+
+        if entry is None:
+            self.misses += 1
+            body = build().model_dump_json().encode()
+            entry = _Entry(f'"{hashlib.sha1(body).hexdigest()}"', body, frozenset(tags))
+            with self._lock:
+                if self._version == version:
+                    self._entries[key] = entry
+                    while len(self._entries) > settings.RESPONSE_CACHE_MAX_ENTRIES:
+                        self._entries.popitem(last=False)
+        else:
+            self.hits += 1
+
+        # Also after a rebuild: an invalidation that changed nothing still revalidates
+        if entry.etag in self._client_etags(request):
+            self.not_modified += 1
+            return Response(status_code=304, headers=self._headers(entry))
+        return Response(content=entry.body, media_type="application/json", headers=self._headers(entry))
+
+    @staticmethod
+    def _client_etags(request: Request) -> set[str]:
+        header = request.headers.get("if-none-match", "")
+        return {tag.strip().removeprefix("W/") for tag in header.split(",") if tag.strip()}
+
+    @staticmethod
+    def _headers(entry: _Entry) -> dict:
+        return {"ETag": entry.etag, "Cache-Control": "private, no-cache"}
+
+
+def _cache() -> ResponseCache:
+    from app.dependencies import get_response_cache
+
+    return get_response_cache()
+
+
+def _mark(session: Session, tag: str) -> None:
+    session.info.setdefault("response_cache_tags", set()).add(tag)
+
+
+@event.listens_for(Session, "after_flush")
+def _tag_flushed_rows(session: Session, flush_context) -> None:
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        tag = _MODEL_TAGS.get(type(obj))
+        if tag is not None:
+            _mark(session, tag)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _tag_bulk_statements(orm_execute_state) -> None:
+    if orm_execute_state.is_select:
+        return
+    mapper = orm_execute_state.bind_mapper
+    tag = _MODEL_TAGS.get(mapper.class_) if mapper is not None else None
+    if tag is not None:
+        _mark(orm_execute_state.session, tag)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session: Session) -> None:
+    tags = session.info.pop("response_cache_tags", None)
+    if tags:
+        _cache().invalidate(tags)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_tags(session: Session) -> None:
+    session.info.pop("response_cache_tags", None)
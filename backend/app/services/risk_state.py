@@ -0,0 +1,190 @@
+"""In-memory pre-trade risk counters for TradeManager's entry gate.
+
+Every alert used to run separate SQLite queries for today's trade count,
+realized PnL, loss streak, per-ticker cooldown and the open position, and
+re-read event_calendar.json from disk. RiskState keeps those answers in
+memory: it loads today's trades once, follows the TradeStateBus (the same
+feed as the PositionBook) and recomputes its counters when a trade opens,
+changes status or closes, so the gate itself only reads attributes. Every
+RISK_STATE_RESYNC_SECONDS it reloads from the database and logs any drift.
+"""
+
+import json
+import logging
+import time
+from dataclasses import dataclass
+from datetime import date, datetime
+from pathlib import Path
+from typing import Optional
+
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+
+from app.config import Settings
+from app.models import Trade, TradeDirection, TradeStatus
+
+logger = logging.getLogger(__name__)
+settings = Settings()
+
+# Trades that block a new entry on the same ticker/direction
+ACTIVE_STATUSES = (TradeStatus.PENDING, TradeStatus.FILLED, TradeStatus.STOP_LOSS_PLACED)
+# Sources that count toward the consecutive-loss pause (manual trades don't)
+SIGNAL_SOURCES = ("tradingview", "orb_auto", "strategy_signal")
+
+
+@dataclass
+class _TradeRecord:
+    trade_id: int
+    trade_date: date
+    ticker: Optional[str]
+    direction: TradeDirection
+    status: TradeStatus
+    source: Optional[str]
+    pnl_dollars: Optional[float]
+    created_at: Optional[datetime]
+    exit_filled_at: Optional[datetime]
+
+    @classmethod
+    def from_trade(cls, trade: Trade) -> "_TradeRecord":
+        return cls(
+            trade_id=trade.id,
+            trade_date=trade.trade_date,
+            ticker=trade.ticker,
+            direction=trade.direction,
+            status=trade.status,
+            source=trade.source,
+            pnl_dollars=trade.pnl_dollars,
+            created_at=trade.created_at,
+            exit_filled_at=trade.exit_filled_at,
+        )
+
+
+class RiskState:
+    """Today's risk counters, kept current from the TradeStateBus."""
+
+    def __init__(self, bus=None):
+        self._trades: dict[int, _TradeRecord] = {}
+        self._day: Optional[date] = None
+        self._loaded_at = 0.0
+        self._calendar: Optional[set[str]] = None
+        self._vix: Optional[float] = None
+        self._vix_at = 0.0
+        self._clear_counters()
+        if bus is not None:
+            bus.subscribe(self.apply)
+
+    def _clear_counters(self) -> None:
+        self.trade_count = 0
+        self.realized_pnl = 0.0
+        self.consecutive_losses = 0
+        self._last_entry_at: dict[Optional[str], datetime] = {}
+        self._open_by_ticker: dict[Optional[str], int] = {}
+        self.active_trade_id: Optional[int] = None
+
+    def reset(self) -> None:
+        self._trades = {}
+        self._day = None
+        self._loaded_at = 0.0
+        self._calendar = None
+        self._vix = None
+        self._vix_at = 0.0
+        self._clear_counters()
+
+    def ensure_loaded(self, db: Session) -> None:
+        """Load on first use, each new day and on the resync interval."""
+        today = date.today()
+        if self._day == today and time.monotonic() - self._loaded_at < settings.RISK_STATE_RESYNC_SECONDS:
+            return
+        trades = (
+            db.query(Trade)
+            .filter(or_(Trade.trade_date == today, Trade.status.in_(ACTIVE_STATUSES)))
+            .all()
+        )
+        resync = self._day == today
+        before = (self.trade_count, round(self.realized_pnl, 2), self.consecutive_losses, self.active_trade_id)
+        self._trades = {t.id: _TradeRecord.from_trade(t) for t in trades}
+        self._day = today
+        self._loaded_at = time.monotonic()
+        self._calendar = None  # Pick up calendar edits on the same cadence
+        self._recompute()
+        after = (self.trade_count, round(self.realized_pnl, 2), self.consecutive_losses, self.active_trade_id)
+        if resync and before != after:
+            logger.warning(
+                f"RiskState drift corrected on resync: (count, pnl, losses, active) {before} -> {after}"
+            )
+
+    def apply(self, trade: Trade) -> None:
+        """TradeStateBus subscriber: upsert one trade and recompute the counters."""
+        if self._day is None:
+            return  # Not loaded yet; the first ensure_loaded picks it up
+        self._trades[trade.id] = _TradeRecord.from_trade(trade)
+        self._recompute()
+
+    def _recompute(self) -> None:
+        self._clear_counters()
+        today = self._day
+        closed_signal: list[_TradeRecord] = []
+        for rec in self._trades.values():
+            if rec.status in ACTIVE_STATUSES and (
+                self.active_trade_id is None or rec.trade_id > self.active_trade_id
+            ):
+                self.active_trade_id = rec.trade_id
+            if rec.trade_date != today:
+                continue
+            if rec.status != TradeStatus.CANCELLED:
+                self.trade_count += 1
+                if rec.created_at is not None:
+                    last = self._last_entry_at.get(rec.ticker)
+                    if last is None or rec.created_at > last:
+                        self._last_entry_at[rec.ticker] = rec.created_at
+            if rec.status in ACTIVE_STATUSES:
+                self._open_by_ticker.setdefault(rec.ticker, rec.trade_id)
+            if rec.status == TradeStatus.CLOSED:
+                self.realized_pnl += rec.pnl_dollars or 0.0
+                if rec.source in SIGNAL_SOURCES:
+                    closed_signal.append(rec)
+        closed_signal.sort(key=lambda r: r.exit_filled_at or datetime.min, reverse=True)
+        for rec in closed_signal:
+            if (rec.pnl_dollars or 0) >= 0:
+                break
+            self.consecutive_losses += 1
+
+    def last_entry_at(self, ticker: str) -> Optional[datetime]:
+        """created_at (naive UTC) of today's latest non-cancelled trade on ticker."""
+        return self._last_entry_at.get(ticker)
+
+    def open_trade_id(self, ticker: str) -> Optional[int]:
+        """Id of one of today's active trades on ticker, if any."""
+        return self._open_by_ticker.get(ticker)
+
+    def event_block(self, day: date) -> tuple[bool, str]:
+        """(is_blocked, description) for an FOMC/CPI afternoon, from the cached calendar."""
+        if self._calendar is None:
+            self._calendar = self._load_calendar()
+        today_str = day.isoformat()
+        if today_str in self._calendar:
+            return True, f"Event day ({today_str})"
+        return False, ""
+
+    @staticmethod
+    def _load_calendar() -> set[str]:
+        cal_path = Path(__file__).resolve().parent.parent / settings.EVENT_CALENDAR_PATH
+        if not cal_path.exists():
+            return set()
+        try:
+            data = json.loads(cal_path.read_text())
+            return set(data.get("blocked_afternoons", []))
+        except Exception as e:
+            logger.warning(f"Event calendar read failed: {e}")
+            return set()
+
+    def cached_vix(self) -> Optional[float]:
+        """Last REST VIX reading, if younger than RISK_VIX_TTL_SECONDS."""
+        if self._vix is not None and time.monotonic() - self._vix_at < settings.RISK_VIX_TTL_SECONDS:
+            return self._vix
+        return None
+
+    def record_vix(self, value: Optional[float]) -> None:
+        if value:
+            self._vix = value
+            self._vix_at = time.monotonic()
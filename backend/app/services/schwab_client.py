@@ -1,8 +1,13 @@
+import asyncio
+import functools
 import json
 import logging
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date
-from typing import Optional
+from typing import Any, Callable, Optional, Union
 from urllib.parse import urlencode
 
 from app.config import Settings
@@ -14,6 +19,13 @@ _client_instance = None
 _dry_run_order_counter = 8000
 _dry_run_orders = {}  # order_id -> order payload
 
+# Option chain cache: {(symbol, contract_type, from, to, strike_count): (chain, fetched_at)}
+# Callers that miss while another thread is fetching the same key wait on its
+# in-flight Event instead of issuing a second request.
+_chain_cache: dict[tuple, tuple[dict, float]] = {}
+_chain_inflight: dict[tuple, threading.Event] = {}
+_chain_lock = threading.Lock()
+
 # Schwab OAuth2 endpoints
 SCHWAB_AUTH_URL = "https://api.schwabapi.com/v1/oauth/authorize"
 SCHWAB_TOKEN_URL = "https://api.schwabapi.com/v1/oauth/token"
@@ -60,6 +72,11 @@ def get_schwab_client():
     return _client_instance
 
 
+def clear_option_chain_cache() -> None:
+    with _chain_lock:
+        _chain_cache.clear()
+
+
 def is_authenticated() -> bool:
     """Check if valid Schwab tokens exist."""
     tokens_db = os.path.expanduser(settings.SCHWAB_TOKENS_DB)
@@ -93,17 +110,76 @@ class SchwabService:
         to_date: Optional[date] = None,
         strike_count: int = 20,
     ) -> dict:
+        return self.get_option_chain_cached(
+            symbol, contract_type, from_date, to_date, strike_count
+        )[0]
+
+    def get_option_chain_cached(
+        self,
+        symbol: str = "SPY",
+        contract_type: str = "CALL",
+        from_date: Optional[date] = None,
+        to_date: Optional[date] = None,
+        strike_count: int = 20,
+    ) -> tuple[dict, bool]:
+        """Return (chain, cache_hit), reusing chains younger than OPTION_CHAIN_CACHE_TTL_SECONDS.
+
+        Concurrent misses for the same key share one request; a waiter whose
+        leader failed fetches for itself. Cached chains are shared — callers
+        must not mutate them.
+        """
         today = date.today()
-        resp = self.client.option_chains(
-            symbol=symbol,
-            contractType=contract_type,
-            fromDate=from_date or today,
-            toDate=to_date or today,
-            strikeCount=strike_count,
-            includeUnderlyingQuote=True,
-        )
-        resp.raise_for_status()
-        return resp.json()
+        key = (symbol, contract_type, from_date or today, to_date or today, strike_count)
+        ttl = settings.OPTION_CHAIN_CACHE_TTL_SECONDS
+
+        def _fresh() -> Optional[dict]:
+            cached = _chain_cache.get(key)
+            if cached and time.monotonic() - cached[1] < ttl:
+                return cached[0]
+            return None
+
+        leader = False
+        if ttl > 0:
+            with _chain_lock:
+                chain = _fresh()
+                if chain is not None:
+                    return chain, True
+                inflight = _chain_inflight.get(key)
+                if inflight is None:
+                    _chain_inflight[key] = threading.Event()
+                    leader = True
+            if not leader:
+                # Another caller is fetching this chain — wait for its result
+                inflight.wait(settings.SCHWAB_CHAIN_TIMEOUT_SECONDS)
+                with _chain_lock:
+                    chain = _fresh()
+                if chain is not None:
+                    return chain, True
+                # Leader failed or timed out; fetch for ourselves
+
+        try:
+            resp = self.client.option_chains(
+                symbol=symbol,
+                contractType=contract_type,
+                fromDate=key[2],
+                toDate=key[3],
+                strikeCount=strike_count,
+                includeUnderlyingQuote=True,
+            )
+            resp.raise_for_status()
+            chain = resp.json()
+            if ttl > 0:
+                now = time.monotonic()
+                with _chain_lock:
+                    # Keys embed the expiry dates, so expired entries would otherwise pile up
+                    for stale in [k for k, (_, at) in _chain_cache.items() if now - at >= ttl]:
+                        del _chain_cache[stale]
+                    _chain_cache[key] = (chain, now)
+            return chain, False
+        finally:
+            if leader:
+                with _chain_lock:
+                    _chain_inflight.pop(key).set()
 
     def place_order(self, order: dict) -> str:
         global _dry_run_order_counter
@@ -169,6 +245,12 @@ class SchwabService:
         resp.raise_for_status()
         return resp.json()
 
+    def get_quotes(self, symbols: list[str]) -> dict:
+        """Quotes for several symbols in one request, keyed by symbol."""
+        resp = self.client.quotes(symbols)
+        resp.raise_for_status()
+        return resp.json()
+
     def get_vix(self) -> Optional[float]:
         """Fetch current VIX level from Schwab quotes."""
         try:
@@ -304,3 +386,174 @@ class SchwabService:
                 }
             ],
         }
+
+
+# ── Async facade ──────────────────────────────────────────────────
+#
+# schwabdev owns the HTTP session (and OAuth token refresh), so the async
+# service runs the blocking calls on a dedicated thread pool instead of
+# opening a second client. Each endpoint class gets its own in-flight limit
+# and timeout; the pool is sized to the sum of the limits so a burst of slow
+# chain or history requests can never take the thread an order call needs.
+
+_api_executor: Optional[ThreadPoolExecutor] = None
+_api_semaphores: dict[str, asyncio.Semaphore] = {}
+_api_semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _endpoint_limits(endpoint: str) -> tuple[int, float]:
+    """(max in-flight calls, timeout seconds) for an endpoint class."""
+    return {
+        "orders": (settings.SCHWAB_ORDER_CONCURRENCY, settings.SCHWAB_ORDER_TIMEOUT_SECONDS),
+        "quotes": (settings.SCHWAB_QUOTE_CONCURRENCY, settings.SCHWAB_QUOTE_TIMEOUT_SECONDS),
+        "chains": (settings.SCHWAB_CHAIN_CONCURRENCY, settings.SCHWAB_CHAIN_TIMEOUT_SECONDS),
+        "history": (settings.SCHWAB_HISTORY_CONCURRENCY, settings.SCHWAB_HISTORY_TIMEOUT_SECONDS),
+    }[endpoint]
+
+
+def _get_api_executor() -> ThreadPoolExecutor:
+    global _api_executor
+    if _api_executor is None:
+        workers = sum(_endpoint_limits(e)[0] for e in ("orders", "quotes", "chains", "history"))
+        _api_executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="schwab-api")
+    return _api_executor
+
+
+def _endpoint_semaphore(endpoint: str) -> asyncio.Semaphore:
+    """Per-endpoint semaphore, shared by every AsyncSchwabService on this loop."""
+    global _api_semaphore_loop
+    loop = asyncio.get_running_loop()
+    if loop is not _api_semaphore_loop:
+        _api_semaphores.clear()
+        _api_semaphore_loop = loop
+    if endpoint not in _api_semaphores:
+        _api_semaphores[endpoint] = asyncio.Semaphore(_endpoint_limits(endpoint)[0])
+    return _api_semaphores[endpoint]
+
+
+class AsyncSchwabService:
+    """Awaitable SchwabService for code running on the event loop.
+
+    Wraps a sync SchwabService; its methods are looked up per call, so
+    patches on the wrapped instance still apply. Instances are meant to live
+    for one monitor tick or request: quotes loaded by prefetch_quotes are
+    served to get_quote until the instance is dropped.
+    """
+
+    build_option_buy_order = staticmethod(SchwabService.build_option_buy_order)
+    build_option_buy_market_order = staticmethod(SchwabService.build_option_buy_market_order)
+    build_option_sell_order = staticmethod(SchwabService.build_option_sell_order)
+    build_stop_loss_order = staticmethod(SchwabService.build_stop_loss_order)
+
+    def __init__(self, service: SchwabService):
+        self.sync = service
+        self._quote_batch: dict[str, dict] = {}
+
+    async def _submit(self, endpoint: str, fn: Callable[..., Any], *args, **kwargs) -> asyncio.Future:
+        """Start fn on the API executor once an endpoint slot is free.
+
+        The slot is held until the worker thread finishes, even when the
+        caller has already given up on a timeout.
+        """
+        semaphore = _endpoint_semaphore(endpoint)
+        await semaphore.acquire()
+        try:
+            future = asyncio.get_running_loop().run_in_executor(
+                _get_api_executor(), functools.partial(fn, *args, **kwargs)
+            )
+        except BaseException:
+            semaphore.release()
+            raise
+
+        def _done(f: asyncio.Future) -> None:
+            semaphore.release()
+            if not f.cancelled():
+                f.exception()  # Mark retrieved when the caller timed out
+
+        future.add_done_callback(_done)
+        return future
+
+    async def run(self, endpoint: str, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run a blocking Schwab call under the endpoint's limit and timeout.
+
+        Only for calls that are safe to abandon; placing and cancelling
+        orders go through run_to_completion.
+        """
+        _, timeout = _endpoint_limits(endpoint)
+        future = await self._submit(endpoint, fn, *args, **kwargs)
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), timeout)
+        except asyncio.TimeoutError:
+            name = getattr(fn, "__name__", repr(fn))
+            logger.warning(f"Schwab {endpoint} call {name} timed out after {timeout}s")
+            raise
+
+    async def run_to_completion(self, endpoint: str, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run a blocking Schwab call under the endpoint's limit, without a timeout.
+
+        For calls that change broker state: giving up on a place_order that
+        still reaches Schwab would leave a live order (or fill) the caller
+        never recorded, so the result is always awaited.
+        """
+        future = await self._submit(endpoint, fn, *args, **kwargs)
+        return await asyncio.shield(future)
+
+    async def get_option_chain(self, *args, **kwargs) -> dict:
+        return await self.run("chains", self.sync.get_option_chain, *args, **kwargs)
+
+    async def get_option_chain_cached(self, *args, **kwargs) -> tuple[dict, bool]:
+        return await self.run("chains", self.sync.get_option_chain_cached, *args, **kwargs)
+
+    async def place_order(self, order: dict) -> str:
+        return await self.run_to_completion("orders", self.sync.place_order, order)
+
+    async def get_order_status(self, order_id: str) -> dict:
+        return await self.run("orders", self.sync.get_order_status, order_id)
+
+    async def cancel_order(self, order_id: str) -> None:
+        return await self.run_to_completion("orders", self.sync.cancel_order, order_id)
+
+    async def get_quote(self, symbol: str) -> dict:
+        if symbol in self._quote_batch:
+            return {symbol: self._quote_batch[symbol]}
+        return await self.run("quotes", self.sync.get_quote, symbol)
+
+    async def get_quotes(self, symbols: list[str]) -> dict:
+        return await self.run("quotes", self.sync.get_quotes, symbols)
+
+    async def prefetch_quotes(self, symbols) -> None:
+        """Load quotes for every symbol a tick needs with one request.
+
+        On failure the batch is left empty and get_quote falls back to
+        single-symbol requests.
+        """
+        missing = sorted({s for s in symbols if s and s not in self._quote_batch})
+        if not missing:
+            return
+        try:
+            self._quote_batch.update(await self.get_quotes(missing))
+        except Exception as e:
+            logger.warning(f"Batched quote fetch for {len(missing)} symbols failed: {e}")
+
+    async def get_vix(self) -> Optional[float]:
+        try:
+            return await self.run("quotes", self.sync.get_vix)
+        except asyncio.TimeoutError:
+            return None
+
+    async def fetch_intraday_bars(self, ticker: str, frequency: int = 5) -> list[dict]:
+        return await self.run("history", self.sync.fetch_intraday_bars, ticker, frequency)
+
+    async def fetch_daily_bars(self, ticker: str, period_months: int = 12) -> list[dict]:
+        return await self.run("history", self.sync.fetch_daily_bars, ticker, period_months)
+
+    async def price_history(self, *args, **kwargs):
+        """Raw schwabdev price_history (caller handles the response)."""
+        return await self.run("history", self.sync.client.price_history, *args, **kwargs)
+
+
+def as_async(service: Union[SchwabService, AsyncSchwabService]) -> AsyncSchwabService:
+    """Accept either flavour of service and return the async one."""
+    if isinstance(service, AsyncSchwabService):
+        return service
+    return AsyncSchwabService(service)
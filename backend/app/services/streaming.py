@@ -10,9 +10,12 @@ import json
 import logging
 import time
 from dataclasses import dataclass, field
-from typing import Optional
+from datetime import datetime
+from typing import Callable, Optional
 
 from app.config import Settings
+from app.services.backtest.market_data import BarData
+from app.services.bar_aggregator import ET
 
 logger = logging.getLogger(__name__)
 settings = Settings()
@@ -26,6 +29,15 @@ OPTION_FIELDS = "0,2,3,4,5,6,7,8,9,10,28,29,30,31"
 # LEVELONE_EQUITIES: 0=Symbol, 1=Bid, 2=Ask, 3=Last, 8=Volume
 EQUITY_FIELDS = "0,1,2,3,8"
 
+# CHART_EQUITY: 0=Symbol, 1=Open, 2=High, 3=Low, 4=Close, 5=Volume,
+# 6=Sequence, 7=Chart Time (epoch ms, bar start), 8=Chart Day
+CHART_FIELDS = "0,1,2,3,4,5,6,7,8"
+
+
+# Option ticks queued for consumers before the oldest are dropped (consumers
+# coalesce by symbol, so a full queue only costs wakeup precision)
+OPTION_TICK_QUEUE_SIZE = 1000
+
 
 # ── Quote cache dataclass ───────────────────────────────────────────
 
@@ -72,9 +84,11 @@ class QuoteSnapshot:
 class StreamingService:
     """Central streaming service managing the Schwab WebSocket."""
 
-    def __init__(self):
+    def __init__(self, bar_aggregator=None):
         self._stream = None
         self._started = False
+        self.bars = bar_aggregator
+        self._chart_symbols: set[str] = set()
 
         # Caches
         self._option_quotes: dict[str, QuoteSnapshot] = {}
@@ -85,6 +99,11 @@ class StreamingService:
         self._option_events: dict[str, asyncio.Event] = {}
         self._equity_events: dict[str, asyncio.Event] = {}
         self._account_event = asyncio.Event()
+        # (symbol, updated_at) for every option quote update — one channel
+        # for all symbols instead of a waiter per symbol
+        self._option_ticks: asyncio.Queue[tuple[str, float]] = asyncio.Queue(maxsize=OPTION_TICK_QUEUE_SIZE)
+        # Called synchronously with every updated option QuoteSnapshot
+        self._option_listeners: list[Callable[[QuoteSnapshot], None]] = []
 
         # Connection tracking
         self._last_message_time: float = 0.0
@@ -150,6 +169,15 @@ class StreamingService:
         await self._stream.send(req)
         logger.info(f"StreamingService: subscribed to equity {symbol}")
 
+    async def subscribe_chart_equity(self, symbol: str):
+        """Subscribe to 1-minute chart bars (feeds the bar aggregator)."""
+        if not self._stream or symbol in self._chart_symbols:
+            return
+        req = self._stream.chart_equity(symbol, CHART_FIELDS, command="ADD")
+        await self._stream.send(req)
+        self._chart_symbols.add(symbol)
+        logger.info(f"StreamingService: subscribed to chart bars for {symbol}")
+
     async def subscribe_account_activity(self):
         """Subscribe to account activity (order fills)."""
         if not self._stream:
@@ -185,6 +213,37 @@ class StreamingService:
         self._account_event.clear()
         return events
 
+    def add_option_listener(self, callback: Callable[[QuoteSnapshot], None]) -> None:
+        self._option_listeners.append(callback)
+
+    def remove_option_listener(self, callback: Callable[[QuoteSnapshot], None]) -> None:
+        if callback in self._option_listeners:
+            self._option_listeners.remove(callback)
+
+    async def wait_option_ticks(self, timeout: float) -> dict[str, float]:
+        """Wait for option quote updates and drain them.
+
+        Returns {symbol: latest update time} for every symbol that ticked
+        since the last call, or {} on timeout.
+        """
+        try:
+            symbol, ts = await asyncio.wait_for(self._option_ticks.get(), timeout)
+        except asyncio.TimeoutError:
+            return {}
+        ticks = {symbol: ts}
+        while not self._option_ticks.empty():
+            symbol, ts = self._option_ticks.get_nowait()
+            ticks[symbol] = ts
+        return ticks
+
+    async def wait_account_activity(self, timeout: float) -> bool:
+        """Wait for queued account activity. Returns False on timeout."""
+        try:
+            await asyncio.wait_for(self._account_event.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
     # ── Message handler ──────────────────────────────────────────
 
     async def _on_message(self, message: str):
@@ -225,6 +284,8 @@ class StreamingService:
                 self._process_option_quotes(contents)
             elif service == "LEVELONE_EQUITIES":
                 self._process_equity_quotes(contents)
+            elif service == "CHART_EQUITY":
+                self._process_chart_equity(contents)
             elif service == "ACCT_ACTIVITY":
                 self._process_account_activity(contents)
 
@@ -269,6 +330,14 @@ class StreamingService:
             event = self._option_events.get(symbol)
             if event:
                 event.set()
+            if self._option_ticks.full():
+                self._option_ticks.get_nowait()
+            self._option_ticks.put_nowait((symbol, now))
+            for callback in self._option_listeners:
+                try:
+                    callback(snap)
+                except Exception as e:
+                    logger.exception(f"StreamingService: option listener failed for {symbol}: {e}")
 
     def _process_equity_quotes(self, contents: list):
         now = time.time()
@@ -292,6 +361,24 @@ class StreamingService:
             if event:
                 event.set()
 
+    def _process_chart_equity(self, contents: list):
+        if self.bars is None:
+            return
+        for entry in contents:
+            try:
+                bar = BarData(
+                    timestamp=datetime.fromtimestamp(int(entry["7"]) / 1000, tz=ET),
+                    open=float(entry["1"]),
+                    high=float(entry["2"]),
+                    low=float(entry["3"]),
+                    close=float(entry["4"]),
+                    volume=int(float(entry.get("5", 0))),
+                )
+            except (KeyError, TypeError, ValueError):
+                logger.debug(f"StreamingService: incomplete chart bar: {entry}")
+                continue
+            self.bars.add_minute_bar(entry.get("key", ""), bar)
+
     def _process_account_activity(self, contents: list):
         for entry in contents:
             self._account_events.append(entry)
@@ -16,7 +16,14 @@ def log_trade_event(
     event_type: TradeEventType,
     message: str,
     details: Optional[Dict[str, Any]] = None,
+    write_behind: bool = False,
 ) -> TradeEvent:
+    """Record a trade event.
+
+    With write_behind=True the row goes through the BulkWriter instead of
+    this session: for audit-only events on hot paths (exit checks) that
+    don't need to commit atomically with a trade state change.
+    """
     event = TradeEvent(
         trade_id=trade_id,
         timestamp=datetime.utcnow(),
@@ -24,7 +31,12 @@ def log_trade_event(
         message=message,
         details=json.dumps(details) if details else None,
     )
-    db.add(event)
-    db.flush()
+    if write_behind:
+        from app.dependencies import get_bulk_writer
+
+        get_bulk_writer().add_event(trade_id, event_type, message, details, timestamp=event.timestamp)
+    else:
+        db.add(event)
+        db.flush()
     logger.debug(f"Trade #{trade_id} event: {event_type.value} - {message}")
     return event
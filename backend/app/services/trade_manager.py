@@ -1,11 +1,12 @@
 from __future__ import annotations
 
+import asyncio
 import logging
+import time as _time
 from datetime import date, datetime, time, timedelta, timezone
-from typing import Optional
+from typing import Optional, Union
 from zoneinfo import ZoneInfo
 
-from sqlalchemy import func
 from sqlalchemy.orm import Session
 
 from app.config import Settings
@@ -13,7 +14,9 @@ from app.models import Alert, AlertStatus, ExitReason, Trade, TradeDirection, Tr
 from app.schemas import TradingViewAlert, WebhookResponse
 from app.services.delta_resolver import DeltaResolution, DeltaResolver
 from app.services.option_selector import IVRankTooHighError, OptionSelector, _0DTE_TICKERS
-from app.services.schwab_client import SchwabService
+from app.services.position_book import publish_trade_state
+from app.services.risk_state import ACTIVE_STATUSES, RiskState
+from app.services.schwab_client import AsyncSchwabService, SchwabService, as_async
 from app.services.strategy_adapter import StrategyAdapter
 from app.services.trade_events import log_trade_event
 from app.services.ws_manager import WebSocketManager
@@ -21,18 +24,16 @@ from app.services.ws_manager import WebSocketManager
 logger = logging.getLogger(__name__)
 settings = Settings()
 
-ACTIVE_STATUSES = [TradeStatus.PENDING, TradeStatus.FILLED, TradeStatus.STOP_LOSS_PLACED]
-
 
 class TradeManager:
     def __init__(
         self,
-        schwab_service: SchwabService,
+        schwab_service: Union[SchwabService, AsyncSchwabService],
         option_selector: OptionSelector,
         ws_manager: WebSocketManager,
         app=None,
     ):
-        self.schwab = schwab_service
+        self.schwab = as_async(schwab_service)
         self.selector = option_selector
         self.ws_manager = ws_manager
         self.app = app
@@ -49,42 +50,24 @@ class TradeManager:
 
         Returns (is_blocked, event_description).
         """
-        import json
-        from pathlib import Path
+        from app.dependencies import get_risk_state
 
-        cal_path = Path(__file__).resolve().parent.parent / settings.EVENT_CALENDAR_PATH
-        if not cal_path.exists():
-            return False, ""
+        return get_risk_state().event_block(date.today())
 
-        try:
-            data = json.loads(cal_path.read_text())
-            blocked = data.get("blocked_afternoons", [])
-            today_str = date.today().isoformat()
-            if today_str in blocked:
-                return True, f"Event day ({today_str})"
-        except Exception as e:
-            logger.warning(f"Event calendar read failed: {e}")
-        return False, ""
+    @staticmethod
+    def _risk_state(db: Session) -> RiskState:
+        """The shared pre-trade risk counters, loaded/resynced from db as needed."""
+        from app.dependencies import get_risk_state
+
+        risk = get_risk_state()
+        risk.ensure_loaded(db)
+        return risk
 
     def get_daily_trade_count(self, db: Session) -> int:
-        today = date.today()
-        count = (
-            db.query(func.count(Trade.id))
-            .filter(Trade.trade_date == today)
-            .filter(Trade.status != TradeStatus.CANCELLED)
-            .scalar()
-        )
-        return count or 0
+        return self._risk_state(db).trade_count
 
     def get_daily_pnl(self, db: Session) -> float:
-        today = date.today()
-        total = (
-            db.query(func.sum(Trade.pnl_dollars))
-            .filter(Trade.trade_date == today)
-            .filter(Trade.status == TradeStatus.CLOSED)
-            .scalar()
-        )
-        return total or 0.0
+        return self._risk_state(db).realized_pnl
 
     def _get_consecutive_losses(self, db: Session) -> int:
         """Count consecutive losses from the most recent closed trades today.
@@ -92,24 +75,17 @@ class TradeManager:
         Only counts signal-based trades (tradingview, orb_auto); manual trades
         (retake, test, etc.) are ignored so they don't trigger the pause.
         """
-        recent_closed = (
-            db.query(Trade)
-            .filter(Trade.trade_date == date.today())
-            .filter(Trade.status == TradeStatus.CLOSED)
-            .filter(Trade.source.in_(["tradingview", "orb_auto", "strategy_signal"]))
-            .order_by(Trade.exit_filled_at.desc())
-            .all()
-        )
-        count = 0
-        for t in recent_closed:
-            if (t.pnl_dollars or 0) < 0:
-                count += 1
-            else:
-                break
-        return count
+        return self._risk_state(db).consecutive_losses
 
     def _get_active_trade(self, db: Session) -> Trade | None:
         """Get the most recent active (open) trade."""
+        trade_id = self._risk_state(db).active_trade_id
+        if trade_id is None:
+            return None
+        trade = db.get(Trade, trade_id)
+        if trade is not None and trade.status in ACTIVE_STATUSES:
+            return trade
+        # Changed outside the TradeStateBus since the last resync
         return (
             db.query(Trade)
             .filter(Trade.status.in_(ACTIVE_STATUSES))
@@ -117,10 +93,31 @@ class TradeManager:
             .first()
         )
 
-    def _compute_live_atr(self, ticker: str, period: int = 14) -> Optional[float]:
-        """Compute current ATR from today's intraday bars (Wilder smoothing)."""
+    async def _get_vix(self) -> Optional[float]:
+        """VIX from the stream cache, else a REST reading reused for RISK_VIX_TTL_SECONDS."""
+        from app.dependencies import get_risk_state, get_streaming_service
+
+        streaming = get_streaming_service()
+        vix_snap = streaming.get_equity_quote("$VIX.X")
+        if vix_snap and not vix_snap.is_stale and vix_snap.last > 0:
+            return vix_snap.last
+        risk = get_risk_state()
+        vix = risk.cached_vix()
+        if vix is None:
+            vix = await self.schwab.get_vix()
+            risk.record_vix(vix)
+        return vix
+
+    async def _compute_live_atr(
+        self, ticker: str, period: int = 14, candles: Optional[list[dict]] = None,
+    ) -> Optional[float]:
+        """Compute current ATR from today's intraday bars (Wilder smoothing).
+
+        Pass candles already fetched for this entry to skip the bar request.
+        """
         try:
-            candles = self.schwab.fetch_intraday_bars(ticker, frequency=5)
+            if candles is None:
+                candles = await self.schwab.fetch_intraday_bars(ticker, frequency=5)
             if len(candles) < period + 1:
                 return None
             trs: list[float] = []
@@ -138,33 +135,82 @@ class TradeManager:
             logger.warning(f"ATR computation failed for {ticker}: {e}")
             return None
 
-    def _resolve_delta(
+    @staticmethod
+    def _signal_type(alert: TradingViewAlert, strategy_params: dict | None) -> Optional[str]:
+        if strategy_params and strategy_params.get("signal_type"):
+            return strategy_params["signal_type"]
+        if alert.source == "orb_auto":
+            return "orb"
+        return None
+
+    @staticmethod
+    async def _timed(timings: dict[str, float], stage: str, awaitable):
+        """Await and record the stage's wall time (ms) in timings."""
+        start = _time.perf_counter()
+        try:
+            return await awaitable
+        finally:
+            timings[stage] = round((_time.perf_counter() - start) * 1000, 1)
+
+    async def _prefetch_entry_data(
+        self, alert: TradingViewAlert, strategy_params: dict | None, timings: dict[str, float],
+    ) -> Optional[list[dict]]:
+        """Run the entry's independent fetches concurrently.
+
+        Fetches today's 5-min bars once (shared by live ATR and the regime
+        classifier) while warming the option chain and IV-rank history caches
+        that select_contract reads. Returns the bars, or None if not needed
+        or the fetch failed.
+        """
+        async def fetch_bars():
+            if not (
+                settings.ATR_STOP_ENABLED
+                or (settings.DYNAMIC_DELTA_ENABLED and self._signal_type(alert, strategy_params))
+            ):
+                return None
+            try:
+                return await self.schwab.fetch_intraday_bars(alert.ticker, frequency=5)
+            except Exception as e:
+                logger.warning(f"Intraday bar fetch failed for {alert.ticker}: {e}")
+                return None
+
+        # Cache warming is best-effort: select_contract fetches anything missing
+        candles, _, _ = await asyncio.gather(
+            self._timed(timings, "bars", fetch_bars()),
+            self._timed(timings, "chain_prefetch", self.schwab.run(
+                "chains", self.selector.warm_chain, alert.direction.value, alert.ticker,
+            )),
+            self._timed(timings, "iv_history", self.schwab.run(
+                "history", self.selector.warm_iv_history, alert.ticker,
+            )),
+            return_exceptions=True,
+        )
+        return None if isinstance(candles, BaseException) else candles
+
+    async def _resolve_delta(
         self, alert: TradingViewAlert, strategy_params: dict | None = None,
+        candles: Optional[list[dict]] = None,
     ) -> Optional[DeltaResolution]:
         """Resolve dynamic delta target based on regime, expected move, VIX,
         and time-of-day.
 
         Returns the full DeltaResolution (with regime, VIX, confidence),
         or None when dynamic delta is disabled or resolution fails.
+        Pass candles already fetched for this entry to skip the bar request.
         """
         if not settings.DYNAMIC_DELTA_ENABLED:
             return None
 
         import pandas as pd
 
-        # Extract signal_type
-        signal_type = None
-        if strategy_params and strategy_params.get("signal_type"):
-            signal_type = strategy_params["signal_type"]
-        elif alert.source == "orb_auto":
-            signal_type = "orb"
-
+        signal_type = self._signal_type(alert, strategy_params)
         if not signal_type:
             return None
 
         try:
             # Fetch bars and build DataFrame
-            candles = self.schwab.fetch_intraday_bars(alert.ticker, frequency=5)
+            if candles is None:
+                candles = await self.schwab.fetch_intraday_bars(alert.ticker, frequency=5)
             if len(candles) < 21:
                 logger.info(f"Delta resolver: only {len(candles)} bars, using default delta")
                 return None
@@ -179,28 +225,22 @@ class TradeManager:
             atr_period = (
                 strategy_params.get("atr_period") if strategy_params else None
             ) or settings.ATR_PERIOD_DEFAULT
-            atr = self._compute_live_atr(alert.ticker, period=atr_period)
+            atr = await self._compute_live_atr(alert.ticker, period=atr_period, candles=candles)
 
             # Hold horizon in minutes
             hold_minutes = (
                 strategy_params.get("param_max_hold_minutes") if strategy_params else None
             ) or settings.MAX_HOLD_MINUTES
 
-            # Fetch VIX (streaming-first, REST fallback)
-            from app.dependencies import get_streaming_service
-
-            streaming = get_streaming_service()
-            vix_snap = streaming.get_equity_quote("$VIX.X")
-            if vix_snap and not vix_snap.is_stale and vix_snap.last > 0:
-                vix = vix_snap.last
-            else:
-                vix = self.schwab.get_vix()
+            # VIX (streaming-first, else a recent REST reading)
+            vix = await self._get_vix()
 
             # Current ET time
             now_et_time = datetime.now(ZoneInfo("America/New_York")).time()
 
-            resolver = DeltaResolver()
-            resolution = resolver.resolve(
+            # Regime classification is pandas work; keep it off the event loop
+            resolution = await asyncio.to_thread(
+                DeltaResolver().resolve,
                 signal_type=signal_type,
                 df=df,
                 vix=vix,
@@ -229,7 +269,7 @@ class TradeManager:
         # Cancel stop-loss if present
         if trade.stop_loss_order_id:
             try:
-                self.schwab.cancel_order(trade.stop_loss_order_id)
+                await self.schwab.cancel_order(trade.stop_loss_order_id)
                 log_trade_event(
                     db, trade.id, TradeEventType.STOP_LOSS_CANCELLED,
                     f"Stop-loss order {trade.stop_loss_order_id} cancelled",
@@ -247,7 +287,7 @@ class TradeManager:
             quantity=remaining_qty,
             order_type="MARKET",
         )
-        order_id = self.schwab.place_order(sell_order)
+        order_id = await self.schwab.place_order(sell_order)
 
         trade.exit_order_id = order_id
         trade.exit_reason = reason
@@ -259,6 +299,7 @@ class TradeManager:
             details={"order_id": order_id, "exit_reason": reason.value, "order_type": "MARKET", "quantity": remaining_qty},
         )
         db.flush()
+        publish_trade_state(trade)
 
         logger.info(f"Trade #{trade.id}: closing ({reason.value}), market sell order={order_id}")
 
@@ -313,14 +354,7 @@ class TradeManager:
         # 0b. VIX circuit breaker — block all new trades when VIX is elevated
         if settings.VIX_CIRCUIT_BREAKER > 0:
             try:
-                from app.dependencies import get_streaming_service
-                streaming = get_streaming_service()
-                vix_snap = streaming.get_equity_quote("$VIX.X")
-                if vix_snap and not vix_snap.is_stale and vix_snap.last > 0:
-                    current_vix = vix_snap.last
-                else:
-                    current_vix = self.schwab.get_vix()
-
+                current_vix = await self._get_vix()
                 if current_vix and current_vix >= settings.VIX_CIRCUIT_BREAKER:
                     db_alert.status = AlertStatus.REJECTED
                     db_alert.rejection_reason = (
@@ -397,20 +431,14 @@ class TradeManager:
             )
 
         # 1d. Trade cooldown — per-ticker: reject if last trade for this ticker was too recent
+        # (created_at is naive UTC)
         cooldown_cutoff = datetime.now(timezone.utc) - timedelta(minutes=settings.TRADE_COOLDOWN_MINUTES)
-        recent_trade = (
-            db.query(Trade)
-            .filter(Trade.trade_date == date.today())
-            .filter(Trade.ticker == alert.ticker)
-            .filter(Trade.status != TradeStatus.CANCELLED)
-            .filter(Trade.created_at >= cooldown_cutoff)
-            .first()
-        )
-        if recent_trade:
+        last_entry_at = self._risk_state(db).last_entry_at(alert.ticker)
+        if last_entry_at and last_entry_at.replace(tzinfo=timezone.utc) >= cooldown_cutoff:
             db_alert.status = AlertStatus.REJECTED
             db_alert.rejection_reason = f"Trade cooldown ({settings.TRADE_COOLDOWN_MINUTES} min)"
             db.commit()
-            logger.info(f"Trade rejected: cooldown active for {alert.ticker} (trade #{recent_trade.id} is recent)")
+            logger.info(f"Trade rejected: cooldown active for {alert.ticker} (last entry {last_entry_at:%H:%M:%S} UTC)")
             return WebhookResponse(
                 status="rejected",
                 message=f"Trade cooldown for {alert.ticker}: must wait {settings.TRADE_COOLDOWN_MINUTES} min between trades",
@@ -418,13 +446,8 @@ class TradeManager:
 
         # 1d2. Duplicate ticker guard — block if any open position exists on the
         # same ticker (any direction). Wait for it to close before opening another.
-        correlated_trade = (
-            db.query(Trade)
-            .filter(Trade.trade_date == date.today())
-            .filter(Trade.ticker == alert.ticker)
-            .filter(Trade.status.in_(ACTIVE_STATUSES))
-            .first()
-        )
+        open_trade_id = self._risk_state(db).open_trade_id(alert.ticker)
+        correlated_trade = db.get(Trade, open_trade_id) if open_trade_id else None
         if correlated_trade:
             db_alert.status = AlertStatus.REJECTED
             db_alert.rejection_reason = (
@@ -483,28 +506,42 @@ class TradeManager:
 
         # 2. Handle existing positions
         active_trade = self._get_active_trade(db)
+        if active_trade and active_trade.direction == alert.direction:
+            # Same direction already open — reject (#2)
+            db_alert.status = AlertStatus.REJECTED
+            db_alert.rejection_reason = f"Already in {alert.direction.value} position (trade #{active_trade.id})"
+            db.commit()
+            logger.info(f"Trade rejected: already in {alert.direction.value} (trade #{active_trade.id})")
+            return WebhookResponse(
+                status="rejected",
+                message=f"Already in {alert.direction.value} position",
+            )
+
+        # 2a. Start the entry's independent fetches (bars, chain, IV history);
+        # they overlap the reverse close below
+        timings: dict[str, float] = {}
+        pipeline_start = _time.perf_counter()
+        prefetch = asyncio.ensure_future(self._prefetch_entry_data(alert, strategy_params, timings))
+
         if active_trade:
-            if active_trade.direction == alert.direction:
-                # Same direction already open — reject (#2)
-                db_alert.status = AlertStatus.REJECTED
-                db_alert.rejection_reason = f"Already in {alert.direction.value} position (trade #{active_trade.id})"
-                db.commit()
-                logger.info(f"Trade rejected: already in {alert.direction.value} (trade #{active_trade.id})")
-                return WebhookResponse(
-                    status="rejected",
-                    message=f"Already in {alert.direction.value} position",
-                )
-            else:
-                # Opposite direction — close existing, then open new (#1)
-                logger.info(f"Reverse signal: closing {active_trade.direction.value} trade #{active_trade.id} for new {alert.direction.value}")
+            # Opposite direction — close existing, then open new (#1)
+            logger.info(f"Reverse signal: closing {active_trade.direction.value} trade #{active_trade.id} for new {alert.direction.value}")
+            try:
                 await self._close_trade(
                     db, active_trade, ExitReason.SIGNAL,
                     f"Reverse signal: closing {active_trade.direction.value} for incoming {alert.direction.value}",
                 )
-                db.flush()
+            except BaseException:
+                prefetch.cancel()
+                raise
+            db.flush()
+
+        candles = await prefetch
 
         # 2b. Resolve dynamic delta + regime context
-        resolution = self._resolve_delta(alert, strategy_params)
+        resolution = await self._timed(
+            timings, "delta", self._resolve_delta(alert, strategy_params, candles=candles),
+        )
         delta_target = resolution.delta_target if resolution else None
 
         # 2c. Adapt strategy params based on regime/volatility
@@ -514,12 +551,14 @@ class TradeManager:
 
         # 3. Select option contract (0DTE for SPY/QQQ, weekly for others)
         try:
-            contract = self.selector.select_contract(
+            contract = await self._timed(timings, "select", self.schwab.run(
+                "chains",
+                self.selector.select_contract,
                 direction=alert.direction.value,
                 underlying_price=alert.price,
                 ticker=alert.ticker,
                 delta_target=delta_target,
-            )
+            ))
         except IVRankTooHighError as e:
             db_alert.status = AlertStatus.REJECTED
             db_alert.rejection_reason = str(e)
@@ -558,7 +597,7 @@ class TradeManager:
             strategy_params.get("atr_period") if strategy_params else None
         ) or settings.ATR_PERIOD_DEFAULT
         atr_value = (
-            self._compute_live_atr(alert.ticker, period=atr_period)
+            await self._compute_live_atr(alert.ticker, period=atr_period, candles=candles)
             if settings.ATR_STOP_ENABLED
             else None
         )
@@ -615,7 +654,9 @@ class TradeManager:
                 quantity=quantity,
                 limit_price=entry_limit_price,
             )
-        order_id = self.schwab.place_order(order)
+        order_id = await self._timed(timings, "order", self.schwab.place_order(order))
+        timings["total"] = round((_time.perf_counter() - pipeline_start) * 1000, 1)
+        logger.info(f"Entry pipeline timings (ms): {timings}")
 
         # 5. Create trade record
         source = alert.source if alert.source else "tradingview"
@@ -667,6 +708,8 @@ class TradeManager:
                 "symbol": contract.symbol, "strike": contract.strike,
                 "delta": contract.delta, "bid": contract.bid, "ask": contract.ask,
                 "spread_percent": round(contract.spread_percent, 1),
+                "chain_cache_hit": contract.chain_cache_hit,
+                "chain_fetch_ms": contract.chain_fetch_ms,
             },
         )
         atr_info = f", ATR={atr_value:.4f}x{atr_stop_mult}" if atr_value else ""
@@ -678,6 +721,7 @@ class TradeManager:
                     "order_id": order_id, "order_type": "MARKET",
                     "mid_price": mid_price, "quantity": quantity,
                     "atr_value": atr_value, "atr_stop_mult": atr_stop_mult,
+                    "timings_ms": timings,
                 },
             )
         else:
@@ -692,6 +736,7 @@ class TradeManager:
                     "timeout_minutes": settings.ENTRY_LIMIT_TIMEOUT_MINUTES,
                     "quantity": quantity,
                     "atr_value": atr_value, "atr_stop_mult": atr_stop_mult,
+                    "timings_ms": timings,
                 },
             )
 
@@ -699,6 +744,7 @@ class TradeManager:
         db_alert.status = AlertStatus.PROCESSED
         db_alert.trade_id = trade.id
         db.commit()
+        publish_trade_state(trade)
 
         price_str = "MARKET" if self._use_market_orders else f"{entry_limit_price:.2f}"
         logger.info(
@@ -762,13 +808,7 @@ class TradeManager:
         # VIX circuit breaker
         if settings.VIX_CIRCUIT_BREAKER > 0:
             try:
-                from app.dependencies import get_streaming_service
-                streaming = get_streaming_service()
-                vix_snap = streaming.get_equity_quote("$VIX.X")
-                if vix_snap and not vix_snap.is_stale and vix_snap.last > 0:
-                    current_vix = vix_snap.last
-                else:
-                    current_vix = self.schwab.get_vix()
+                current_vix = await self._get_vix()
                 if current_vix and current_vix >= settings.VIX_CIRCUIT_BREAKER:
                     return WebhookResponse(
                         status="rejected",
@@ -794,7 +834,7 @@ class TradeManager:
             return WebhookResponse(status="rejected", message=f"Already in {direction.value} position (trade #{active_trade.id})")
 
         # Get current underlying price
-        quote_data = self.schwab.get_quote(retake_ticker)
+        quote_data = await self.schwab.get_quote(retake_ticker)
         underlying_price = quote_data.get(retake_ticker, {}).get("quote", {}).get("lastPrice")
         if not underlying_price:
             return WebhookResponse(status="rejected", message=f"Could not get current {retake_ticker} price")
@@ -805,7 +845,10 @@ class TradeManager:
             secret=settings.WEBHOOK_SECRET, price=underlying_price,
             source="retake",
         )
-        resolution = self._resolve_delta(retake_alert)
+        timings: dict[str, float] = {}
+        pipeline_start = _time.perf_counter()
+        candles = await self._prefetch_entry_data(retake_alert, None, timings)
+        resolution = await self._timed(timings, "delta", self._resolve_delta(retake_alert, candles=candles))
         delta_target = resolution.delta_target if resolution else None
 
         # Adapt strategy params based on regime/volatility
@@ -815,7 +858,14 @@ class TradeManager:
 
         # Select fresh option contract
         try:
-            contract = self.selector.select_contract(direction=direction.value, underlying_price=underlying_price, ticker=retake_ticker, delta_target=delta_target)
+            contract = await self._timed(timings, "select", self.schwab.run(
+                "chains",
+                self.selector.select_contract,
+                direction=direction.value,
+                underlying_price=underlying_price,
+                ticker=retake_ticker,
+                delta_target=delta_target,
+            ))
         except IVRankTooHighError as e:
             logger.info(f"Retake rejected: {e}")
             return WebhookResponse(status="rejected", message=str(e))
@@ -833,7 +883,7 @@ class TradeManager:
 
         # ATR computation (Fix 3)
         atr_value = (
-            self._compute_live_atr(retake_ticker, period=settings.ATR_PERIOD_DEFAULT)
+            await self._compute_live_atr(retake_ticker, period=settings.ATR_PERIOD_DEFAULT, candles=candles)
             if settings.ATR_STOP_ENABLED
             else None
         )
@@ -867,7 +917,8 @@ class TradeManager:
                 quantity=quantity,
                 limit_price=entry_limit_price,
             )
-        order_id = self.schwab.place_order(order)
+        order_id = await self._timed(timings, "order", self.schwab.place_order(order))
+        timings["total"] = round((_time.perf_counter() - pipeline_start) * 1000, 1)
 
         # Create new trade
         trade = Trade(
@@ -912,6 +963,8 @@ class TradeManager:
                 "symbol": contract.symbol, "strike": contract.strike,
                 "delta": contract.delta, "bid": contract.bid, "ask": contract.ask,
                 "spread_percent": round(contract.spread_percent, 1),
+                "chain_cache_hit": contract.chain_cache_hit,
+                "chain_fetch_ms": contract.chain_fetch_ms,
             },
         )
         if self._use_market_orders:
@@ -921,6 +974,7 @@ class TradeManager:
                 details={
                     "order_id": order_id, "order_type": "MARKET",
                     "mid_price": mid_price, "quantity": quantity,
+                    "timings_ms": timings,
                 },
             )
         else:
@@ -934,10 +988,12 @@ class TradeManager:
                     "mid_price": mid_price, "discount_percent": settings.ENTRY_LIMIT_BELOW_PERCENT,
                     "timeout_minutes": settings.ENTRY_LIMIT_TIMEOUT_MINUTES,
                     "quantity": quantity,
+                    "timings_ms": timings,
                 },
             )
 
         db.commit()
+        publish_trade_state(trade)
 
         retake_price_str = "MARKET" if self._use_market_orders else f"{entry_limit_price:.2f}"
         logger.info(
@@ -1,6 +1,6 @@
 import json
 import logging
-from typing import List
+from typing import Callable, List
 
 from fastapi import WebSocket
 
@@ -10,6 +10,11 @@ logger = logging.getLogger(__name__)
 class WebSocketManager:
     def __init__(self):
         self.active_connections: List[WebSocket] = []
+        self._listeners: List[Callable[[dict], None]] = []
+
+    def add_listener(self, callback: Callable[[dict], None]) -> None:
+        """Call back with every broadcast message, whether or not clients are connected."""
+        self._listeners.append(callback)
 
     async def connect(self, websocket: WebSocket):
         await websocket.accept()
@@ -22,6 +27,11 @@ class WebSocketManager:
         logger.info(f"WebSocket client disconnected. Total: {len(self.active_connections)}")
 
     async def broadcast(self, message: dict):
+        for callback in self._listeners:
+            try:
+                callback(message)
+            except Exception as e:
+                logger.exception(f"WebSocketManager: listener failed for {message.get('event')}: {e}")
         if not self.active_connections:
             return
         payload = json.dumps(message)
@@ -87,19 +87,21 @@ class DataRecorderTask:
         return count
 
     async def _record_snapshot(self, db):
-        from app.services.schwab_client import SchwabService
-
-        schwab = SchwabService(self.app.state.schwab_client)
-
-        call_chain = schwab.get_option_chain(
-            symbol="SPY",
-            contract_type="CALL",
-            strike_count=settings.DATA_RECORDER_STRIKE_COUNT,
-        )
-        put_chain = schwab.get_option_chain(
-            symbol="SPY",
-            contract_type="PUT",
-            strike_count=settings.DATA_RECORDER_STRIKE_COUNT,
+        from app.services.schwab_client import AsyncSchwabService, SchwabService
+
+        schwab = AsyncSchwabService(SchwabService(self.app.state.schwab_client))
+
+        call_chain, put_chain = await asyncio.gather(
+            schwab.get_option_chain(
+                symbol="SPY",
+                contract_type="CALL",
+                strike_count=settings.DATA_RECORDER_STRIKE_COUNT,
+            ),
+            schwab.get_option_chain(
+                symbol="SPY",
+                contract_type="PUT",
+                strike_count=settings.DATA_RECORDER_STRIKE_COUNT,
+            ),
         )
 
         underlying_price = call_chain.get("underlyingPrice")
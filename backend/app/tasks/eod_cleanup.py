@@ -6,6 +6,7 @@ import pytz
 
 from app.database import SessionLocal
 from app.models import DailySummary, Trade, TradeStatus
+from app.services.pnl_aggregates import refresh_days
 
 logger = logging.getLogger(__name__)
 ET = pytz.timezone("US/Eastern")
@@ -81,6 +82,8 @@ class EODCleanupTask:
                         ),
                     )
                     db.merge(summary)
+                    # Reconcile the dashboard aggregates for the day
+                    refresh_days(db.connection(), [today])
                     db.commit()
                     logger.info(
                         f"EOD summary {today}: {len(closed)} trades, "
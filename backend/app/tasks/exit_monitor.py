@@ -1,105 +1,106 @@
 import asyncio
 import logging
-from datetime import date
+import time
 
 from app.config import Settings
 from app.database import SessionLocal
-from app.models import Trade, TradeStatus
+from app.models import Trade
+from app.services.position_book import OPEN_STATUSES
 
 logger = logging.getLogger(__name__)
 settings = Settings()
 
 
-async def _wait_any_event(events: list[asyncio.Event], timeout: float):
-    """Wait until any event is set, or timeout expires."""
-
-    async def _wait_single(evt: asyncio.Event):
-        await evt.wait()
-
-    tasks = [asyncio.create_task(_wait_single(e)) for e in events]
-    try:
-        await asyncio.wait(tasks, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
-    finally:
-        for t in tasks:
-            t.cancel()
-
-
 class ExitMonitorTask:
     """Evaluates exit conditions for open positions.
 
-    When streaming is active, wakes immediately on any subscribed option
-    price change. Falls back to EXIT_CHECK_INTERVAL_SECONDS timer otherwise.
+    When streaming is active, wakes on the streaming service's option tick
+    channel and evaluates only the trades whose option actually ticked. A
+    full sweep of every open position (which also covers time-based exits)
+    runs every EXIT_CHECK_INTERVAL_SECONDS, and is the only mode when
+    streaming is down. Open positions come from the shared PositionBook.
     """
 
     def __init__(self, app):
         self.app = app
+        # Open positions: option symbol -> ids of today's open trades on it,
+        # rebuilt whenever the PositionBook version changes
+        self._positions: dict[str, set[int]] = {}
+        self._book_version: int | None = None
+        self._subscribed: set[str] = set()
+
+    async def _refresh_positions(self, book, streaming):
+        if book.version == self._book_version:
+            return
+        self._book_version = book.version
+        positions: dict[str, set[int]] = {}
+        for pos in book.positions(OPEN_STATUSES):
+            positions.setdefault(pos.option_symbol, set()).add(pos.trade_id)
+        self._positions = positions
+        await self._sync_subscriptions(streaming)
+
+    async def _sync_subscriptions(self, streaming):
+        current_symbols = set(self._positions)
+        for sym in current_symbols - self._subscribed:
+            await streaming.subscribe_option(sym)
+            self._subscribed.add(sym)
+        for sym in self._subscribed - current_symbols:
+            await streaming.unsubscribe_option(sym)
+            self._subscribed.discard(sym)
 
     async def run(self):
-        from app.dependencies import get_streaming_service, get_ws_manager
+        from app.dependencies import get_position_book, get_streaming_service, get_ws_manager
         from app.services.exit_engine import ExitEngine
         from app.services.order_manager import OrderManager
-        from app.services.schwab_client import SchwabService
+        from app.services.schwab_client import AsyncSchwabService, SchwabService
 
         logger.info("ExitMonitorTask started")
         streaming = get_streaming_service()
-        _subscribed_symbols: set[str] = set()
+        book = get_position_book()
+        last_sweep = 0.0
 
         while True:
             try:
-                # Event-driven: wait for ANY subscribed option quote to update,
-                # or fall back to timer if streaming is inactive
-                if streaming.is_active and _subscribed_symbols:
-                    events = []
-                    for sym in _subscribed_symbols:
-                        evt = streaming.get_option_event(sym)
-                        if evt:
-                            events.append(evt)
-                    if events:
-                        await _wait_any_event(
-                            events, timeout=settings.EXIT_CHECK_INTERVAL_SECONDS
-                        )
-                        # Clear all events after wake
-                        for evt in events:
-                            evt.clear()
-                    else:
-                        await asyncio.sleep(settings.EXIT_CHECK_INTERVAL_SECONDS)
+                # Event-driven: wait for subscribed option quotes to tick, or
+                # fall back to the timer if streaming is inactive
+                ticked: dict[str, float] = {}
+                if streaming.is_active and self._positions:
+                    wait = max(settings.EXIT_CHECK_INTERVAL_SECONDS - (time.monotonic() - last_sweep), 0)
+                    ticked = await streaming.wait_option_ticks(timeout=wait)
                 else:
                     await asyncio.sleep(settings.EXIT_CHECK_INTERVAL_SECONDS)
 
+                await self._refresh_positions(book, streaming)
+                sweep = not ticked or time.monotonic() - last_sweep >= settings.EXIT_CHECK_INTERVAL_SECONDS
+                if not sweep and not any(sym in self._positions for sym in ticked):
+                    continue
+
                 db = SessionLocal()
                 try:
-                    schwab = SchwabService(self.app.state.schwab_client)
+                    book.ensure_loaded(db)
+                    await self._refresh_positions(book, streaming)
+                    if sweep:
+                        last_sweep = time.monotonic()
+                        trade_ids = {tid for ids in self._positions.values() for tid in ids}
+                    else:
+                        trade_ids = {tid for sym in ticked for tid in self._positions.get(sym, ())}
+                    if not trade_ids:
+                        continue
+
+                    schwab = AsyncSchwabService(SchwabService(self.app.state.schwab_client))
                     ws = get_ws_manager()
                     order_mgr = OrderManager(schwab, ws, streaming_service=streaming)
                     exit_engine = ExitEngine(schwab, order_mgr, streaming_service=streaming)
 
-                    open_trades = (
-                        db.query(Trade)
-                        .filter(Trade.trade_date == date.today())
-                        .filter(
-                            Trade.status.in_(
-                                [
-                                    TradeStatus.FILLED,
-                                    TradeStatus.STOP_LOSS_PLACED,
-                                ]
-                            )
+                    trades = db.query(Trade).filter(Trade.id.in_(trade_ids)).all()
+                    if sweep:
+                        # One multi-symbol REST request for positions without a live stream quote
+                        await schwab.prefetch_quotes(
+                            t.option_symbol for t in trades
+                            if streaming.get_option_quote(t.option_symbol) is None
                         )
-                        .all()
-                    )
-
-                    # Dynamic subscription management
-                    current_symbols = {t.option_symbol for t in open_trades}
-                    new_symbols = current_symbols - _subscribed_symbols
-                    old_symbols = _subscribed_symbols - current_symbols
-
-                    for sym in new_symbols:
-                        await streaming.subscribe_option(sym)
-                        _subscribed_symbols.add(sym)
-                    for sym in old_symbols:
-                        await streaming.unsubscribe_option(sym)
-                        _subscribed_symbols.discard(sym)
-
-                    for trade in open_trades:
+
+                    for trade in trades:
                         await exit_engine.evaluate_position(
                             db, trade,
                             skip_snapshot=streaming.is_active,
@@ -108,7 +109,7 @@ class ExitMonitorTask:
                     db.close()
 
             except asyncio.CancelledError:
-                for sym in _subscribed_symbols:
+                for sym in self._subscribed:
                     await streaming.unsubscribe_option(sym)
                 logger.info("ExitMonitorTask cancelled")
                 break
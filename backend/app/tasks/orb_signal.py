@@ -54,7 +54,7 @@ class ORBSignalTask:
         self.orb_close = 0.0
         self.today = None
 
-    def _get_spy_price(self) -> float | None:
+    async def _get_spy_price(self) -> float | None:
         try:
             # Try streaming cache first
             from app.dependencies import get_streaming_service
@@ -64,29 +64,48 @@ class ORBSignalTask:
                 return snap.last
 
             # REST fallback
-            from app.services.schwab_client import SchwabService
+            from app.services.schwab_client import AsyncSchwabService, SchwabService
 
-            schwab = SchwabService(self.app.state.schwab_client)
-            data = schwab.get_quote("SPY")
+            schwab = AsyncSchwabService(SchwabService(self.app.state.schwab_client))
+            data = await schwab.get_quote("SPY")
             return data.get("SPY", {}).get("quote", {}).get("lastPrice")
         except Exception as e:
             logger.warning(f"ORB: failed to get SPY price: {e}")
             return None
 
-    def _fetch_orb_candle(self) -> bool:
+    async def _fetch_orb_candle(self) -> bool:
         """Fetch the 9:30 AM 15-min candle from Schwab price history.
         Returns True if ORB was successfully built."""
         try:
-            from app.services.schwab_client import SchwabService
+            from app.services.schwab_client import AsyncSchwabService, SchwabService
 
-            schwab = SchwabService(self.app.state.schwab_client)
+            schwab = AsyncSchwabService(SchwabService(self.app.state.schwab_client))
 
             # Request today's 15-min candles
             now = self._now_et()
             start = datetime.combine(now.date(), time(9, 30), tzinfo=ET)
             end = datetime.combine(now.date(), time(9, 46), tzinfo=ET)
 
-            resp = self.app.state.schwab_client.price_history(
+            # Prefer the streamed 1m bars once 9:30-9:44 are all in
+            from app.dependencies import get_bar_aggregator, get_streaming_service
+
+            bars = get_bar_aggregator()
+            if await bars.track("SPY", get_streaming_service(), schwab):
+                minute_bars = bars.get_bars("SPY", 1, since=start)
+                opening = [b for b in minute_bars if b.timestamp.time() < ORB_END]
+                if len(opening) == 15:
+                    self.orb_open = opening[0].open
+                    self.orb_high = max(b.high for b in opening)
+                    self.orb_low = min(b.low for b in opening)
+                    self.orb_close = opening[-1].close
+                    logger.info(
+                        f"ORB: 9:30 candle from stream — "
+                        f"O=${self.orb_open:.2f} H=${self.orb_high:.2f} "
+                        f"L=${self.orb_low:.2f} C=${self.orb_close:.2f}"
+                    )
+                    return True
+
+            resp = await schwab.price_history(
                 "SPY",
                 periodType="day",
                 period="1",
@@ -159,7 +178,7 @@ class ORBSignalTask:
                     continue
 
                 if self.state == ORBState.FETCHING_ORB:
-                    if self._fetch_orb_candle():
+                    if await self._fetch_orb_candle():
                         orb_range = self.orb_high - self.orb_low
                         logger.info(
                             f"ORB: range = ${orb_range:.2f} "
@@ -211,7 +230,7 @@ class ORBSignalTask:
                 await asyncio.sleep(30)
 
     async def _check_confirmation(self):
-        price = self._get_spy_price()
+        price = await self._get_spy_price()
         if price is None:
             logger.warning("ORB: could not get SPY price for confirmation")
             return
@@ -1,6 +1,6 @@
 import asyncio
 import logging
-from datetime import date
+import time
 
 from app.config import Settings
 from app.database import SessionLocal
@@ -11,50 +11,73 @@ settings = Settings()
 
 
 class OrderMonitorTask:
-    """Polls Schwab for order status updates every ORDER_POLL_INTERVAL_SECONDS."""
+    """Tracks order status for active trades.
+
+    While streaming is up, fills/cancels/rejects arrive via ACCT_ACTIVITY and
+    are applied immediately, and events REST hadn't confirmed yet are
+    re-checked on every ORDER_POLL_INTERVAL_SECONDS wake, as are pending
+    entries past ENTRY_LIMIT_TIMEOUT_MINUTES; the per-trade REST sweep only
+    runs every ORDER_RECONCILE_INTERVAL_SECONDS. Without streaming it polls
+    every ORDER_POLL_INTERVAL_SECONDS as before. Active trades come from the shared
+    PositionBook; rows are only loaded for the trades being reconciled.
+    """
 
     def __init__(self, app):
         self.app = app
 
+    @staticmethod
+    async def _expire_entry_limits(db, order_mgr, positions) -> None:
+        pending_ids = [p.trade_id for p in positions if p.status == TradeStatus.PENDING]
+        if not pending_ids:
+            return
+        for trade in db.query(Trade).filter(Trade.id.in_(pending_ids)).all():
+            if order_mgr.entry_limit_expired(trade):
+                # Full check: a fill REST already knows about wins over the cancel
+                await order_mgr.check_entry_fill(db, trade)
+
     async def run(self):
-        from app.dependencies import get_streaming_service, get_ws_manager
+        from app.dependencies import get_position_book, get_streaming_service, get_ws_manager
         from app.services.order_manager import OrderManager
-        from app.services.schwab_client import SchwabService
+        from app.services.order_tracker import OrderTracker
+        from app.services.schwab_client import AsyncSchwabService, SchwabService
 
         logger.info("OrderMonitorTask started")
         streaming = get_streaming_service()
+        book = get_position_book()
         _subscribed_symbols: set[str] = set()
+        last_reconcile = 0.0
+        tracker = OrderTracker(None)
 
         while True:
             try:
-                await asyncio.sleep(settings.ORDER_POLL_INTERVAL_SECONDS)
+                await streaming.wait_account_activity(settings.ORDER_POLL_INTERVAL_SECONDS)
                 db = SessionLocal()
                 try:
-                    schwab = SchwabService(self.app.state.schwab_client)
+                    schwab = AsyncSchwabService(SchwabService(self.app.state.schwab_client))
                     ws = get_ws_manager()
                     order_mgr = OrderManager(schwab, ws, streaming_service=streaming)
 
-                    active_trades = (
-                        db.query(Trade)
-                        .filter(Trade.trade_date == date.today())
-                        .filter(
-                            Trade.status.in_(
-                                [
-                                    TradeStatus.PENDING,
-                                    TradeStatus.EXITING,
-                                    TradeStatus.FILLED,
-                                    TradeStatus.STOP_LOSS_PLACED,
-                                ]
-                            )
-                        )
-                        .all()
+                    tracker.order_manager = order_mgr
+                    if tracker.unconfirmed:
+                        await tracker.recheck_unconfirmed(db)
+                    events = streaming.pop_account_events()
+                    if events:
+                        await tracker.handle_events(db, events)
+
+                    now = time.monotonic()
+                    reconcile = (
+                        not streaming.is_active
+                        or now - last_reconcile >= settings.ORDER_RECONCILE_INTERVAL_SECONDS
                     )
 
+                    book.ensure_loaded(db)
+                    positions = book.positions()
+
                     # Dynamic subscription for pending trades' option symbols
                     current_symbols = {
-                        t.option_symbol
-                        for t in active_trades
-                        if t.status == TradeStatus.PENDING
+                        p.option_symbol
+                        for p in positions
+                        if p.status == TradeStatus.PENDING
                     }
                     new_symbols = current_symbols - _subscribed_symbols
                     old_symbols = _subscribed_symbols - current_symbols
@@ -66,11 +89,31 @@ class OrderMonitorTask:
                         await streaming.unsubscribe_option(sym)
                         _subscribed_symbols.discard(sym)
 
+                    if not positions:
+                        continue
+                    if not reconcile:
+                        # The entry limit timeout can't wait for the next REST sweep
+                        await self._expire_entry_limits(db, order_mgr, positions)
+                        continue
+                    last_reconcile = now
+
+                    active_trades = (
+                        db.query(Trade)
+                        .filter(Trade.id.in_([p.trade_id for p in positions]))
+                        .all()
+                    )
+
+                    if not streaming.is_active:
+                        await schwab.prefetch_quotes(
+                            t.option_symbol for t in active_trades
+                            if t.status == TradeStatus.PENDING
+                        )
+
                     for trade in active_trades:
                         if trade.status == TradeStatus.PENDING:
                             if not streaming.is_active:
                                 # Record price while waiting for fill (REST-only mode)
-                                mid = order_mgr._get_current_mid(trade.option_symbol)
+                                mid = await order_mgr._get_current_mid(trade.option_symbol)
                                 if mid is not None:
                                     db.add(TradePriceSnapshot(
                                         trade_id=trade.id,
@@ -85,7 +128,7 @@ class OrderMonitorTask:
                             TradeStatus.FILLED,
                             TradeStatus.STOP_LOSS_PLACED,
                         ):
-                            order_mgr.check_stop_loss_fill(db, trade)
+                            await order_mgr.check_stop_loss_fill(db, trade)
                 finally:
                     db.close()
 
@@ -1,10 +1,12 @@
 import asyncio
 import logging
-from datetime import date
+
+from sqlalchemy import or_
 
 from app.config import Settings
 from app.database import SessionLocal
-from app.models import Trade, TradePriceSnapshot, TradeStatus
+from app.models import Trade
+from app.services.position_book import OPEN_STATUSES
 
 logger = logging.getLogger(__name__)
 settings = Settings()
@@ -13,79 +15,76 @@ settings = Settings()
 class PriceRecorderTask:
     """Records every streaming price change for open trades to the database.
 
-    Polls the streaming cache every SNAPSHOT_RECORD_INTERVAL_SECONDS and writes
-    a TradePriceSnapshot whenever a quote has been updated since the last recording.
-    Only active when streaming is running (not DRY_RUN/PAPER_TRADE).
+    Listens to option quote updates from the streaming service and queues a
+    TradePriceSnapshot on the BulkWriter for every tick on an open trade's
+    option, so no tick is sampled away and nothing is written on the event
+    loop. High-water marks rise in the shared PositionBook immediately and
+    are persisted every SNAPSHOT_RECORD_INTERVAL_SECONDS. Only active when
+    streaming is running (not DRY_RUN/PAPER_TRADE).
     """
 
     def __init__(self, app):
         self.app = app
+        # Trades whose high-water mark rose since it was last persisted
+        self._dirty: set[int] = set()
+
+    def _on_option_quote(self, snap):
+        from app.dependencies import get_bulk_writer, get_position_book
+
+        if snap.bid <= 0 or snap.ask <= 0:
+            return
+        book = get_position_book()
+        writer = get_bulk_writer()
+        for pos in book.positions(OPEN_STATUSES):
+            if pos.option_symbol != snap.symbol:
+                continue
+            # BID-based, consistent with exit_engine
+            if book.raise_high_water(pos.trade_id, snap.bid):
+                self._dirty.add(pos.trade_id)
+            writer.add_snapshot(pos.trade_id, snap.mid, pos.highest_price_seen or snap.bid)
+
+    def _persist_high_water(self, db, book):
+        dirty, self._dirty = self._dirty, set()
+        for trade_id in dirty:
+            pos = book.get(trade_id)
+            if pos is None or pos.highest_price_seen is None:
+                continue
+            # The guard keeps a higher mark the exit engine already wrote
+            (
+                db.query(Trade)
+                .filter(Trade.id == trade_id)
+                .filter(or_(
+                    Trade.highest_price_seen.is_(None),
+                    Trade.highest_price_seen < pos.highest_price_seen,
+                ))
+                .update({Trade.highest_price_seen: pos.highest_price_seen}, synchronize_session=False)
+            )
+        if dirty:
+            db.commit()
 
     async def run(self):
-        from app.dependencies import get_streaming_service
+        from app.dependencies import get_position_book, get_streaming_service
 
         logger.info("PriceRecorderTask started")
         streaming = get_streaming_service()
-        # Per-trade: last recorded snap.updated_at timestamp
-        _last_recorded: dict[int, float] = {}
+        book = get_position_book()
+        streaming.add_option_listener(self._on_option_quote)
 
         while True:
             try:
                 await asyncio.sleep(settings.SNAPSHOT_RECORD_INTERVAL_SECONDS)
-                if not streaming.is_active:
+                if not streaming.is_active and not self._dirty:
                     continue
 
                 db = SessionLocal()
                 try:
-                    open_trades = (
-                        db.query(Trade)
-                        .filter(Trade.trade_date == date.today())
-                        .filter(
-                            Trade.status.in_(
-                                [TradeStatus.FILLED, TradeStatus.STOP_LOSS_PLACED]
-                            )
-                        )
-                        .all()
-                    )
-
-                    wrote_any = False
-                    for trade in open_trades:
-                        snap = streaming.get_option_quote(trade.option_symbol)
-                        if not snap or snap.is_stale or snap.bid <= 0 or snap.ask <= 0:
-                            continue
-
-                        last_ts = _last_recorded.get(trade.id, 0.0)
-                        if snap.updated_at <= last_ts:
-                            continue  # No new data since last recording
-
-                        # Update high-water mark (BID-based, consistent with exit_engine)
-                        if snap.bid > (trade.highest_price_seen or 0):
-                            trade.highest_price_seen = snap.bid
-                            db.flush()
-
-                        db.add(
-                            TradePriceSnapshot(
-                                trade_id=trade.id,
-                                price=snap.mid,
-                                highest_price_seen=trade.highest_price_seen
-                                or snap.bid,
-                            )
-                        )
-                        _last_recorded[trade.id] = snap.updated_at
-                        wrote_any = True
-
-                    if wrote_any:
-                        db.commit()
-
-                    # Cleanup closed trades from tracking dict
-                    open_ids = {t.id for t in open_trades}
-                    for tid in list(_last_recorded):
-                        if tid not in open_ids:
-                            del _last_recorded[tid]
+                    book.ensure_loaded(db)
+                    self._persist_high_water(db, book)
                 finally:
                     db.close()
 
             except asyncio.CancelledError:
+                streaming.remove_option_listener(self._on_option_quote)
                 logger.info("PriceRecorderTask cancelled")
                 break
             except Exception as e:
@@ -1,7 +1,10 @@
 """Live signal polling task for enabled strategies from TopSetups.
 
-Fetches intraday bars from Schwab, runs _generate_signals() from the backtest
-engine, and fires trades through TradeManager when new signals are detected.
+Reads intraday bars from the shared streaming BarAggregator (REST
+price_history when the stream is unavailable), advances an
+IncrementalSignalEngine (bar-for-bar parity with the backtest's
+_generate_signals) over the bars it has not seen yet, and fires trades through
+TradeManager when new signals are detected.
 """
 
 from __future__ import annotations
@@ -16,7 +19,8 @@ from app.config import Settings
 from app.database import SessionLocal
 from app.models import Alert, AlertStatus, TradeDirection
 from app.schemas import TradingViewAlert
-from app.services.backtest.engine import BacktestParams, _generate_signals
+from app.services.backtest.engine import BacktestParams
+from app.services.backtest.incremental_signals import IncrementalSignalEngine
 from app.services.backtest.market_data import BarData
 from app.services.option_selector import _0DTE_TICKERS
 
@@ -54,18 +58,35 @@ class StrategySignalTask:
         self._prev_day_high: float | None = None
         self._prev_day_low: float | None = None
         self._prev_day_close: float | None = None
+        # Running indicator state for today's bars, rebuilt when the bar source changes
+        self._signal_engine: IncrementalSignalEngine | None = None
+        self._bar_source: str | None = None
 
     def _now_et(self) -> datetime:
         return datetime.now(ET)
 
-    def _fetch_prev_day_ohlc(self) -> tuple[float | None, float | None, float | None]:
+    async def _stream_bars(self):
+        """The shared BarAggregator when it is live for this ticker, else None."""
+        from app.dependencies import get_bar_aggregator, get_streaming_service
+
+        bars = get_bar_aggregator()
+        if await bars.track(self.ticker, get_streaming_service(), self._schwab()):
+            return bars
+        return None
+
+    def _schwab(self):
+        from app.services.schwab_client import AsyncSchwabService, SchwabService
+
+        return AsyncSchwabService(SchwabService(self.app.state.schwab_client))
+
+    async def _fetch_prev_day_ohlc(self) -> tuple[float | None, float | None, float | None]:
         """Fetch prior trading day OHLC from Schwab daily bars."""
         now = self._now_et()
         start = datetime.combine(now.date() - timedelta(days=7), time(0, 0), tzinfo=ET)
         end = datetime.combine(now.date(), time(0, 0), tzinfo=ET)
 
         try:
-            resp = self.app.state.schwab_client.price_history(
+            resp = await self._schwab().price_history(
                 self.ticker,
                 periodType="month",
                 period="1",
@@ -87,11 +108,12 @@ class StrategySignalTask:
         last = candles[-1]
         return float(last["high"]), float(last["low"]), float(last["close"])
 
-    def _reset_day(self, today: date):
+    async def _reset_day(self, today: date):
         self.today = today
         self.fired_signal_timestamps.clear()
         self._pending_confirm.clear()
-        self._prev_day_high, self._prev_day_low, self._prev_day_close = self._fetch_prev_day_ohlc()
+        self._signal_engine = None
+        self._prev_day_high, self._prev_day_low, self._prev_day_close = await self._fetch_prev_day_ohlc()
         logger.info(
             f"StrategySignal: new day {today}, reset for {self.ticker} {self.signal_type}"
             f" (prev H={self._prev_day_high}, L={self._prev_day_low}, C={self._prev_day_close})"
@@ -103,6 +125,23 @@ class StrategySignalTask:
         # entries to be 5+ minutes late for 0DTE options.
         return 60
 
+    async def _wait_next_poll(self):
+        """Sleep until the next poll is due.
+
+        With live streamed bars, wake as soon as the strategy's bar (or the 1m
+        bar, while a confirmation is pending) closes; the poll interval is
+        then only an upper bound.
+        """
+        from app.dependencies import get_bar_aggregator, get_streaming_service
+
+        poll_interval = self._poll_interval_seconds()
+        bars = get_bar_aggregator()
+        if get_streaming_service().is_active and bars.is_live(self.ticker):
+            minutes = 1 if self._pending_confirm else _FREQ_MAP.get(self.timeframe, 5)
+            await bars.wait_for_bar_close(self.ticker, minutes, timeout=poll_interval)
+        else:
+            await asyncio.sleep(poll_interval)
+
     def _build_engine_params(self) -> BacktestParams:
         p = self.params
         today = date.today()
@@ -150,16 +189,22 @@ class StrategySignalTask:
             pivot_filter_enabled=bool(p.get("pivot_filter_enabled", False)),
         )
 
-    def _fetch_live_bars(self) -> list[BarData]:
-        """Fetch today's intraday bars from Schwab price_history."""
+    async def _fetch_live_bars(self) -> list[BarData]:
+        """Today's intraday bars from the bar stream, or Schwab price_history."""
         now = self._now_et()
         start = datetime.combine(now.date(), MARKET_OPEN, tzinfo=ET)
         end = now + timedelta(minutes=1)  # slightly ahead to capture current bar
 
         frequency = _FREQ_MAP.get(self.timeframe, 5)
 
+        stream = await self._stream_bars()
+        if stream is not None:
+            self._set_bar_source("stream")
+            return stream.get_bars(self.ticker, frequency)
+        self._set_bar_source("rest")
+
         try:
-            resp = self.app.state.schwab_client.price_history(
+            resp = await self._schwab().price_history(
                 self.ticker,
                 periodType="day",
                 period="1",
@@ -193,6 +238,12 @@ class StrategySignalTask:
         bars.sort(key=lambda b: b.timestamp)
         return bars
 
+    def _set_bar_source(self, source: str):
+        """Stream and REST bars can differ slightly; don't mix them in one engine."""
+        if source != self._bar_source:
+            self._bar_source = source
+            self._signal_engine = None
+
     def _get_strategy_params(self, signal=None) -> dict:
         """Extract per-trade exit params from this strategy's config."""
         p = self.params
@@ -278,14 +329,18 @@ class StrategySignalTask:
         finally:
             db.close()
 
-    def _fetch_confirm_bars(self) -> list[BarData]:
+    async def _fetch_confirm_bars(self) -> list[BarData]:
         """Fetch recent 1-minute bars for signal confirmation."""
         now = self._now_et()
         start = now - timedelta(minutes=15)
         end = now + timedelta(minutes=1)
 
+        stream = await self._stream_bars()
+        if stream is not None:
+            return stream.get_bars(self.ticker, 1, since=start)
+
         try:
-            resp = self.app.state.schwab_client.price_history(
+            resp = await self._schwab().price_history(
                 self.ticker,
                 periodType="day",
                 period="1",
@@ -322,7 +377,7 @@ class StrategySignalTask:
         if not self._pending_confirm:
             return
 
-        confirm_bars = self._fetch_confirm_bars()
+        confirm_bars = await self._fetch_confirm_bars()
         if not confirm_bars:
             return
 
@@ -397,21 +452,23 @@ class StrategySignalTask:
         if self._pending_confirm:
             await self._check_confirmations()
 
-        bars = self._fetch_live_bars()
+        bars = await self._fetch_live_bars()
         if not bars:
             return
 
-        engine_params = self._build_engine_params()
-
-        try:
-            signals = _generate_signals(
-                bars, engine_params,
+        if self._signal_engine is None:
+            self._signal_engine = IncrementalSignalEngine(
+                self._build_engine_params(),
                 prev_close=self._prev_day_close,
                 prev_high=self._prev_day_high,
                 prev_low=self._prev_day_low,
             )
+
+        try:
+            signals = self._signal_engine.update(bars)
         except Exception as e:
             logger.warning(f"StrategySignal: signal generation error: {e}")
+            self._signal_engine = None
             return
 
         for signal in signals:
@@ -450,7 +507,7 @@ class StrategySignalTask:
 
                 # New day reset
                 if self.today != today:
-                    self._reset_day(today)
+                    await self._reset_day(today)
 
                 # Weekend check
                 if today.weekday() >= 5:
@@ -515,9 +572,8 @@ class StrategySignalTask:
                 # Poll for signals
                 await self._poll_and_check()
 
-                # Sleep for the polling interval
-                poll_interval = self._poll_interval_seconds()
-                await asyncio.sleep(poll_interval)
+                # Wait for the next bar close (streaming) or the polling interval
+                await self._wait_next_poll()
 
             except asyncio.CancelledError:
                 logger.info("StrategySignalTask cancelled")
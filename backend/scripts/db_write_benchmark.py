@@ -0,0 +1,163 @@
+"""
+SQLite write-latency benchmark under concurrent dashboard load
+
+Compares the original bare engine (default rollback journal, one engine for
+reads and writes) with the tuned engines from app.database (WAL pragmas,
+bounded pool, separate read-only engine for analytics).
+
+Usage:
+    cd backend
+    python -m scripts.db_write_benchmark [--writes 300] [--readers 4] [--trades 2000]
+
+What happens:
+    1. A temporary database is seeded with trades, events and price snapshots
+    2. Reader threads run dashboard-style aggregate queries in a loop
+    3. The main thread times small trade-state write transactions
+    4. Steps 1-3 run once per configuration and latency percentiles are printed
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, datetime, timedelta
+
+# Add the backend directory to sys.path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, func
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+
+def _seed(engine, n_trades: int):
+    from app.models import (
+        Base, Trade, TradeDirection, TradeEvent, TradeEventType, TradePriceSnapshot, TradeStatus,
+    )
+
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    start = datetime(2026, 1, 2, 14, 30)
+    for i in range(n_trades):
+        trade = Trade(
+            trade_date=date(2026, 1, 2) + timedelta(days=i % 60),
+            direction=TradeDirection.CALL if i % 2 else TradeDirection.PUT,
+            option_symbol=f"SPY_BENCH_{i}",
+            strike_price=600.0,
+            expiration_date=date(2026, 1, 2),
+            entry_quantity=2,
+            entry_price=1.50,
+            exit_price=1.50 + (i % 7 - 3) * 0.1,
+            pnl_dollars=(i % 7 - 3) * 20.0,
+            status=TradeStatus.CLOSED,
+        )
+        db.add(trade)
+        db.flush()
+        db.add_all(
+            TradePriceSnapshot(
+                trade_id=trade.id, timestamp=start + timedelta(seconds=s),
+                price=1.50 + s * 0.001, highest_price_seen=1.50 + s * 0.001,
+            )
+            for s in range(50)
+        )
+        db.add(TradeEvent(trade_id=trade.id, event_type=TradeEventType.EXIT_FILLED, message="bench"))
+    db.commit()
+    db.close()
+
+
+def _dashboard_query(db):
+    from app.models import Trade, TradePriceSnapshot
+
+    (
+        db.query(Trade.trade_date, func.count(Trade.id), func.sum(Trade.pnl_dollars), func.max(TradePriceSnapshot.price))
+        .join(TradePriceSnapshot, TradePriceSnapshot.trade_id == Trade.id)
+        .group_by(Trade.trade_date)
+        .all()
+    )
+
+
+def _run(label: str, write_engine, read_engine, n_writes: int, n_readers: int):
+    from app.models import Trade, TradeEvent, TradeEventType, TradeStatus
+
+    WriteSession = sessionmaker(bind=write_engine)
+    ReadSession = sessionmaker(bind=read_engine)
+    stop = threading.Event()
+    reads = [0] * n_readers
+
+    def reader(idx):
+        while not stop.is_set():
+            db = ReadSession()
+            try:
+                _dashboard_query(db)
+                reads[idx] += 1
+            except OperationalError:
+                pass
+            finally:
+                db.close()
+
+    threads = [threading.Thread(target=reader, args=(i,), daemon=True) for i in range(n_readers)]
+    for t in threads:
+        t.start()
+    time.sleep(0.2)  # Let the readers get going
+
+    latencies, errors = [], 0
+    for i in range(n_writes):
+        t0 = time.perf_counter()
+        db = WriteSession()
+        try:
+            trade = db.get(Trade, i % 100 + 1)
+            trade.status = TradeStatus.FILLED if i % 2 else TradeStatus.CLOSED
+            db.add(TradeEvent(trade_id=trade.id, event_type=TradeEventType.ENTRY_FILLED, message="bench write"))
+            db.commit()
+            latencies.append((time.perf_counter() - t0) * 1000)
+        except OperationalError:
+            db.rollback()
+            errors += 1
+        finally:
+            db.close()
+
+    stop.set()
+    for t in threads:
+        t.join()
+
+    if latencies:
+        q = statistics.quantiles(latencies, n=100)
+        print(
+            f"{label:<10} writes={len(latencies):>4} errors={errors:>3} "
+            f"p50={q[49]:7.2f}ms p95={q[94]:7.2f}ms p99={q[98]:7.2f}ms max={max(latencies):8.2f}ms "
+            f"dashboard_reads={sum(reads)}"
+        )
+    else:
+        print(f"{label:<10} all {errors} writes failed")
+
+
+def main():
+    from app.database import create_db_engine
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--writes", type=int, default=300)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--trades", type=int, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Baseline: what app.database used to build
+        url = f"sqlite:///{os.path.join(tmp, 'baseline.db')}"
+        engine = create_engine(url, connect_args={"check_same_thread": False})
+        _seed(engine, args.trades)
+        _run("baseline", engine, engine, args.writes, args.readers)
+        engine.dispose()
+
+        url = f"sqlite:///{os.path.join(tmp, 'tuned.db')}"
+        engine = create_db_engine(url)
+        read_engine = create_db_engine(url, read_only=True)
+        _seed(engine, args.trades)
+        _run("tuned", engine, read_engine, args.writes, args.readers)
+        read_engine.dispose()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -19,7 +19,7 @@ from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
 import app.database as database_module
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.dependencies import get_ws_manager
 from app.models import Base
 from app.services.ws_manager import WebSocketManager
@@ -47,6 +47,31 @@ def db_session(db_engine):
     session.close()
 
 
+@pytest.fixture(autouse=True)
+def _reset_shared_state():
+    """Reset the process-wide caches and singletons around every test."""
+    from app.dependencies import (
+        get_alert_queue,
+        get_bulk_writer,
+        get_position_book,
+        get_response_cache,
+        get_risk_state,
+    )
+    from app.services.schwab_client import clear_option_chain_cache
+
+    def reset():
+        clear_option_chain_cache()
+        get_position_book().reset()
+        get_bulk_writer().reset()
+        get_risk_state().reset()
+        get_alert_queue().reset()
+        get_response_cache().reset()
+
+    reset()
+    yield
+    reset()
+
+
 @pytest.fixture
 def mock_schwab():
     return MockSchwabClient()
@@ -77,6 +102,7 @@ def app(db_engine, mock_schwab):
             session.close()
 
     application.dependency_overrides[get_db] = get_test_db
+    application.dependency_overrides[get_read_db] = get_test_db
     application.state.schwab_client = mock_schwab
     application.state.ws_manager = get_ws_manager()
     application.state.ignore_trading_windows = True
@@ -0,0 +1,659 @@
+"""Per-bar reference implementations the backtest engine is parity-tested against.
+
+The engine generates signals with the columnar NumPy engine (signal_engine)
+and simulates exits with the event-indexed simulator (exit_simulator).
+generate_signals_loop and simulate_trade_loop are the original bar-by-bar
+versions of the same rules. They live here, not in the app, so each rule has
+a single production implementation.
+"""
+
+from datetime import time
+from typing import Callable, Iterator, Optional, Sequence
+
+from app.services.backtest.engine import (
+    BacktestParams,
+    PivotLevels,
+    Signal,
+    SimulatedTrade,
+    _apply_entry_confirmation,
+    _close_trade,
+    _exit_levels,
+    _path_minutes_to_close,
+    _price_path_chunks,
+    compute_pivot_levels,
+)
+from app.services.backtest.market_data import BarData
+from app.services.backtest.spread_model import estimate_spread_pct
+
+
+def _compute_ema(values: list[float], period: int) -> list[Optional[float]]:
+    if len(values) < period:
+        return [None] * len(values)
+
+    result: list[Optional[float]] = [None] * (period - 1)
+    sma = sum(values[:period]) / period
+    result.append(sma)
+
+    k = 2.0 / (period + 1)
+    for i in range(period, len(values)):
+        val = values[i] * k + result[-1] * (1 - k)
+        result.append(val)
+
+    return result
+
+
+def _compute_rsi(closes: list[float], period: int) -> list[Optional[float]]:
+    """Wilder's RSI."""
+    if len(closes) < period + 1:
+        return [None] * len(closes)
+
+    result: list[Optional[float]] = [None] * period
+
+    gains = []
+    losses = []
+    for i in range(1, period + 1):
+        delta = closes[i] - closes[i - 1]
+        gains.append(max(delta, 0))
+        losses.append(max(-delta, 0))
+
+    avg_gain = sum(gains) / period
+    avg_loss = sum(losses) / period
+    rs = avg_gain / avg_loss if avg_loss > 0 else 100
+    result.append(100 - 100 / (1 + rs))
+
+    for i in range(period + 1, len(closes)):
+        delta = closes[i] - closes[i - 1]
+        avg_gain = (avg_gain * (period - 1) + max(delta, 0)) / period
+        avg_loss = (avg_loss * (period - 1) + max(-delta, 0)) / period
+        rs = avg_gain / avg_loss if avg_loss > 0 else 100
+        result.append(100 - 100 / (1 + rs))
+
+    return result
+
+
+def _compute_vwap(bars: list[BarData]) -> list[Optional[float]]:
+    vwap: list[Optional[float]] = []
+    cum_tp_vol = 0.0
+    cum_vol = 0
+    for bar in bars:
+        tp = (bar.high + bar.low + bar.close) / 3.0
+        cum_tp_vol += tp * bar.volume
+        cum_vol += bar.volume
+        vwap.append(cum_tp_vol / cum_vol if cum_vol > 0 else None)
+    return vwap
+
+
+def _compute_bollinger(closes: list[float], period: int = 20, std_mult: float = 2.0):
+    """Returns (upper, lower, mid) band lists."""
+    n = len(closes)
+    upper: list[Optional[float]] = [None] * n
+    lower: list[Optional[float]] = [None] * n
+    mid: list[Optional[float]] = [None] * n
+
+    for i in range(period - 1, n):
+        window = closes[i - period + 1 : i + 1]
+        m = sum(window) / period
+        var = sum((x - m) ** 2 for x in window) / period
+        std = var ** 0.5
+        mid[i] = m
+        upper[i] = m + std_mult * std
+        lower[i] = m - std_mult * std
+
+    return upper, lower, mid
+
+
+def _compute_macd(
+    closes: list[float],
+    fast: int = 12,
+    slow: int = 26,
+    signal: int = 9,
+) -> tuple[list[Optional[float]], list[Optional[float]], list[Optional[float]]]:
+    """MACD line, signal line, histogram."""
+    ema_fast = _compute_ema(closes, fast)
+    ema_slow = _compute_ema(closes, slow)
+    n = len(closes)
+
+    macd_line: list[Optional[float]] = [None] * n
+    for i in range(n):
+        if ema_fast[i] is not None and ema_slow[i] is not None:
+            macd_line[i] = ema_fast[i] - ema_slow[i]
+
+    # Signal line = EMA of MACD line (skip Nones)
+    macd_vals = [v for v in macd_line if v is not None]
+    if len(macd_vals) < signal:
+        return macd_line, [None] * n, [None] * n
+
+    sig_ema = _compute_ema(macd_vals, signal)
+    signal_line: list[Optional[float]] = [None] * n
+    j = 0
+    for i in range(n):
+        if macd_line[i] is not None:
+            signal_line[i] = sig_ema[j] if j < len(sig_ema) else None
+            j += 1
+
+    histogram: list[Optional[float]] = [None] * n
+    for i in range(n):
+        if macd_line[i] is not None and signal_line[i] is not None:
+            histogram[i] = macd_line[i] - signal_line[i]
+
+    return macd_line, signal_line, histogram
+
+
+def _compute_volume_sma(bars: list[BarData], period: int) -> list[Optional[float]]:
+    """Simple moving average of volume."""
+    n = len(bars)
+    if n < period:
+        return [None] * n
+
+    result: list[Optional[float]] = [None] * (period - 1)
+    window_sum = sum(b.volume for b in bars[:period])
+    result.append(window_sum / period)
+
+    for i in range(period, n):
+        window_sum += bars[i].volume - bars[i - period].volume
+        result.append(window_sum / period)
+
+    return result
+
+
+def generate_signals_loop(
+    bars: list[BarData],
+    params: BacktestParams,
+    prev_close: Optional[float] = None,
+    prev_high: Optional[float] = None,
+    prev_low: Optional[float] = None,
+    confirm_bars: Optional[list[BarData]] = None,
+) -> list[Signal]:
+    """Per-bar reference implementation of engine._generate_signals."""
+    if len(bars) < max(params.ema_slow + 1, 26):
+        return []
+
+    closes = [b.close for b in bars]
+    ema_f = _compute_ema(closes, params.ema_fast)
+    ema_s = _compute_ema(closes, params.ema_slow)
+    vwap = _compute_vwap(bars)
+
+    # RSI (computed if needed for rsi strategies OR confluence)
+    rsi: list[Optional[float]] = [None] * len(bars)
+    rsi_period = params.rsi_period if params.rsi_period > 0 else 9
+    if params.rsi_period > 0 or params.signal_type == "confluence":
+        rsi = _compute_rsi(closes, rsi_period)
+
+    # Bollinger Bands (for bb_squeeze strategy)
+    bb_upper, bb_lower, bb_mid = _compute_bollinger(closes, params.bb_period, params.bb_std_mult)
+
+    # MACD and Volume SMA (for confluence strategy)
+    macd_line: list[Optional[float]] = [None] * len(bars)
+    macd_sig_line: list[Optional[float]] = [None] * len(bars)
+    macd_hist: list[Optional[float]] = [None] * len(bars)
+    vol_sma: list[Optional[float]] = [None] * len(bars)
+    if params.signal_type == "confluence":
+        macd_line, macd_sig_line, macd_hist = _compute_macd(closes, params.macd_fast, params.macd_slow, params.macd_signal_period)
+        vol_sma = _compute_volume_sma(bars, params.vol_sma_period)
+
+    # Pivot points (from prior day OHLC)
+    pivots: Optional[PivotLevels] = None
+    if params.pivot_enabled and prev_high is not None and prev_low is not None and prev_close is not None:
+        pivots = compute_pivot_levels(prev_high, prev_low, prev_close)
+
+    # ORB: compute opening range from first N minutes
+    orb_high: Optional[float] = None
+    orb_low: Optional[float] = None
+    orb_open: Optional[float] = None
+    orb_close: Optional[float] = None
+    orb_ready = False
+    if params.signal_type in ("orb", "orb_direction"):
+        open_time = bars[0].timestamp.replace(hour=9, minute=30, second=0) if bars else None
+        if open_time:
+            from datetime import timedelta
+            orb_end_time = open_time + timedelta(minutes=params.orb_minutes)
+            orb_bars = [b for b in bars if b.timestamp < orb_end_time]
+            if orb_bars:
+                orb_high = max(b.high for b in orb_bars)
+                orb_low = min(b.low for b in orb_bars)
+                orb_open = orb_bars[0].open
+                orb_close = orb_bars[-1].close
+                orb_ready = True
+
+    windows = [(params.morning_window_start, params.morning_window_end)]
+    if params.afternoon_enabled:
+        windows.append((params.afternoon_window_start, params.afternoon_window_end))
+
+    signals: list[Signal] = []
+
+    for i in range(1, len(bars)):
+        bar = bars[i]
+        bt = bar.timestamp.time()
+
+        # Strategy-specific window checks
+        if params.signal_type == "vwap_reclaim":
+            if not (time(10, 30) <= bt <= time(12, 0)):
+                continue
+        elif params.signal_type == "orb_direction":
+            orb_end_minutes = 30 + params.orb_minutes
+            orb_end_t = time(9 + orb_end_minutes // 60, orb_end_minutes % 60)
+            if bt < orb_end_t or bt > params.orb_time_stop:
+                continue
+        else:
+            if not any(s <= bt <= e for s, e in windows):
+                continue
+
+        direction: Optional[str] = None
+        reason = ""
+        sig_orb_range: Optional[float] = None
+        sig_orb_entry: Optional[float] = None
+        sig_confluence_score: Optional[int] = None
+        sig_confluence_max: Optional[int] = None
+        sig_rel_vol: Optional[float] = None
+
+        if params.signal_type == "confluence":
+            # ── Multi-indicator confluence scoring ──
+            # 6 factors scored independently for CALL and PUT
+            call_score = 0
+            put_score = 0
+            call_factors: list[str] = []
+            put_factors: list[str] = []
+
+            # 1. VWAP bias: close above/below VWAP
+            if vwap[i] is not None:
+                if bar.close > vwap[i]:
+                    call_score += 1
+                    call_factors.append("VWAP")
+                elif bar.close < vwap[i]:
+                    put_score += 1
+                    put_factors.append("VWAP")
+
+            # 2. EMA trend: fast above/below slow
+            if ema_f[i] is not None and ema_s[i] is not None:
+                if ema_f[i] > ema_s[i]:
+                    call_score += 1
+                    call_factors.append("EMA")
+                elif ema_f[i] < ema_s[i]:
+                    put_score += 1
+                    put_factors.append("EMA")
+
+            # 3. RSI favorable zone (not at extremes)
+            if rsi[i] is not None:
+                if rsi[i] < params.rsi_ob:
+                    call_score += 1
+                    call_factors.append(f"RSI:{rsi[i]:.0f}")
+                if rsi[i] > params.rsi_os:
+                    put_score += 1
+                    put_factors.append(f"RSI:{rsi[i]:.0f}")
+
+            # 4. MACD histogram direction
+            if macd_hist[i] is not None:
+                if macd_hist[i] > 0:
+                    call_score += 1
+                    call_factors.append("MACD")
+                elif macd_hist[i] < 0:
+                    put_score += 1
+                    put_factors.append("MACD")
+
+            # 5. Relative volume above threshold (confirms EMA trend direction)
+            if vol_sma[i] is not None and vol_sma[i] > 0:
+                rel_vol = bar.volume / vol_sma[i]
+                if rel_vol >= params.vol_threshold:
+                    if ema_f[i] is not None and ema_s[i] is not None:
+                        if ema_f[i] > ema_s[i]:
+                            call_score += 1
+                            call_factors.append(f"Vol:{rel_vol:.1f}x")
+                        elif ema_f[i] < ema_s[i]:
+                            put_score += 1
+                            put_factors.append(f"Vol:{rel_vol:.1f}x")
+
+            # 6. Price action: candle direction
+            if bar.close > bar.open:
+                call_score += 1
+                call_factors.append("Candle")
+            elif bar.close < bar.open:
+                put_score += 1
+                put_factors.append("Candle")
+
+            # 7. Pivot point S/R proximity
+            if pivots is not None:
+                proximity = params.pivot_proximity_pct / 100.0
+                price = bar.close
+                near_s1 = abs(price - pivots.s1) / pivots.s1 < proximity if pivots.s1 != 0 else False
+                near_s2 = abs(price - pivots.s2) / pivots.s2 < proximity if pivots.s2 != 0 else False
+                near_r1 = abs(price - pivots.r1) / pivots.r1 < proximity if pivots.r1 != 0 else False
+                near_r2 = abs(price - pivots.r2) / pivots.r2 < proximity if pivots.r2 != 0 else False
+                if near_s1 or near_s2:
+                    call_score += 1
+                    nearest = "S1" if abs(price - pivots.s1) < abs(price - pivots.s2) else "S2"
+                    call_factors.append(f"Pivot:{nearest}")
+                elif near_r1 or near_r2:
+                    put_score += 1
+                    nearest = "R1" if abs(price - pivots.r1) < abs(price - pivots.r2) else "R2"
+                    put_factors.append(f"Pivot:{nearest}")
+                elif price < pivots.pivot:
+                    call_score += 1
+                    call_factors.append("Pivot:<P")
+                elif price > pivots.pivot:
+                    put_score += 1
+                    put_factors.append("Pivot:>P")
+
+            # Fire signal if score meets minimum confluence threshold
+            max_score = 7 if pivots is not None else 6
+
+            # Compute rel_vol for this bar (used for confidence sizing)
+            bar_rel_vol = None
+            if vol_sma[i] is not None and vol_sma[i] > 0:
+                bar_rel_vol = round(bar.volume / vol_sma[i], 2)
+
+            if call_score >= params.min_confluence and call_score > put_score:
+                direction = "CALL"
+                reason = f"Confluence {call_score}/{max_score}: {', '.join(call_factors)}"
+                sig_confluence_score = call_score
+                sig_confluence_max = max_score
+                sig_rel_vol = bar_rel_vol
+            elif put_score >= params.min_confluence and put_score > call_score:
+                direction = "PUT"
+                reason = f"Confluence {put_score}/{max_score}: {', '.join(put_factors)}"
+                sig_confluence_score = put_score
+                sig_confluence_max = max_score
+                sig_rel_vol = bar_rel_vol
+
+        elif params.signal_type == "orb":
+            # ORB: trade breakouts of opening range
+            if orb_ready and orb_high is not None and orb_low is not None:
+                prev = bars[i - 1]
+                if prev.close <= orb_high and bar.close > orb_high:
+                    direction, reason = "CALL", f"ORB breakout above {orb_high:.2f}"
+                elif prev.close >= orb_low and bar.close < orb_low:
+                    direction, reason = "PUT", f"ORB breakdown below {orb_low:.2f}"
+
+        elif params.signal_type == "orb_direction":
+            # ORB with direction filter: only trade in ORB candle direction
+            if orb_ready and orb_high is not None and orb_low is not None:
+                orb_rng = orb_high - orb_low
+                if orb_rng > 0:
+                    prev = bars[i - 1]
+                    orb_body = abs((orb_close or 0) - (orb_open or 0))
+                    body_pct = orb_body / orb_rng
+
+                    if body_pct >= params.orb_body_min_pct:
+                        orb_bullish = (orb_close or 0) > (orb_open or 0)
+                        orb_bearish = (orb_close or 0) < (orb_open or 0)
+
+                        vwap_ok = True
+                        if params.orb_vwap_filter and vwap[i] is not None:
+                            if orb_bullish and (orb_close or 0) < vwap[i]:
+                                vwap_ok = False
+                            elif orb_bearish and (orb_close or 0) > vwap[i]:
+                                vwap_ok = False
+
+                        gap_ok = True
+                        if params.orb_gap_fade_filter and prev_close is not None and orb_open is not None:
+                            gap = orb_open - prev_close
+                            if orb_bullish and gap > 0:
+                                gap_ok = False  # want gap to oppose direction
+                            elif orb_bearish and gap < 0:
+                                gap_ok = False
+
+                        if vwap_ok and gap_ok:
+                            if orb_bullish and prev.close <= orb_high and bar.close > orb_high:
+                                direction = "CALL"
+                                reason = f"ORB-{params.orb_minutes} bullish breakout (body {body_pct:.0%})"
+                                sig_orb_range = orb_rng
+                                sig_orb_entry = orb_high
+                            elif orb_bearish and prev.close >= orb_low and bar.close < orb_low:
+                                direction = "PUT"
+                                reason = f"ORB-{params.orb_minutes} bearish breakdown (body {body_pct:.0%})"
+                                sig_orb_range = orb_rng
+                                sig_orb_entry = orb_low
+
+        elif params.signal_type == "vwap_reclaim":
+            # VWAP reclaim: price crosses VWAP with strong bar
+            if vwap[i] is not None and vwap[i - 1] is not None:
+                prev = bars[i - 1]
+                bar_body = abs(bar.close - bar.open)
+                if bar_body >= 0.30:
+                    if prev.close < vwap[i - 1] and bar.close > vwap[i]:
+                        direction = "CALL"
+                        reason = f"VWAP reclaim bullish (body ${bar_body:.2f})"
+                    elif prev.close > vwap[i - 1] and bar.close < vwap[i]:
+                        direction = "PUT"
+                        reason = f"VWAP reclaim bearish (body ${bar_body:.2f})"
+
+        elif params.signal_type == "vwap_rsi":
+            # VWAP for direction + RSI for timing
+            if vwap[i] is not None and rsi[i] is not None:
+                if bar.close > vwap[i] and rsi[i] <= params.rsi_os:
+                    direction, reason = "CALL", f"Above VWAP + RSI oversold ({rsi[i]:.0f})"
+                elif bar.close < vwap[i] and rsi[i] >= params.rsi_ob:
+                    direction, reason = "PUT", f"Below VWAP + RSI overbought ({rsi[i]:.0f})"
+
+        elif params.signal_type == "bb_squeeze":
+            # Bollinger Band squeeze breakout
+            if bb_upper[i] is not None and bb_lower[i] is not None and bb_upper[i - 1] is not None:
+                width = bb_upper[i] - bb_lower[i]
+                prev_width = (bb_upper[i - 1] or 0) - (bb_lower[i - 1] or 0)
+                expanding = width > prev_width  # bands expanding = squeeze release
+                if expanding:
+                    if bar.close > bb_upper[i]:
+                        direction, reason = "CALL", "BB squeeze breakout above"
+                    elif bar.close < bb_lower[i]:
+                        direction, reason = "PUT", "BB squeeze breakdown below"
+
+        elif params.signal_type == "rsi_reversal":
+            # Pure RSI reversal signals
+            if rsi[i] is not None and rsi[i - 1] is not None:
+                if rsi[i - 1] < params.rsi_os and rsi[i] >= params.rsi_os:
+                    direction, reason = "CALL", f"RSI crossed above {params.rsi_os:.0f}"
+                elif rsi[i - 1] > params.rsi_ob and rsi[i] <= params.rsi_ob:
+                    direction, reason = "PUT", f"RSI crossed below {params.rsi_ob:.0f}"
+
+        else:
+            # Original strategies: ema_cross, vwap_cross, ema_vwap
+            if any(v is None for v in [ema_f[i], ema_f[i - 1], ema_s[i], ema_s[i - 1]]):
+                continue
+
+            ema_bull = ema_f[i - 1] <= ema_s[i - 1] and ema_f[i] > ema_s[i]
+            ema_bear = ema_f[i - 1] >= ema_s[i - 1] and ema_f[i] < ema_s[i]
+
+            vwap_bull = vwap[i] is not None and bar.close > vwap[i]
+            vwap_bear = vwap[i] is not None and bar.close < vwap[i]
+
+            if params.signal_type == "ema_cross":
+                if ema_bull:
+                    direction, reason = "CALL", f"EMA {params.ema_fast}/{params.ema_slow} bullish cross"
+                elif ema_bear:
+                    direction, reason = "PUT", f"EMA {params.ema_fast}/{params.ema_slow} bearish cross"
+
+            elif params.signal_type == "vwap_cross":
+                if vwap[i] is not None and vwap[i - 1] is not None:
+                    if bars[i - 1].close <= vwap[i - 1] and bar.close > vwap[i]:
+                        direction, reason = "CALL", "Price crossed above VWAP"
+                    elif bars[i - 1].close >= vwap[i - 1] and bar.close < vwap[i]:
+                        direction, reason = "PUT", "Price crossed below VWAP"
+
+            elif params.signal_type == "ema_vwap":
+                if ema_bull and vwap_bull:
+                    direction, reason = "CALL", "EMA cross + above VWAP"
+                elif ema_bear and vwap_bear:
+                    direction, reason = "PUT", "EMA cross + below VWAP"
+
+        # RSI filter: if enabled, block signals that disagree with RSI
+        # (confluence handles RSI internally, skip filter for it)
+        if direction and params.rsi_period > 0 and rsi[i] is not None:
+            if params.signal_type not in ("vwap_rsi", "rsi_reversal", "confluence"):
+                if direction == "CALL" and rsi[i] > params.rsi_ob:
+                    continue  # don't buy calls when overbought
+                if direction == "PUT" and rsi[i] < params.rsi_os:
+                    continue  # don't buy puts when oversold
+
+        # Pivot S/R filter: block signals that fight key levels
+        if direction and params.pivot_filter_enabled and pivots is not None:
+            proximity = params.pivot_proximity_pct / 100.0
+            price = bar.close
+            if direction == "CALL":
+                # Block CALL if price is near resistance (buying into ceiling)
+                near_r1 = abs(price - pivots.r1) / pivots.r1 < proximity if pivots.r1 != 0 else False
+                near_r2 = abs(price - pivots.r2) / pivots.r2 < proximity if pivots.r2 != 0 else False
+                if near_r1 or near_r2:
+                    continue
+            elif direction == "PUT":
+                # Block PUT if price is near support (selling into floor)
+                near_s1 = abs(price - pivots.s1) / pivots.s1 < proximity if pivots.s1 != 0 else False
+                near_s2 = abs(price - pivots.s2) / pivots.s2 < proximity if pivots.s2 != 0 else False
+                if near_s1 or near_s2:
+                    continue
+
+        if direction:
+            signals.append(Signal(
+                timestamp=bar.timestamp,
+                direction=direction,
+                ticker_price=bar.close,
+                reason=reason,
+                orb_range=sig_orb_range,
+                orb_entry_level=sig_orb_entry,
+                confluence_score=sig_confluence_score,
+                confluence_max_score=sig_confluence_max,
+                rel_vol=sig_rel_vol,
+            ))
+
+    # Entry confirmation: require N 1-minute bars to confirm direction
+    if params.entry_confirm_minutes > 0 and confirm_bars:
+        signals = _apply_entry_confirmation(signals, params, confirm_bars)
+
+    return signals
+
+
+def price_trade_path(
+    bars: Sequence[BarData],
+    strike: float,
+    vix: float,
+    direction: str,
+    intrabar_worst: bool,
+    minutes_to_expiry: Callable[[Sequence[BarData]], list[float]] = _path_minutes_to_close,
+) -> Iterator[tuple[float, float, float, float]]:
+    """Yield (minutes to expiry, mid, delta, worst-case mid) for each bar of a
+    trade; see _price_path_chunks()."""
+    for _, *columns in _price_path_chunks(bars, strike, vix, direction, intrabar_worst, minutes_to_expiry):
+        yield from zip(*columns)
+
+
+def simulate_trade_loop(
+    trade: SimulatedTrade,
+    bars_after: list[BarData],
+    vix: float,
+    params: BacktestParams,
+    atr_at_entry: Optional[float] = None,
+) -> None:
+    """Per-bar reference implementation of engine._simulate_trade."""
+    trade.highest_price_seen = trade.entry_price
+
+    levels = _exit_levels(trade, params, atr_at_entry)
+    use_orb_stops = levels.use_orb_stops
+    spy_stop, spy_target = levels.spy_stop, levels.spy_target
+    stop_price = levels.stop_price
+
+    # Option mid, delta and intrabar worst-case mid for each bar, priced ahead
+    # of the exit checks
+    path = price_trade_path(bars_after, trade.strike, vix, trade.direction, intrabar_worst=not use_orb_stops)
+
+    for bar, (mtc, opt_price, opt_delta, opt_price_worst) in zip(bars_after, path):
+        # Compute per-bar exit slippage (dynamic spread or flat)
+        if params.spread_model_enabled:
+            exit_spread = estimate_spread_pct(opt_delta, mtc, vix, opt_price, is_0dte=True)
+            bar_slippage = exit_spread / 2 * 100  # _close_trade expects a percentage
+        else:
+            bar_slippage = params.exit_slippage_percent
+
+        if opt_price > trade.highest_price_seen:
+            trade.highest_price_seen = opt_price
+
+        elapsed = (bar.timestamp - trade.entry_time).total_seconds() / 60
+        gain_pct = (opt_price - trade.entry_price) / trade.entry_price * 100 if trade.entry_price > 0 else 0
+
+        # P1: Force exit
+        if bar.timestamp.time() >= params.force_exit_time:
+            _close_trade(trade, bar.timestamp, opt_price, "TIME_BASED", bar_slippage,
+                         exit_detail=f"Force exit at {bar.timestamp.strftime('%H:%M')} (opt ${opt_price:.2f})")
+            return
+
+        # ORB time stop
+        if use_orb_stops and bar.timestamp.time() >= params.orb_time_stop:
+            _close_trade(trade, bar.timestamp, opt_price, "ORB_TIME_STOP", bar_slippage,
+                         exit_detail=f"ORB time stop at {bar.timestamp.strftime('%H:%M')} (opt ${opt_price:.2f})")
+            return
+
+        # P2: Max hold
+        if elapsed >= params.max_hold_minutes:
+            _close_trade(trade, bar.timestamp, opt_price, "MAX_HOLD_TIME", bar_slippage,
+                         exit_detail=f"Held {elapsed:.0f}min (max {params.max_hold_minutes}min)")
+            return
+
+        # P3: Stop loss (intrabar: check worst-case price within bar)
+        if use_orb_stops:
+            if trade.direction == "CALL" and bar.low <= spy_stop:
+                _close_trade(trade, bar.timestamp, opt_price, "STOP_LOSS", bar_slippage,
+                             exit_detail=f"Underlying ${bar.low:.2f} hit ORB stop ${spy_stop:.2f}")
+                return
+            elif trade.direction == "PUT" and bar.high >= spy_stop:
+                _close_trade(trade, bar.timestamp, opt_price, "STOP_LOSS", bar_slippage,
+                             exit_detail=f"Underlying ${bar.high:.2f} hit ORB stop ${spy_stop:.2f}")
+                return
+        else:
+            if opt_price_worst <= stop_price:
+                fill_price = opt_price_worst  # realistic fill at actual worst price, not ideal stop level
+                _close_trade(trade, bar.timestamp, fill_price, "STOP_LOSS", bar_slippage,
+                             exit_detail=f"Opt ${opt_price_worst:.2f} <= stop ${stop_price:.2f} (-{params.stop_loss_percent:.0f}%)")
+                return
+
+        # Breakeven stop adjustment (non-ORB only)
+        if not use_orb_stops:
+            if (
+                not trade.breakeven_stop_applied
+                and params.breakeven_trigger_percent > 0
+                and trade.highest_price_seen >= trade.entry_price * (1 + params.breakeven_trigger_percent / 100)
+            ):
+                stop_price = trade.entry_price
+                trade.breakeven_stop_applied = True
+
+        # P4: Profit target
+        if use_orb_stops:
+            if trade.direction == "CALL" and bar.high >= spy_target:
+                _close_trade(trade, bar.timestamp, opt_price, "PROFIT_TARGET", bar_slippage,
+                             exit_detail=f"Underlying ${bar.high:.2f} hit ORB target ${spy_target:.2f}")
+                return
+            elif trade.direction == "PUT" and bar.low <= spy_target:
+                _close_trade(trade, bar.timestamp, opt_price, "PROFIT_TARGET", bar_slippage,
+                             exit_detail=f"Underlying ${bar.low:.2f} hit ORB target ${spy_target:.2f}")
+                return
+        else:
+            if gain_pct >= params.profit_target_percent:
+                if params.scale_out_enabled and trade.quantity >= 2 and not trade.scaled_out:
+                    trade.scaled_out = True
+                    trade.scaled_out_quantity = trade.quantity // 2
+                    trade.scaled_out_price = opt_price
+                elif not trade.scaled_out:
+                    _close_trade(trade, bar.timestamp, opt_price, "PROFIT_TARGET", bar_slippage,
+                                 exit_detail=f"Gain {gain_pct:.1f}% >= {params.profit_target_percent:.0f}% (opt ${opt_price:.2f})")
+                    return
+
+        # P5: Trailing stop
+        if trade.highest_price_seen > trade.entry_price:
+            trail_pct = (
+                params.trailing_stop_after_scale_out_percent
+                if trade.scaled_out
+                else params.trailing_stop_percent
+            )
+            trail_price = trade.highest_price_seen * (1 - trail_pct / 100)
+            if opt_price <= trail_price:
+                _close_trade(trade, bar.timestamp, opt_price, "TRAILING_STOP", bar_slippage,
+                             exit_detail=f"Opt ${opt_price:.2f} <= trail ${trail_price:.2f} (peak ${trade.highest_price_seen:.2f}, {trail_pct:.0f}%)")
+                return
+
+    # End of day — force close at last bar
+    if trade.exit_time is None and bars_after:
+        last = bars_after[-1]
+        last_price = opt_price  # the loop ran to the last bar
+        if params.spread_model_enabled:
+            exit_spread = estimate_spread_pct(opt_delta, mtc, vix, last_price, is_0dte=True)
+            eod_slippage = exit_spread / 2 * 100
+        else:
+            eod_slippage = params.exit_slippage_percent
+        _close_trade(trade, last.timestamp, last_price, "TIME_BASED", eod_slippage,
+                     exit_detail=f"EOD close (opt ${last_price:.2f})")
@@ -0,0 +1,39 @@
+import random
+from datetime import date, datetime, timedelta
+
+import pytz
+
+from app.services.backtest.market_data import BarData
+
+ET = pytz.timezone("US/Eastern")
+
+
+def make_day(seed: int, day: date, interval_min: int = 5, start_price: float = 600.0) -> list[BarData]:
+    """Deterministic random-walk session (9:30-16:00 ET) for backtest tests."""
+    rng = random.Random(seed)
+    start = ET.localize(datetime(day.year, day.month, day.day, 9, 30))
+    bars = []
+    price = start_price
+    for i in range(390 // interval_min):
+        o = price
+        c = o + rng.gauss(0, 0.6)
+        h = max(o, c) + abs(rng.gauss(0, 0.25))
+        l = min(o, c) - abs(rng.gauss(0, 0.25))
+        bars.append(BarData(
+            timestamp=start + timedelta(minutes=i * interval_min),
+            open=round(o, 2), high=round(h, 2), low=round(l, 2), close=round(c, 2),
+            volume=rng.randint(50_000, 400_000),
+        ))
+        price = c
+    return bars
+
+
+def make_days(num_days: int, start: date = date(2026, 1, 5), seed: int = 0, **kwargs) -> dict[date, list[BarData]]:
+    """num_days consecutive weekdays of synthetic bars keyed by trade date."""
+    bars_by_day: dict[date, list[BarData]] = {}
+    day = start
+    while len(bars_by_day) < num_days:
+        if day.weekday() < 5:
+            bars_by_day[day] = make_day(seed + len(bars_by_day), day, **kwargs)
+        day += timedelta(days=1)
+    return bars_by_day
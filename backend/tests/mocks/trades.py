@@ -0,0 +1,21 @@
+from datetime import date
+
+from app.models import Trade, TradeDirection, TradeStatus
+
+
+def make_trade(db_session, status=TradeStatus.PENDING, trade_date=None, **fields):
+    """Insert and commit a minimal SPY call Trade; keyword fields override the defaults."""
+    values = {
+        "trade_date": trade_date or date.today(),
+        "direction": TradeDirection.CALL,
+        "option_symbol": "SPY_TEST_OPT",
+        "strike_price": 601.0,
+        "expiration_date": date.today(),
+        "entry_quantity": 1,
+        "status": status,
+    }
+    values.update(fields)
+    trade = Trade(**values)
+    db_session.add(trade)
+    db_session.commit()
+    return trade
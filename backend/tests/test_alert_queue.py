@@ -0,0 +1,218 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+import app.database as database_module
+from app.dependencies import get_alert_queue
+from app.models import Alert, AlertStatus
+from app.schemas import TradingViewAlert
+from app.services import alert_queue as alert_queue_module
+from app.services.alert_queue import AlertQueue, QueuedAlert
+
+
+def _alert(action="BUY_CALL", ticker="SPY"):
+    return TradingViewAlert(ticker=ticker, action=action, secret="test-secret", price=600.0)
+
+
+def _item(alert_id, action, at):
+    return QueuedAlert(alert_id, _alert(action), enqueued_at=at)
+
+
+def _payload(action="BUY_CALL"):
+    return {"ticker": "SPY", "action": action, "secret": "test-secret", "price": 600.0}
+
+
+def test_coalesce_drops_duplicates_and_superseded():
+    queue = AlertQueue()
+    batch = [
+        _item(1, "BUY_CALL", 100.0),
+        _item(2, "BUY_CALL", 101.0),  # duplicate of #1
+        _item(3, "BUY_PUT", 102.0),  # supersedes #1
+        _item(4, "CLOSE", 103.0),
+        _item(5, "BUY_PUT", 104.0),  # not coalesced across the CLOSE
+    ]
+    keep, dropped = queue._coalesce("SPY", batch)
+
+    assert [i.alert_id for i in keep] == [3, 4, 5]
+    reasons = {i.alert_id: reason for i, reason in dropped}
+    assert reasons[2].startswith("Duplicate alert")
+    assert reasons[1] == "Superseded by opposite alert #3 (within 30s)"
+
+
+def test_coalesce_keeps_alerts_outside_window():
+    queue = AlertQueue()
+    queue._last_buy["SPY"] = ("BUY_CALL", 0.0)
+    keep, dropped = queue._coalesce("SPY", [_item(1, "BUY_CALL", 100.0), _item(2, "BUY_CALL", 200.0)])
+
+    assert [i.alert_id for i in keep] == [1, 2]
+    assert dropped == []
+
+
+@pytest.mark.asyncio
+async def test_worker_processes_in_order_and_rejects_coalesced(db_engine, db_session, monkeypatch):
+    monkeypatch.setattr(database_module, "SessionLocal", sessionmaker(bind=db_engine))
+    alerts = []
+    for action in ("BUY_CALL", "BUY_CALL", "CLOSE"):
+        db_alert = Alert(raw_payload="{}", ticker="SPY", direction="CALL", status=AlertStatus.RECEIVED)
+        db_session.add(db_alert)
+        db_session.commit()
+        alerts.append((db_alert.id, action))
+
+    processed = []
+
+    async def fake_process(app, item):
+        processed.append(item.alert_id)
+
+    queue = AlertQueue()
+    monkeypatch.setattr(queue, "_process", fake_process)
+    for alert_id, action in alerts:
+        assert queue.enqueue(SimpleNamespace(), alert_id, _alert(action))
+    await asyncio.sleep(0.05)
+    await queue.stop()
+
+    assert processed == [alerts[0][0], alerts[2][0]]
+    db_session.expire_all()
+    duplicate = db_session.get(Alert, alerts[1][0])
+    assert duplicate.status == AlertStatus.REJECTED
+    stats = queue.stats()
+    assert stats["depth"] == 0
+    assert stats["processed"] == 2
+    assert stats["coalesced"] == 1
+    assert stats["max_lag_ms"] is not None
+
+
+@pytest.mark.asyncio
+async def test_depth_counts_each_tickers_batch_separately(monkeypatch):
+    release = asyncio.Event()
+
+    async def blocked_process(app, item):
+        await release.wait()
+
+    queue = AlertQueue()
+    monkeypatch.setattr(queue, "_process", blocked_process)
+    for alert_id, ticker in ((1, "SPY"), (2, "QQQ"), (3, "QQQ")):
+        action = "CLOSE" if alert_id == 3 else "BUY_CALL"
+        assert queue.enqueue(SimpleNamespace(), alert_id, _alert(action, ticker=ticker))
+    await asyncio.sleep(0.01)
+
+    stats = queue.stats()
+    assert stats["depth_by_ticker"] == {"SPY": 1, "QQQ": 2}
+    assert stats["depth"] == 3
+
+    release.set()
+    await asyncio.sleep(0.01)
+    assert queue.stats()["depth"] == 0
+    await queue.stop()
+
+
+def _received_alerts(db_session, count):
+    ids = []
+    for _ in range(count):
+        db_alert = Alert(raw_payload="{}", ticker="SPY", direction="CALL", status=AlertStatus.RECEIVED)
+        db_session.add(db_alert)
+        db_session.commit()
+        ids.append(db_alert.id)
+    return ids
+
+
+@pytest.mark.asyncio
+async def test_stop_drains_queued_alerts(monkeypatch):
+    processed = []
+
+    async def slow_process(app, item):
+        await asyncio.sleep(0.02)
+        processed.append(item.alert_id)
+
+    queue = AlertQueue()
+    monkeypatch.setattr(queue, "_process", slow_process)
+    for alert_id, action in ((1, "BUY_CALL"), (2, "CLOSE")):
+        assert queue.enqueue(SimpleNamespace(), alert_id, _alert(action))
+    await queue.stop(drain_timeout=1.0)
+
+    assert processed == [1, 2]
+
+
+@pytest.mark.asyncio
+async def test_stop_marks_alerts_left_after_drain_timeout(db_engine, db_session, monkeypatch):
+    monkeypatch.setattr(database_module, "SessionLocal", sessionmaker(bind=db_engine))
+    ids = _received_alerts(db_session, 2)
+
+    async def blocked_process(app, item):
+        await asyncio.Event().wait()
+
+    queue = AlertQueue()
+    monkeypatch.setattr(queue, "_process", blocked_process)
+    for alert_id, action in zip(ids, ("BUY_CALL", "CLOSE")):
+        assert queue.enqueue(SimpleNamespace(), alert_id, _alert(action))
+    await queue.stop(drain_timeout=0.05)
+
+    db_session.expire_all()
+    for alert_id in ids:
+        db_alert = db_session.get(Alert, alert_id)
+        assert db_alert.status == AlertStatus.ERROR
+        assert db_alert.rejection_reason == "Not processed before shutdown"
+
+
+@pytest.mark.asyncio
+async def test_worker_error_marks_rest_of_batch(db_engine, db_session, monkeypatch):
+    monkeypatch.setattr(database_module, "SessionLocal", sessionmaker(bind=db_engine))
+    ids = _received_alerts(db_session, 2)
+
+    async def failing_process(app, item):
+        raise RuntimeError("boom")
+
+    queue = AlertQueue()
+    monkeypatch.setattr(queue, "_process", failing_process)
+    for alert_id, action in zip(ids, ("BUY_CALL", "CLOSE")):
+        assert queue.enqueue(SimpleNamespace(), alert_id, _alert(action))
+    await asyncio.sleep(0.05)
+
+    db_session.expire_all()
+    assert [db_session.get(Alert, i).status for i in ids] == [AlertStatus.ERROR, AlertStatus.ERROR]
+    assert queue.stats()["depth"] == 0
+    await queue.stop()
+
+
+def test_webhook_queued_returns_202_and_reports_depth(client, monkeypatch):
+    from app.routers import webhook as webhook_module
+
+    monkeypatch.setattr(webhook_module.settings, "WEBHOOK_QUEUE_ENABLED", True)
+    monkeypatch.setattr(webhook_module, "_in_trading_window", lambda: True)
+
+    async def idle_worker(self, app, ticker, queue):
+        await asyncio.Event().wait()
+
+    monkeypatch.setattr(AlertQueue, "_worker", idle_worker)
+
+    resp = client.post("/api/webhook", json=_payload())
+    assert resp.status_code == 202
+    assert resp.json()["status"] == "queued"
+
+    status = client.get("/api/dashboard/alert-queue").json()
+    assert status["depth"] == 1
+    assert status["depth_by_ticker"] == {"SPY": 1}
+
+
+def test_webhook_queue_full_returns_503(client, db_engine, monkeypatch):
+    from app.routers import webhook as webhook_module
+
+    monkeypatch.setattr(webhook_module.settings, "WEBHOOK_QUEUE_ENABLED", True)
+    monkeypatch.setattr(webhook_module, "_in_trading_window", lambda: True)
+    monkeypatch.setattr(alert_queue_module.settings, "WEBHOOK_QUEUE_MAX_DEPTH", 1)
+
+    async def idle_worker(self, app, ticker, queue):
+        await asyncio.Event().wait()
+
+    monkeypatch.setattr(AlertQueue, "_worker", idle_worker)
+
+    assert client.post("/api/webhook", json=_payload("BUY_CALL")).status_code == 202
+    resp = client.post("/api/webhook", json=_payload("BUY_PUT"))
+    assert resp.status_code == 503
+
+    db = sessionmaker(bind=db_engine)()
+    rejected = db.query(Alert).filter(Alert.status == AlertStatus.REJECTED).one()
+    assert rejected.rejection_reason == "Alert queue full"
+    db.close()
+    assert get_alert_queue().stats()["rejected_full"] == 1
@@ -0,0 +1,83 @@
+import asyncio
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.services.backtest.market_data import BarData
+from app.services.bar_aggregator import ET, BarAggregator, resample_bars
+from app.services.streaming import StreamingService
+
+
+def _minute(day, minute_offset, price, volume=100):
+    ts = datetime.combine(day, datetime.min.time(), tzinfo=ET).replace(hour=9, minute=30)
+    ts += timedelta(minutes=minute_offset)
+    return BarData(timestamp=ts, open=price, high=price + 0.5, low=price - 0.5, close=price + 0.1, volume=volume)
+
+
+def test_resample_bars_aligns_to_open():
+    day = datetime.now(ET).date()
+    minute_bars = [_minute(day, i, 600.0 + i) for i in range(7)]
+
+    five = resample_bars(minute_bars, 5)
+
+    assert [b.timestamp.strftime("%H:%M") for b in five] == ["09:30", "09:35"]
+    first = five[0]
+    assert first.open == 600.0
+    assert first.high == 604.5
+    assert first.low == 599.5
+    assert first.close == 604.1
+    assert first.volume == 500
+    # Trailing partial bar built from 9:35 and 9:36
+    assert five[1].volume == 200
+
+
+def test_add_minute_bar_replaces_and_orders():
+    day = datetime.now(ET).date()
+    agg = BarAggregator()
+    agg.add_minute_bar("SPY", _minute(day, 1, 601.0))
+    agg.add_minute_bar("SPY", _minute(day, 0, 600.0))
+    agg.add_minute_bar("SPY", _minute(day, 1, 602.0))
+
+    bars = agg.get_bars("SPY")
+    assert [b.open for b in bars] == [600.0, 602.0]
+
+
+@pytest.mark.asyncio
+async def test_wait_for_bar_close_wakes_on_boundary():
+    day = datetime.now(ET).date()
+    agg = BarAggregator()
+
+    waiter = asyncio.create_task(agg.wait_for_bar_close("SPY", 5, timeout=1.0))
+    await asyncio.sleep(0)
+    agg.add_minute_bar("SPY", _minute(day, 3, 600.0))  # 9:33 — 5m bar still open
+    await asyncio.sleep(0)
+    assert not waiter.done()
+
+    agg.add_minute_bar("SPY", _minute(day, 4, 600.0))  # 9:34 — closes the 9:30 bar
+    assert await waiter is True
+
+
+@pytest.mark.asyncio
+async def test_streaming_chart_equity_feeds_aggregator():
+    day = datetime.now(ET).date()
+    agg = BarAggregator()
+    streaming = StreamingService(bar_aggregator=agg)
+    start = _minute(day, 2, 0).timestamp
+    message = {
+        "data": [{
+            "service": "CHART_EQUITY",
+            "content": [{
+                "key": "SPY", "1": 600.0, "2": 601.0, "3": 599.5, "4": 600.5,
+                "5": 12345.0, "6": 1, "7": int(start.timestamp() * 1000), "8": 1,
+            }],
+        }]
+    }
+
+    await streaming._on_message(json.dumps(message))
+
+    bars = agg.get_bars("SPY")
+    assert len(bars) == 1
+    assert bars[0].timestamp == start
+    assert bars[0].close == 600.5
+    assert bars[0].volume == 12345
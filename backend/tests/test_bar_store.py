@@ -0,0 +1,105 @@
+"""Tests for the memory-mapped CSV bar store."""
+import os
+import pickle
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from app.services.backtest import bar_store
+from app.services.backtest.day_bars import DayBars
+from app.services.backtest.market_data import ET, BarData, read_bar_csv
+from tests.mocks.synthetic_bars import make_days
+
+
+def _write_csv(path, bars_by_day):
+    rows = []
+    for day_bars in bars_by_day.values():
+        for b in day_bars:
+            ts = b.timestamp.replace(tzinfo=None)
+            rows.append({
+                "Date": ts.date().isoformat(), "Time": ts.strftime("%H:%M"),
+                "Timestamp": ts.isoformat(sep=" "),
+                "Open": b.open, "High": b.high, "Low": b.low, "Close": b.close, "Volume": b.volume,
+            })
+    # Shuffle rows so the loader has to sort them back into order
+    df = pd.DataFrame(rows).sample(frac=1.0, random_state=1)
+    df.to_csv(path, index=False)
+
+
+def _row_parse(path, start, end):
+    """The original iterrows loader, kept here as the reference."""
+    df = pd.read_csv(path, parse_dates=["Timestamp"])
+    out: dict[date, list[BarData]] = {}
+    for _, row in df.iterrows():
+        ts_naive = row["Timestamp"].to_pydatetime()
+        if not (start <= ts_naive.date() <= end):
+            continue
+        out.setdefault(ts_naive.date(), []).append(BarData(
+            timestamp=ET.localize(ts_naive), open=float(row["Open"]), high=float(row["High"]),
+            low=float(row["Low"]), close=float(row["Close"]), volume=int(row["Volume"]),
+        ))
+    for d in out:
+        out[d].sort(key=lambda b: b.timestamp)
+    return out
+
+
+def test_store_matches_row_parser(tmp_path):
+    csv_path = str(tmp_path / "SPY_5min_6months.csv")
+    _write_csv(csv_path, make_days(6))
+    start, end = date(2026, 1, 6), date(2026, 1, 12)
+
+    loaded = read_bar_csv(csv_path, start, end)
+    assert isinstance(loaded, DayBars)
+    expected = _row_parse(csv_path, start, end)
+    assert list(loaded) == sorted(expected)
+    assert all(loaded[d] == expected[d] for d in expected)
+    assert os.path.exists(tmp_path / ".barstore" / "SPY_5min_6months" / "meta.json")
+
+
+def test_day_columns_are_zero_copy_views(tmp_path):
+    csv_path = str(tmp_path / "QQQ_5min_6months.csv")
+    _write_csv(csv_path, make_days(3))
+    loaded = read_bar_csv(csv_path, date(2026, 1, 1), date(2026, 12, 31))
+
+    view = loaded[next(iter(loaded))]
+    assert isinstance(view.close, np.memmap)
+    assert view.close.tolist() == [b.close for b in view]
+
+
+def test_rebuilds_when_csv_changes(tmp_path):
+    csv_path = str(tmp_path / "SPY_5min_6months.csv")
+    _write_csv(csv_path, make_days(2))
+    first = bar_store.open_bar_store(csv_path)
+    assert bar_store.open_bar_store(csv_path) is first
+
+    _write_csv(csv_path, make_days(4))
+    st = os.stat(csv_path)
+    os.utime(csv_path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    second = bar_store.open_bar_store(csv_path)
+    assert second is not first
+    assert len(second.bars) == 4
+
+
+def test_mapped_bars_pickle_as_path(tmp_path):
+    csv_path = str(tmp_path / "SPY_5min_6months.csv")
+    _write_csv(csv_path, make_days(20))
+    loaded = read_bar_csv(csv_path, date(2026, 1, 1), date(2026, 12, 31))
+
+    payload = pickle.dumps(loaded)
+    assert len(payload) < 4096  # no column data in the pickle
+    restored = pickle.loads(payload)
+    day = list(loaded)[3]
+    assert restored[day] == loaded[day]
+
+
+def test_sub_minute_timestamps_fall_back_to_rows(tmp_path):
+    csv_path = str(tmp_path / "SPY_1min_6months.csv")
+    pd.DataFrame([{
+        "Date": "2026-01-05", "Time": "09:30", "Timestamp": "2026-01-05 09:30:15",
+        "Open": 1.0, "High": 2.0, "Low": 0.5, "Close": 1.5, "Volume": 10,
+    }]).to_csv(csv_path, index=False)
+
+    loaded = read_bar_csv(csv_path, date(2026, 1, 5), date(2026, 1, 5))
+    assert isinstance(loaded, dict)
+    assert loaded[date(2026, 1, 5)][0].timestamp.second == 15
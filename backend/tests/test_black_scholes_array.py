@@ -0,0 +1,91 @@
+"""Vectorized B-S kernel vs. the scalar black_scholes()."""
+from datetime import date
+
+import numpy as np
+import pytest
+
+from app.services.backtest.black_scholes import (
+    _round_array,
+    black_scholes,
+    black_scholes_array,
+    estimate_option_path,
+    estimate_option_price_and_delta,
+    estimate_option_price_at,
+)
+from app.services.backtest.day_bars import DayBars
+from app.services.backtest.engine import _minutes_to_close
+from tests.mocks.reference_engine import price_trade_path
+from tests.mocks.synthetic_bars import make_day
+
+
+@pytest.mark.parametrize("option_type", ["CALL", "PUT"])
+@pytest.mark.parametrize("sigma", [0.12, 0.35])
+def test_array_matches_scalar_exactly(option_type, sigma):
+    rng = np.random.default_rng(11)
+    n = 5000
+    S = rng.uniform(50, 700, n)
+    K = np.round(S * rng.uniform(0.9, 1.1, n))
+    # Include expired (< 1 minute) and near-expiry times
+    T = rng.choice([0.0, 1e-7, 1 / 525600, 1e-4, 1e-3, 0.02], n) * rng.uniform(0.5, 1.5, n)
+
+    price, delta = black_scholes_array(S, K, T, sigma, option_type=option_type)
+
+    for i in range(n):
+        expected = black_scholes(S[i], K[i], T[i], sigma, option_type=option_type)
+        assert (price[i], delta[i]) == (expected.price, expected.delta)
+
+
+def test_array_broadcasts_scalars():
+    price, delta = black_scholes_array(600.0, np.array([590.0, 600.0, 610.0]), 60 / 525600, 0.2)
+    assert price.shape == delta.shape == (3,)
+    assert price[0] > price[1] > price[2]
+
+    price, delta = black_scholes_array(600.0, 600.0, 60 / 525600, 0.2, option_type="PUT")
+    expected = black_scholes(600.0, 600.0, 60 / 525600, 0.2, option_type="PUT")
+    assert (float(price), float(delta)) == (expected.price, expected.delta)
+
+
+def test_round_array_matches_round():
+    rng = np.random.default_rng(3)
+    x = np.concatenate([
+        rng.uniform(-1, 1, 20000),
+        (rng.integers(-20000, 20000, 5000) + 0.5) / 1e4,  # exact .5 ties at 4 digits
+        [0.0, -0.0, 1.0, -1.0],
+    ])
+    assert _round_array(x, 4).tolist() == [round(v, 4) for v in x.tolist()]
+
+
+def test_estimate_option_path_matches_per_bar_calls():
+    prices = np.linspace(598.0, 604.0, 50)
+    minutes = np.linspace(390.0, 0.0, 50)
+    path_prices, path_deltas = estimate_option_path(prices, 601.0, minutes, 18.0, "PUT")
+    for s, m, p, d in zip(prices, minutes, path_prices, path_deltas):
+        expected = estimate_option_price_and_delta(s, 601.0, m, 18.0, "PUT")
+        assert (p, d) == (expected.price, expected.delta)
+
+
+@pytest.mark.parametrize("packed", [False, True])
+@pytest.mark.parametrize("direction", ["CALL", "PUT"])
+def test_trade_path_matches_per_bar_pricing(packed, direction):
+    """Scalar head and every vectorized chunk agree with per-bar B-S calls."""
+    bars = make_day(5, date(2026, 1, 6), interval_min=1)
+    if packed:
+        bars = DayBars.from_bars_by_day({date(2026, 1, 6): bars})[date(2026, 1, 6)]
+    bars = bars[20:]
+    strike = round(bars[0].close)
+
+    path = list(price_trade_path(bars, strike, 19.0, direction, intrabar_worst=True))
+
+    assert len(path) == len(bars)
+    for bar, (mtc, price, delta, worst) in zip(bars, path):
+        assert mtc == _minutes_to_close(bar.timestamp)
+        expected = estimate_option_price_and_delta(bar.close, strike, mtc, 19.0, direction)
+        assert (price, delta) == (max(expected.price, 0.01), expected.delta)
+        worst_level = bar.low if direction == "CALL" else bar.high
+        assert worst == max(estimate_option_price_at(worst_level, strike, mtc, 19.0, direction), 0.01)
+
+
+def test_trade_path_without_intrabar_worst_repeats_mid():
+    bars = make_day(2, date(2026, 1, 7))
+    for _, price, _, worst in price_trade_path(bars, 600.0, 19.0, "CALL", intrabar_worst=False):
+        assert worst == price
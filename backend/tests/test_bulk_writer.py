@@ -0,0 +1,91 @@
+import asyncio
+import json
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+import app.database as database_module
+from app.dependencies import get_bulk_writer, get_position_book
+from app.models import TradeEvent, TradeEventType, TradePriceSnapshot, TradeStatus
+from app.services.bulk_writer import BulkWriter
+from app.services.streaming import StreamingService
+from app.tasks.price_recorder import PriceRecorderTask
+from tests.mocks.trades import make_trade
+
+
+@pytest.fixture
+def bulk_db(db_engine, db_session, monkeypatch):
+    monkeypatch.setattr(database_module, "SessionLocal", sessionmaker(bind=db_engine))
+    return db_session
+
+
+@pytest.mark.asyncio
+async def test_flush_inserts_snapshots_and_events(bulk_db):
+    trade = make_trade(bulk_db, TradeStatus.FILLED, entry_price=1.50)
+    writer = BulkWriter()
+    for i in range(3):
+        writer.add_snapshot(trade.id, 1.50 + i * 0.1, 1.70)
+    writer.add_event(trade.id, TradeEventType.EXIT_TRIGGERED, "Trailing stop hit", details={"reason": "TRAILING_STOP"})
+
+    assert await writer.flush() == 4
+    assert writer.pending == 0
+
+    snaps = bulk_db.query(TradePriceSnapshot).filter_by(trade_id=trade.id).all()
+    assert sorted(s.price for s in snaps) == pytest.approx([1.50, 1.60, 1.70])
+    event = bulk_db.query(TradeEvent).filter_by(trade_id=trade.id).one()
+    assert event.event_type == TradeEventType.EXIT_TRIGGERED
+    assert json.loads(event.details) == {"reason": "TRAILING_STOP"}
+
+
+@pytest.mark.asyncio
+async def test_full_batch_flushes_before_interval(bulk_db, monkeypatch):
+    from app.services import bulk_writer as bulk_writer_module
+
+    monkeypatch.setattr(bulk_writer_module.settings, "WRITE_BEHIND_FLUSH_MS", 60_000)
+    monkeypatch.setattr(bulk_writer_module.settings, "WRITE_BEHIND_BATCH_SIZE", 5)
+    trade = make_trade(bulk_db, TradeStatus.FILLED, entry_price=1.50)
+    writer = BulkWriter()
+    writer.start()
+    await asyncio.sleep(0)
+
+    for _ in range(5):
+        writer.add_snapshot(trade.id, 1.55, 1.55)
+    for _ in range(50):
+        if writer.pending == 0:
+            break
+        await asyncio.sleep(0.01)
+
+    assert bulk_db.query(TradePriceSnapshot).count() == 5
+    await writer.stop()
+
+
+@pytest.mark.asyncio
+async def test_stop_flushes_pending_rows(bulk_db):
+    trade = make_trade(bulk_db, TradeStatus.FILLED, entry_price=1.50)
+    writer = BulkWriter()
+    writer.start()
+    writer.add_snapshot(trade.id, 1.55, 1.55)
+
+    await writer.stop()
+
+    assert writer.pending == 0
+    assert bulk_db.query(TradePriceSnapshot).count() == 1
+
+
+def test_price_recorder_queues_every_streamed_tick(db_session):
+    trade = make_trade(db_session, TradeStatus.FILLED, entry_price=1.50)
+    book = get_position_book()
+    book.ensure_loaded(db_session)
+    streaming = StreamingService()
+    recorder = PriceRecorderTask(app=None)
+    streaming.add_option_listener(recorder._on_option_quote)
+
+    streaming._process_option_quotes([{"key": trade.option_symbol, "2": 1.60, "3": 1.70}])
+    streaming._process_option_quotes([{"key": trade.option_symbol, "2": 1.55}])
+    streaming._process_option_quotes([{"key": "OTHER_OPT", "2": 2.00, "3": 2.10}])
+
+    assert get_bulk_writer().pending == 2
+    assert book.get(trade.id).highest_price_seen == 1.60
+
+    recorder._persist_high_water(db_session, book)
+    db_session.refresh(trade)
+    assert trade.highest_price_seen == 1.60
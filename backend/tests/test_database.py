@@ -0,0 +1,43 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import QueuePool
+
+from app.config import Settings
+from app.database import create_db_engine
+from app.models import Alert, Base
+
+settings = Settings()
+
+
+def test_file_engine_uses_wal_pragmas_and_bounded_pool(tmp_path):
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'trades.db'}")
+    try:
+        with engine.connect() as conn:
+            assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+            assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+            assert conn.execute(text("PRAGMA busy_timeout")).scalar() == settings.SQLITE_BUSY_TIMEOUT_MS
+        assert isinstance(engine.pool, QueuePool)
+        assert engine.pool.size() == settings.DB_POOL_SIZE
+    finally:
+        engine.dispose()
+
+
+def test_read_engine_rejects_writes(tmp_path):
+    url = f"sqlite:///{tmp_path / 'trades.db'}"
+    engine = create_db_engine(url)
+    read_engine = create_db_engine(url, read_only=True)
+    try:
+        Base.metadata.create_all(bind=engine)
+        with Session(engine) as db:
+            db.add(Alert(raw_payload="{}", ticker="SPY"))
+            db.commit()
+
+        with read_engine.connect() as conn:
+            assert conn.execute(text("SELECT COUNT(*) FROM alerts")).scalar() == 1
+            with pytest.raises(OperationalError):
+                conn.execute(text("DELETE FROM alerts"))
+    finally:
+        read_engine.dispose()
+        engine.dispose()
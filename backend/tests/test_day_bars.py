@@ -0,0 +1,91 @@
+"""Tests for the struct-of-arrays DayBars container."""
+import bisect
+import pickle
+import tracemalloc
+from datetime import date
+
+import numpy as np
+
+from app.services.backtest.day_bars import DayBars, DayView, bar_timestamps, day_extremes
+from app.services.backtest.engine import BacktestParams, MarketDataCache, _compute_atr, run_backtest
+from app.services.backtest.market_data import ET, BarData
+from tests.mocks.synthetic_bars import make_day, make_days
+
+
+def test_round_trip_matches_bar_lists():
+    legacy = make_days(5)
+    packed = DayBars.from_bars_by_day(legacy)
+
+    assert list(packed) == sorted(legacy)
+    assert packed.num_bars == sum(len(v) for v in legacy.values())
+    for d, bars in legacy.items():
+        view = packed[d]
+        assert isinstance(view, DayView)
+        assert list(view) == bars
+        assert view[-1] == bars[-1]
+        assert view[10:20] == bars[10:20]
+        assert view[0].timestamp.tzinfo.zone == "US/Eastern"
+
+
+def test_timestamps_keep_dst_offset():
+    summer, winter = date(2026, 7, 6), date(2026, 1, 5)
+    packed = DayBars.from_bars_by_day({summer: make_day(1, summer), winter: make_day(2, winter)})
+    assert packed[summer][0].timestamp == ET.localize(packed[summer][0].timestamp.replace(tzinfo=None))
+    assert packed[summer][0].timestamp.utcoffset() != packed[winter][0].timestamp.utcoffset()
+
+
+def test_helpers_match_list_versions():
+    bars = make_day(3, date(2026, 1, 6))
+    view = DayBars.from_bars_by_day({date(2026, 1, 6): bars})[date(2026, 1, 6)]
+
+    assert day_extremes(view) == day_extremes(bars)
+    assert _compute_atr(view, 14) == _compute_atr(bars, 14)
+    ts = bar_timestamps(view)
+    for probe in (bars[0].timestamp, bars[17].timestamp, bars[-1].timestamp):
+        assert bisect.bisect_left(ts, probe) == bisect.bisect_left([b.timestamp for b in bars], probe)
+
+
+def test_subset_and_between():
+    packed = DayBars.from_bars_by_day(make_days(10))
+    days = list(packed)
+
+    window = packed.between(days[2], days[5])
+    assert list(window) == days[2:6]
+    assert np.shares_memory(window.close, packed.close)
+
+    picked = packed.subset([days[0], days[7]])
+    assert list(picked) == [days[0], days[7]]
+    assert picked[days[7]] == packed[days[7]]
+
+
+def _unpickled_bytes(obj) -> int:
+    payload = pickle.dumps(obj)
+    tracemalloc.start()
+    try:
+        restored = pickle.loads(payload)  # noqa: F841 - keep alive while measuring
+        return tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+
+def test_worker_copy_is_much_smaller_than_bar_lists():
+    legacy = make_days(40)
+    packed = DayBars.from_bars_by_day(legacy)
+    assert _unpickled_bytes(legacy) > 5 * _unpickled_bytes(packed)
+    restored = pickle.loads(pickle.dumps(packed))
+    assert all(restored[d] == legacy[d] for d in legacy)
+
+
+def test_backtest_matches_on_day_bars():
+    legacy = make_days(8)
+    vix = {d: 18.0 for d in legacy}
+    params = BacktestParams(
+        start_date=date(2026, 1, 5), end_date=date(2026, 1, 16),
+        signal_type="confluence", rsi_period=9, atr_period=14, min_confluence=4,
+    )
+    expected = run_backtest(params, MarketDataCache(bars_by_day=legacy, vix_by_day=vix))
+    actual = run_backtest(params, MarketDataCache(bars_by_day=DayBars.from_bars_by_day(legacy), vix_by_day=vix))
+
+    assert expected.total_trades > 0
+    assert [(t.entry_time, t.exit_time, t.exit_reason, t.pnl_dollars) for t in actual.trades] == \
+        [(t.entry_time, t.exit_time, t.exit_reason, t.pnl_dollars) for t in expected.trades]
@@ -0,0 +1,108 @@
+"""Parity tests: event-indexed exit simulator vs. the per-bar reference loop."""
+import copy
+import random
+from datetime import date, time, timedelta
+
+import pytest
+
+from app.services.backtest.black_scholes import estimate_option_price_and_delta
+from app.services.backtest.day_bars import DayBars
+from app.services.backtest.engine import (
+    BacktestParams,
+    MarketDataCache,
+    SimulatedTrade,
+    _minutes_to_close,
+    _simulate_trade,
+    run_backtest,
+)
+from tests.mocks.reference_engine import simulate_trade_loop
+from tests.mocks.synthetic_bars import make_day, make_days
+
+PARAM_VARIANTS = [
+    {},
+    {"stop_loss_percent": 90.0, "profit_target_percent": 500.0, "trailing_stop_percent": 60.0, "max_hold_minutes": 390},
+    {"stop_loss_percent": 100.0, "breakeven_trigger_percent": 0.0, "trailing_stop_percent": 100.0, "max_hold_minutes": 390},
+    {"stop_loss_percent": 100.0, "profit_target_percent": 1000.0, "trailing_stop_percent": 100.0, "max_hold_minutes": 20},
+    {"scale_out_enabled": False, "profit_target_percent": 15.0, "spread_model_enabled": False},
+    {"breakeven_trigger_percent": 5.0, "trailing_stop_after_scale_out_percent": 3.0, "profit_target_percent": 10.0},
+    {"force_exit_time": time(13, 0), "orb_time_stop": time(11, 0), "max_hold_minutes": 45},
+    {"atr_period": 14, "stop_loss_percent": 30.0, "trailing_stop_percent": 5.0},
+]
+
+
+def _trades(seed: int, bars: list, count: int = 12):
+    """Random entries on one day, with and without ORB levels."""
+    rng = random.Random(seed)
+    for _ in range(count):
+        i = rng.randrange(1, len(bars) - 1)
+        entry_bar = bars[i]
+        direction = rng.choice(["CALL", "PUT"])
+        strike = round(entry_bar.close) + rng.choice([-2, -1, 0, 1, 2])
+        opt = estimate_option_price_and_delta(
+            entry_bar.close, strike, _minutes_to_close(entry_bar.timestamp), 18.0, direction,
+        )
+        trade = SimulatedTrade(
+            trade_date=entry_bar.timestamp.date(), direction=direction, strike=strike,
+            entry_time=entry_bar.timestamp, entry_price=max(opt.price, 0.05),
+            quantity=rng.choice([1, 2, 3]),
+        )
+        if rng.random() < 0.3:
+            trade.orb_range = rng.uniform(0.5, 3.0)
+            trade.orb_entry_level = entry_bar.close
+        yield trade, i + 1, rng.choice([None, rng.uniform(0.3, 1.5)])
+
+
+@pytest.mark.parametrize("variant", range(len(PARAM_VARIANTS)))
+@pytest.mark.parametrize("interval_min", [1, 5])
+def test_event_simulator_matches_loop(variant, interval_min):
+    params = BacktestParams(start_date=date(2026, 1, 5), end_date=date(2026, 1, 30), **PARAM_VARIANTS[variant])
+    for seed in range(4):
+        day = date(2026, 1, 5) + timedelta(days=seed)
+        bars = make_day(seed * 7 + variant, day, interval_min=interval_min)
+        view = DayBars.from_bars_by_day({day: bars})[day]
+        for trade, start, atr in _trades(seed, bars):
+            expected = copy.deepcopy(trade)
+            simulate_trade_loop(expected, bars[start:], 18.0, params, atr_at_entry=atr)
+            for bars_after in (bars[start:], view[start:]):
+                actual = copy.deepcopy(trade)
+                _simulate_trade(actual, bars_after, 18.0, params, atr_at_entry=atr)
+                assert vars(actual) == vars(expected)
+
+
+def test_event_simulator_covers_exit_reasons():
+    """Sanity check that the parity data reaches every exit rule."""
+    reasons = set()
+    for variant in PARAM_VARIANTS:
+        params = BacktestParams(start_date=date(2026, 1, 5), end_date=date(2026, 1, 30), **variant)
+        for seed in range(4):
+            bars = make_day(seed, date(2026, 1, 5) + timedelta(days=seed), interval_min=1)
+            for trade, start, atr in _trades(seed, bars):
+                _simulate_trade(trade, bars[start:], 18.0, params, atr_at_entry=atr)
+                reasons.add(trade.exit_reason)
+    assert reasons >= {"TIME_BASED", "ORB_TIME_STOP", "MAX_HOLD_TIME", "STOP_LOSS", "PROFIT_TARGET", "TRAILING_STOP"}
+
+
+def test_empty_path_leaves_trade_open():
+    trade = SimulatedTrade(
+        trade_date=date(2026, 1, 5), direction="CALL", strike=600.0,
+        entry_time=make_day(0, date(2026, 1, 5))[-1].timestamp, entry_price=1.0, quantity=2,
+    )
+    _simulate_trade(trade, [], 18.0, BacktestParams(start_date=date(2026, 1, 5), end_date=date(2026, 1, 5)))
+    assert trade.exit_time is None
+
+
+def test_backtest_matches_loop(monkeypatch):
+    import app.services.backtest.engine as engine
+
+    bars = DayBars.from_bars_by_day(make_days(10, seed=4))
+    vix = {d: 16.0 + i for i, d in enumerate(bars)}
+    params = BacktestParams(
+        start_date=date(2026, 1, 5), end_date=date(2026, 1, 16),
+        signal_type="ema_cross", trailing_stop_percent=30.0, max_hold_minutes=240,
+    )
+    expected = run_backtest(params, MarketDataCache(bars_by_day=bars, vix_by_day=vix))
+    assert expected.trades
+    monkeypatch.setattr(engine, "_simulate_trade", simulate_trade_loop)
+    actual = run_backtest(params, MarketDataCache(bars_by_day=bars, vix_by_day=vix))
+    assert [vars(t) for t in actual.trades] == [vars(t) for t in expected.trades]
+    assert actual.total_pnl == expected.total_pnl
@@ -0,0 +1,68 @@
+"""Parity tests: incremental live signal engine vs. _generate_signals."""
+from dataclasses import replace
+from datetime import date, timedelta
+
+import pytest
+
+from app.services.backtest.engine import BacktestParams, _compute_atr, _generate_signals
+from app.services.backtest.incremental_signals import IncrementalSignalEngine
+from tests.mocks.synthetic_bars import make_day
+from tests.test_signal_engine import PARAM_VARIANTS, SIGNAL_TYPES
+
+
+def _params(signal_type: str, **overrides) -> BacktestParams:
+    return BacktestParams(
+        start_date=date(2026, 1, 5), end_date=date(2026, 1, 30),
+        signal_type=signal_type, **overrides,
+    )
+
+
+@pytest.mark.parametrize("signal_type", SIGNAL_TYPES)
+@pytest.mark.parametrize("variant", range(len(PARAM_VARIANTS)))
+def test_every_prefix_matches_generate_signals(signal_type, variant):
+    params = _params(signal_type, **PARAM_VARIANTS[variant])
+    prev = make_day(variant, date(2026, 1, 5))
+    bars = make_day(variant * 17 + 3, date(2026, 1, 6))
+    kwargs = {
+        "prev_close": prev[-1].close,
+        "prev_high": max(b.high for b in prev),
+        "prev_low": min(b.low for b in prev),
+    }
+
+    engine = IncrementalSignalEngine(params, **kwargs)
+    for k in range(1, len(bars) + 1):
+        assert engine.update(bars[:k]) == _generate_signals(bars[:k], params, **kwargs), k
+
+
+@pytest.mark.parametrize("signal_type", ["ema_cross", "orb", "confluence", "bb_squeeze"])
+def test_forming_bar_is_reevaluated(signal_type):
+    """Polls see the last bar change while it forms; only closed bars are committed."""
+    params = _params(signal_type, **PARAM_VARIANTS[5])
+    bars = make_day(11, date(2026, 1, 7))
+    engine = IncrementalSignalEngine(params)
+    for k in range(1, len(bars) + 1):
+        last = bars[k - 1]
+        for close in (last.open, (last.open + last.close) / 2):
+            forming = replace(last, close=close, high=max(last.high, close), low=min(last.low, close))
+            partial = bars[:k - 1] + [forming]
+            assert engine.update(partial) == _generate_signals(partial, params), k
+        assert engine.update(bars[:k]) == _generate_signals(bars[:k], params), k
+
+
+def test_rebuilds_when_bars_do_not_extend_state():
+    params = _params("ema_cross", ema_fast=5, ema_slow=13)
+    day1 = make_day(1, date(2026, 1, 5))
+    day2 = make_day(2, date(2026, 1, 6))
+    engine = IncrementalSignalEngine(params)
+
+    assert engine.update(day1) == _generate_signals(day1, params)
+    assert engine.update(day2[:40]) == _generate_signals(day2[:40], params)
+    assert engine.update(day2[:30]) == _generate_signals(day2[:30], params)
+
+
+def test_atr_matches_engine():
+    params = _params("ema_cross", atr_period=14)
+    bars = make_day(5, date(2026, 1, 8))
+    engine = IncrementalSignalEngine(params)
+    engine.update(bars + [bars[-1]])  # the duplicate stays uncommitted as the forming bar
+    assert engine.atr == _compute_atr(bars, 14)[-1]
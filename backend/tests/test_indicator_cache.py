@@ -0,0 +1,94 @@
+"""Tests for the per-day indicator cache used by the optimizer."""
+from datetime import date
+
+import numpy as np
+import pytest
+
+from app.services.backtest import optimizer
+from app.services.backtest.engine import BacktestParams, MarketDataCache, run_backtest
+from app.services.backtest.indicator_cache import IndicatorCache
+from tests.mocks.synthetic_bars import make_days
+
+
+def test_hit_and_miss_counters():
+    cache = IndicatorCache()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return np.arange(10, dtype=np.float64)
+
+    a = cache.get_or_compute((date(2026, 1, 5), "ema", (8,)), compute)
+    b = cache.get_or_compute((date(2026, 1, 5), "ema", (8,)), compute)
+    assert a is b
+    assert len(calls) == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_lru_eviction_respects_byte_budget():
+    cache = IndicatorCache(max_bytes=3 * 80)  # room for three 10-float arrays
+    for period in (5, 8, 13):
+        cache.get_or_compute(("d", "ema", (period,)), lambda: np.zeros(10))
+    cache.get_or_compute(("d", "ema", (5,)), lambda: np.zeros(10))  # touch -> most recent
+    cache.get_or_compute(("d", "ema", (21,)), lambda: np.zeros(10))  # evicts period 8
+
+    assert cache.evictions == 1
+    assert cache.current_bytes <= cache.max_bytes
+    misses = cache.misses
+    cache.get_or_compute(("d", "ema", (5,)), lambda: np.zeros(10))
+    assert cache.misses == misses
+    cache.get_or_compute(("d", "ema", (8,)), lambda: np.zeros(10))
+    assert cache.misses == misses + 1
+
+
+def test_cached_arrays_are_read_only():
+    cache = IndicatorCache()
+    arr = cache.get_or_compute(("d", "rsi", (9,)), lambda: np.ones(5))
+    with pytest.raises(ValueError):
+        arr[0] = 2.0
+
+
+def _params(**overrides) -> BacktestParams:
+    return BacktestParams(
+        start_date=date(2026, 1, 5), end_date=date(2026, 1, 16),
+        signal_type="confluence", rsi_period=9, atr_period=14, min_confluence=4, **overrides,
+    )
+
+
+def test_cached_backtest_matches_uncached():
+    bars = make_days(8)
+    vix = {d: 18.0 for d in bars}
+    plain = run_backtest(_params(), MarketDataCache(bars_by_day=bars, vix_by_day=vix))
+
+    cache = IndicatorCache()
+    cached_data = MarketDataCache(bars_by_day=bars, vix_by_day=vix, indicator_cache=cache)
+    first = run_backtest(_params(), cached_data)
+    misses = cache.misses
+    second = run_backtest(_params(stop_loss_percent=25.0), cached_data)
+
+    assert plain.total_trades > 0
+    assert [(t.entry_time, t.exit_time, t.pnl_dollars) for t in first.trades] == \
+        [(t.entry_time, t.exit_time, t.pnl_dollars) for t in plain.trades]
+    assert second.total_trades == first.total_trades
+    assert cache.misses == misses  # second combo reuses every indicator
+    assert cache.hits > 0
+
+
+def test_worker_reports_cache_counters():
+    bars = make_days(5)
+    config_dict = {
+        "start_date": date(2026, 1, 5), "end_date": date(2026, 1, 9),
+        "bar_interval": "5m", "data_source": "csv",
+        "afternoon_enabled": True, "scale_out_enabled": True, "quantity": 2,
+        "target_metric": "composite", "indicator_cache_mb": 16,
+    }
+    optimizer._init_worker(bars, {}, config_dict)
+    combo = optimizer._generate_combinations(1)[0]
+    combo.update(signal_type="ema_cross", ema_fast=8, ema_slow=21, entry_confirm_minutes=0)
+
+    _, _, first = optimizer._run_single_combo(combo)
+    _, _, second = optimizer._run_single_combo(dict(combo, stop_loss_percent=20))
+
+    assert first["cache_misses"] > 0
+    assert second["cache_misses"] == 0
+    assert second["cache_hits"] > 0
@@ -0,0 +1,111 @@
+"""Tests for early-abort pruning of optimizer combos."""
+from datetime import date
+
+from app.services.backtest import optimizer
+from app.services.backtest.day_bars import DayBars
+from app.services.backtest.engine import BacktestParams, BacktestProgress, MarketDataCache, run_backtest
+from tests.mocks.synthetic_bars import make_days
+
+
+def _params(**kwargs) -> BacktestParams:
+    return BacktestParams(
+        start_date=date(2026, 1, 5), end_date=date(2026, 1, 30),
+        signal_type="ema_cross", entry_confirm_minutes=0, **kwargs,
+    )
+
+
+def _data(num_days: int = 10) -> MarketDataCache:
+    return MarketDataCache(bars_by_day=DayBars.from_bars_by_day(make_days(num_days, seed=2)), vix_by_day={})
+
+
+def test_prune_callback_stops_backtest_early():
+    data = _data()
+    full = run_backtest(_params(), data)
+    seen = []
+
+    def prune(progress: BacktestProgress) -> bool:
+        seen.append((progress.days_done, progress.total_trades, round(progress.total_pnl, 2)))
+        return progress.days_done == 4
+
+    pruned = run_backtest(_params(), data, prune=prune)
+
+    assert pruned.pruned and not full.pruned
+    assert len(pruned.days) == 4
+    assert [d for d, _, _ in seen] == [1, 2, 3, 4]
+    first_four = [t for t in full.trades if t.trade_date in {d.trade_date for d in full.days[:4]}]
+    assert [vars(t) for t in pruned.trades] == [vars(t) for t in first_four]
+    assert seen[-1][1:] == (len(first_four), round(sum(t.pnl_dollars for t in first_four), 2))
+
+
+def test_progress_matches_summary():
+    result = run_backtest(_params(), _data())
+    progress = BacktestProgress(days_done=10, days_total=10)
+    for trade in result.trades:
+        progress.add_trade(trade)
+    assert progress.total_trades == result.total_trades
+    assert round(progress.total_pnl, 2) == result.total_pnl
+    assert round(progress.max_drawdown, 2) == result.max_drawdown
+
+
+def test_pruner_rules():
+    params = _params(max_daily_trades=2)
+
+    # Can't reach min_trades even at 2 trades/day over the 5 days left
+    prune = optimizer._make_pruner(params, "composite", 30, float("-inf"))
+    assert prune(BacktestProgress(days_done=15, days_total=20, total_trades=19))
+    assert not prune(BacktestProgress(days_done=5, days_total=20, total_trades=20))
+
+    # No trades by the halfway point
+    prune = optimizer._make_pruner(params, "composite", 1, float("-inf"))
+    assert not prune(BacktestProgress(days_done=9, days_total=20))
+    assert prune(BacktestProgress(days_done=10, days_total=20))
+
+    # Projected score vs. the leaderboard cutoff
+    progress = BacktestProgress(
+        days_done=10, days_total=20, total_trades=20, winning_trades=10,
+        total_pnl=200.0, gross_wins=600.0, gross_losses=400.0,
+    )
+    projected = optimizer._projected_score(progress, params, "composite", 1)
+    assert projected == 1.5 * 40 ** 0.5
+    assert not optimizer._make_pruner(params, "composite", 1, projected * 1.4)(progress)
+    assert optimizer._make_pruner(params, "composite", 1, projected * 1.6)(progress)
+
+
+def test_leaderboard_publishes_nth_best_score():
+    class Shared:
+        value = float("-inf")
+
+    board = optimizer._Leaderboard(3, Shared())
+    for score in (5.0, float("-inf"), 1.0):
+        board.add(score)
+    assert board.cutoff.value == float("-inf")
+    board.add(3.0)
+    assert board.cutoff.value == 1.0
+    board.add(4.0)
+    board.add(0.5)
+    assert board.cutoff.value == 3.0
+
+
+def test_worker_marks_pruned_combos():
+    bars = DayBars.from_bars_by_day(make_days(8, seed=3))
+    config_dict = {
+        "start_date": date(2026, 1, 5), "end_date": date(2026, 1, 14),
+        "bar_interval": "5m", "data_source": "csv",
+        "afternoon_enabled": True, "scale_out_enabled": True, "quantity": 2,
+        "target_metric": "composite", "indicator_cache_mb": 0, "prune_enabled": True,
+    }
+    optimizer._init_worker(bars, {}, config_dict)
+    combo = dict(
+        optimizer._generate_combinations(1)[0],
+        signal_type="ema_cross", ema_fast=8, ema_slow=21, entry_confirm_minutes=0, max_daily_trades=2,
+    )
+
+    # 8 days x 2 trades/day can never reach MIN_TRADES
+    score, _, summary = optimizer._run_single_combo(combo)
+    assert score == float("-inf")
+    assert summary["pruned"]
+    assert summary["days_run"] < summary["days_total"] == 8
+
+    _, _, summary = optimizer._run_single_combo(combo, min_trades=1)
+    assert not summary["pruned"]
+    assert summary["days_run"] == 8
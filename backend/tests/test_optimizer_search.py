@@ -0,0 +1,105 @@
+"""Tests for the optimizer's TPE and successive-halving search strategies."""
+import random
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+import pytest
+
+from app.services.backtest import optimizer
+from app.services.backtest.day_bars import DayBars
+from app.services.backtest.tpe_sampler import TPESampler
+from tests.mocks.synthetic_bars import make_days
+
+SPACE = {"x": list(range(10)), "y": ["a", "b", "c"]}
+
+
+def test_tpe_starts_random_then_concentrates_on_good_values():
+    sampler = TPESampler(SPACE, n_startup=30, rng=random.Random(1))
+    for _ in range(30):
+        combo = sampler.suggest()
+        sampler.observe(combo, -abs(combo["x"] - 7))
+
+    suggestions = [sampler.suggest() for _ in range(200)]
+    near = sum(abs(c["x"] - 7) <= 1 for c in suggestions)
+    assert near / len(suggestions) > 0.6  # 3/10 under uniform sampling
+
+
+def test_tpe_stays_random_without_viable_trials():
+    sampler = TPESampler(SPACE, n_startup=5, rng=random.Random(2))
+    for _ in range(20):
+        sampler.observe(sampler.suggest(), float("-inf"))
+    xs = {sampler.suggest()["x"] for _ in range(200)}
+    assert xs == set(SPACE["x"])
+
+
+def test_normalize_combo_rejects_invalid_and_normalizes_unused():
+    base = {k: v[0] for k, v in optimizer.PARAM_SPACE.items()}
+    assert optimizer._normalize_combo(dict(base, signal_type="ema_cross", ema_fast=21, ema_slow=9)) is None
+    assert optimizer._normalize_combo(dict(base, vix_min=30.0, vix_max=20.0)) is None
+
+    combo = optimizer._normalize_combo(dict(base, signal_type="orb", ema_fast=21, ema_slow=9, macd_fast=8, macd_slow=21))
+    assert combo is not None
+    assert (combo["macd_fast"], combo["macd_slow"], combo["min_confluence"]) == (12, 26, 5)
+
+
+def test_suggest_combo_never_repeats():
+    sampler = TPESampler(optimizer.PARAM_SPACE, n_startup=5)
+    seen: set = set()
+    combos = [optimizer._suggest_combo(sampler, seen) for _ in range(100)]
+    assert len({optimizer._combo_key(c) for c in combos}) == 100
+
+
+@pytest.fixture
+def worker(monkeypatch):
+    """Initialize the optimizer worker globals in-process on synthetic bars."""
+    monkeypatch.setitem(optimizer.PARAM_SPACE, "entry_confirm_minutes", [0])  # no CSV lookups
+    bars = DayBars.from_bars_by_day(make_days(8, seed=3))
+    config_dict = {
+        "start_date": date(2026, 1, 5), "end_date": date(2026, 1, 14),
+        "bar_interval": "5m", "data_source": "csv",
+        "afternoon_enabled": True, "scale_out_enabled": True, "quantity": 2,
+        "target_metric": "composite", "indicator_cache_mb": 16,
+    }
+    optimizer._init_worker(bars, {}, config_dict)
+    return bars
+
+
+def test_subset_run_only_trades_on_subset_days(worker):
+    days = tuple(sorted(worker)[-2:])
+    combo = dict(optimizer._generate_combinations(1)[0], signal_type="ema_cross", ema_fast=8, ema_slow=21)
+
+    _, _, full = optimizer._run_single_combo(combo)
+    _, _, subset = optimizer._run_single_combo(combo, days, 1)
+
+    assert 0 < subset["total_trades"] < full["total_trades"]
+    assert optimizer._worker_data(days) is optimizer._worker_data(days)
+
+
+def test_halving_promotes_best_screened_combos(worker):
+    random.seed(5)
+    combos = optimizer._generate_combinations(20)
+    config = optimizer.OptimizationConfig(
+        start_date=date(2026, 1, 5), end_date=date(2026, 1, 14), top_n=3,
+        halving_subset_pct=0.25, halving_keep_pct=0.2,
+    )
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        scored, screened = optimizer._search_halving(pool, combos, list(worker), config)
+
+    assert screened == 20
+    assert len(scored) == 4  # max(top_n, 20% of 20)
+    assert all(c in combos for _, c, _ in scored)
+
+
+def test_halving_without_room_to_screen_runs_everything(worker):
+    combos = optimizer._generate_combinations(3)
+    config = optimizer.OptimizationConfig(start_date=date(2026, 1, 5), end_date=date(2026, 1, 14), top_n=10)
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        scored, screened = optimizer._search_halving(pool, combos, list(worker), config)
+    assert (len(scored), screened) == (3, 0)
+
+
+def test_tpe_search_runs_requested_budget(worker):
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        scored = optimizer._search_tpe(pool, 25, workers=2)
+    assert len(scored) == 25
+    assert len({optimizer._combo_key(c) for _, c, _ in scored}) == 25
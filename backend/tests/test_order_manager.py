@@ -101,6 +101,39 @@ async def test_place_exit_order_market(db_session, mock_schwab, ws_manager):
     assert trade.exit_reason == ExitReason.PROFIT_TARGET
 
 
+@pytest.mark.asyncio
+async def test_slow_exit_order_is_not_abandoned(db_session, mock_schwab, ws_manager, monkeypatch):
+    import time
+
+    from app.services import schwab_client
+
+    monkeypatch.setattr(schwab_client.settings, "SCHWAB_ORDER_TIMEOUT_SECONDS", 0.05)
+    trade, _ = _make_trade(
+        db_session, mock_schwab, status=TradeStatus.STOP_LOSS_PLACED, entry_price=2.00
+    )
+    trade.stop_loss_order_id = SchwabService(mock_schwab).place_order(
+        SchwabService.build_stop_loss_order("SPY_TEST_OPT", 1, 1.50)
+    )
+    db_session.commit()
+
+    sells = []
+    place_order = mock_schwab.place_order
+
+    def slow_place_order(account_hash, order):
+        time.sleep(0.2)  # Slower than the order timeout
+        sells.append(order)
+        return place_order(account_hash, order)
+
+    monkeypatch.setattr(mock_schwab, "place_order", slow_place_order)
+    order_mgr = OrderManager(SchwabService(mock_schwab), ws_manager)
+    await order_mgr.place_exit_order(db_session, trade, ExitReason.TRAILING_STOP)
+
+    assert trade.status == TradeStatus.EXITING
+    assert trade.exit_order_id is not None
+    # The next exit tick sees EXITING and doesn't sell again
+    assert len(sells) == 1
+
+
 @pytest.mark.asyncio
 async def test_check_exit_fill(db_session, mock_schwab, ws_manager):
     schwab_svc = SchwabService(mock_schwab)
@@ -183,7 +216,8 @@ def test_extract_fill_price_fallback():
     assert OrderManager._extract_fill_price(order_data) == 1.60
 
 
-def test_check_stop_loss_fill(db_session, mock_schwab, ws_manager):
+@pytest.mark.asyncio
+async def test_check_stop_loss_fill(db_session, mock_schwab, ws_manager):
     schwab_svc = SchwabService(mock_schwab)
     stop_order_id = schwab_svc.place_order(
         SchwabService.build_stop_loss_order("SPY_TEST_OPT", 1, 1.80)
@@ -208,7 +242,7 @@ def test_check_stop_loss_fill(db_session, mock_schwab, ws_manager):
     mock_schwab.simulate_fill(stop_order_id, 1.78)
 
     order_mgr = OrderManager(schwab_svc, ws_manager)
-    changed = order_mgr.check_stop_loss_fill(db_session, trade)
+    changed = await order_mgr.check_stop_loss_fill(db_session, trade)
 
     assert changed is True
     assert trade.status == TradeStatus.CLOSED
@@ -236,3 +270,25 @@ async def test_entry_limit_timeout_cancels_trade(db_session, mock_schwab, ws_man
     assert trade.status == TradeStatus.CANCELLED
     # Should NOT have placed a new order (no fallback)
     assert trade.entry_is_fallback is False
+
+
+@pytest.mark.asyncio
+async def test_order_monitor_expires_entry_limits_between_sweeps(db_session, mock_schwab, ws_manager):
+    """Only entries past the limit timeout get a status check outside the REST sweep."""
+    from app.services.position_book import Position
+    from app.tasks.order_monitor import OrderMonitorTask
+
+    stale, _ = _make_trade(db_session, mock_schwab)
+    stale.created_at = datetime.utcnow() - timedelta(minutes=5)
+    fresh, _ = _make_trade(db_session, mock_schwab)
+    db_session.commit()
+
+    schwab_svc = SchwabService(mock_schwab)
+    order_mgr = OrderManager(schwab_svc, ws_manager)
+    positions = [Position.from_trade(stale), Position.from_trade(fresh)]
+    with patch.object(schwab_svc, 'get_order_status', return_value={"status": "WORKING"}) as status:
+        await OrderMonitorTask._expire_entry_limits(db_session, order_mgr, positions)
+
+    assert stale.status == TradeStatus.CANCELLED
+    assert fresh.status == TradeStatus.PENDING
+    status.assert_called_once_with(stale.entry_order_id)
@@ -0,0 +1,89 @@
+import json
+
+import pytest
+
+from app.models import TradeStatus
+from app.services.order_manager import OrderManager
+from app.services.order_tracker import OrderTracker, parse_account_activity
+from app.services.schwab_client import SchwabService
+from tests.mocks.trades import make_trade
+
+
+def _activity(message_type: str, order_id: str) -> dict:
+    return {
+        "seq": 1,
+        "key": "acct",
+        "1": "12345678",
+        "2": message_type,
+        "3": json.dumps({"SchwabOrderID": order_id, "AccountNumber": "12345678"}),
+    }
+
+
+def _make_pending_trade(db_session, schwab_svc):
+    order_id = schwab_svc.place_order(
+        SchwabService.build_option_buy_order("SPY_TEST_OPT", 1, 1.60)
+    )
+    trade = make_trade(db_session, entry_order_id=order_id)
+    return trade, order_id
+
+
+def test_parse_account_activity():
+    fill = parse_account_activity(_activity("OrderFillCompleted", "42"))
+    assert fill.order_id == "42"
+    assert fill.kind == "fill"
+
+    assert parse_account_activity(_activity("OrderUROutCompleted", "42")).kind == "cancel"
+    assert parse_account_activity(_activity("OrderRejected", "42")).kind == "reject"
+    assert parse_account_activity(_activity("OrderCreated", "42")) is None
+    assert parse_account_activity(_activity("OrderPartialFill", "42")) is None
+    assert parse_account_activity({"2": "OrderFillCompleted", "3": "<xml/>"}) is None
+
+
+@pytest.mark.asyncio
+async def test_fill_event_moves_pending_trade(db_session, mock_schwab, ws_manager):
+    schwab_svc = SchwabService(mock_schwab)
+    trade, order_id = _make_pending_trade(db_session, schwab_svc)
+    mock_schwab.simulate_fill(order_id, 1.55)
+
+    tracker = OrderTracker(OrderManager(schwab_svc, ws_manager))
+    changed = await tracker.handle_events(db_session, [
+        _activity("OrderCreated", order_id),
+        _activity("OrderFillCompleted", order_id),
+        _activity("OrderFillCompleted", order_id),
+    ])
+
+    assert changed == 1
+    assert trade.status == TradeStatus.FILLED
+    assert trade.entry_price == 1.55
+
+
+@pytest.mark.asyncio
+async def test_event_for_unknown_order_is_ignored(db_session, mock_schwab, ws_manager):
+    schwab_svc = SchwabService(mock_schwab)
+    trade, _ = _make_pending_trade(db_session, schwab_svc)
+
+    tracker = OrderTracker(OrderManager(schwab_svc, ws_manager))
+    changed = await tracker.handle_events(db_session, [_activity("OrderFillCompleted", "999999")])
+
+    assert changed == 0
+    assert trade.status == TradeStatus.PENDING
+
+
+@pytest.mark.asyncio
+async def test_unconfirmed_fill_is_rechecked_until_rest_agrees(db_session, mock_schwab, ws_manager):
+    schwab_svc = SchwabService(mock_schwab)
+    trade, order_id = _make_pending_trade(db_session, schwab_svc)
+    tracker = OrderTracker(OrderManager(schwab_svc, ws_manager))
+
+    # Stream reports the fill before REST does
+    assert await tracker.handle_events(db_session, [_activity("OrderFillCompleted", order_id)]) == 0
+    assert trade.status == TradeStatus.PENDING
+    assert tracker.unconfirmed == {order_id}
+
+    assert await tracker.recheck_unconfirmed(db_session) == 0
+    assert tracker.unconfirmed == {order_id}
+
+    mock_schwab.simulate_fill(order_id, 1.55)
+    assert await tracker.recheck_unconfirmed(db_session) == 1
+    assert trade.status == TradeStatus.FILLED
+    assert tracker.unconfirmed == set()
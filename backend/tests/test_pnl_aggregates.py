@@ -0,0 +1,82 @@
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import delete
+
+from app.models import DailyPnL, PnLBucket, TradeStatus
+from app.services import pnl_aggregates
+from tests.mocks.trades import make_trade
+
+
+def _trade(db_session, pnl=None, status=TradeStatus.FILLED, source="tradingview", hold_minutes=20, trade_date=None):
+    entry = datetime(2026, 2, 9, 15, 10)  # 10:10 ET
+    return make_trade(
+        db_session, status, trade_date,
+        entry_price=2.00,
+        entry_filled_at=entry,
+        exit_filled_at=entry + timedelta(minutes=hold_minutes) if pnl is not None else None,
+        pnl_dollars=pnl,
+        source=source,
+    )
+
+
+def test_daily_row_follows_trade_lifecycle(db_session):
+    trade = _trade(db_session)
+    day = db_session.query(DailyPnL).filter_by(trade_date=date.today()).one()
+    assert (day.total_trades, day.open_positions, day.closed_trades) == (1, 1, 0)
+
+    trade.status = TradeStatus.CLOSED
+    trade.pnl_dollars = 35.0
+    trade.exit_filled_at = trade.entry_filled_at + timedelta(minutes=7)
+    db_session.commit()
+
+    db_session.expire_all()
+    day = db_session.query(DailyPnL).filter_by(trade_date=date.today()).one()
+    assert (day.open_positions, day.closed_trades, day.winning_trades) == (0, 1, 1)
+    assert day.total_pnl == 35.0
+    bucket = db_session.query(PnLBucket).one()
+    assert (bucket.hour, bucket.source, bucket.hold_bucket) == (10, "tradingview", 1)
+    assert bucket.gross_wins == 35.0
+
+
+def test_analytics_reads_aggregates(client, db_session):
+    _trade(db_session, pnl=50.0, status=TradeStatus.CLOSED, source="orb_auto", hold_minutes=3)
+    _trade(db_session, pnl=-20.0, status=TradeStatus.CLOSED, source="orb_auto", hold_minutes=40)
+    _trade(db_session, pnl=-10.0, status=TradeStatus.CLOSED, source=None, hold_minutes=40)
+
+    data = client.get("/api/dashboard/analytics?days=30").json()
+
+    assert data["total_trades"] == 3
+    hour_10 = next(h for h in data["by_hour"] if h["hour"] == 10)
+    assert (hour_10["total_trades"], hour_10["winning_trades"], hour_10["total_pnl"]) == (3, 1, 20.0)
+    strategies = {s["strategy"]: s for s in data["by_strategy"]}
+    assert strategies["orb_auto"]["profit_factor"] == 2.5
+    assert strategies["unknown"]["total_trades"] == 1
+    weekday = date.today().weekday()
+    if weekday < 5:
+        assert data["by_day_of_week"][weekday]["total_trades"] == 3
+    holds = {h["label"]: h for h in data["by_hold_time"]}
+    assert holds["< 5 min"]["total_trades"] == 1
+    assert holds["30-60 min"]["avg_pnl"] == -15.0
+    assert data["streak"] == {"current_type": "loss", "current_count": 2, "longest_win": 1, "longest_loss": 2}
+
+
+def test_pnl_summary_reads_daily_rows(client, db_session):
+    _trade(db_session, pnl=30.0, status=TradeStatus.CLOSED)
+    _trade(db_session)  # open trades don't count toward the summary
+
+    data = client.get("/api/dashboard/pnl-summary").json()
+    today = next(d for d in data["days"] if d["trade_date"] == date.today().isoformat())
+    assert (today["total_trades"], today["pnl"]) == (1, 30.0)
+
+
+def test_backfill_builds_missing_days(db_session):
+    old_day = date.today() - timedelta(days=3)
+    _trade(db_session, pnl=-5.0, status=TradeStatus.CLOSED, trade_date=old_day)
+    db_session.execute(delete(DailyPnL))
+    db_session.execute(delete(PnLBucket))
+    db_session.commit()
+
+    assert pnl_aggregates.backfill(db_session) == 1
+    assert pnl_aggregates.backfill(db_session) == 0
+    day = db_session.query(DailyPnL).filter_by(trade_date=old_day).one()
+    assert (day.closed_trades, day.winning_trades, day.total_pnl) == (1, 0, -5.0)
@@ -0,0 +1,73 @@
+from datetime import date, timedelta
+
+import pytest
+
+from app.config import Settings
+from app.dependencies import get_position_book
+from app.models import TradeStatus
+from app.services.order_manager import OrderManager
+from app.services.position_book import OPEN_STATUSES, PositionBook, TradeStateBus
+from app.services.schwab_client import SchwabService
+from tests.mocks.trades import make_trade
+
+settings = Settings()
+
+
+def test_loads_only_todays_active_trades(db_session):
+    pending = make_trade(db_session)
+    filled = make_trade(db_session, status=TradeStatus.FILLED, entry_price=1.50)
+    make_trade(db_session, status=TradeStatus.CLOSED)
+    make_trade(db_session, status=TradeStatus.FILLED, trade_date=date.today() - timedelta(days=1))
+
+    book = PositionBook()
+    book.ensure_loaded(db_session)
+
+    assert {p.trade_id for p in book.positions()} == {pending.id, filled.id}
+    assert [p.trade_id for p in book.positions(OPEN_STATUSES)] == [filled.id]
+
+
+def test_bus_updates_book_without_reload(db_session):
+    bus = TradeStateBus()
+    book = PositionBook(bus)
+    book.ensure_loaded(db_session)
+    version = book.version
+
+    trade = make_trade(db_session)
+    bus.publish(trade)
+    assert book.get(trade.id).status == TradeStatus.PENDING
+    assert book.version > version
+
+    trade.status = TradeStatus.CLOSED
+    db_session.commit()
+    bus.publish(trade)
+    assert book.get(trade.id) is None
+
+
+@pytest.mark.asyncio
+async def test_order_manager_publishes_fill(db_session, mock_schwab, ws_manager):
+    schwab_svc = SchwabService(mock_schwab)
+    order_id = schwab_svc.place_order(SchwabService.build_option_buy_order("SPY_TEST_OPT", 1, 1.60))
+    book = get_position_book()
+    book.ensure_loaded(db_session)
+    trade = make_trade(db_session, entry_order_id=order_id)
+    assert book.get(trade.id) is None  # written directly, not published
+
+    mock_schwab.simulate_fill(order_id, 1.55)
+    await OrderManager(schwab_svc, ws_manager).check_entry_fill(db_session, trade)
+
+    pos = book.get(trade.id)
+    assert pos.status == TradeStatus.FILLED
+    assert pos.highest_price_seen == 1.55
+
+
+def test_high_water_survives_resync(db_session):
+    trade = make_trade(db_session, status=TradeStatus.FILLED, highest_price_seen=1.50)
+    book = PositionBook()
+    book.ensure_loaded(db_session)
+
+    assert book.raise_high_water(trade.id, 1.80) is True
+    assert book.raise_high_water(trade.id, 1.70) is False
+
+    book._loaded_at -= settings.POSITION_BOOK_RESYNC_SECONDS  # force the periodic reload
+    book.ensure_loaded(db_session)
+    assert book.get(trade.id).highest_price_seen == 1.80
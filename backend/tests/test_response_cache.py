@@ -0,0 +1,100 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import insert
+
+from app.dependencies import get_response_cache
+from app.models import Alert, AlertStatus, TradePriceSnapshot, TradeStatus
+from app.services.response_cache import ResponseCache, _Entry
+from app.services.ws_manager import WebSocketManager
+from tests.mocks.trades import make_trade
+
+
+def _closed_trade(db_session, pnl=40.0):
+    return make_trade(
+        db_session, TradeStatus.CLOSED,
+        entry_price=2.00,
+        entry_filled_at=datetime(2026, 2, 9, 15, 0),
+        exit_filled_at=datetime(2026, 2, 9, 15, 20),
+        pnl_dollars=pnl,
+    )
+
+
+def test_repeat_poll_returns_304(client):
+    first = client.get("/api/dashboard/stats")
+    etag = first.headers["etag"]
+
+    second = client.get("/api/dashboard/stats", headers={"If-None-Match": etag})
+
+    assert second.status_code == 304
+    assert second.headers["etag"] == etag
+    assert client.get("/api/dashboard/stats").json() == first.json()
+    assert get_response_cache().not_modified == 1
+
+
+def test_query_params_are_part_of_the_key(client):
+    today = client.get("/api/dashboard/stats").headers["etag"]
+    other = client.get("/api/dashboard/stats", params={"trade_date": "2026-01-05"}).headers["etag"]
+    assert today != other
+
+
+def test_trade_commit_invalidates(client, db_session):
+    etag = client.get("/api/dashboard/stats").headers["etag"]
+    _closed_trade(db_session)
+
+    resp = client.get("/api/dashboard/stats", headers={"If-None-Match": etag})
+
+    assert resp.status_code == 200
+    assert resp.json()["total_pnl"] == 40.0
+
+
+def test_alert_commit_invalidates_alerts_only(client, db_session):
+    client.get("/api/alerts")
+    stats_etag = client.get("/api/dashboard/stats").headers["etag"]
+    db_session.add(Alert(raw_payload="{}", ticker="SPY", direction="CALL", status=AlertStatus.RECEIVED))
+    db_session.commit()
+
+    assert client.get("/api/alerts").json()["total"] == 1
+    assert client.get("/api/dashboard/stats", headers={"If-None-Match": stats_etag}).status_code == 304
+
+
+def test_bulk_snapshot_insert_invalidates_trades(client, db_session):
+    trade = _closed_trade(db_session)
+    client.get("/api/trades")
+    misses = get_response_cache().misses
+
+    db_session.execute(insert(TradePriceSnapshot), [
+        {"trade_id": trade.id, "timestamp": datetime.utcnow(), "price": 1.9, "highest_price_seen": 1.9},
+    ])
+    db_session.commit()
+    client.get("/api/trades")
+
+    assert get_response_cache().misses == misses + 1
+
+
+@pytest.mark.asyncio
+async def test_trade_broadcast_invalidates():
+    cache = ResponseCache()
+    ws = WebSocketManager()
+    ws.add_listener(cache.on_ws_event)
+    cache._entries["k"] = _Entry('"etag"', b"{}", frozenset({"trades"}))
+
+    await ws.broadcast({"event": "quote_update", "data": {}})
+    assert "k" in cache._entries
+    await ws.broadcast({"event": "trade_closed", "data": {"trade_id": 1}})
+    assert "k" not in cache._entries
+
+
+def test_response_built_during_invalidation_is_not_stored(client, monkeypatch):
+    from app.routers import dashboard as dashboard_module
+
+    cache = get_response_cache()
+    original = dashboard_module.DailyStatsResponse
+
+    def racing_response(**kwargs):
+        cache.invalidate(("trades",))  # A trade commits while the response is computed
+        return original(**kwargs)
+
+    monkeypatch.setattr(dashboard_module, "DailyStatsResponse", racing_response)
+    assert client.get("/api/dashboard/stats").status_code == 200
+    assert len(cache._entries) == 0
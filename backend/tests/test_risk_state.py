@@ -0,0 +1,98 @@
+import json
+import logging
+from datetime import date, datetime, timedelta
+
+from app.config import Settings
+from app.models import TradeStatus
+from app.services import risk_state as risk_state_module
+from app.services.position_book import TradeStateBus
+from app.services.risk_state import RiskState
+from tests.mocks.trades import make_trade
+
+settings = Settings()
+
+
+def test_counters_match_todays_trades(db_session):
+    now = datetime.utcnow()
+    make_trade(db_session, TradeStatus.CLOSED, ticker="SPY", source="tradingview", pnl_dollars=50.0,
+               exit_filled_at=now - timedelta(minutes=30))
+    make_trade(db_session, TradeStatus.CLOSED, ticker="SPY", source="tradingview", pnl_dollars=-20.0,
+               exit_filled_at=now - timedelta(minutes=20))
+    make_trade(db_session, TradeStatus.CLOSED, ticker="SPY", source="retake", pnl_dollars=-5.0,
+               exit_filled_at=now - timedelta(minutes=15))
+    make_trade(db_session, TradeStatus.CLOSED, ticker="QQQ", source="orb_auto", pnl_dollars=-10.0,
+               exit_filled_at=now - timedelta(minutes=10))
+    make_trade(db_session, TradeStatus.CANCELLED, ticker="SPY")
+    open_qqq = make_trade(db_session, TradeStatus.FILLED, ticker="QQQ")
+    stale = make_trade(db_session, TradeStatus.FILLED, ticker="SPY", trade_date=date.today() - timedelta(days=1))
+
+    risk = RiskState()
+    risk.ensure_loaded(db_session)
+
+    assert risk.trade_count == 5  # cancelled and yesterday's trades excluded
+    assert risk.realized_pnl == 15.0
+    assert risk.consecutive_losses == 2  # retake loss doesn't count toward the streak
+    assert risk.open_trade_id("QQQ") == open_qqq.id
+    assert risk.open_trade_id("SPY") is None
+    # Latest active trade of any date, like the old query
+    assert risk.active_trade_id == max(open_qqq.id, stale.id)
+    assert risk.last_entry_at("QQQ") == open_qqq.created_at
+
+
+def test_bus_updates_counters_without_reload(db_session):
+    bus = TradeStateBus()
+    risk = RiskState(bus)
+    risk.ensure_loaded(db_session)
+    assert risk.trade_count == 0
+
+    trade = make_trade(db_session, ticker="SPY", source="tradingview")
+    bus.publish(trade)
+    assert risk.trade_count == 1
+    assert risk.active_trade_id == trade.id
+    assert risk.open_trade_id("SPY") == trade.id
+
+    trade.status = TradeStatus.CLOSED
+    trade.pnl_dollars = -40.0
+    trade.exit_filled_at = datetime.utcnow()
+    db_session.commit()
+    bus.publish(trade)
+    assert risk.realized_pnl == -40.0
+    assert risk.consecutive_losses == 1
+    assert risk.active_trade_id is None
+
+
+def test_resync_corrects_out_of_band_writes(db_session, caplog):
+    risk = RiskState()
+    risk.ensure_loaded(db_session)
+
+    make_trade(db_session, ticker="SPY")  # not published on the bus
+    risk.ensure_loaded(db_session)
+    assert risk.trade_count == 0
+
+    risk._loaded_at -= settings.RISK_STATE_RESYNC_SECONDS
+    with caplog.at_level(logging.WARNING, logger="app.services.risk_state"):
+        risk.ensure_loaded(db_session)
+    assert risk.trade_count == 1
+    assert "drift" in caplog.text
+
+
+def test_event_calendar_parsed_once(tmp_path, monkeypatch):
+    cal = tmp_path / "event_calendar.json"
+    cal.write_text(json.dumps({"blocked_afternoons": ["2026-03-18"]}))
+    monkeypatch.setattr(risk_state_module.settings, "EVENT_CALENDAR_PATH", str(cal))
+    risk = RiskState()
+
+    assert risk.event_block(date(2026, 3, 18)) == (True, "Event day (2026-03-18)")
+    assert risk.event_block(date(2026, 3, 19)) == (False, "")
+
+    cal.write_text(json.dumps({"blocked_afternoons": ["2026-03-19"]}))
+    assert risk.event_block(date(2026, 3, 19)) == (False, "")  # cached until the next reload
+
+
+def test_rest_vix_reused_within_ttl():
+    risk = RiskState()
+    assert risk.cached_vix() is None
+    risk.record_vix(19.5)
+    assert risk.cached_vix() == 19.5
+    risk._vix_at -= settings.RISK_VIX_TTL_SECONDS
+    assert risk.cached_vix() is None
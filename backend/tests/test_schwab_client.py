@@ -0,0 +1,159 @@
+import asyncio
+import threading
+import time
+from datetime import date
+
+import pytest
+
+from app.services.schwab_client import AsyncSchwabService, SchwabService, as_async, settings
+
+
+@pytest.mark.asyncio
+async def test_async_service_wraps_sync_calls(mock_schwab):
+    schwab = as_async(SchwabService(mock_schwab))
+    order_id = await schwab.place_order(
+        AsyncSchwabService.build_stop_loss_order("SPY_TEST_OPT", 1, 1.80)
+    )
+    mock_schwab.simulate_fill(order_id, 1.78)
+
+    order_data = await schwab.get_order_status(order_id)
+
+    assert order_data["status"] == "FILLED"
+    assert as_async(schwab) is schwab
+
+
+@pytest.mark.asyncio
+async def test_async_service_times_out_without_blocking_loop(mock_schwab, monkeypatch):
+    monkeypatch.setattr(settings, "SCHWAB_QUOTE_TIMEOUT_SECONDS", 0.05)
+    release = threading.Event()
+    svc = SchwabService(mock_schwab)
+    monkeypatch.setattr(svc, "get_quote", lambda symbol: release.wait(1) or {})
+    schwab = AsyncSchwabService(svc)
+
+    ticks = 0
+
+    async def _ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.005)
+
+    ticker = asyncio.create_task(_ticker())
+    with pytest.raises(asyncio.TimeoutError):
+        await schwab.get_quote("SPY")
+    ticker.cancel()
+    release.set()
+
+    assert ticks > 1
+
+
+@pytest.mark.asyncio
+async def test_async_service_limits_in_flight_per_endpoint(mock_schwab, monkeypatch):
+    monkeypatch.setattr(settings, "SCHWAB_CHAIN_CONCURRENCY", 1)
+    svc = SchwabService(mock_schwab)
+    active = {"chains": 0, "max_chains": 0}
+    lock = threading.Lock()
+
+    def _slow_chain(*args, **kwargs):
+        with lock:
+            active["chains"] += 1
+            active["max_chains"] = max(active["max_chains"], active["chains"])
+        time.sleep(0.02)
+        with lock:
+            active["chains"] -= 1
+        return {}
+
+    monkeypatch.setattr(svc, "get_option_chain", _slow_chain)
+    schwab = AsyncSchwabService(svc)
+
+    await asyncio.gather(*(schwab.get_option_chain(symbol="SPY") for _ in range(3)))
+
+    assert active["max_chains"] == 1
+
+
+@pytest.mark.asyncio
+async def test_prefetch_quotes_serves_lookups_from_one_request(mock_schwab, monkeypatch):
+    mock_schwab.set_quote("OPT_A", bid=1.00, ask=1.10)
+    calls = {"quote": 0, "quotes": 0}
+    single, batch = mock_schwab.quote, mock_schwab.quotes
+
+    def _quote(symbol):
+        calls["quote"] += 1
+        return single(symbol)
+
+    def _quotes(symbols, **kwargs):
+        calls["quotes"] += 1
+        return batch(symbols, **kwargs)
+
+    monkeypatch.setattr(mock_schwab, "quote", _quote)
+    monkeypatch.setattr(mock_schwab, "quotes", _quotes)
+    schwab = AsyncSchwabService(SchwabService(mock_schwab))
+
+    await schwab.prefetch_quotes(["OPT_A", "OPT_B", "OPT_A"])
+    a = await schwab.get_quote("OPT_A")
+    b = await schwab.get_quote("OPT_B")
+    await schwab.get_quote("OPT_C")
+
+    assert a["OPT_A"]["quote"]["bidPrice"] == 1.00
+    assert b["OPT_B"]["quote"]["bidPrice"] == 1.50
+    assert calls == {"quote": 1, "quotes": 1}
+
+
+def test_option_chain_cache_hits_within_ttl(mock_schwab, monkeypatch):
+    monkeypatch.setattr(settings, "OPTION_CHAIN_CACHE_TTL_SECONDS", 60.0)
+    calls = []
+    fetch = mock_schwab.option_chains
+    monkeypatch.setattr(
+        mock_schwab, "option_chains",
+        lambda **kwargs: calls.append(kwargs) or fetch(**kwargs),
+    )
+    svc = SchwabService(mock_schwab)
+
+    first, first_hit = svc.get_option_chain_cached("SPY", "CALL")
+    second, second_hit = svc.get_option_chain_cached("SPY", "CALL")
+    svc.get_option_chain_cached("SPY", "PUT")
+
+    assert (first_hit, second_hit) == (False, True)
+    assert second is first
+    assert len(calls) == 2
+
+
+def test_option_chain_cache_coalesces_concurrent_fetches(mock_schwab, monkeypatch):
+    monkeypatch.setattr(settings, "OPTION_CHAIN_CACHE_TTL_SECONDS", 60.0)
+    calls = []
+    fetch = mock_schwab.option_chains
+
+    def _slow_fetch(**kwargs):
+        calls.append(kwargs)
+        time.sleep(0.05)
+        return fetch(**kwargs)
+
+    monkeypatch.setattr(mock_schwab, "option_chains", _slow_fetch)
+    svc = SchwabService(mock_schwab)
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(svc.get_option_chain_cached("SPY", "CALL")))
+        for _ in range(4)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert sorted(hit for _, hit in results) == [False, True, True, True]
+
+
+def test_option_chain_cache_drops_expired_entries(mock_schwab, monkeypatch):
+    from app.services import schwab_client
+
+    monkeypatch.setattr(settings, "OPTION_CHAIN_CACHE_TTL_SECONDS", 60.0)
+    svc = SchwabService(mock_schwab)
+    svc.get_option_chain_cached("SPY", "CALL", from_date=date(2026, 1, 2), to_date=date(2026, 1, 2))
+    # Age the first entry past the TTL
+    key, (chain, at) = next(iter(schwab_client._chain_cache.items()))
+    schwab_client._chain_cache[key] = (chain, at - 61.0)
+
+    svc.get_option_chain_cached("SPY", "CALL", from_date=date(2026, 1, 5), to_date=date(2026, 1, 5))
+
+    assert list(schwab_client._chain_cache) == [("SPY", "CALL", date(2026, 1, 5), date(2026, 1, 5), 20)]
@@ -0,0 +1,68 @@
+"""Tests for publishing DayBars to worker processes via shared memory."""
+import multiprocessing
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import pytest
+
+from app.services.backtest import optimizer
+from app.services.backtest.day_bars import DayBars
+from app.services.backtest.shared_bars import SharedBarsPublisher
+from tests.mocks.synthetic_bars import make_days
+
+
+def _summarize(bars_by_day) -> tuple:
+    closes = [bars_by_day[d][-1].close for d in bars_by_day]
+    return type(bars_by_day).__name__, bars_by_day.close.flags.writeable, bars_by_day.num_bars, closes
+
+
+def _summarize_worker_data() -> tuple:
+    return _summarize(optimizer._worker_market_data.bars_by_day)
+
+
+def test_published_bars_pickle_as_handle():
+    legacy = make_days(30)
+    with SharedBarsPublisher() as publisher:
+        shared = publisher.publish(legacy)
+        assert isinstance(shared, DayBars)
+        assert len(pickle.dumps(shared)) < 512
+        assert publisher.nbytes >= DayBars.from_bars_by_day(legacy).nbytes
+
+
+def test_workers_attach_to_shared_block():
+    legacy = make_days(12)
+    expected = [legacy[d][-1].close for d in sorted(legacy)]
+
+    with SharedBarsPublisher() as publisher, ProcessPoolExecutor(max_workers=2) as pool:
+        shared = publisher.publish(legacy)
+        results = list(pool.map(_summarize, [shared] * 4))
+
+    for name, writeable, num_bars, closes in results:
+        assert name == "DayBars"
+        assert not writeable
+        assert num_bars == sum(len(v) for v in legacy.values())
+        assert closes == expected
+
+
+def test_optimizer_initializer_receives_shared_bars():
+    # spawn pickles initargs (fork would just inherit the parent's arrays)
+    legacy = make_days(6)
+    with SharedBarsPublisher() as publisher, ProcessPoolExecutor(
+        max_workers=1,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=optimizer._init_worker,
+        initargs=(publisher.publish(legacy), {}, {"indicator_cache_mb": 0}),
+    ) as pool:
+        name, writeable, num_bars, _ = pool.submit(_summarize_worker_data).result()
+    assert (name, writeable) == ("DayBars", False)
+    assert num_bars == sum(len(v) for v in legacy.values())
+
+
+def test_close_unlinks_blocks():
+    publisher = SharedBarsPublisher()
+    shared = publisher.publish(make_days(2))
+    handle = shared.__reduce__()[1][0]
+    publisher.close()
+    with pytest.raises(FileNotFoundError):
+        shared_memory.SharedMemory(name=handle.name)
@@ -0,0 +1,79 @@
+"""Parity tests: columnar signal engine vs. the per-bar reference loop."""
+from datetime import date, timedelta
+
+import pytest
+
+from app.services.backtest.engine import BacktestParams, _generate_signals
+from tests.mocks.reference_engine import generate_signals_loop
+from tests.mocks.synthetic_bars import make_day
+
+SIGNAL_TYPES = [
+    "ema_cross", "vwap_cross", "ema_vwap", "orb", "vwap_rsi",
+    "bb_squeeze", "rsi_reversal", "confluence", "orb_direction", "vwap_reclaim",
+]
+
+
+def _params(signal_type: str, **overrides) -> BacktestParams:
+    return BacktestParams(
+        start_date=date(2026, 1, 5), end_date=date(2026, 1, 30),
+        signal_type=signal_type, **overrides,
+    )
+
+
+PARAM_VARIANTS = [
+    {},
+    {"ema_fast": 5, "ema_slow": 13, "rsi_period": 9},
+    {"rsi_period": 14, "rsi_ob": 60.0, "rsi_os": 40.0, "afternoon_enabled": False},
+    {"pivot_enabled": True, "pivot_filter_enabled": True, "pivot_proximity_pct": 0.5},
+    {"min_confluence": 4, "vol_threshold": 1.0, "bb_period": 10, "bb_std_mult": 1.5},
+    {"orb_minutes": 30, "orb_body_min_pct": 0.0, "orb_vwap_filter": False, "orb_gap_fade_filter": False},
+    {"macd_fast": 8, "macd_slow": 21, "macd_signal_period": 7, "orb_minutes": 5},
+    {"rsi_period": 5, "rsi_ob": 45.0, "rsi_os": 55.0},
+]
+
+
+@pytest.mark.parametrize("signal_type", SIGNAL_TYPES)
+@pytest.mark.parametrize("variant", range(len(PARAM_VARIANTS)))
+def test_columnar_matches_loop(signal_type, variant):
+    params = _params(signal_type, **PARAM_VARIANTS[variant])
+    prev = None
+    for seed in range(8):
+        day = date(2026, 1, 5) + timedelta(days=seed)
+        bars = make_day(seed * 31 + variant, day)
+        kwargs = {}
+        if prev is not None:
+            kwargs = {
+                "prev_close": prev[-1].close,
+                "prev_high": max(b.high for b in prev),
+                "prev_low": min(b.low for b in prev),
+            }
+        assert _generate_signals(bars, params, **kwargs) == generate_signals_loop(bars, params, **kwargs)
+        prev = bars
+
+
+def test_columnar_fires_signals():
+    """Sanity check that the parity data actually exercises the signal paths."""
+    fired = set()
+    for signal_type in SIGNAL_TYPES:
+        params = _params(signal_type, **PARAM_VARIANTS[5])
+        if signal_type in ("vwap_rsi", "rsi_reversal"):
+            params.rsi_period = 9
+        for seed in range(8):
+            if _generate_signals(make_day(seed, date(2026, 1, 5)), params):
+                fired.add(signal_type)
+                break
+    assert len(fired) >= 8
+
+
+def test_entry_confirmation_parity():
+    params = _params("ema_cross", ema_fast=5, ema_slow=13, entry_confirm_minutes=2)
+    day = date(2026, 1, 6)
+    bars = make_day(3, day)
+    confirm = make_day(4, day, interval_min=1)
+    assert _generate_signals(bars, params, confirm_bars=confirm) == \
+        generate_signals_loop(bars, params, confirm_bars=confirm)
+
+
+def test_too_few_bars_returns_empty():
+    bars = make_day(1, date(2026, 1, 5))[:20]
+    assert _generate_signals(bars, _params("ema_cross")) == []
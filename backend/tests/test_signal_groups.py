@@ -0,0 +1,105 @@
+"""Tests for sharing signals across combos that differ only in exit params."""
+import inspect
+import random
+import re
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import fields
+from datetime import date
+
+from app.services.backtest import engine, optimizer, signal_engine
+from app.services.backtest.day_bars import DayBars
+from app.services.backtest.engine import (
+    SIGNAL_PARAM_FIELDS,
+    BacktestParams,
+    MarketDataCache,
+    run_backtest,
+    signal_params_key,
+)
+from tests.mocks import reference_engine
+from tests.mocks.synthetic_bars import make_days
+
+
+def test_signal_fields_cover_everything_signal_generation_reads():
+    sources = [
+        inspect.getsource(signal_engine),
+        inspect.getsource(reference_engine.generate_signals_loop),
+        inspect.getsource(engine._apply_entry_confirmation),
+    ]
+    read = {name for src in sources for name in re.findall(r"params\.(\w+)", src)}
+    assert read <= set(SIGNAL_PARAM_FIELDS)
+    assert set(SIGNAL_PARAM_FIELDS) <= {f.name for f in fields(BacktestParams)}
+
+
+def test_exit_param_keys_are_not_signal_fields():
+    param_fields = {f.name for f in fields(BacktestParams)}
+    assert {optimizer.PARAM_FIELD_NAMES.get(k, k) for k in optimizer.PARAM_SPACE} <= param_fields
+    assert not set(optimizer.EXIT_PARAM_KEYS) & set(SIGNAL_PARAM_FIELDS)
+    assert "stop_loss_percent" in optimizer.EXIT_PARAM_KEYS
+    assert "morning_start_min" not in optimizer.EXIT_PARAM_KEYS
+
+
+def test_exit_variants_share_signal_setup():
+    random.seed(4)
+    combos = optimizer._generate_combinations(60, exit_variants=4)
+    groups = {}
+    for combo in combos:
+        groups.setdefault(optimizer._signal_group_key(combo), []).append(combo)
+
+    assert len(combos) == 60
+    assert len(groups) < 30
+    cfg = {"bar_interval": "5m", "data_source": "csv", "afternoon_enabled": True,
+           "scale_out_enabled": True, "quantity": 2}
+    for group in groups.values():
+        keys = {signal_params_key(optimizer._combo_params(c, cfg, date(2026, 1, 5), date(2026, 1, 9))) for c in group}
+        assert len(keys) == 1
+
+
+def test_shared_signals_match_fresh_backtests():
+    bars = DayBars.from_bars_by_day(make_days(6, seed=9))
+    params = BacktestParams(
+        start_date=date(2026, 1, 5), end_date=date(2026, 1, 12),
+        signal_type="confluence", pivot_enabled=True, pivot_filter_enabled=True, pivot_proximity_pct=0.5,
+    )
+    variants = [
+        params,
+        BacktestParams(**{**vars(params), "stop_loss_percent": 30.0, "max_hold_minutes": 30}),
+        BacktestParams(**{**vars(params), "profit_target_percent": 15.0, "delta_target": 0.3}),
+    ]
+    full = MarketDataCache(bars_by_day=bars, vix_by_day={})
+    # A subset starting mid-window has no prior day for its first day's pivots
+    subset = MarketDataCache(bars_by_day=bars.subset(list(bars)[2:]), vix_by_day={})
+
+    for data in (full, subset):
+        day_signals: dict = {}
+        for p in variants:
+            expected = run_backtest(p, data)
+            actual = run_backtest(p, data, day_signals=day_signals)
+            assert [vars(t) for t in actual.trades] == [vars(t) for t in expected.trades]
+        assert len(day_signals) == len(data.bars_by_day)
+
+
+def test_run_combos_dispatches_groups(monkeypatch):
+    monkeypatch.setitem(optimizer.PARAM_SPACE, "entry_confirm_minutes", [0])
+    config_dict = {
+        "start_date": date(2026, 1, 5), "end_date": date(2026, 1, 9),
+        "bar_interval": "5m", "data_source": "csv",
+        "afternoon_enabled": True, "scale_out_enabled": True, "quantity": 2,
+        "target_metric": "composite", "indicator_cache_mb": 0,
+    }
+    optimizer._init_worker(DayBars.from_bars_by_day(make_days(5)), {}, config_dict)
+    random.seed(2)
+    combos = optimizer._generate_combinations(12, exit_variants=3)
+
+    calls = []
+    run_group = optimizer._run_combo_group
+    monkeypatch.setattr(optimizer, "_run_combo_group", lambda group, *a: calls.append(len(group)) or run_group(group, *a))
+    generated = []
+    generate = engine._generate_signals
+    monkeypatch.setattr(engine, "_generate_signals", lambda bars, params, **kw: generated.append(1) or generate(bars, params, **kw))
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        scored = optimizer._run_combos(pool, combos)
+
+    assert sorted(map(optimizer._combo_key, (c for _, c, _ in scored))) == sorted(map(optimizer._combo_key, combos))
+    assert sum(calls) == 12 and len(calls) < 12
+    # Without an indicator cache, signals are still generated once per group and day
+    assert len(generated) <= len(calls) * 5
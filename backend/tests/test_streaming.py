@@ -0,0 +1,38 @@
+import asyncio
+import json
+
+import pytest
+
+from app.services.streaming import StreamingService
+
+
+def _option_message(*entries) -> str:
+    return json.dumps({"data": [{"service": "LEVELONE_OPTIONS", "content": list(entries)}]})
+
+
+@pytest.mark.asyncio
+async def test_option_ticks_are_coalesced_by_symbol():
+    streaming = StreamingService()
+
+    await streaming._on_message(_option_message(
+        {"key": "SPY_C600", "2": 1.00, "3": 1.10},
+        {"key": "SPY_P590", "2": 0.80, "3": 0.85},
+    ))
+    await streaming._on_message(_option_message({"key": "SPY_C600", "2": 1.05}))
+
+    ticks = await streaming.wait_option_ticks(timeout=1.0)
+    assert set(ticks) == {"SPY_C600", "SPY_P590"}
+    assert ticks["SPY_C600"] == streaming._option_quotes["SPY_C600"].updated_at
+
+    assert await streaming.wait_option_ticks(timeout=0.01) == {}
+
+
+@pytest.mark.asyncio
+async def test_wait_option_ticks_wakes_on_quote():
+    streaming = StreamingService()
+    waiter = asyncio.create_task(streaming.wait_option_ticks(timeout=1.0))
+    await asyncio.sleep(0)
+    assert not waiter.done()
+
+    await streaming._on_message(_option_message({"key": "SPY_C600", "4": 1.02}))
+    assert set(await waiter) == {"SPY_C600"}
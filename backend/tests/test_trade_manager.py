@@ -230,3 +230,51 @@ async def test_event_calendar_blocks_afternoon_trades(db_session, trade_manager_
 
     assert result.status == "rejected"
     assert "Afternoon trading blocked" in result.message
+
+
+@pytest.mark.asyncio
+async def test_entry_pipeline_shares_fetches_and_records_timings(db_session, mock_schwab, trade_manager_deps):
+    """Bars are fetched once for ATR + regime, the chain once, and stage timings land in the event."""
+    import json
+
+    from app.models import TradeEvent, TradeEventType
+
+    calls = {"minute": 0, "chain": 0}
+    price_history, option_chains = mock_schwab.price_history, mock_schwab.option_chains
+
+    def counting_history(symbol, **kwargs):
+        if kwargs.get("frequencyType") == "minute":
+            calls["minute"] += 1
+        return price_history(symbol, **kwargs)
+
+    def counting_chains(*args, **kwargs):
+        calls["chain"] += 1
+        return option_chains(*args, **kwargs)
+
+    mock_schwab.price_history = counting_history
+    mock_schwab.option_chains = counting_chains
+
+    alert = TradingViewAlert(ticker="SPY", action="BUY_CALL", secret="test-secret", price=600.0)
+    db_alert = Alert(
+        raw_payload="{}", ticker="SPY", direction=TradeDirection.CALL,
+        signal_price=600.0, status=AlertStatus.RECEIVED,
+    )
+    db_session.add(db_alert)
+    db_session.flush()
+
+    with _mock_market_hours():
+        result = await trade_manager_deps.process_alert(
+            db_session, db_alert, alert, strategy_params={"signal_type": "ema_cross"},
+        )
+
+    assert result.status == "accepted"
+    assert calls == {"minute": 1, "chain": 1}
+
+    event = (
+        db_session.query(TradeEvent)
+        .filter_by(trade_id=result.trade_id, event_type=TradeEventType.ENTRY_ORDER_PLACED)
+        .one()
+    )
+    timings = json.loads(event.details)["timings_ms"]
+    assert {"bars", "chain_prefetch", "iv_history", "delta", "select", "order", "total"} <= set(timings)
+    assert timings["total"] >= timings["select"]
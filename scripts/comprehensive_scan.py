@@ -29,6 +29,7 @@ from stock_backtest_engine import (
     load_vix_data,
     run_stock_backtest,
 )
+from app.services.backtest.shared_bars import SharedBarsPublisher
 
 DATA_DIR = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data"))
 TIMEFRAMES = ["5m", "10m", "15m", "30m"]
@@ -241,16 +242,24 @@ def _build_params(ticker: str, timeframe: str, strat: dict, start_date: date, en
 
 
 def _worker(args: tuple) -> list[dict]:
-    """Worker: backtest one ticker across all timeframes and strategies."""
-    ticker, start_date, end_date, strategies = args
+    """Worker: backtest one ticker across all timeframes and strategies.
+
+    args may carry {timeframe: bars} and VIX loaded by the parent (bars
+    published through shared memory); otherwise the worker loads its own.
+    """
+    ticker, start_date, end_date, strategies = args[:4]
+    bars_by_tf, shared_vix = args[4:6] if len(args) >= 6 else (None, None)
     results = []
 
     for tf in TIMEFRAMES:
-        bars_by_day = load_ticker_csv_bars(ticker, start_date, end_date, tf)
+        if bars_by_tf is not None:
+            bars_by_day = bars_by_tf.get(tf)
+        else:
+            bars_by_day = load_ticker_csv_bars(ticker, start_date, end_date, tf)
         if not bars_by_day or len(bars_by_day) < 10:
             continue
 
-        vix_by_day = load_vix_data(start_date, end_date)
+        vix_by_day = shared_vix if shared_vix is not None else load_vix_data(start_date, end_date)
 
         for strat in strategies:
             try:
@@ -454,7 +463,17 @@ def main():
     ]
 
     completed = 0
-    with ProcessPoolExecutor(max_workers=workers) as pool:
+    with SharedBarsPublisher() as publisher, ProcessPoolExecutor(max_workers=workers) as pool:
+        # Load every ticker/timeframe once here; workers attach to shared copies
+        vix_by_day = load_vix_data(start_date, end_date)
+        tasks = [
+            task + ({
+                tf: publisher.publish(load_ticker_csv_bars(task[0], start_date, end_date, tf))
+                for tf in TIMEFRAMES
+            }, vix_by_day)
+            for task in tasks
+        ]
+        print(f"  Shared bar data: {publisher.nbytes / 1e6:.1f} MB\n")
         futures = {pool.submit(_worker, task): task[0] for task in tasks}
 
         for future in as_completed(futures):
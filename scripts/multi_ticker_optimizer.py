@@ -40,7 +40,10 @@ from stock_backtest_engine import (
     load_vix_data,
     run_stock_backtest,
 )
+from app.services.backtest.day_bars import DayBars
+from app.services.backtest.indicator_cache import IndicatorCache
 from app.services.backtest.market_data import BarData
+from app.services.backtest.shared_bars import SharedBarsPublisher
 
 logging.basicConfig(level=logging.WARNING, format="%(levelname)s: %(message)s")
 logger = logging.getLogger(__name__)
@@ -403,8 +406,12 @@ def optimize_ticker_timeframe(
         if len(dates) - split_idx >= 10:
             train_dates = dates[:split_idx]
             test_dates = dates[split_idx:]
-            train_bars = {d: bars_by_day[d] for d in train_dates}
-            test_bars = {d: bars_by_day[d] for d in test_dates}
+            if isinstance(bars_by_day, DayBars):
+                train_bars = bars_by_day.subset(train_dates)
+                test_bars = bars_by_day.subset(test_dates)
+            else:
+                train_bars = {d: bars_by_day[d] for d in train_dates}
+                test_bars = {d: bars_by_day[d] for d in test_dates}
             has_oos = True
 
     train_dates_sorted = sorted(train_bars.keys())
@@ -420,10 +427,15 @@ def optimize_ticker_timeframe(
     # ── Optimize on train set ────────────────────────────────────
     combos = generate_combinations(iterations)
     scored: list[tuple[float, dict, StockBacktestResult]] = []
+    # Indicators are shared across combos; train/test days are disjoint so one cache serves both
+    indicator_cache = IndicatorCache()
 
     for combo in combos:
         params = _build_params(combo, ticker, timeframe, train_start, train_end, quantity)
-        result = run_stock_backtest(params, bars_by_day=train_bars, vix_by_day=vix_by_day, rolling_vol=precomputed_vol)
+        result = run_stock_backtest(
+            params, bars_by_day=train_bars, vix_by_day=vix_by_day, rolling_vol=precomputed_vol,
+            indicator_cache=indicator_cache,
+        )
         score = compute_score(result, metric)
         scored.append((score, combo, result))
 
@@ -473,6 +485,7 @@ def optimize_ticker_timeframe(
             )
             oos_result = run_stock_backtest(
                 test_params, bars_by_day=test_bars, vix_by_day=vix_by_day, rolling_vol=oos_vol,
+                indicator_cache=indicator_cache,
             )
             oos_score = compute_score(oos_result, metric)
 
@@ -684,15 +697,22 @@ def parse_args():
 
 
 def _worker_task(args: tuple) -> list[dict]:
-    """Worker function for parallel optimization of a single ticker/timeframe."""
-    ticker, tf, iterations, metric, quantity, top_n, start_date, end_date = args
+    """Worker function for parallel optimization of a single ticker/timeframe.
 
-    # Each worker loads its own data (can't share across processes)
-    bars_by_day = load_ticker_csv_bars(ticker, start_date, end_date, tf)
+    args may carry pre-loaded bars and VIX (see _publish_task_data); the
+    bars are then a shared-memory DayBars the worker attaches to by name.
+    Otherwise the worker loads its own data.
+    """
+    ticker, tf, iterations, metric, quantity, top_n, start_date, end_date = args[:8]
+    bars_by_day, vix_by_day = args[8:10] if len(args) >= 10 else (None, None)
+
+    if bars_by_day is None:
+        bars_by_day = load_ticker_csv_bars(ticker, start_date, end_date, tf)
     if not bars_by_day:
         return []
 
-    vix_by_day = load_vix_data(start_date, end_date)
+    if vix_by_day is None:
+        vix_by_day = load_vix_data(start_date, end_date)
 
     return optimize_ticker_timeframe(
         ticker=ticker,
@@ -706,6 +726,25 @@ def _worker_task(args: tuple) -> list[dict]:
     )
 
 
+def _publish_task_data(
+    publisher: SharedBarsPublisher,
+    tasks: list[tuple],
+) -> list[tuple]:
+    """Load each task's bars once in the parent and append them (shared) plus VIX.
+
+    Tasks keep the _worker_task layout (ticker, tf, ..., start_date, end_date).
+    """
+    vix_cache: dict[tuple, dict] = {}
+    published = []
+    for task in tasks:
+        ticker, tf, start_date, end_date = task[0], task[1], task[6], task[7]
+        bars_by_day = load_ticker_csv_bars(ticker, start_date, end_date, tf)
+        if (start_date, end_date) not in vix_cache:
+            vix_cache[(start_date, end_date)] = load_vix_data(start_date, end_date)
+        published.append(task + (publisher.publish(bars_by_day), vix_cache[(start_date, end_date)]))
+    return published
+
+
 def main():
     args = parse_args()
     tickers = ALL_TICKERS if args.tickers == "all" else [t.strip().upper() for t in args.tickers.split(",")]
@@ -742,7 +781,8 @@ def main():
     ]
 
     completed = 0
-    with ProcessPoolExecutor(max_workers=workers) as pool:
+    with SharedBarsPublisher() as publisher, ProcessPoolExecutor(max_workers=workers) as pool:
+        tasks = _publish_task_data(publisher, tasks)
         futures = {pool.submit(_worker_task, task): task for task in tasks}
 
         for future in as_completed(futures):
@@ -55,9 +55,11 @@ from multi_ticker_optimizer import (
     compute_score,
     print_report,
     save_json_report,
+    _publish_task_data,
     _worker_task,
 )
 from stock_backtest_engine import load_ticker_csv_bars, load_vix_data
+from app.services.backtest.shared_bars import SharedBarsPublisher
 
 # Skip 1-minute — user requested
 FREQUENCIES = [5, 10, 15, 30]
@@ -289,7 +291,8 @@ def run_optimization(
     all_results: list[dict] = []
     completed = 0
 
-    with ProcessPoolExecutor(max_workers=opt_workers) as pool:
+    with SharedBarsPublisher() as publisher, ProcessPoolExecutor(max_workers=opt_workers) as pool:
+        tasks = _publish_task_data(publisher, tasks)
         futures = {pool.submit(_worker_task, task): task for task in tasks}
 
         for future in as_completed(futures):
@@ -25,21 +25,21 @@ import pytz
 # Add backend to path so we can import the existing engine
 sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
 
-from app.services.backtest.black_scholes import (
-    estimate_option_price_at,
-    estimate_option_price_and_delta,
-    select_strike_for_delta,
-)
+from app.services.backtest.black_scholes import select_strike_for_delta
 from app.services.backtest.spread_model import (
     estimate_spread_pct,
 )
+from app.services.backtest.day_bars import bar_timestamps, day_extremes
 from app.services.backtest.engine import (
     BacktestParams,
     Signal,
     _compute_atr,
     _generate_signals,
+    _path_minutes_to_close,
+    _price_trade_path,
 )
-from app.services.backtest.market_data import BarData, fetch_vix_daily
+from app.services.backtest.indicator_cache import IndicatorCache
+from app.services.backtest.market_data import BarData, count_bars, fetch_vix_daily, read_bar_csv
 
 logger = logging.getLogger(__name__)
 
@@ -377,36 +377,11 @@ def load_ticker_csv_bars(
         logger.warning(f"CSV not found: {csv_path}")
         return {}
 
-    df = pd.read_csv(csv_path, parse_dates=["Timestamp"])
-    logger.info(f"Loaded {len(df)} rows from {csv_path}")
-
-    bars_by_day: dict[date, list[BarData]] = {}
-
-    for _, row in df.iterrows():
-        ts_naive = row["Timestamp"].to_pydatetime()
-        trade_date = ts_naive.date()
-
-        if trade_date < start_date or trade_date > end_date:
-            continue
-
-        ts_et = ET.localize(ts_naive)
-
-        bar = BarData(
-            timestamp=ts_et,
-            open=float(row["Open"]),
-            high=float(row["High"]),
-            low=float(row["Low"]),
-            close=float(row["Close"]),
-            volume=int(row["Volume"]),
-        )
-        bars_by_day.setdefault(trade_date, []).append(bar)
-
-    for day in bars_by_day:
-        bars_by_day[day].sort(key=lambda b: b.timestamp)
+    bars_by_day = read_bar_csv(csv_path, start_date, end_date)
 
     logger.info(
         f"CSV {ticker} {interval}: {len(bars_by_day)} days, "
-        f"{sum(len(v) for v in bars_by_day.values())} bars "
+        f"{count_bars(bars_by_day)} bars "
         f"({start_date} to {end_date})"
     )
     return bars_by_day
@@ -538,28 +513,25 @@ def _simulate_option_trade(
         else:
             stop_price = trade.entry_price * (1 - params.stop_loss_percent / 100)
 
-    for bar in bars_after:
-        mtc = _minutes_to_expiry(bar.timestamp, expiry_date) if expiry_date else _minutes_to_close(bar.timestamp)
-        # Combined B-S call: get both price and delta in one shot
-        opt_result = estimate_option_price_and_delta(bar.close, trade.strike, mtc, vix, trade.direction)
-        opt_price = max(opt_result.price, 0.01)
-
-        # Intrabar stop check: estimate option price at worst underlying level
-        # CALL worst = bar.low (underlying drops), PUT worst = bar.high (underlying rises)
-        if not use_orb_stops:
-            worst_underlying = bar.low if trade.direction == "CALL" else bar.high
-            opt_price_worst = max(
-                estimate_option_price_at(worst_underlying, trade.strike, mtc, vix, trade.direction),
-                0.01,
-            )
-        else:
-            opt_price_worst = opt_price  # ORB stops use underlying levels, not option price
+    # Option mid, delta and intrabar worst-case mid for each bar, priced ahead
+    # of the exit checks. CALL worst = bar.low (underlying drops), PUT worst =
+    # bar.high (underlying rises); ORB stops use underlying levels instead.
+    def path_minutes_to_expiry(chunk: list[BarData]) -> list[float]:
+        if not expiry_date:
+            return _path_minutes_to_close(chunk)
+        return [_minutes_to_expiry(ts, expiry_date) for ts in bar_timestamps(chunk)]
+
+    path = _price_trade_path(
+        bars_after, trade.strike, vix, trade.direction, intrabar_worst=not use_orb_stops,
+        minutes_to_expiry=path_minutes_to_expiry,
+    )
 
+    for bar, (_, opt_price, opt_delta, opt_price_worst) in zip(bars_after, path):
         # Compute per-bar exit slippage (dynamic spread or flat)
         if params.spread_model_enabled:
             mtc_close = _minutes_to_close(bar.timestamp)
             exit_spread = estimate_spread_pct(
-                opt_result.delta, mtc_close, vix, opt_price, is_0dte=is_0dte,
+                opt_delta, mtc_close, vix, opt_price, is_0dte=is_0dte,
                 liquidity_mult=liquidity_mult,
             )
             bar_slippage = exit_spread / 2 * 100
@@ -655,13 +627,11 @@ def _simulate_option_trade(
     # End of day — force close at last bar
     if trade.exit_time is None and bars_after:
         last = bars_after[-1]
-        mtc = _minutes_to_expiry(last.timestamp, expiry_date) if expiry_date else _minutes_to_close(last.timestamp)
-        eod_result = estimate_option_price_and_delta(last.close, trade.strike, mtc, vix, trade.direction)
-        last_price = max(eod_result.price, 0.01)
+        last_price = opt_price  # the loop ran to the last bar
         if params.spread_model_enabled:
             mtc_close = _minutes_to_close(last.timestamp)
             exit_spread = estimate_spread_pct(
-                eod_result.delta, mtc_close, vix, last_price, is_0dte=is_0dte,
+                opt_delta, mtc_close, vix, last_price, is_0dte=is_0dte,
                 liquidity_mult=liquidity_mult,
             )
             eod_slippage = exit_spread / 2 * 100
@@ -758,8 +728,12 @@ def run_stock_backtest(
     bars_by_day: Optional[dict[date, list[BarData]]] = None,
     vix_by_day: Optional[dict[date, float]] = None,
     rolling_vol: Optional[dict[date, float]] = None,
+    indicator_cache: Optional[IndicatorCache] = None,
 ) -> StockBacktestResult:
-    """Run an options-level backtest using Black-Scholes pricing for any ticker."""
+    """Run an options-level backtest using Black-Scholes pricing for any ticker.
+
+    indicator_cache, if given, must only ever see this ticker/interval's bars.
+    """
 
     if bars_by_day is None:
         bars_by_day = load_ticker_csv_bars(
@@ -847,9 +821,7 @@ def run_stock_backtest(
         day_vix = vix_by_day.get(trade_date, default_vix)
         if day_vix < params.vix_min or day_vix > params.vix_max:
             if day_bars:
-                prev_close = day_bars[-1].close
-                prev_high = max(b.high for b in day_bars)
-                prev_low = min(b.low for b in day_bars)
+                prev_close, prev_high, prev_low = day_extremes(day_bars)
             result.days.append(StockDailyResult(trade_date=trade_date))
             continue
 
@@ -860,12 +832,16 @@ def run_stock_backtest(
             day_bars, engine_params, prev_close=prev_close,
             prev_high=prev_high, prev_low=prev_low,
             confirm_bars=confirm_day,
+            indicator_cache=indicator_cache, cache_day=trade_date,
         )
 
         # Precompute ATR if enabled
         day_atr: list[Optional[float]] = [None] * len(day_bars)
         if params.atr_period > 0:
-            day_atr = _compute_atr(day_bars, params.atr_period)
+            day_atr = _compute_atr(
+                day_bars, params.atr_period,
+                indicator_cache=indicator_cache, cache_day=trade_date,
+            )
 
         daily_trades = 0
         daily_pnl = 0.0
@@ -873,7 +849,7 @@ def run_stock_backtest(
         last_exit_time: Optional[datetime] = None
 
         # Precompute sorted timestamps for bisect-based entry bar lookup
-        bar_timestamps = [b.timestamp for b in day_bars]
+        day_timestamps = bar_timestamps(day_bars)
 
         for signal in signals:
             # Limits
@@ -926,7 +902,7 @@ def run_stock_backtest(
             else:
                 entry_price = round(max(limit_price, 0.01), 2)
 
-            entry_idx = bisect.bisect_left(bar_timestamps, signal.timestamp)
+            entry_idx = bisect.bisect_left(day_timestamps, signal.timestamp)
             if entry_idx >= len(day_bars):
                 continue
             bars_after = day_bars[entry_idx + 1:]
@@ -972,9 +948,7 @@ def run_stock_backtest(
 
         day_result.pnl = round(daily_pnl, 2)
         if day_bars:
-            prev_close = day_bars[-1].close
-            prev_high = max(b.high for b in day_bars)
-            prev_low = min(b.low for b in day_bars)
+            prev_close, prev_high, prev_low = day_extremes(day_bars)
         result.days.append(day_result)
 
     _compute_summary(result)